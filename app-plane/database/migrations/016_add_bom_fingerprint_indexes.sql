@@ -0,0 +1,32 @@
+-- Migration: Add per-organization fingerprint indexes on boms.metadata
+-- Date: 2026-10-18
+-- Purpose: Fast lookup of previously uploaded BOMs by content fingerprint
+--
+-- PROBLEM:
+-- Upload idempotency looks up prior BOMs with
+--   WHERE organization_id = :org AND metadata->>'file_hash' = :hash
+-- which has no supporting index, so every upload scans all BOMs of the tenant.
+--
+-- SOLUTION:
+-- Expression indexes on (organization_id, metadata->>'file_hash') and
+-- (organization_id, metadata->>'content_hash'). content_hash is the SHA-256 of
+-- the normalized parsed line items (see cns-service app/services/bom_fingerprint.py),
+-- so a re-saved or re-ordered spreadsheet also matches its prior upload.
+--
+-- PERFORMANCE IMPACT:
+-- - Before: Sequential scan over the organization's BOMs per upload
+-- - After: Index scan O(log n) per fingerprint lookup
+--
+-- Apply to: supabase database
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_boms_org_file_hash
+ON public.boms (organization_id, (metadata->>'file_hash'), created_at DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_boms_org_content_hash
+ON public.boms (organization_id, (metadata->>'content_hash'), created_at DESC);
+
+COMMENT ON INDEX public.idx_boms_org_file_hash IS
+'Fingerprint index for exact re-upload detection: WHERE organization_id = :org AND metadata->>''file_hash'' = :hash';
+
+COMMENT ON INDEX public.idx_boms_org_content_hash IS
+'Fingerprint index for same-content re-upload detection: WHERE organization_id = :org AND metadata->>''content_hash'' = :hash';
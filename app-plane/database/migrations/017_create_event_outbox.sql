@@ -0,0 +1,48 @@
+-- Migration: Create transactional outbox for domain events
+-- Date: 2026-10-18
+-- Purpose: Publish RabbitMQ events reliably without blocking request handlers
+--
+-- PROBLEM:
+-- Handlers commit their database changes and then publish to RabbitMQ inline.
+-- Publishing adds broker latency to the request, and a crash (or broker
+-- outage) between COMMIT and publish silently loses the event.
+--
+-- SOLUTION:
+-- Handlers insert the event envelope into event_outbox in the same transaction
+-- as the domain change (see cns-service app/services/event_outbox.py). The
+-- outbox relay (app/workers/outbox_relay.py) claims unpublished rows with
+-- FOR UPDATE SKIP LOCKED, publishes them with publisher confirms and marks
+-- them published. Several relays can run side by side without double sends.
+-- Delivery is at-least-once; consumers dedupe on event_id.
+--
+-- Apply to: supabase database
+
+CREATE TABLE IF NOT EXISTS public.event_outbox (
+    id BIGSERIAL PRIMARY KEY,
+    event_id UUID NOT NULL UNIQUE,
+    routing_key VARCHAR(255) NOT NULL,
+    payload JSONB NOT NULL,
+    priority SMALLINT NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    available_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    published_at TIMESTAMPTZ
+);
+
+-- Relay claim query: WHERE published_at IS NULL AND available_at <= NOW() ORDER BY id
+CREATE INDEX IF NOT EXISTS idx_event_outbox_pending
+ON public.event_outbox (id)
+WHERE published_at IS NULL;
+
+-- Retention purge of published rows
+CREATE INDEX IF NOT EXISTS idx_event_outbox_published_at
+ON public.event_outbox (published_at)
+WHERE published_at IS NOT NULL;
+
+COMMENT ON TABLE public.event_outbox IS
+'Transactional outbox: events written with the domain change, published to RabbitMQ by the outbox relay';
+COMMENT ON COLUMN public.event_outbox.payload IS
+'Full event envelope as published (event_id, event_type, routing_key, timestamp, source, ...)';
+COMMENT ON COLUMN public.event_outbox.available_at IS
+'Earliest time the relay may (re)try this row; pushed back with exponential backoff on failure';
@@ -0,0 +1,23 @@
+-- Migration: Mark line risk scores carried over from a previous BOM revision
+-- Date: 2026-10-18
+-- Purpose: Let the first risk run of a new revision skip exactly the carried-over rows
+--
+-- PROBLEM:
+-- When a BOM revision is uploaded, unchanged lines inherit the previous
+-- revision's bom_line_item_risk_scores row (cns-service app/services/bom_diff.py).
+-- The risk activity can't tell those rows from rows that were scored long ago,
+-- so it either re-scores everything or skips everything that has a row.
+--
+-- SOLUTION:
+-- carried_over is set when a row is copied from the previous revision. The
+-- next risk run skips those lines and clears the flag, and any re-scoring
+-- (store_line_item_risk upsert) clears it too, so later analyses recompute
+-- every line as before.
+--
+-- Apply to: supabase database
+
+ALTER TABLE public.bom_line_item_risk_scores
+    ADD COLUMN IF NOT EXISTS carried_over BOOLEAN NOT NULL DEFAULT FALSE;
+
+COMMENT ON COLUMN public.bom_line_item_risk_scores.carried_over IS
+'TRUE when copied from the previous BOM revision and not re-analyzed since';
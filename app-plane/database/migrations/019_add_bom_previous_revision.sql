@@ -0,0 +1,26 @@
+-- Migration: Record BOM revision lineage
+-- Date: 2026-10-18
+-- Purpose: Find the latest revision of a BOM by following an explicit link
+--
+-- PROBLEM:
+-- A re-upload under an existing BOM name is stored as "name (YYYYmmdd_HHMMSS)"
+-- to satisfy idx_boms_unique_per_project. Looking up the previous revision by
+-- the uploaded name always finds the first upload, so the third and later
+-- revisions were diffed against revision one.
+--
+-- SOLUTION:
+-- boms.previous_revision_id points at the revision a BOM was diffed against
+-- (set by cns-service app/services/bom_diff.py). The latest revision is the
+-- newest BOM reachable from the named BOM through this link.
+--
+-- Apply to: supabase database
+
+ALTER TABLE public.boms
+    ADD COLUMN IF NOT EXISTS previous_revision_id UUID REFERENCES public.boms(id) ON DELETE SET NULL;
+
+CREATE INDEX IF NOT EXISTS idx_boms_previous_revision_id
+ON public.boms (previous_revision_id)
+WHERE previous_revision_id IS NOT NULL;
+
+COMMENT ON COLUMN public.boms.previous_revision_id IS
+'BOM revision this upload was diffed against (NULL for a first upload)';
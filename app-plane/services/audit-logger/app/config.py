@@ -20,6 +20,12 @@ class Config:
         self.RABBITMQ_VHOST = os.getenv('RABBITMQ_VHOST', '/')
         self.RABBITMQ_EXCHANGE = os.getenv('RABBITMQ_EXCHANGE', 'platform.events')
 
+        # Batched ingestion: flush after AUDIT_BATCH_SIZE rows or AUDIT_FLUSH_MS,
+        # whichever comes first. Prefetch defaults to one full batch.
+        self.AUDIT_BATCH_SIZE = int(os.getenv('AUDIT_BATCH_SIZE', '500'))
+        self.AUDIT_FLUSH_MS = int(os.getenv('AUDIT_FLUSH_MS', '200'))
+        self.AUDIT_PREFETCH = int(os.getenv('AUDIT_PREFETCH', str(self.AUDIT_BATCH_SIZE)))
+
         # PostgreSQL Direct Connection Configuration
         self.SUPABASE_DB_HOST = os.getenv('SUPABASE_DB_HOST', 'components-v2-supabase-db')
         self.SUPABASE_DB_PORT = os.getenv('SUPABASE_DB_PORT', '5432')
@@ -45,6 +51,8 @@ class Config:
             f"  RABBITMQ_USER={self.RABBITMQ_USER},\n"
             f"  SUPABASE_DB_HOST={self.SUPABASE_DB_HOST},\n"
             f"  SUPABASE_DB_PORT={self.SUPABASE_DB_PORT},\n"
-            f"  RABBITMQ_EXCHANGE={self.RABBITMQ_EXCHANGE}\n"
+            f"  RABBITMQ_EXCHANGE={self.RABBITMQ_EXCHANGE},\n"
+            f"  AUDIT_BATCH_SIZE={self.AUDIT_BATCH_SIZE},\n"
+            f"  AUDIT_FLUSH_MS={self.AUDIT_FLUSH_MS}\n"
             f")"
         )
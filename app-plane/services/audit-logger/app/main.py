@@ -14,6 +14,12 @@ Environment Variables:
     RABBITMQ_PASS: RabbitMQ password
     SUPABASE_URL: Supabase project URL
     SUPABASE_SERVICE_KEY: Supabase service role key (bypasses RLS)
+    AUDIT_BATCH_SIZE: Rows per multi-row INSERT (default: 500)
+    AUDIT_FLUSH_MS: Max time a message waits in the buffer (default: 200)
+    AUDIT_PREFETCH: Unacked messages the broker may deliver (default: AUDIT_BATCH_SIZE)
+
+Messages are buffered and written with one INSERT per batch; the whole
+delivery-tag range is then acked with a single basic_ack(multiple=True).
 """
 
 import os
@@ -21,9 +27,10 @@ import json
 import signal
 import sys
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 import pika
+import psycopg2
 from pika.exceptions import AMQPConnectionError
 
 from config import Config
@@ -36,6 +43,29 @@ logger = get_logger('audit-logger')
 shutdown_flag = False
 
 
+def build_audit_log(event: Dict[str, Any], routing_key: str) -> Dict[str, Any]:
+    """Map a platform event to an audit_logs record"""
+    audit_log = {
+        'event_type': event.get('event_type', routing_key),
+        'routing_key': routing_key,
+        'timestamp': event.get('timestamp', datetime.utcnow().isoformat()),
+        # Actor information (who performed the action)
+        'user_id': event.get('user_id'),
+        'username': event.get('username'),
+        'email': event.get('email'),
+        'ip_address': event.get('ip_address'),
+        'user_agent': event.get('user_agent'),
+        'source': event.get('source'),
+        'session_id': event.get('session_id'),
+        'tenant_id': event.get('tenant_id'),
+        # Store full event as JSONB
+        'event_data': event,
+    }
+
+    # Remove None values (Supabase handles defaults)
+    return {k: v for k, v in audit_log.items() if v is not None}
+
+
 class AuditLoggerService:
     """
     RabbitMQ consumer that stores all events in audit_logs table
@@ -46,6 +76,9 @@ class AuditLoggerService:
         self.supabase_client = SupabaseClient()
         self.connection = None
         self.channel = None
+        # (delivery_tag, audit_log) waiting for the next flush
+        self.buffer: List[Tuple[int, Dict[str, Any]]] = []
+        self.flush_timer = None
 
     def connect_rabbitmq(self):
         """Establish connection to RabbitMQ"""
@@ -118,7 +151,7 @@ class AuditLoggerService:
 
     def process_event(self, ch, method, properties, body):
         """
-        Process incoming event and store in audit_logs table
+        Buffer an incoming event for the next batched insert
 
         Args:
             ch: Channel
@@ -127,74 +160,70 @@ class AuditLoggerService:
             body: Message body (JSON)
         """
         try:
-            logger.info(f"[CALLBACK] Received message with routing_key: {method.routing_key}")
-
-            # Parse event
             event = json.loads(body)
-            routing_key = method.routing_key
-
-            logger.info(f"[CALLBACK] Parsed event: {json.dumps(event)[:200]}...")
-
-            # Extract common fields
-            event_type = event.get('event_type', routing_key)
-            timestamp = event.get('timestamp', datetime.utcnow().isoformat())
-
-            # Extract actor information (who performed the action)
-            user_id = event.get('user_id')
-            username = event.get('username')
-            email = event.get('email')
-            ip_address = event.get('ip_address')
-            user_agent = event.get('user_agent')
-            source = event.get('source')
-            session_id = event.get('session_id')
-            tenant_id = event.get('tenant_id')
-
-            # Store full event as JSONB
-            event_data = event
-
-            # Create audit log record
-            audit_log = {
-                'event_type': event_type,
-                'routing_key': routing_key,
-                'timestamp': timestamp,
-                'user_id': user_id,
-                'username': username,
-                'email': email,
-                'ip_address': ip_address,
-                'user_agent': user_agent,
-                'source': source,
-                'session_id': session_id,
-                'tenant_id': tenant_id,
-                'event_data': event_data,
-            }
-
-            # Remove None values (Supabase handles defaults)
-            audit_log = {k: v for k, v in audit_log.items() if v is not None}
-
-            logger.info(f"[CALLBACK] Inserting audit log: event_type={event_type}, email={email}")
-
-            # Insert into Supabase
-            result = self.supabase_client.insert_audit_log(audit_log)
-
-            logger.info(f"[CALLBACK] Insert result: {result is not None}")
-
-            if result:
-                logger.info(f"✓ Stored audit log: {event_type} (routing_key: {routing_key}, email: {email})")
-            else:
-                logger.warning(f"✗ Failed to store audit log: {event_type}")
-
-            # Acknowledge message
-            ch.basic_ack(delivery_tag=method.delivery_tag)
-
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse event JSON: {e}")
             # Reject and don't requeue malformed messages
             ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+            return
+
+        logger.debug(f"[CALLBACK] Received message with routing_key: {method.routing_key}")
+        self.buffer.append((method.delivery_tag, build_audit_log(event, method.routing_key)))
+
+        if len(self.buffer) >= self.config.AUDIT_BATCH_SIZE:
+            self.flush()
+        elif self.flush_timer is None:
+            self.flush_timer = self.connection.call_later(
+                self.config.AUDIT_FLUSH_MS / 1000.0, self._on_flush_timer
+            )
+
+    def _on_flush_timer(self):
+        self.flush_timer = None
+        self.flush()
+
+    def flush(self):
+        """
+        Write buffered audit logs and settle their deliveries
+
+        One multi-row INSERT per batch, then one basic_ack(multiple=True) for
+        the highest delivery tag. A connection-level failure nacks the range
+        with requeue so the broker redelivers it.
+        """
+        if self.flush_timer is not None:
+            self.connection.remove_timeout(self.flush_timer)
+            self.flush_timer = None
+
+        batch, self.buffer = self.buffer, []
+        if not batch:
+            return
+
+        last_tag = batch[-1][0]
+        audit_logs = [audit_log for _, audit_log in batch]
+
+        try:
+            try:
+                stored = self.supabase_client.insert_audit_logs(audit_logs)
+            except (psycopg2.DataError, psycopg2.IntegrityError) as e:
+                # A bad row fails the whole statement; isolate it
+                logger.warning(f"Batch insert rejected, storing {len(batch)} audit logs individually: {e}")
+                stored = self._insert_individually(audit_logs)
+
+            self.channel.basic_ack(delivery_tag=last_tag, multiple=True)
+            logger.info(f"✓ Stored {stored}/{len(batch)} audit logs")
 
         except Exception as e:
-            logger.error(f"Error processing event: {e}", exc_info=True)
-            # Reject and requeue for retry
-            ch.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
+            logger.error(f"Error storing {len(batch)} audit logs: {e}", exc_info=True)
+            # Reject and requeue the whole range for retry
+            self.channel.basic_nack(delivery_tag=last_tag, multiple=True, requeue=True)
+
+    def _insert_individually(self, audit_logs: List[Dict[str, Any]]) -> int:
+        stored = 0
+        for audit_log in audit_logs:
+            if self.supabase_client.insert_audit_log(audit_log):
+                stored += 1
+            else:
+                logger.warning(f"✗ Failed to store audit log: {audit_log.get('event_type')}")
+        return stored
 
     def start(self):
         """Start consuming events"""
@@ -207,7 +236,8 @@ class AuditLoggerService:
             logger.info(f"Storing audit logs in Supabase table: audit_logs")
 
             # Start consuming
-            self.channel.basic_qos(prefetch_count=10)  # Process 10 messages at a time
+            # Let a full batch arrive before the first flush
+            self.channel.basic_qos(prefetch_count=self.config.AUDIT_PREFETCH)
             self.channel.basic_consume(
                 queue=queue_name,
                 on_message_callback=self.process_event
@@ -231,6 +261,8 @@ class AuditLoggerService:
 
         if self.channel and not self.channel.is_closed:
             self.channel.stop_consuming()
+            # Store (and ack) whatever is still buffered
+            self.flush()
 
         if self.connection and not self.connection.is_closed:
             self.connection.close()
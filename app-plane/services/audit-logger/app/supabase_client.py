@@ -7,16 +7,37 @@ Bypasses REST API and RLS for service-to-service communication.
 
 import os
 import json
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 import uuid
 
 import psycopg2
-from psycopg2.extras import RealDictCursor, Json
+from psycopg2.extras import RealDictCursor, Json, execute_values
 from shared.logger_config import get_logger
 
 logger = get_logger('supabase_client')
 
+AUDIT_LOG_COLUMNS = ['event_type', 'routing_key', 'timestamp', 'user_id', 'username',
+                     'email', 'ip_address', 'user_agent', 'source', 'session_id',
+                     'organization_id', 'event_data']
+
+
+def _audit_log_values(audit_log: Dict[str, Any]) -> list:
+    """Column values for one audit log, in AUDIT_LOG_COLUMNS order"""
+    values = []
+    for col in AUDIT_LOG_COLUMNS:
+        if col == 'event_data':
+            values.append(Json(audit_log.get(col, {})))
+        elif col == 'timestamp':
+            ts = audit_log.get(col)
+            if isinstance(ts, str):
+                values.append(ts)
+            else:
+                values.append(datetime.utcnow().isoformat())
+        else:
+            values.append(audit_log.get(col))
+    return values
+
 
 class SupabaseClient:
     """
@@ -77,28 +98,12 @@ class SupabaseClient:
         try:
             self._ensure_connection()
 
-            # Prepare the insert query
-            columns = ['event_type', 'routing_key', 'timestamp', 'user_id', 'username',
-                       'email', 'ip_address', 'user_agent', 'source', 'session_id',
-                       'organization_id', 'event_data']
-
             # Build values, using None for missing fields
-            values = []
-            for col in columns:
-                if col == 'event_data':
-                    values.append(Json(audit_log.get(col, {})))
-                elif col == 'timestamp':
-                    ts = audit_log.get(col)
-                    if isinstance(ts, str):
-                        values.append(ts)
-                    else:
-                        values.append(datetime.utcnow().isoformat())
-                else:
-                    values.append(audit_log.get(col))
+            values = _audit_log_values(audit_log)
 
             # Build the INSERT query
-            placeholders = ', '.join(['%s'] * len(columns))
-            column_names = ', '.join(columns)
+            placeholders = ', '.join(['%s'] * len(AUDIT_LOG_COLUMNS))
+            column_names = ', '.join(AUDIT_LOG_COLUMNS)
             query = f"""
                 INSERT INTO audit_logs ({column_names})
                 VALUES ({placeholders})
@@ -126,6 +131,47 @@ class SupabaseClient:
             )
             return None
 
+    def insert_audit_logs(self, audit_logs: List[Dict[str, Any]]) -> int:
+        """
+        Insert a batch of audit logs with one multi-row INSERT in one transaction
+
+        Args:
+            audit_logs: Audit log dictionaries (same shape as insert_audit_log)
+
+        Returns:
+            Number of rows inserted
+
+        Raises:
+            psycopg2.Error: The batch was not written (nothing is committed).
+                DataError/IntegrityError mean a row in the batch is bad;
+                other errors are usually connection problems.
+        """
+        if not audit_logs:
+            return 0
+
+        self._ensure_connection()
+        query = f"INSERT INTO audit_logs ({', '.join(AUDIT_LOG_COLUMNS)}) VALUES %s"
+        rows = [_audit_log_values(audit_log) for audit_log in audit_logs]
+
+        # autocommit is on for single inserts; run the batch as one transaction
+        self.conn.autocommit = False
+        try:
+            with self.conn.cursor() as cur:
+                execute_values(cur, query, rows, page_size=len(rows))
+            self.conn.commit()
+        except Exception:
+            try:
+                self.conn.rollback()
+            except psycopg2.Error:
+                pass
+            raise
+        finally:
+            if not self.conn.closed:
+                self.conn.autocommit = True
+
+        logger.debug(f"Inserted {len(rows)} audit logs")
+        return len(rows)
+
     def get_recent_auth_events(self, limit: int = 100) -> list:
         """
         Query recent authentication events (last 24 hours)
@@ -2,92 +2,123 @@
 API Routes for Component Normalization Service (CNS)
 
 This package contains all FastAPI route handlers organized by resource.
+
+Route modules are imported when the routers are registered (include_api_routers()
+from app.main, or first access to api_router), not when the package is imported.
+Importing a single module such as app.api.risk from a worker or test therefore
+doesn't load the other routers and their dependencies.
 """
 
-from fastapi import APIRouter
-from app.api import health, bom, bom_workflow, bom_enrichment, catalog, queue, history, suppliers, analytics, enrichment_config, rate_limiting_config_redis, websocket, events, admin_bom, bulk_upload, bulk_enrichment, bom_line_items, customer_upload, audit, bom_snapshots, bom_ingest_status, boms_unified, files, quality_queue
-from app.api import admin_lookup
-from app.api import admin_data
-from app.api import admin_token
-from app.api import admin_directus
-from app.api import supplier_responses
-from app.api import audit_objects as audit_objects_module
-from app.api import enrichment_stream
-from app.api import activity_log
-from app.api import billing
-from app.api import risk
-from app.api import alerts
-from app.api import account
-from app.api import organization_settings
-from app.api import onboarding
-from app.api import auth_provisioning
-from app.api import organizations
-from app.api import workspaces
-from app.api import projects
-from app.api import column_mapping_templates
-from app.api import workflow_state
-from app.api import component_enrichment
-
-# CRITICAL Fixes Examples
-try:
-    from app.api import critical_fixes_examples
-    CRITICAL_EXAMPLES_AVAILABLE = True
-except ImportError:
-    CRITICAL_EXAMPLES_AVAILABLE = False
-
-# Create main API router
-api_router = APIRouter()
-
-# Include sub-routers
-api_router.include_router(health.router, tags=["Health"])
-api_router.include_router(bom.router, prefix="/bom", tags=["BOM Upload"])
-api_router.include_router(bom_workflow.router, prefix="/bom/workflow", tags=["BOM Workflow"])
-api_router.include_router(bom_enrichment.router, tags=["BOM Enrichment"])  # Manual enrichment control (customer BOMs)
-api_router.include_router(bulk_enrichment.router, tags=["Bulk Upload Enrichment"])  # Manual enrichment control (staff bulk uploads)
-api_router.include_router(bom_line_items.router, tags=["BOM Line Items"])  # BOM line item CRUD operations
-api_router.include_router(admin_bom.router, tags=["Admin BOM"])  # Admin BOM management
-api_router.include_router(bulk_upload.router, tags=["CNS Bulk Upload - Redis Storage"])  # CNS bulk upload with Redis
-api_router.include_router(customer_upload.router, tags=["Customer Portal Upload"])  # Customer Portal file storage
-api_router.include_router(bom_snapshots.router, tags=["BOM Snapshots"])  # Parsed BOM snapshots + bom.parsed events
-api_router.include_router(bom_ingest_status.router, tags=["BOM Ingest Status"])  # Ingest workflow status
-api_router.include_router(boms_unified.router, tags=["BOM Upload - Unified"])  # New unified BOM upload API (Option C+)
-api_router.include_router(catalog.router, prefix="/catalog", tags=["Catalog"])
-api_router.include_router(queue.router, prefix="/queue", tags=["Review Queue"])
-api_router.include_router(history.router, prefix="/history", tags=["History"])
-api_router.include_router(suppliers.router, prefix="/suppliers", tags=["Supplier APIs"])
-api_router.include_router(analytics.router, prefix="/analytics", tags=["Analytics"])
-api_router.include_router(enrichment_config.router, prefix="/enrichment-config", tags=["Enrichment Configuration"])
-api_router.include_router(rate_limiting_config_redis.router, tags=["Rate Limiting Configuration"])
-api_router.include_router(audit.router, tags=["Audit Trail"])
-api_router.include_router(audit_objects_module.router, prefix="/bulk", tags=["Audit Objects"])  # Real-time audit viewing
-api_router.include_router(files.router, tags=["File Downloads"])  # Generic file downloads from MinIO
-api_router.include_router(admin_lookup.router, tags=["Admin Lookup"])  # /api/admin/* lookups
-api_router.include_router(websocket.router, tags=["WebSocket"])
-api_router.include_router(events.router, tags=["Events"])
-api_router.include_router(admin_data.router, tags=["Admin Data"])  # /api/admin/* aggregated data
-api_router.include_router(admin_token.router, tags=["Admin Token"])
-api_router.include_router(admin_directus.router, tags=["Admin Directus"])  # Directus integration (Redis sync, promotion, audit)
-api_router.include_router(supplier_responses.router)
-api_router.include_router(enrichment_stream.router, tags=["Enrichment Stream"])  # SSE real-time enrichment progress
-api_router.include_router(activity_log.router, tags=["Activity Log"])
-api_router.include_router(billing.router, tags=["Billing"])  # Subscription & billing management
-api_router.include_router(quality_queue.router)  # Quality Queue (Redis-based component review)
-api_router.include_router(risk.router, tags=["Risk Analysis"])  # Component risk scoring & portfolio risk
-api_router.include_router(alerts.router, tags=["Alerts"])  # Alert system, preferences, component watches
-api_router.include_router(account.router, tags=["Account Management"])  # Account deletion, data export, settings
-api_router.include_router(organization_settings.router, tags=["Organization Settings"])  # Organization profile & settings
-api_router.include_router(onboarding.router, tags=["Onboarding"])  # User welcome & onboarding notifications
-api_router.include_router(auth_provisioning.router, tags=["Auth Provisioning"])  # Auth0 user/org provisioning
-api_router.include_router(organizations.router, tags=["Organizations"])  # Multi-org management (create, join, leave)
-api_router.include_router(workspaces.router, tags=["Workspaces"])  # Workspace management within orgs
-api_router.include_router(workspaces.invitations_router, tags=["Workspaces"])  # Workspace invitation management
-api_router.include_router(projects.router, tags=["Projects"])  # Project management within workspaces
-api_router.include_router(column_mapping_templates.router, tags=["Column Mapping Templates"])  # Column mapping template management
-api_router.include_router(workflow_state.router, tags=["Workflow State"])  # S3-persisted workflow state for BOM upload
-api_router.include_router(component_enrichment.router, tags=["Single Component Enrichment"])  # On-demand single component enrichment via Temporal
-
-# CRITICAL Fixes Example Endpoints
-if CRITICAL_EXAMPLES_AVAILABLE:
-    api_router.include_router(critical_fixes_examples.router, tags=["CRITICAL Fixes Examples"])
-
-__all__ = ["api_router"]
+import importlib
+import logging
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from fastapi import APIRouter, FastAPI
+
+logger = logging.getLogger(__name__)
+
+# (module, router attribute, include_router() kwargs), in registration order
+ROUTERS: List[Tuple[str, str, Dict[str, Any]]] = [
+    ("health", "router", {"tags": ["Health"]}),
+    ("bom", "router", {"prefix": "/bom", "tags": ["BOM Upload"]}),
+    ("bom_workflow", "router", {"prefix": "/bom/workflow", "tags": ["BOM Workflow"]}),
+    ("bom_enrichment", "router", {"tags": ["BOM Enrichment"]}),  # Manual enrichment control (customer BOMs)
+    ("bulk_enrichment", "router", {"tags": ["Bulk Upload Enrichment"]}),  # Manual enrichment control (staff bulk uploads)
+    ("bom_line_items", "router", {"tags": ["BOM Line Items"]}),  # BOM line item CRUD operations
+    ("admin_bom", "router", {"tags": ["Admin BOM"]}),  # Admin BOM management
+    ("bulk_upload", "router", {"tags": ["CNS Bulk Upload - Redis Storage"]}),  # CNS bulk upload with Redis
+    ("customer_upload", "router", {"tags": ["Customer Portal Upload"]}),  # Customer Portal file storage
+    ("bom_snapshots", "router", {"tags": ["BOM Snapshots"]}),  # Parsed BOM snapshots + bom.parsed events
+    ("bom_ingest_status", "router", {"tags": ["BOM Ingest Status"]}),  # Ingest workflow status
+    ("boms_unified", "router", {"tags": ["BOM Upload - Unified"]}),  # New unified BOM upload API (Option C+)
+    ("catalog", "router", {"prefix": "/catalog", "tags": ["Catalog"]}),
+    ("queue", "router", {"prefix": "/queue", "tags": ["Review Queue"]}),
+    ("history", "router", {"prefix": "/history", "tags": ["History"]}),
+    ("suppliers", "router", {"prefix": "/suppliers", "tags": ["Supplier APIs"]}),
+    ("analytics", "router", {"prefix": "/analytics", "tags": ["Analytics"]}),
+    ("enrichment_config", "router", {"prefix": "/enrichment-config", "tags": ["Enrichment Configuration"]}),
+    ("rate_limiting_config_redis", "router", {"tags": ["Rate Limiting Configuration"]}),
+    ("audit", "router", {"tags": ["Audit Trail"]}),
+    ("audit_objects", "router", {"prefix": "/bulk", "tags": ["Audit Objects"]}),  # Real-time audit viewing
+    ("files", "router", {"tags": ["File Downloads"]}),  # Generic file downloads from MinIO
+    ("admin_lookup", "router", {"tags": ["Admin Lookup"]}),  # /api/admin/* lookups
+    ("websocket", "router", {"tags": ["WebSocket"]}),
+    ("events", "router", {"tags": ["Events"]}),
+    ("admin_data", "router", {"tags": ["Admin Data"]}),  # /api/admin/* aggregated data
+    ("admin_token", "router", {"tags": ["Admin Token"]}),
+    ("admin_directus", "router", {"tags": ["Admin Directus"]}),  # Directus integration (Redis sync, promotion, audit)
+    ("supplier_responses", "router", {}),
+    ("enrichment_stream", "router", {"tags": ["Enrichment Stream"]}),  # SSE real-time enrichment progress
+    ("activity_log", "router", {"tags": ["Activity Log"]}),
+    ("billing", "router", {"tags": ["Billing"]}),  # Subscription & billing management
+    ("quality_queue", "router", {}),  # Quality Queue (Redis-based component review)
+    ("risk", "router", {"tags": ["Risk Analysis"]}),  # Component risk scoring & portfolio risk
+    ("alerts", "router", {"tags": ["Alerts"]}),  # Alert system, preferences, component watches
+    ("account", "router", {"tags": ["Account Management"]}),  # Account deletion, data export, settings
+    ("organization_settings", "router", {"tags": ["Organization Settings"]}),  # Organization profile & settings
+    ("onboarding", "router", {"tags": ["Onboarding"]}),  # User welcome & onboarding notifications
+    ("auth_provisioning", "router", {"tags": ["Auth Provisioning"]}),  # Auth0 user/org provisioning
+    ("organizations", "router", {"tags": ["Organizations"]}),  # Multi-org management (create, join, leave)
+    ("workspaces", "router", {"tags": ["Workspaces"]}),  # Workspace management within orgs
+    ("workspaces", "invitations_router", {"tags": ["Workspaces"]}),  # Workspace invitation management
+    ("projects", "router", {"tags": ["Projects"]}),  # Project management within workspaces
+    ("column_mapping_templates", "router", {"tags": ["Column Mapping Templates"]}),  # Column mapping template management
+    ("workflow_state", "router", {"tags": ["Workflow State"]}),  # S3-persisted workflow state for BOM upload
+    ("component_enrichment", "router", {"tags": ["Single Component Enrichment"]}),  # On-demand single component enrichment via Temporal
+]
+
+# Registered only when the module can be imported
+OPTIONAL_ROUTERS: List[Tuple[str, str, Dict[str, Any]]] = [
+    ("critical_fixes_examples", "router", {"tags": ["CRITICAL Fixes Examples"]}),  # CRITICAL Fixes Example Endpoints
+]
+
+
+def _load_routers() -> Iterator[Tuple[APIRouter, Dict[str, Any]]]:
+    for module_name, attr, kwargs in ROUTERS:
+        module = importlib.import_module(f"{__name__}.{module_name}")
+        yield getattr(module, attr), kwargs
+
+    for module_name, attr, kwargs in OPTIONAL_ROUTERS:
+        try:
+            module = importlib.import_module(f"{__name__}.{module_name}")
+        except ImportError:
+            logger.debug(f"[API] Optional router {module_name} not available")
+            continue
+        yield getattr(module, attr), kwargs
+
+
+def include_api_routers(app: FastAPI, prefix: str = "/api") -> None:
+    """
+    Register every API router on the app under prefix.
+
+    Routers are included directly rather than through api_router: each
+    include_router() level rebuilds every route, which is the bulk of
+    startup time after imports.
+    """
+    for router, kwargs in _load_routers():
+        kwargs = dict(kwargs)
+        app.include_router(router, prefix=prefix + kwargs.pop("prefix", ""), **kwargs)
+
+
+def build_api_router() -> APIRouter:
+    """All API routers combined in one APIRouter (without the /api prefix)."""
+    api_router = APIRouter()
+    for router, kwargs in _load_routers():
+        api_router.include_router(router, **kwargs)
+    return api_router
+
+
+_api_router: Optional[APIRouter] = None
+
+
+def __getattr__(name: str) -> Any:
+    # PEP 562: build api_router on first access
+    if name == "api_router":
+        global _api_router
+        if _api_router is None:
+            _api_router = build_api_router()
+        return _api_router
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ["api_router", "build_api_router", "include_api_routers"]
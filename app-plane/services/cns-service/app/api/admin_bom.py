@@ -22,6 +22,7 @@ from fastapi import APIRouter, HTTPException, status, Depends, Query
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 from sqlalchemy import desc, or_
+from sqlalchemy.exc import SQLAlchemyError
 from temporalio.client import Client
 
 from app.models.base import get_db
@@ -40,6 +41,7 @@ from app.core.authorization import (
 # Import event bus
 try:
     from shared.event_bus import EventPublisher
+    from app.services.event_outbox import transactional_events
     EVENT_BUS_AVAILABLE = True
 except ImportError as e:
     logging.warning(f"Failed to import event_bus: {e}. Events will be logged but not published.")
@@ -116,8 +118,20 @@ async def get_temporal_client() -> Client:
         )
 
 
-def publish_admin_event(action: str, job_id: str, admin_email: str, metadata: Dict[str, Any] = None):
-    """Publish admin action event to RabbitMQ"""
+def publish_admin_event(
+    action: str,
+    job_id: str,
+    admin_email: str,
+    metadata: Dict[str, Any] = None,
+    db: Optional[Session] = None,
+):
+    """
+    Publish admin action event to RabbitMQ
+
+    With `db`, the event is written to the transactional outbox in that
+    session's transaction and commits with the caller's change; the outbox
+    relay publishes it. A failed outbox write raises so the caller rolls back.
+    """
     if not EVENT_BUS_AVAILABLE:
         logger.warning(f"Event bus not available, event logged only: admin.bom.{action}")
         return False
@@ -135,15 +149,25 @@ def publish_admin_event(action: str, job_id: str, admin_email: str, metadata: Di
         # Use EventPublisher to publish admin events
         # These events will be consumed by Temporal workers
         if hasattr(EventPublisher, 'admin_workflow_action'):
-            EventPublisher.admin_workflow_action(
-                workflow_id=f"bom-enrichment-{job_id}",
-                action=action,
-                admin_id=admin_email,
-                metadata=metadata or {}
-            )
+            def publish():
+                EventPublisher.admin_workflow_action(
+                    workflow_id=f"bom-enrichment-{job_id}",
+                    action=action,
+                    admin_id=admin_email,
+                    metadata=metadata or {}
+                )
+
+            if db is not None:
+                with transactional_events(db):
+                    publish()
+            else:
+                publish()
 
         logger.info(f"Published admin event: {routing_key}", extra=event_data)
         return True
+    except SQLAlchemyError:
+        # Outbox write failed: the caller's transaction must not commit
+        raise
     except Exception as e:
         logger.error(f"Failed to publish admin event: {e}", exc_info=True)
         return False
@@ -336,7 +360,7 @@ async def update_bom_job(
         logger.info(f"[Admin] update_bom_job: user={auth.user_id} job_id={job_id}")
 
         dual_db = get_dual_database()
-        supabase_db = dual_db.get_session(DatabaseType.SUPABASE)
+        supabase_db = next(dual_db.get_session("supabase"))
 
         # Update job in database
         from app.models.supabase_models import BOMJob as SupabaseBOMJob
@@ -353,16 +377,17 @@ async def update_bom_job(
             job.project_id = update.project_id
         # Note: 'notes' field might need to be added to BOMJob model
 
-        supabase_db.commit()
-
-        # Publish update event
+        # Queue the update event in the same transaction (transactional outbox)
         publish_admin_event(
             action="updated",
             job_id=job_id,
             admin_email=admin_email,
-            metadata={"changes": update.dict(exclude_unset=True)}
+            metadata={"changes": update.dict(exclude_unset=True)},
+            db=supabase_db,
         )
 
+        supabase_db.commit()
+
         logger.info(f"Successfully updated BOM job: {job_id}")
 
         return {
@@ -19,6 +19,7 @@ from pydantic import BaseModel, Field, EmailStr
 from sqlalchemy import text
 
 from ..models.dual_database import get_dual_database
+from ..cache.auth_context_cache import invalidate_after_commit
 from ..services.onboarding_service import get_onboarding_service
 
 logger = logging.getLogger(__name__)
@@ -508,6 +509,7 @@ async def accept_invite(request: AcceptInviteRequest):
                 """),
                 {"org_id": target_org_id, "user_id": user_id, "role": assigned_role}
             )
+            invalidate_after_commit(session, user_ids=[user_id], org_ids=[forfeited_org_id])
 
             # Get default workspace of the target org and add user to it
             default_workspace = session.execute(
@@ -763,7 +763,6 @@ async def confirm_bom_mapping(
                 DEBUG_BOM_PROCESSING: Set to 'true' for detailed console logging
             """
             import os
-            import asyncio
             from datetime import datetime
             debug_mode = os.getenv('DEBUG_BOM_PROCESSING', 'false').lower() == 'true'
 
@@ -779,22 +778,13 @@ async def confirm_bom_mapping(
                     from app.api.websocket import get_connection_manager
                     manager = get_connection_manager()
 
-                    # Check if there are any connected clients
-                    if manager.get_connection_count(job_id) > 0:
-                        # Create new event loop for this thread
-                        loop = asyncio.new_event_loop()
-                        asyncio.set_event_loop(loop)
-                        try:
-                            loop.run_until_complete(
-                                manager.broadcast_to_job(job_id, {
-                                    "event": event,
-                                    "job_id": job_id,
-                                    "data": data,
-                                    "timestamp": datetime.utcnow().isoformat() + "Z"
-                                })
-                            )
-                        finally:
-                            loop.close()
+                    # Published via Redis: viewers may be attached to any instance
+                    manager.publish_sync(job_id, {
+                        "event": event,
+                        "job_id": job_id,
+                        "data": data,
+                        "timestamp": datetime.utcnow().isoformat() + "Z"
+                    })
                 except Exception as e:
                     logger.warning(f"Failed to send WebSocket event: {e}")
 
@@ -22,6 +22,7 @@ from temporalio.common import WorkflowIDReusePolicy
 from temporalio.exceptions import WorkflowAlreadyStartedError
 
 from app.core.temporal_client import get_temporal_client_manager
+from app.cache.scope_cache import invalidate_after_commit as invalidate_scope_after_commit
 from app.config import settings, PLATFORM_SUPER_ADMIN_ORG
 from app.utils.activity_log import record_audit_log_entry
 from shared.event_bus import EventPublisher
@@ -853,6 +854,7 @@ async def delete_enrichment_job(bom_id: str):
             WHERE id = :bom_id
         """)
         db.execute(delete_bom_query, {"bom_id": bom_id})
+        invalidate_scope_after_commit(db, bom_ids=[bom_id])
 
         # Mark bom_uploads as deleted
         update_upload_query = text("""
@@ -1229,15 +1231,16 @@ async def get_bom_components(
                 logger.debug(f"[BOM Components] Fetching from Redis: key={redis_key}")
                 try:
                     if redis_client is None:
-                        from app.cache.redis_cache import get_sync_redis_client
-                        redis_client = get_sync_redis_client()
+                        from app.cache.redis_cache import get_sync_binary_client
+                        redis_client = get_sync_binary_client()
 
                     if redis_client is None:
                         logger.warning("[BOM Components] Redis not available, skipping redis_component_key=%s", redis_key)
                     else:
-                        redis_data_str = redis_client.get(redis_key)
-                        if redis_data_str:
-                            redis_data = json.loads(redis_data_str)
+                        redis_data_raw = redis_client.get(redis_key)
+                        if redis_data_raw:
+                            from app.cache.redis_cache import deserialize
+                            redis_data = deserialize(redis_data_raw)
                             enrichment_data = {
                                 "supplier": redis_data.get("supplier"),
                                 "supplier_part_number": redis_data.get("supplier_part_number"),
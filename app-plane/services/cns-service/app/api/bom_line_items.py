@@ -23,8 +23,10 @@ from fastapi import APIRouter, Depends, HTTPException, Request, status, Path
 from pydantic import BaseModel, Field, field_validator
 from sqlalchemy.orm import Session
 from sqlalchemy import text
+from starlette.background import BackgroundTask
 
 from app.models.dual_database import get_dual_database, DatabaseType
+from app.core.responses import NDJSONResponse, wants_ndjson
 from app.core.input_validation import (
     ValidatedMPN,
     ValidatedComponent,
@@ -168,6 +170,144 @@ class BOMLineItemListResponse(BaseModel):
         return v
 
 
+LINE_ITEM_LIST_SQL = """
+    SELECT
+        id,
+        bom_id,
+        line_number,
+        manufacturer_part_number,
+        manufacturer,
+        quantity,
+        reference_designator,
+        description,
+        enrichment_status,
+        component_id,
+        enrichment_error,
+        lifecycle_status,
+        match_confidence,
+        component_storage,
+        redis_component_key,
+        category,
+        subcategory,
+        datasheet_url,
+        unit_price,
+        risk_level,
+        compliance_status,
+        specifications,
+        pricing,
+        metadata,
+        enriched_at,
+        created_at,
+        updated_at
+    FROM bom_line_items
+    WHERE bom_id = :bom_id
+"""
+
+
+def _build_line_item_responses(rows) -> List[BOMLineItemResponse]:
+    """Build line item responses, with Component Vault data looked up in bulk."""
+    # Collect component lookups for items with MPN + manufacturer
+    # Build list of (mpn, manufacturer) for bulk lookup
+    component_lookups = []
+    for row in rows:
+        if row.manufacturer_part_number and row.manufacturer:
+            component_lookups.append({
+                'mpn': row.manufacturer_part_number,
+                'manufacturer': row.manufacturer
+            })
+
+    # Bulk lookup component data from Component Vault
+    component_data_map = {}
+    if component_lookups:
+        try:
+            catalog_service = get_component_catalog()
+            component_data_map = catalog_service.bulk_lookup_components(component_lookups)
+            logger.info(
+                f"[BOM Line Items] Fetched {len([v for v in component_data_map.values() if v])} "
+                f"component records from Component Vault for {len(component_lookups)} items"
+            )
+        except Exception as catalog_error:
+            logger.warning(
+                f"[BOM Line Items] Failed to fetch component data from vault: {catalog_error}"
+            )
+
+    # Build response items with component data
+    items = []
+    for row in rows:
+        # Look up component data by (mpn, manufacturer) tuple
+        component_data = None
+        if row.manufacturer_part_number and row.manufacturer:
+            catalog_data = component_data_map.get(
+                (row.manufacturer_part_number, row.manufacturer)
+            )
+            if catalog_data:
+                component_data = ComponentData(
+                    id=str(catalog_data.get('id')) if catalog_data.get('id') else None,
+                    manufacturer_part_number=catalog_data.get('manufacturer_part_number'),
+                    manufacturer=catalog_data.get('manufacturer'),
+                    category=catalog_data.get('category'),
+                    subcategory=catalog_data.get('subcategory'),
+                    description=catalog_data.get('description'),
+                    datasheet_url=catalog_data.get('datasheet_url'),
+                    image_url=catalog_data.get('image_url'),
+                    lifecycle_status=catalog_data.get('lifecycle_status'),
+                    risk_level=catalog_data.get('risk_level'),
+                    rohs_compliant=catalog_data.get('rohs_compliant'),
+                    reach_compliant=catalog_data.get('reach_compliant'),
+                    aec_qualified=catalog_data.get('aec_qualified'),
+                    unit_price=float(catalog_data.get('unit_price')) if catalog_data.get('unit_price') else None,
+                    currency=catalog_data.get('currency'),
+                    moq=catalog_data.get('moq'),
+                    lead_time_days=catalog_data.get('lead_time_days'),
+                    stock_status=catalog_data.get('stock_status'),
+                    quality_score=float(catalog_data.get('quality_score')) if catalog_data.get('quality_score') else None,
+                    enrichment_source=catalog_data.get('enrichment_source'),
+                )
+
+        # Build response - include fields from bom_line_items, fall back to component_data
+        items.append(BOMLineItemResponse(
+            id=row.id,
+            bom_id=row.bom_id,
+            line_number=row.line_number,
+            manufacturer_part_number=row.manufacturer_part_number,
+            manufacturer=row.manufacturer,
+            quantity=row.quantity or 1,
+            reference_designator=row.reference_designator,
+            description=row.description,
+            enrichment_status=row.enrichment_status or 'pending',
+            component_id=row.component_id,
+            enrichment_error=row.enrichment_error,
+            lifecycle_status=row.lifecycle_status,
+            match_confidence=float(row.match_confidence) if row.match_confidence else None,
+            component_storage=row.component_storage,
+            redis_component_key=row.redis_component_key,
+            # Enrichment fields from bom_line_items table
+            category=row.category,
+            subcategory=row.subcategory,
+            datasheet_url=row.datasheet_url,
+            unit_price=float(row.unit_price) if row.unit_price else None,
+            risk_level=row.risk_level,
+            compliance_status=row.compliance_status,
+            specifications=row.specifications,
+            pricing=row.pricing,
+            metadata=row.metadata,
+            enriched_at=row.enriched_at.isoformat() if row.enriched_at else None,
+            # Component Vault data (fallback/additional enrichment)
+            component_data=component_data,
+            created_at=row.created_at.isoformat(),
+            updated_at=row.updated_at.isoformat()
+        ))
+    return items
+
+
+def _iter_line_items(db: Session, query, params: Dict[str, Any], batch_size: int):
+    """Yield line items from a server-side cursor, one Component Vault lookup per batch."""
+    result = db.execute(query, params, execution_options={"yield_per": batch_size})
+    # Result.yield_per isn't applied to text() statements, so size the partitions explicitly
+    for rows in result.partitions(batch_size):
+        yield from _build_line_item_responses(rows)
+
+
 @router.get("/{bom_id}/line_items", response_model=BOMLineItemListResponse)
 @require_bom(enforce=True, log_access=True)  # Phase 2: Automatic scope validation
 async def list_bom_line_items(
@@ -184,7 +324,10 @@ async def list_bom_line_items(
 
     **Phase 2: CNS Projects Alignment**
 
-    Supports pagination and filtering by enrichment status.
+    Supports pagination and filtering by enrichment status. With
+    ``Accept: application/x-ndjson`` every matching line item is streamed as
+    newline-delimited JSON instead (page is ignored, page_size sets the fetch
+    batch size).
 
     Authorization:
         - Automatic validation: bom → project → workspace → organization
@@ -196,6 +339,7 @@ async def list_bom_line_items(
         - Cross-tenant access automatically denied
         - Comprehensive audit logging
     """
+    streaming = False
     try:
         # Extract validated scope from request state (set by @require_bom decorator)
         scope = request.state.validated_scope
@@ -209,41 +353,22 @@ async def list_bom_line_items(
             f"(org={organization_id}, user={user.id}, page={page})"
         )
 
+        status_filter = " AND enrichment_status = :enrichment_status" if enrichment_status else ""
+
+        if wants_ndjson(request):
+            # Stream every matching line item; the session stays open until the last one is sent
+            stream_params: Dict[str, Any] = {'bom_id': bom_id}
+            if enrichment_status:
+                stream_params['enrichment_status'] = enrichment_status
+            response = NDJSONResponse(
+                _iter_line_items(db, text(LINE_ITEM_LIST_SQL + status_filter + " ORDER BY line_number"), stream_params, page_size),
+                background=BackgroundTask(db.close),
+            )
+            streaming = True
+            return response
+
         # Build query - include ALL enrichment fields from bom_line_items table
-        query = text("""
-            SELECT
-                id,
-                bom_id,
-                line_number,
-                manufacturer_part_number,
-                manufacturer,
-                quantity,
-                reference_designator,
-                description,
-                enrichment_status,
-                component_id,
-                enrichment_error,
-                lifecycle_status,
-                match_confidence,
-                component_storage,
-                redis_component_key,
-                category,
-                subcategory,
-                datasheet_url,
-                unit_price,
-                risk_level,
-                compliance_status,
-                specifications,
-                pricing,
-                metadata,
-                enriched_at,
-                created_at,
-                updated_at
-            FROM bom_line_items
-            WHERE bom_id = :bom_id
-            """ + (
-            " AND enrichment_status = :enrichment_status" if enrichment_status else ""
-        ) + """
+        query = text(LINE_ITEM_LIST_SQL + status_filter + """
             ORDER BY line_number
             LIMIT :limit OFFSET :offset
         """)
@@ -253,9 +378,7 @@ async def list_bom_line_items(
             SELECT COUNT(*)
             FROM bom_line_items
             WHERE bom_id = :bom_id
-            """ + (
-            " AND enrichment_status = :enrichment_status" if enrichment_status else ""
-        ))
+            """ + status_filter)
 
         # Execute queries
         params = {
@@ -270,99 +393,7 @@ async def list_bom_line_items(
         result = db.execute(query, params)
         rows = result.fetchall()
 
-        # Collect component lookups for items with MPN + manufacturer
-        # Build list of (mpn, manufacturer) for bulk lookup
-        component_lookups = []
-        row_data_list = []
-        for row in rows:
-            row_data_list.append(row)
-            if row.manufacturer_part_number and row.manufacturer:
-                component_lookups.append({
-                    'mpn': row.manufacturer_part_number,
-                    'manufacturer': row.manufacturer
-                })
-
-        # Bulk lookup component data from Component Vault
-        component_data_map = {}
-        if component_lookups:
-            try:
-                catalog_service = get_component_catalog()
-                component_data_map = catalog_service.bulk_lookup_components(component_lookups)
-                logger.info(
-                    f"[BOM Line Items] Fetched {len([v for v in component_data_map.values() if v])} "
-                    f"component records from Component Vault for {len(component_lookups)} items"
-                )
-            except Exception as catalog_error:
-                logger.warning(
-                    f"[BOM Line Items] Failed to fetch component data from vault: {catalog_error}"
-                )
-
-        # Build response items with component data
-        items = []
-        for row in row_data_list:
-            # Look up component data by (mpn, manufacturer) tuple
-            component_data = None
-            if row.manufacturer_part_number and row.manufacturer:
-                catalog_data = component_data_map.get(
-                    (row.manufacturer_part_number, row.manufacturer)
-                )
-                if catalog_data:
-                    component_data = ComponentData(
-                        id=str(catalog_data.get('id')) if catalog_data.get('id') else None,
-                        manufacturer_part_number=catalog_data.get('manufacturer_part_number'),
-                        manufacturer=catalog_data.get('manufacturer'),
-                        category=catalog_data.get('category'),
-                        subcategory=catalog_data.get('subcategory'),
-                        description=catalog_data.get('description'),
-                        datasheet_url=catalog_data.get('datasheet_url'),
-                        image_url=catalog_data.get('image_url'),
-                        lifecycle_status=catalog_data.get('lifecycle_status'),
-                        risk_level=catalog_data.get('risk_level'),
-                        rohs_compliant=catalog_data.get('rohs_compliant'),
-                        reach_compliant=catalog_data.get('reach_compliant'),
-                        aec_qualified=catalog_data.get('aec_qualified'),
-                        unit_price=float(catalog_data.get('unit_price')) if catalog_data.get('unit_price') else None,
-                        currency=catalog_data.get('currency'),
-                        moq=catalog_data.get('moq'),
-                        lead_time_days=catalog_data.get('lead_time_days'),
-                        stock_status=catalog_data.get('stock_status'),
-                        quality_score=float(catalog_data.get('quality_score')) if catalog_data.get('quality_score') else None,
-                        enrichment_source=catalog_data.get('enrichment_source'),
-                    )
-
-            # Build response - include fields from bom_line_items, fall back to component_data
-            items.append(BOMLineItemResponse(
-                id=row.id,
-                bom_id=row.bom_id,
-                line_number=row.line_number,
-                manufacturer_part_number=row.manufacturer_part_number,
-                manufacturer=row.manufacturer,
-                quantity=row.quantity or 1,
-                reference_designator=row.reference_designator,
-                description=row.description,
-                enrichment_status=row.enrichment_status or 'pending',
-                component_id=row.component_id,
-                enrichment_error=row.enrichment_error,
-                lifecycle_status=row.lifecycle_status,
-                match_confidence=float(row.match_confidence) if row.match_confidence else None,
-                component_storage=row.component_storage,
-                redis_component_key=row.redis_component_key,
-                # Enrichment fields from bom_line_items table
-                category=row.category,
-                subcategory=row.subcategory,
-                datasheet_url=row.datasheet_url,
-                unit_price=float(row.unit_price) if row.unit_price else None,
-                risk_level=row.risk_level,
-                compliance_status=row.compliance_status,
-                specifications=row.specifications,
-                pricing=row.pricing,
-                metadata=row.metadata,
-                enriched_at=row.enriched_at.isoformat() if row.enriched_at else None,
-                # Component Vault data (fallback/additional enrichment)
-                component_data=component_data,
-                created_at=row.created_at.isoformat(),
-                updated_at=row.updated_at.isoformat()
-            ))
+        items = _build_line_item_responses(rows)
 
         # Get total count
         count_result = db.execute(count_query, {k: v for k, v in params.items() if k != 'limit' and k != 'offset'})
@@ -393,7 +424,7 @@ async def list_bom_line_items(
         )
     finally:
         # CRITICAL: Always close database session to prevent pool exhaustion
-        if db is not None:
+        if db is not None and not streaming:
             try:
                 db.close()
             except Exception as close_error:
@@ -14,21 +14,32 @@ import io
 import json
 import logging
 import uuid
-from typing import Dict, Any, Optional
+from typing import TYPE_CHECKING, Dict, Any, Optional
 
-import pandas as pd
 from fastapi import APIRouter, HTTPException, status
 from pydantic import BaseModel, Field, validator
 
 from app.config import settings
 from app.utils.minio_client import get_minio_client
 from app.services.bom_ingest import build_line_items_from_rows, create_supabase_bom_and_items
+from app.services.bom_diff import apply_revision_diff, find_previous_revision, get_revision
+from app.services.bom_fingerprint import (
+    clone_line_enrichment,
+    compute_content_hash,
+    compute_file_hash,
+    find_prior_bom,
+)
 from app.core.temporal_client import get_temporal_client_manager, ensure_temporal_connected
+from app.services.event_outbox import transactional_events
+from shared.event_bus import EventPublisher
 from app.workflows.bom_enrichment import (
     BOMIngestAndEnrichRequest,
     BOMIngestAndEnrichWorkflow,
 )
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 logger = logging.getLogger(__name__)
 
 
@@ -69,6 +80,10 @@ class BOMSnapshotRequest(BaseModel):
     column_mappings: Dict[str, str] = Field(
         ..., description="Canonical field → source column name"
     )
+    previous_bom_id: Optional[str] = Field(
+        None,
+        description="BOM this upload revises (defaults to the latest BOM with the same name in the project)",
+    )
 
     @validator("source")
     def validate_source(cls, v: str) -> str:
@@ -197,6 +212,8 @@ async def create_bom_snapshot(payload: BOMSnapshotRequest) -> BOMSnapshotRespons
         )
 
     # 2) Parse with pandas
+    import pandas as pd
+
     try:
         # Simple extension-based parsing
         if raw_key.lower().endswith(".csv"):
@@ -259,6 +276,35 @@ async def create_bom_snapshot(payload: BOMSnapshotRequest) -> BOMSnapshotRespons
 
     bom_name = payload.bom_name or f"BOM - {raw_key}"
 
+    # Fingerprint the upload; a prior BOM with the same parsed content lends
+    # its enrichment results so only new/changed lines are enriched again.
+    file_hash = compute_file_hash(raw_bytes)
+    content_hash = compute_content_hash(line_items)
+    content_prior = find_prior_bom(db, payload.organization_id, content_hash=content_hash)
+
+    # Previous revision: unchanged lines inherit its enrichment and risk rows.
+    # An explicit previous_bom_id must be in the same organization and project
+    # as the new BOM, or another tenant's results would be copied in.
+    if payload.previous_bom_id:
+        previous_revision = get_revision(
+            db,
+            payload.previous_bom_id,
+            organization_id=payload.organization_id,
+            project_id=payload.project_id,
+        )
+        if previous_revision is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Previous BOM {payload.previous_bom_id} not found in this organization/project",
+            )
+    else:
+        previous_revision = find_previous_revision(
+            db,
+            organization_id=payload.organization_id,
+            project_id=payload.project_id,
+            bom_name=bom_name,
+        )
+
     line_items_saved, create_error = create_supabase_bom_and_items(
         db,
         bom_id=actual_bom_id, organization_id=payload.organization_id,
@@ -271,6 +317,8 @@ async def create_bom_snapshot(payload: BOMSnapshotRequest) -> BOMSnapshotRespons
         line_items=line_items,
         source=payload.source,
         uploaded_by=payload.uploaded_by,
+        file_hash=file_hash,
+        content_hash=content_hash,
     )
 
     if create_error is not None:
@@ -280,6 +328,35 @@ async def create_bom_snapshot(payload: BOMSnapshotRequest) -> BOMSnapshotRespons
             detail=f"Failed to create BOM: {create_error}",
         )
 
+    if previous_revision:
+        try:
+            apply_revision_diff(
+                db,
+                organization_id=payload.organization_id,
+                previous_bom_id=previous_revision["bom_id"],
+                previous_parsed_s3_key=previous_revision["parsed_file_s3_key"],
+                new_bom_id=actual_bom_id,
+                new_line_items=line_items,
+            )
+        except Exception as diff_error:
+            logger.warning(
+                "[BOM Snapshots] Failed to carry over revision results from BOM %s (non-critical): %s",
+                previous_revision["bom_id"],
+                diff_error,
+            )
+            db.rollback()
+    elif content_prior:
+        try:
+            clone_line_enrichment(db, source_bom_id=content_prior.bom_id, target_bom_id=actual_bom_id)
+            db.commit()
+        except Exception as clone_error:
+            logger.warning(
+                "[BOM Snapshots] Failed to clone enrichment from BOM %s (non-critical): %s",
+                content_prior.bom_id,
+                clone_error,
+            )
+            db.rollback()
+
     # 6) Store parsed snapshot to S3 for audit/reference
     parsed_bucket = settings.minio_bucket_uploads
     parsed_key = f"parsed/{payload.organization_id}/{actual_bom_id}.json"
@@ -294,6 +371,8 @@ async def create_bom_snapshot(payload: BOMSnapshotRequest) -> BOMSnapshotRespons
         "file_id": payload.file_id,
         "total_rows": total_rows,
         "line_items": line_items,
+        "file_hash": file_hash,
+        "content_hash": content_hash,
     }
 
     snapshot_bytes = json.dumps(snapshot).encode("utf-8")
@@ -308,7 +387,20 @@ async def create_bom_snapshot(payload: BOMSnapshotRequest) -> BOMSnapshotRespons
         logger.warning("[BOM Snapshots] Failed to upload snapshot file (non-critical): %s", error)
         # Don't fail the request - BOM is already created in database
 
-    # 7) Update bom_uploads.bom_id to link upload to BOM (if upload exists)
+    def publish_bom_parsed() -> None:
+        EventPublisher.bom_parsed(
+            bom_id=actual_bom_id, organization_id=payload.organization_id,
+            project_id=payload.project_id,
+            source=payload.source,
+            bom_name=bom_name,
+            parsed_s3_key=parsed_key,
+            uploaded_by=payload.uploaded_by or "unknown",
+        )
+
+    # 7) Update bom_uploads.bom_id to link upload to BOM (if upload exists).
+    # The bom.parsed event is queued in the outbox in the same transaction
+    # (transactional outbox); the outbox relay publishes it.
+    event_queued = False
     try:
         from sqlalchemy import text as sql_text
         update_query = sql_text("""
@@ -319,41 +411,25 @@ async def create_bom_snapshot(payload: BOMSnapshotRequest) -> BOMSnapshotRespons
             WHERE id = :upload_id
         """)
         db.execute(update_query, {"bom_id": actual_bom_id, "upload_id": payload.file_id})
+        with transactional_events(db):
+            publish_bom_parsed()
         db.commit()
+        event_queued = True
         logger.info("[BOM Snapshots] ✅ Linked bom_upload %s to BOM %s", payload.file_id, actual_bom_id)
+        logger.info("[BOM Snapshots] Queued bom.parsed event for %s", actual_bom_id)
     except Exception as link_error:
+        db.rollback()
         logger.warning(
             "[BOM Snapshots] Failed to link bom_upload (non-critical): %s",
             link_error
         )
         # Don't fail - BOM is already created
 
-    # 8) Emit bom.created event (best-effort) for event sourcing
+    # 8) Outbox write failed: emit bom.parsed directly (best-effort)
     try:
-        try:
-            import sys
-            import os
-
-            shared_path = os.path.join(
-                os.path.dirname(__file__), "..", "..", "..", "shared"
-            )
-            if os.path.exists(shared_path):
-                sys.path.insert(0, shared_path)
-            from event_bus import EventPublisher  # type: ignore
-
-            EventPublisher.bom_parsed(
-                bom_id=actual_bom_id, organization_id=payload.organization_id,
-                project_id=payload.project_id,
-                source=payload.source,
-                bom_name=bom_name,
-                parsed_s3_key=parsed_key,
-                uploaded_by=payload.uploaded_by or "unknown",
-            )
+        if not event_queued:
+            publish_bom_parsed()
             logger.info("[BOM Snapshots] Published bom.parsed event for %s", actual_bom_id)
-        except ImportError:
-            logger.warning(
-                "[BOM Snapshots] event_bus not available; skipping bom.parsed event publish"
-            )
     except Exception as exc:
         logger.warning(
             "[BOM Snapshots] Failed to publish bom.parsed event for %s: %s",
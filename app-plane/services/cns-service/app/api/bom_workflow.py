@@ -25,6 +25,7 @@ from app.config import settings
 from app.core.scope_decorators import require_bom
 from app.dependencies.scope_deps import get_supabase_session
 from app.auth.dependencies import get_current_user, User
+from app.services.event_outbox import transactional_events
 from shared.event_bus import EventPublisher
 
 logger = logging.getLogger(__name__)
@@ -702,11 +703,13 @@ async def pause_processing(
 
         workflow_id = row[0]
 
-        # Publish pause event to RabbitMQ
-        EventPublisher.admin_workflow_paused(
-            workflow_id=workflow_id,
-            admin_id=str(user.id) if hasattr(user, 'id') else "unknown"
-        )
+        # Queue pause event in the outbox; the relay publishes it to RabbitMQ
+        with transactional_events(db):
+            EventPublisher.admin_workflow_paused(
+                workflow_id=workflow_id,
+                admin_id=str(user.id) if hasattr(user, 'id') else "unknown"
+            )
+        db.commit()
 
         return {
             "bom_id": bom_id,
@@ -759,11 +762,13 @@ async def resume_processing(
 
         workflow_id = row[0]
 
-        # Publish resume event to RabbitMQ
-        EventPublisher.admin_workflow_resumed(
-            workflow_id=workflow_id,
-            admin_id=str(user.id) if hasattr(user, 'id') else "unknown"
-        )
+        # Queue resume event in the outbox; the relay publishes it to RabbitMQ
+        with transactional_events(db):
+            EventPublisher.admin_workflow_resumed(
+                workflow_id=workflow_id,
+                admin_id=str(user.id) if hasattr(user, 'id') else "unknown"
+            )
+        db.commit()
 
         return {
             "bom_id": bom_id,
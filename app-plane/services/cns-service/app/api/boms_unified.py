@@ -21,17 +21,17 @@ import json
 import logging
 import uuid as uuid_lib
 from uuid import UUID
-import hashlib
 from datetime import datetime
-from typing import Optional, Dict, Any, List, Tuple
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, Tuple
 from io import BytesIO
 
-import pandas as pd
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, Request, Query
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
+from app.cache.response_cache import etag_response
+from app.cache.scope_cache import invalidate_after_commit as invalidate_scope_after_commit
 from app.config import settings
 # NEW: Import scope validation decorators and dependencies
 from app.core.scope_decorators import require_project
@@ -39,6 +39,14 @@ from app.dependencies.scope_deps import get_supabase_session
 from app.auth.dependencies import get_current_user, User
 from app.models.dual_database import get_dual_database
 from app.services.bom_ingest import build_line_items_from_rows, create_supabase_bom_and_items
+from app.services.bom_diff import apply_revision_diff, find_previous_revision
+from app.services.bom_fingerprint import (
+    PriorBOM,
+    clone_line_enrichment,
+    compute_content_hash,
+    compute_file_hash,
+    find_prior_bom,
+)
 from app.services.project_service import get_default_project_for_org
 from app.utils.directus_client import get_directus_file_service
 from app.workflows.temporal_client import get_temporal_client
@@ -54,6 +62,9 @@ from app.core.authorization import (
     build_tenant_where_clause,
 )
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 logger = logging.getLogger(__name__)
 UPLOADS_BUCKET = settings.minio_bucket_uploads or "cns-bom-uploads"
 
@@ -218,7 +229,68 @@ class BOMUploadResponse(BaseModel):
     priority: str = Field(..., description="Enrichment priority (high/normal)")
 
 
-def parse_csv_file(file_content: bytes, filename: str) -> pd.DataFrame:
+async def _reuse_prior_bom(
+    prior: PriorBOM,
+    *,
+    organization_id: str,
+    project_id: Optional[str],
+    filename: str,
+    user_id: str,
+    priority: str,
+    start_enrichment: bool,
+) -> BOMUploadResponse:
+    """Build the upload response for an exact re-upload of a prior BOM.
+
+    If the prior BOM never got its workflow started (pending/workflow_pending)
+    and enrichment is requested, try to start it now.
+    """
+    logger.info(
+        "[boms_unified] Idempotency hit: reusing BOM %s for organization %s (%s, status=%s)",
+        prior.bom_id,
+        organization_id,
+        prior.matched_on,
+        prior.status,
+    )
+
+    workflow_id = None
+    enrichment_started = False
+
+    if start_enrichment and prior.status in ('pending', 'workflow_pending'):
+        logger.info(
+            "[boms_unified] Idempotency: BOM %s is %s, attempting to start workflow",
+            prior.bom_id,
+            prior.status,
+        )
+        success, workflow_id, error = await _start_workflow_with_retry(
+            bom_id=prior.bom_id,
+            organization_id=organization_id,
+            filename=filename,
+            project_id=project_id,
+            user_id=user_id,
+            priority=priority,
+        )
+        enrichment_started = success
+
+        if not success:
+            await _mark_bom_for_retry(prior.bom_id, error or "Unknown error")
+            logger.warning(
+                "[boms_unified] Idempotency: workflow start failed for BOM %s, marked for retry",
+                prior.bom_id,
+            )
+
+    return BOMUploadResponse(
+        bom_id=prior.bom_id, organization_id=organization_id,
+        component_count=prior.component_count,
+        raw_file_s3_key=prior.raw_file_s3_key,
+        parsed_file_s3_key=prior.parsed_file_s3_key,
+        enrichment_started=enrichment_started,
+        workflow_id=workflow_id,
+        status=prior.status,
+        priority=priority,
+    )
+
+
+def parse_csv_file(file_content: bytes, filename: str) -> "pd.DataFrame":
     """Parse uploaded CSV file into DataFrame.
 
     Args:
@@ -231,6 +303,8 @@ def parse_csv_file(file_content: bytes, filename: str) -> pd.DataFrame:
     Raises:
         HTTPException: If file cannot be parsed
     """
+    import pandas as pd
+
     try:
         df = pd.read_csv(BytesIO(file_content))
 
@@ -351,9 +425,9 @@ def register_directus_upload_artifact(
         logger.debug(f"[boms_unified] Directus registration skipped for {object_key}: {exc}")
 
 def apply_column_mappings(
-    df: pd.DataFrame,
+    df: "pd.DataFrame",
     column_mappings: Optional[Dict[str, str]] = None
-) -> pd.DataFrame:
+) -> "pd.DataFrame":
     """Apply column mappings to rename DataFrame columns.
 
     Args:
@@ -488,7 +562,20 @@ async def upload_bom_scoped(
         )
 
     # Compute content hash for idempotency
-    file_hash = hashlib.sha256(file_content).hexdigest()
+    file_hash = compute_file_hash(file_content)
+
+    # Exact re-upload: reuse the prior BOM before storing, parsing or inserting anything
+    prior = find_prior_bom(db, organization_id, file_hash=file_hash)
+    if prior:
+        return await _reuse_prior_bom(
+            prior,
+            organization_id=organization_id,
+            project_id=project_id,
+            filename=bom_name or file.filename or f"BOM-{prior.bom_id[:8]}",
+            user_id=uploaded_by or str(user.id),
+            priority=priority,
+            start_enrichment=start_enrichment,
+        )
 
     # Store raw file to MinIO
     start_time = datetime.utcnow()
@@ -568,6 +655,9 @@ async def upload_bom_scoped(
             detail="No valid line items found in file. Ensure file has MPN/part number column."
         )
 
+    # Normalized fingerprint of the parsed rows (order/format insensitive)
+    content_hash = compute_content_hash(line_items)
+
     # Store parsed snapshot
     parsed_snapshot = {
         "bom_id": bom_id,
@@ -582,6 +672,7 @@ async def upload_bom_scoped(
         "column_mappings": mappings_dict,
         "total_items": len(line_items),
         "file_hash": file_hash,
+        "content_hash": content_hash,
     }
 
     parsed_s3_key = f"parsed/{organization_id}/{bom_id}.json"
@@ -638,72 +729,14 @@ async def upload_bom_scoped(
 
         logger.info(f"[boms_unified] Project {project_id} validated for organization {organization_id}")
 
-        # Idempotency check
-        idempotent_query = text("""
-            SELECT id, component_count, raw_file_s3_key, parsed_file_s3_key, status
-            FROM boms
-            WHERE organization_id = :organization_id
-              AND metadata->>'file_hash' = :file_hash
-            ORDER BY created_at DESC
-            LIMIT 1
-        """)
-
-        existing = db.execute(
-            idempotent_query,
-            {"organization_id": organization_id, "file_hash": file_hash},
-        ).fetchone()
-
-        if existing:
-            existing_bom_id, existing_count, existing_raw_key, existing_parsed_key, existing_status = existing
-            logger.info(
-                "[boms_unified] Idempotency hit: reusing BOM %s for organization %s (file_hash=%s, status=%s)",
-                existing_bom_id,
-                organization_id,
-                file_hash,
-                existing_status,
-            )
-
-            # If existing BOM is still pending/workflow_pending and start_enrichment is requested,
-            # try to start workflow (it may have failed previously)
-            existing_workflow_id = None
-            existing_enrichment_started = False
+        # Same parsed content as a prior upload: its enrichment results are cloned below
+        content_prior = find_prior_bom(db, organization_id, content_hash=content_hash)
 
-            if start_enrichment and existing_status in ('pending', 'workflow_pending'):
-                logger.info(
-                    "[boms_unified] Idempotency: BOM %s is %s, attempting to start workflow",
-                    existing_bom_id,
-                    existing_status,
-                )
-                effective_user_id = uploaded_by or str(user.id)
-                filename_for_workflow = bom_name or file.filename or f"BOM-{existing_bom_id[:8]}"
-
-                success, existing_workflow_id, error = await _start_workflow_with_retry(
-                    bom_id=str(existing_bom_id),
-                    organization_id=organization_id,
-                    filename=filename_for_workflow,
-                    project_id=project_id,
-                    user_id=effective_user_id,
-                    priority=priority,
-                )
-                existing_enrichment_started = success
-
-                if not success:
-                    await _mark_bom_for_retry(str(existing_bom_id), error or "Unknown error")
-                    logger.warning(
-                        "[boms_unified] Idempotency: workflow start failed for BOM %s, marked for retry",
-                        existing_bom_id,
-                    )
-
-            return BOMUploadResponse(
-                bom_id=str(existing_bom_id), organization_id=organization_id,
-                component_count=existing_count,
-                raw_file_s3_key=existing_raw_key,
-                parsed_file_s3_key=existing_parsed_key,
-                enrichment_started=existing_enrichment_started,
-                workflow_id=existing_workflow_id,
-                status=existing_status,
-                priority=priority,
-            )
+        # Re-upload under an existing BOM name in this project is a new revision:
+        # unchanged lines inherit enrichment/risk from the previous revision below
+        previous_revision = find_previous_revision(
+            db, organization_id=organization_id, project_id=project_id, bom_name=bom_name_final
+        )
 
         # Check for duplicate BOM name in project to avoid unique constraint violation
         # Database has idx_boms_unique_per_project on (project_id, name, version)
@@ -759,7 +792,8 @@ async def upload_bom_scoped(
                     'uploaded_by', :uploaded_by,
                     'filename', :filename,
                     'column_mappings', :column_mappings,
-                    'file_hash', :file_hash
+                    'file_hash', :file_hash,
+                    'content_hash', :content_hash
                 ),
                 NOW(),
                 NOW()
@@ -783,6 +817,7 @@ async def upload_bom_scoped(
                 "filename": filename,
                 "column_mappings": json.dumps(mappings_dict) if mappings_dict else "{}",
                 "file_hash": file_hash,
+                "content_hash": content_hash,
             },
         )
 
@@ -836,6 +871,29 @@ async def upload_bom_scoped(
             f"[boms_unified] [OK] Created Supabase BOM {bom_id} with {len(line_items)} line items (scoped)"
         )
 
+        # Carry over results from the previous revision (or a same-content upload)
+        # so only added/changed lines are enriched and risk-scored again
+        if previous_revision:
+            try:
+                apply_revision_diff(
+                    db,
+                    organization_id=organization_id,
+                    previous_bom_id=previous_revision["bom_id"],
+                    previous_parsed_s3_key=previous_revision["parsed_file_s3_key"],
+                    new_bom_id=bom_id,
+                    new_line_items=line_items,
+                )
+            except SQLAlchemyError as diff_err:
+                logger.warning(f"[boms_unified] Failed to carry over revision results from BOM {previous_revision['bom_id']}: {diff_err}")
+                db.rollback()
+        elif content_prior:
+            try:
+                clone_line_enrichment(db, source_bom_id=content_prior.bom_id, target_bom_id=bom_id)
+                db.commit()
+            except SQLAlchemyError as clone_err:
+                logger.warning(f"[boms_unified] Failed to clone enrichment from BOM {content_prior.bom_id}: {clone_err}")
+                db.rollback()
+
         # Create cns_bulk_uploads tracking record (optional - failure should not fail upload)
         try:
             cns_upload_insert = text("""
@@ -1085,7 +1143,7 @@ async def upload_bom(
         )
 
     # Compute content hash for idempotency / audit
-    file_hash = hashlib.sha256(file_content).hexdigest()
+    file_hash = compute_file_hash(file_content)
 
     # Store raw file to MinIO for audit/recovery
     start_time = datetime.utcnow()
@@ -1157,6 +1215,9 @@ async def upload_bom(
             detail="No valid line items found in file. Ensure file has MPN/part number column."
         )
 
+    # Normalized fingerprint of the parsed rows (order/format insensitive)
+    content_hash = compute_content_hash(line_items)
+
     # Store parsed snapshot to MinIO for audit/verification
     parsed_snapshot = {
         "bom_id": bom_id,
@@ -1171,6 +1232,7 @@ async def upload_bom(
         "column_mappings": mappings_dict,
         "total_items": len(line_items),
         "file_hash": file_hash,
+        "content_hash": content_hash,
     }
 
     parsed_s3_key = f"parsed/{organization_id}/{bom_id}.json"
@@ -1207,78 +1269,26 @@ async def upload_bom(
             )
 
             # Idempotency check: if a BOM with the same file_hash already exists
-            # for this tenant, reuse it instead of creating a duplicate.
+            # for this tenant, reuse it instead of creating a duplicate. A BOM with
+            # the same parsed content (content_hash) gets its enrichment cloned.
             # Can be disabled via BOM_UPLOAD_IDEMPOTENCY_ENABLED=false for testing.
-            existing = None
+            content_prior = None
             if settings.bom_upload_idempotency_enabled:
-                idempotent_query = text("""
-                    SELECT id, component_count, raw_file_s3_key, parsed_file_s3_key, status
-                    FROM boms
-                    WHERE organization_id = :organization_id
-                      AND metadata->>'file_hash' = :file_hash
-                    ORDER BY created_at DESC
-                    LIMIT 1
-                """)
-
-                existing = db.execute(
-                    idempotent_query,
-                    {"organization_id": organization_id, "file_hash": file_hash},
-                ).fetchone()
-            else:
-                logger.info(
-                    "[boms_unified] Idempotency check disabled via BOM_UPLOAD_IDEMPOTENCY_ENABLED=false"
-                )
-
-            if existing:
-                existing_bom_id, existing_count, existing_raw_key, existing_parsed_key, existing_status = existing
-                logger.info(
-                    "[boms_unified] Idempotency hit: reusing BOM %s for organization %s (file_hash=%s, status=%s)",
-                    existing_bom_id,
-                    organization_id,
-                    file_hash,
-                    existing_status,
-                )
-
-                # If existing BOM is still pending/workflow_pending and start_enrichment is requested,
-                # try to start workflow (it may have failed previously)
-                existing_workflow_id = None
-                existing_enrichment_started = False
-
-                if start_enrichment and existing_status in ('pending', 'workflow_pending'):
-                    logger.info(
-                        "[boms_unified] Idempotency: BOM %s is %s, attempting to start workflow",
-                        existing_bom_id,
-                        existing_status,
-                    )
-                    effective_user_id = uploaded_by or auth.user_id
-                    filename_for_workflow = bom_name or file.filename or f"BOM-{existing_bom_id[:8]}"
-
-                    success, existing_workflow_id, error = await _start_workflow_with_retry(
-                        bom_id=str(existing_bom_id),
+                prior = find_prior_bom(db, organization_id, file_hash=file_hash)
+                if prior:
+                    return await _reuse_prior_bom(
+                        prior,
                         organization_id=organization_id,
-                        filename=filename_for_workflow,
                         project_id=project_id,
-                        user_id=effective_user_id,
+                        filename=bom_name or file.filename or f"BOM-{prior.bom_id[:8]}",
+                        user_id=uploaded_by or auth.user_id,
                         priority=priority,
+                        start_enrichment=start_enrichment,
                     )
-                    existing_enrichment_started = success
-
-                    if not success:
-                        await _mark_bom_for_retry(str(existing_bom_id), error or "Unknown error")
-                        logger.warning(
-                            "[boms_unified] Idempotency: workflow start failed for BOM %s, marked for retry",
-                            existing_bom_id,
-                        )
-
-                return BOMUploadResponse(
-                    bom_id=str(existing_bom_id), organization_id=organization_id,
-                    component_count=existing_count,
-                    raw_file_s3_key=existing_raw_key,
-                    parsed_file_s3_key=existing_parsed_key,
-                    enrichment_started=existing_enrichment_started,
-                    workflow_id=existing_workflow_id,
-                    status=existing_status,
-                    priority=priority,
+                content_prior = find_prior_bom(db, organization_id, content_hash=content_hash)
+            else:
+                logger.info(
+                    "[boms_unified] Idempotency check disabled via BOM_UPLOAD_IDEMPOTENCY_ENABLED=false"
                 )
 
             # If no project_id provided, try to find default project for organization
@@ -1290,6 +1300,11 @@ async def upload_bom(
                 else:
                     logger.warning(f"[boms_unified] No default project found for org {organization_id}")
 
+            # Re-upload under an existing BOM name in this project is a new revision
+            previous_revision = find_previous_revision(
+                db, organization_id=organization_id, project_id=project_id, bom_name=bom_name_final
+            )
+
             # Check for duplicate BOM name in project to avoid unique constraint violation
             # Database has idx_boms_unique_per_project on (project_id, name, version)
             if project_id:
@@ -1345,7 +1360,8 @@ async def upload_bom(
                         'uploaded_by', :uploaded_by,
                         'filename', :filename,
                         'column_mappings', :column_mappings,
-                        'file_hash', :file_hash
+                        'file_hash', :file_hash,
+                        'content_hash', :content_hash
                     ),
                     NOW(),
                     NOW()
@@ -1369,6 +1385,7 @@ async def upload_bom(
                     "filename": filename,
                     "column_mappings": json.dumps(mappings_dict) if mappings_dict else "{}",
                     "file_hash": file_hash,
+                    "content_hash": content_hash,
                 },
             )
 
@@ -1422,6 +1439,29 @@ async def upload_bom(
                 f"[boms_unified] [OK] Supabase BOM {bom_id} created with {len(line_items)} line items"
             )
 
+            # Carry over results from the previous revision (or a same-content upload)
+            # so only added/changed lines are enriched and risk-scored again
+            if previous_revision:
+                try:
+                    apply_revision_diff(
+                        db,
+                        organization_id=organization_id,
+                        previous_bom_id=previous_revision["bom_id"],
+                        previous_parsed_s3_key=previous_revision["parsed_file_s3_key"],
+                        new_bom_id=bom_id,
+                        new_line_items=line_items,
+                    )
+                except SQLAlchemyError as diff_err:
+                    logger.warning(f"[boms_unified] Failed to carry over revision results from BOM {previous_revision['bom_id']}: {diff_err}")
+                    db.rollback()
+            elif content_prior:
+                try:
+                    clone_line_enrichment(db, source_bom_id=content_prior.bom_id, target_bom_id=bom_id)
+                    db.commit()
+                except SQLAlchemyError as clone_err:
+                    logger.warning(f"[boms_unified] Failed to clone enrichment from BOM {content_prior.bom_id}: {clone_err}")
+                    db.rollback()
+
             # ====================================================================
             # Create cns_bulk_uploads record for metadata tracking
             # ====================================================================
@@ -1799,6 +1839,7 @@ class BOMDetailResponse(BaseModel):
 @require_role(Role.ANALYST)
 async def get_bom_detail(
     bom_id: str,
+    request: Request,
     auth: AuthContext = Depends(get_auth_context),
 ) -> BOMDetailResponse:
     """
@@ -1813,6 +1854,10 @@ async def get_bom_detail(
     Authorization:
     - Non-super_admins can only access BOMs in their organization
     - Super_admins can access any BOM
+
+    The response carries an ETag of its body; If-None-Match gets a 304. It is
+    not stored server-side because enrichment progress changes with every
+    line item update.
     """
     try:
         logger.info(
@@ -1950,7 +1995,7 @@ async def get_bom_detail(
             bom_id, status, line_count or 0, enriched_count or 0
         )
 
-        return response
+        return etag_response(request, response)
 
     except HTTPException:
         raise
@@ -2050,6 +2095,7 @@ async def delete_bom(
             db.rollback()
             raise HTTPException(status_code=500, detail="Failed to delete BOM")
 
+        invalidate_scope_after_commit(db, bom_ids=[bom_id])
         db.commit()
 
         logger.info(
@@ -17,7 +17,7 @@ Authorization:
     See docs/architecture/APP_LAYER_RLS-CD-Nov-25-25.md for details.
 """
 
-import io
+import asyncio
 import json
 import logging
 import uuid
@@ -25,7 +25,6 @@ from uuid import UUID
 from datetime import datetime
 from typing import Optional
 
-import pandas as pd
 from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
 from pydantic import BaseModel
 from sqlalchemy import text
@@ -34,7 +33,8 @@ from app.config import settings, PLATFORM_SUPER_ADMIN_ORG
 from app.services.project_service import get_default_project_for_org
 from app.utils.activity_log import record_audit_log_entry
 from app.utils.bulk_upload_redis import get_bulk_upload_storage
-from app.utils.minio_client import get_minio_client, upload_to_minio
+from app.utils.minio_client import get_minio_client
+from app.utils.streaming_upload import stream_upload_to_minio
 
 # App-layer authorization (see docs/architecture/APP_LAYER_RLS-CD-Nov-25-25.md)
 from app.core.authorization import (
@@ -47,6 +47,7 @@ from app.core.authorization import (
 # Import event bus
 try:
     from shared.event_bus import EventPublisher
+    from app.services.event_outbox import transactional_events
     EVENT_BUS_AVAILABLE = True
 except ImportError as e:
     logging.warning(f"Failed to import event_bus: {e}. Events will be logged but not published.")
@@ -112,8 +113,8 @@ async def upload_bulk_file(
 
     Flow:
     1. Validate file type
-    2. Upload raw file to MinIO/S3
-    3. Parse CSV/Excel immediately
+    2. Stream raw file to MinIO/S3 (multipart, bounded memory)
+    3. Parse CSV on the fly from the same byte stream (Excel after upload)
     4. ✅ Save metadata to Redis (temporary, 24h TTL)
     5. ✅ Save line items to Redis (temporary, 24h TTL)
     6. Publish RabbitMQ event
@@ -168,15 +169,11 @@ async def upload_bulk_file(
                 detail=f"Unsupported file type: {file_ext}. Allowed: {', '.join(allowed_extensions)}"
             )
 
-        # Read file content
-        file_content = await file.read()
-        file_size = len(file_content)
-
-        logger.info(f"[CNS Bulk Upload Redis] File read: {file_size} bytes")
-
         # ====================================================================
-        # STEP 2: Upload raw file to MinIO
+        # STEP 2+3: Stream raw file to MinIO while parsing it on the fly
         # ====================================================================
+        # The request body is never fully materialized in memory: MinIO receives
+        # it as a multipart upload and the same bytes are teed into the parser.
         minio_client = get_minio_client()
         if not minio_client.is_enabled():
             raise HTTPException(
@@ -184,51 +181,45 @@ async def upload_bulk_file(
                 detail="MinIO storage is not enabled. Please enable MinIO to upload files."
             )
 
-        s3_key, s3_url, error = upload_to_minio(
-            file_content=file_content, organization_id=organization_id,
+        logger.info(f"[CNS Bulk Upload Redis] Streaming and parsing file: {file.filename}")
+
+        streamed = await asyncio.to_thread(
+            stream_upload_to_minio,
+            source=file.file,
+            organization_id=organization_id,
             upload_id=upload_id,
             filename=file.filename,
             content_type=file.content_type or 'application/octet-stream',
-            bucket=settings.minio_bucket_uploads
+            bucket=settings.minio_bucket_uploads,
+            parse_as=file_ext,
         )
 
-        if error:
+        if streamed.error:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to upload to MinIO: {error}"
+                detail=f"Failed to upload to MinIO: {streamed.error}"
             )
 
+        s3_key, s3_url = streamed.s3_key, streamed.s3_url
+        file_size = streamed.file_size
+
         logger.info(
-            f"[CNS Bulk Upload Redis] File uploaded to MinIO: {s3_key}",
+            f"[CNS Bulk Upload Redis] File uploaded to MinIO: {s3_key} ({file_size} bytes)",
             extra={'s3_url': s3_url}
         )
 
-        # ====================================================================
-        # STEP 3: Parse CSV/Excel file
-        # ====================================================================
-        logger.info(f"[CNS Bulk Upload Redis] Parsing file: {file.filename}")
-
-        try:
-            file_stream = io.BytesIO(file_content)
-
-            # Parse based on file type
-            if file_ext == 'csv':
-                df = pd.read_csv(file_stream)
-            elif file_ext in ['xlsx', 'xls']:
-                df = pd.read_excel(file_stream)
-            else:
-                raise ValueError(f"Unsupported file type: {file_ext}")
-
-            total_rows = len(df)
-            logger.info(f"[CNS Bulk Upload Redis] Parsed {total_rows} rows from file")
-
-        except Exception as e:
-            logger.error(f"[CNS Bulk Upload Redis] File parsing failed: {e}", exc_info=True)
+        if streamed.parse_error is not None or streamed.dataframe is None:
+            e = streamed.parse_error or ValueError(f"Unsupported file type: {file_ext}")
+            logger.error(f"[CNS Bulk Upload Redis] File parsing failed: {e}", exc_info=e)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Failed to parse file: {str(e)}"
             )
 
+        df = streamed.dataframe
+        total_rows = len(df)
+        logger.info(f"[CNS Bulk Upload Redis] Parsed {total_rows} rows from file")
+
         # ====================================================================
         # STEP 4: Initialize Redis storage
         # ====================================================================
@@ -275,6 +266,7 @@ async def upload_bulk_file(
         # STEP 6: Build and save line items to Redis
         # ====================================================================
         logger.info(f"[CNS Bulk Upload Redis] Building {total_rows} line items")
+        import pandas as pd
 
         line_items = []
         for idx, row in df.iterrows():
@@ -362,6 +354,20 @@ async def upload_bulk_file(
 
         logger.info(f"[CNS Bulk Upload Redis] Upload completed: {upload_id}")
 
+        def publish_bulk_uploaded(event_bom_id: str) -> None:
+            EventPublisher.cns_bulk_uploaded(
+                bom_id=event_bom_id, organization_id=organization_id,
+                admin_id=uploaded_by or 'cns-bulk-upload',
+                filename=file.filename,
+                file_size=file_size,
+                s3_key=s3_key,
+                s3_bucket=settings.minio_bucket_uploads,
+                total_items=line_items_saved
+            )
+
+        # Set once the event is committed to the outbox together with the BOM
+        event_queued = False
+
         # ====================================================================
         # STEP 7.5: Create Supabase BOM + Line Items (Unified Enrichment)
         # ====================================================================
@@ -501,7 +507,14 @@ async def upload_bulk_file(
                             "description": item.get('description')
                         })
 
+                # Queue the bulk-upload event in the same transaction as the BOM
+                # (transactional outbox); the outbox relay publishes it
+                if EVENT_BUS_AVAILABLE:
+                    with transactional_events(supabase_db):
+                        publish_bulk_uploaded(bom_id)
+
                 supabase_db.commit()
+                event_queued = EVENT_BUS_AVAILABLE
                 logger.info(f"[CNS Bulk Upload] ✅ Created {line_items_saved} line items in Supabase")
 
                 # ====================================================================
@@ -647,21 +660,14 @@ async def upload_bulk_file(
         # ====================================================================
         # STEP 8: Publish RabbitMQ event
         # ====================================================================
-        event_published = False
+        event_published = event_queued
 
-        if EVENT_BUS_AVAILABLE:
+        if event_queued:
+            logger.info(f"[CNS Bulk Upload Redis] Event queued in outbox: staff.bom.bulk_uploaded (bom_id={bom_id})")
+        elif EVENT_BUS_AVAILABLE:
             try:
-                # Use the canonical Supabase BOM ID if available so
-                # downstream consumers receive the correct identifier.
-                EventPublisher.cns_bulk_uploaded(
-                    bom_id=bom_id or upload_id, organization_id=organization_id,
-                    admin_id=uploaded_by or 'cns-bulk-upload',
-                    filename=file.filename,
-                    file_size=file_size,
-                    s3_key=s3_key,
-                    s3_bucket=settings.minio_bucket_uploads,
-                    total_items=line_items_saved
-                )
+                # Supabase BOM creation failed: publish directly with the upload ID
+                publish_bulk_uploaded(bom_id or upload_id)
 
                 event_published = True
                 logger.info(f"[CNS Bulk Upload Redis] RabbitMQ event published: staff.bom.bulk_uploaded (bom_id={bom_id or upload_id})")
@@ -714,12 +720,13 @@ async def list_bulk_uploads(
     """
     List all active bulk uploads from Redis. Requires ADMIN role.
 
-    Scans Redis for all bulk_upload:* keys and returns metadata.
+    Reads active upload ids from the bulk upload registry and returns metadata.
     Non-super_admins only see uploads from their own organization.
     """
     logger.info(f"[Admin] list_bulk_uploads: user={auth.user_id} role={auth.role}")
     try:
         from app.cache.redis_cache import get_cache
+        from app.utils.bulk_upload_redis import list_active_bulk_uploads
 
         redis_cache = get_cache()
         if not redis_cache or not redis_cache.is_connected:
@@ -728,27 +735,9 @@ async def list_bulk_uploads(
                 detail="Redis not available"
             )
 
-        redis_client = redis_cache.get_client()
-
-        # Scan for all bulk upload metadata keys
-        pattern = "bulk_upload:*:metadata"
-        keys = []
-        cursor = 0
-
-        while True:
-            cursor, partial_keys = redis_client.scan(cursor, match=pattern, count=100)
-            keys.extend(partial_keys)
-            if cursor == 0:
-                break
-
         # Fetch metadata for each upload
         uploads = []
-        for key in keys:
-            # Extract upload_id from key: bulk_upload:{upload_id}:metadata
-            # Handle both bytes and str (redis-py can return either)
-            key_str = key.decode('utf-8') if isinstance(key, bytes) else key
-            upload_id = key_str.split(':')[1]
-
+        for upload_id in list_active_bulk_uploads():
             redis_storage = get_bulk_upload_storage(upload_id)
             metadata = redis_storage.get_metadata()
 
@@ -14,11 +14,19 @@ import re
 import json
 from datetime import datetime
 from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from pydantic import BaseModel, Field
-
+from starlette.background import BackgroundTask
+
+from app.cache.response_cache import (
+    catalog_namespaces,
+    conditional_response,
+    get_response_cache,
+    invalidate_catalog_component,
+)
+from app.core.responses import NDJSONResponse, wants_ndjson
 from app.models.base import get_db
 from app.models.dual_database import get_dual_database
 from app.repositories.catalog_repository import CatalogRepository
@@ -50,6 +58,7 @@ router = APIRouter()
 MAX_QUERY_LENGTH = 500  # Maximum search query length
 MAX_FILTER_VALUE_LENGTH = 200  # Maximum length for filter strings (category, manufacturer, etc.)
 MAX_FILTER_LIST_SIZE = 50  # Maximum number of filter values in array parameters
+MY_COMPONENTS_STREAM_BATCH_SIZE = 500  # Rows per fetch when streaming /my-components
 
 
 def _validate_string_length(value: str, param_name: str, max_length: int) -> None:
@@ -1073,10 +1082,12 @@ def _fetch_component(where_clause: str, params: dict, identifier: str) -> Catalo
 # ============================================================================
 
 @router.get("/component/{mpn}", response_model=CatalogComponent)
-def get_component_by_mpn(mpn: str):
+def get_component_by_mpn(mpn: str, request: Request):
     """
     Get component by MPN from component_catalog table
 
+    Served from the response cache with an ETag; If-None-Match gets a 304.
+
     Args:
         mpn: Manufacturer Part Number
 
@@ -1099,20 +1110,28 @@ def get_component_by_mpn(mpn: str):
             detail="Invalid MPN format. Must be 1-100 characters, alphanumeric with hyphens, underscores, dots, commas, or spaces."
         )
 
+    slot = get_response_cache().slot(f"catalog:mpn:{mpn.lower()}", catalog_namespaces(mpn=mpn))
+    cached = slot.get()
+    if cached:
+        return conditional_response(request, cached)
+
     logger.info(f"[Catalog API] Fetching component by MPN: {mpn}")
 
-    return _fetch_component(
+    component = _fetch_component(
         where_clause="LOWER(manufacturer_part_number) = LOWER(:mpn)",
         params={"mpn": mpn},
         identifier=mpn
     )
+    return conditional_response(request, slot.put(component))
 
 
 @router.get("/component/id/{component_id}", response_model=CatalogComponent)
-def get_component_by_id(component_id: str):
+def get_component_by_id(component_id: str, request: Request):
     """
     Get component by ID from component_catalog table
 
+    Served from the response cache with an ETag; If-None-Match gets a 304.
+
     Args:
         component_id: Component database ID (UUID string)
 
@@ -1132,13 +1151,20 @@ def get_component_by_id(component_id: str):
     if not UUID_PATTERN.match(component_id):
         raise HTTPException(status_code=400, detail="Invalid component ID format. Must be a valid UUID.")
 
+    component_id = component_id.lower()
+    slot = get_response_cache().slot(f"catalog:id:{component_id}", catalog_namespaces(component_id=component_id))
+    cached = slot.get()
+    if cached:
+        return conditional_response(request, cached)
+
     logger.info(f"[Catalog API] Fetching component by ID: {component_id}")
 
-    return _fetch_component(
+    component = _fetch_component(
         where_clause="id = :component_id",
         params={"component_id": component_id},
         identifier=f"ID {component_id}"
     )
+    return conditional_response(request, slot.put(component))
 
 
 @router.get("/stats", response_model=CatalogStats)
@@ -1529,6 +1555,7 @@ def _save_to_component_catalog(db: Session, components: List[DashboardSearchResu
                 )
 
             db.commit()
+            invalidate_catalog_component(existing[0] if existing else None, comp.mpn)
             saved.append(comp)
 
         except Exception as e:
@@ -1992,8 +2019,72 @@ def _bom_line_item_to_search_result(row: dict) -> DashboardSearchResult:
     )
 
 
+def _fill_catalog_descriptions(dual_db, row_dicts: List[Dict[str, Any]]) -> None:
+    """Fill missing line item descriptions from component_catalog (in place)."""
+    # Enrich descriptions from component_catalog for rows missing descriptions
+    # Since bom_line_items and component_catalog are in different databases,
+    # we need to do a separate lookup for items without descriptions
+    rows_needing_desc = [
+        r for r in row_dicts
+        if not r.get("description") and not (r.get("specifications") or {}).get("description")
+    ]
+
+    if rows_needing_desc:
+        try:
+            # Get components database session for catalog lookup
+            components_db = next(dual_db.get_session("components"))
+
+            # Build a lookup query for all MPNs that need descriptions
+            mpn_list = [
+                (r.get("manufacturer_part_number") or r.get("enriched_mpn"), r.get("manufacturer") or r.get("enriched_manufacturer"))
+                for r in rows_needing_desc
+                if r.get("manufacturer_part_number") or r.get("enriched_mpn")
+            ]
+
+            if mpn_list:
+                # Query component_catalog for descriptions
+                # Use case-insensitive matching for better hit rate
+                catalog_lookup_sql = text("""
+                    SELECT manufacturer_part_number, manufacturer, description
+                    FROM component_catalog
+                    WHERE LOWER(manufacturer_part_number) = ANY(:mpns)
+                    AND description IS NOT NULL AND description != ''
+                """)
+                mpns_lower = [mpn[0].lower() for mpn in mpn_list if mpn[0]]
+                catalog_results = components_db.execute(catalog_lookup_sql, {"mpns": mpns_lower}).fetchall()
+
+                # Build lookup dict (lowercase MPN -> description)
+                catalog_desc_map = {
+                    r._mapping["manufacturer_part_number"].lower(): r._mapping["description"]
+                    for r in catalog_results
+                }
+
+                # Apply catalog descriptions to rows missing descriptions
+                for row_dict in row_dicts:
+                    if not row_dict.get("description") and not (row_dict.get("specifications") or {}).get("description"):
+                        mpn = (row_dict.get("manufacturer_part_number") or row_dict.get("enriched_mpn") or "").lower()
+                        if mpn in catalog_desc_map:
+                            row_dict["description"] = catalog_desc_map[mpn]
+
+                logger.info(f"[Catalog API] My Components - enriched {len(catalog_desc_map)} descriptions from catalog")
+
+            components_db.close()
+        except Exception as e:
+            logger.warning(f"[Catalog API] My Components - catalog description lookup failed: {e}")
+
+
+def _iter_my_components(dual_db, result, batch_size: int):
+    """Yield search results from a server-side cursor, one catalog lookup per batch."""
+    for rows in result.partitions(batch_size):
+        row_dicts = [dict(row._mapping) for row in rows]
+        _fill_catalog_descriptions(dual_db, row_dicts)
+        for row_dict in row_dicts:
+            yield _bom_line_item_to_search_result(row_dict)
+
+
 @router.get("/my-components", response_model=DashboardSearchResponse)
 def get_my_components(
+    request: Request,
     # Required scoping parameters
     organization_id: str = Query(..., description="Organization ID (tenant)"),
     # Optional scope refinement
@@ -2040,6 +2131,10 @@ def get_my_components(
 
     Returns:
         DashboardSearchResponse with components from user's BOMs
+
+    With ``Accept: application/x-ndjson`` every matching component is streamed
+    as newline-delimited DashboardSearchResult objects instead; limit and
+    offset are ignored and no total or facets are returned.
     """
     logger.info(
         f"[Catalog API] My Components - org={organization_id}, workspace={workspace_id}, "
@@ -2066,6 +2161,7 @@ def get_my_components(
     # Get Supabase database connection
     dual_db = get_dual_database()
     supabase_db = None
+    streaming = False
 
     try:
         supabase_db = dual_db.SupabaseSession()
@@ -2237,9 +2333,20 @@ def get_my_components(
             INNER JOIN projects p ON b.project_id = p.id
             WHERE {where_sql}
             ORDER BY {order_by}
-            LIMIT :limit OFFSET :offset
         """
 
+        if wants_ndjson(request):
+            # The session stays open until the last component is sent
+            result = supabase_db.execute(
+                text(select_sql), params, execution_options={"yield_per": MY_COMPONENTS_STREAM_BATCH_SIZE}
+            )
+            response = NDJSONResponse(
+                _iter_my_components(dual_db, result, MY_COMPONENTS_STREAM_BATCH_SIZE),
+                background=BackgroundTask(supabase_db.close),
+            )
+            streaming = True
+            return response
+
         # Count query
         count_sql = f"""
             SELECT COUNT(*)
@@ -2253,7 +2360,7 @@ def get_my_components(
         params["limit"] = limit
         params["offset"] = offset
 
-        results = supabase_db.execute(text(select_sql), params).fetchall()
+        results = supabase_db.execute(text(select_sql + " LIMIT :limit OFFSET :offset"), params).fetchall()
 
         # Get total count (without limit/offset)
         count_params = {k: v for k, v in params.items() if k not in ['limit', 'offset']}
@@ -2265,56 +2372,7 @@ def get_my_components(
         for row in results:
             row_dicts.append(dict(row._mapping))
 
-        # Enrich descriptions from component_catalog for rows missing descriptions
-        # Since bom_line_items and component_catalog are in different databases,
-        # we need to do a separate lookup for items without descriptions
-        rows_needing_desc = [
-            r for r in row_dicts
-            if not r.get("description") and not (r.get("specifications") or {}).get("description")
-        ]
-
-        if rows_needing_desc:
-            try:
-                # Get components database session for catalog lookup
-                components_db = next(dual_db.get_session("components"))
-
-                # Build a lookup query for all MPNs that need descriptions
-                mpn_list = [
-                    (r.get("manufacturer_part_number") or r.get("enriched_mpn"), r.get("manufacturer") or r.get("enriched_manufacturer"))
-                    for r in rows_needing_desc
-                    if r.get("manufacturer_part_number") or r.get("enriched_mpn")
-                ]
-
-                if mpn_list:
-                    # Query component_catalog for descriptions
-                    # Use case-insensitive matching for better hit rate
-                    catalog_lookup_sql = text("""
-                        SELECT manufacturer_part_number, manufacturer, description
-                        FROM component_catalog
-                        WHERE LOWER(manufacturer_part_number) = ANY(:mpns)
-                        AND description IS NOT NULL AND description != ''
-                    """)
-                    mpns_lower = [mpn[0].lower() for mpn in mpn_list if mpn[0]]
-                    catalog_results = components_db.execute(catalog_lookup_sql, {"mpns": mpns_lower}).fetchall()
-
-                    # Build lookup dict (lowercase MPN -> description)
-                    catalog_desc_map = {
-                        r._mapping["manufacturer_part_number"].lower(): r._mapping["description"]
-                        for r in catalog_results
-                    }
-
-                    # Apply catalog descriptions to rows missing descriptions
-                    for row_dict in row_dicts:
-                        if not row_dict.get("description") and not (row_dict.get("specifications") or {}).get("description"):
-                            mpn = (row_dict.get("manufacturer_part_number") or row_dict.get("enriched_mpn") or "").lower()
-                            if mpn in catalog_desc_map:
-                                row_dict["description"] = catalog_desc_map[mpn]
-
-                    logger.info(f"[Catalog API] My Components - enriched {len(catalog_desc_map)} descriptions from catalog")
-
-                components_db.close()
-            except Exception as e:
-                logger.warning(f"[Catalog API] My Components - catalog description lookup failed: {e}")
+        _fill_catalog_descriptions(dual_db, row_dicts)
 
         # Convert to DashboardSearchResult format
         search_results = []
@@ -2410,7 +2468,7 @@ def get_my_components(
         logger.error(f"[Catalog API] My Components error: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error fetching my components: {str(e)}")
     finally:
-        if supabase_db:
+        if supabase_db and not streaming:
             supabase_db.close()
 
 
@@ -15,6 +15,7 @@ Authorization:
     See docs/architecture/APP_LAYER_RLS-CD-Nov-25-25.md for details.
 """
 
+import asyncio
 import uuid
 import logging
 from typing import Optional, Tuple, List, Literal
@@ -23,7 +24,9 @@ from pydantic import BaseModel
 
 from sqlalchemy import text
 
-from app.utils.minio_client import upload_to_minio, get_minio_client
+from app.utils.minio_client import get_minio_client
+from app.utils.streaming_upload import stream_upload_to_minio
+from app.cache.scope_cache import invalidate_after_commit as invalidate_scope_after_commit
 from app.models.dual_database import get_dual_database
 from app.utils.activity_log import record_audit_log_entry
 
@@ -124,12 +127,6 @@ async def upload_customer_file(
                 detail=f"Unsupported file type: {file_ext}. Allowed: {', '.join(allowed_extensions)}"
             )
 
-        # Read file content
-        file_content = await file.read()
-        file_size = len(file_content)
-
-        logger.info(f"[Customer Upload] File read: {file_size} bytes")
-
         # Check MinIO is enabled
         minio_client = get_minio_client()
         if not minio_client.is_enabled():
@@ -138,10 +135,12 @@ async def upload_customer_file(
                 detail="MinIO storage is not enabled."
             )
 
-        # Upload to MinIO (customer uploads bucket)
+        # Stream to MinIO (customer uploads bucket) as a multipart upload so the
+        # file is never fully buffered in memory
         customer_bucket = 'customer-uploads'
-        s3_key, s3_url, error = upload_to_minio(
-            file_content=file_content,
+        streamed = await asyncio.to_thread(
+            stream_upload_to_minio,
+            source=file.file,
             organization_id=organization_id,
             upload_id=upload_id,
             filename=file.filename,
@@ -149,14 +148,16 @@ async def upload_customer_file(
             bucket=customer_bucket
         )
 
-        if error:
+        if streamed.error:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to upload to MinIO: {error}"
+                detail=f"Failed to upload to MinIO: {streamed.error}"
             )
 
+        s3_key, s3_url = streamed.s3_key, streamed.s3_url
+
         logger.info(
-            f"[Customer Upload] File uploaded to MinIO: {s3_key}",
+            f"[Customer Upload] File uploaded to MinIO: {s3_key} ({streamed.file_size} bytes)",
             extra={'s3_url': s3_url}
         )
 
@@ -562,6 +563,7 @@ async def delete_customer_upload(
                 text("DELETE FROM boms WHERE id = :bom_id"),
                 {"bom_id": linked_bom_id}
             )
+            invalidate_scope_after_commit(db, bom_ids=[linked_bom_id])
 
         db.execute(
             text("DELETE FROM bom_uploads WHERE id = :upload_id"),
@@ -6,28 +6,35 @@ Uses Redis Pub/Sub for event distribution with automatic reconnection.
 
 Features:
 - Real-time progress updates via SSE
-- Automatic reconnection (browser native)
-- Redis Pub/Sub backend for scalability
-- Per-BOM event channels
+- Automatic reconnection (browser native) with Last-Event-ID replay
+- One shared Redis pattern subscription per process (EnrichmentEventHub)
+- Per-BOM event channels, persisted to capped Redis Streams
 - Graceful error handling
 """
 
 import asyncio
 import json
 import logging
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import StreamingResponse
-from redis.asyncio import Redis
 from redis.exceptions import RedisError
 
 from app.cache.redis_cache import get_redis_client
+from app.services.enrichment_event_hub import (
+    TERMINAL_EVENT_TYPES,
+    EnrichmentEventHub,
+    parse_stream_id,
+)
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/enrichment", tags=["enrichment-stream"])
 
+# One pattern subscription per process; the lambda resolves the client lazily
+_hub = EnrichmentEventHub(lambda: get_redis_client())
+
 
 class SSEMessage:
     """Server-Sent Event message formatter"""
@@ -50,29 +57,31 @@ class SSEMessage:
         return message
 
 
-async def enrichment_event_stream(bom_id: str) -> AsyncGenerator[str, None]:
+def _event_id(event_data: dict) -> str:
+    """SSE id for an event: the stream id when persisted, else the event id."""
+    return event_data.get('stream_id') or event_data.get('event_id')
+
+
+async def enrichment_event_stream(bom_id: str, last_event_id: Optional[str] = None) -> AsyncGenerator[str, None]:
     """
     Async generator that yields SSE-formatted enrichment events.
 
-    Subscribes to Redis channel `enrichment:{bom_id}` and streams all
-    published events to the client with automatic keepalive.
+    Registers with the process-wide event hub (one `enrichment:*` pattern
+    subscription shared by every client) and streams events for this BOM.
+    When `last_event_id` is given, events persisted since then are replayed
+    from the BOM's Redis Stream before live events resume.
 
     Args:
         bom_id: BOM identifier to stream events for
+        last_event_id: Last stream id the client received (reconnects)
 
     Yields:
         SSE-formatted event strings
     """
-    redis_client: Redis = None
-    pubsub = None
+    subscriber = None
 
     try:
-        redis_client = await get_redis_client()
-        pubsub = redis_client.pubsub()
-
-        # Subscribe to BOM-specific channel
-        channel = f"enrichment:{bom_id}"
-        await pubsub.subscribe(channel)
+        subscriber = await _hub.subscribe(bom_id, last_event_id)
 
         logger.info(f"[SSE] Client connected to stream for BOM: {bom_id}")
 
@@ -82,60 +91,54 @@ async def enrichment_event_stream(bom_id: str) -> AsyncGenerator[str, None]:
             event="connected"
         )
 
-        # Set keepalive interval (30 seconds)
+        # Replay what the client missed while disconnected
+        replayed_through = None
+        if last_event_id:
+            replayed = await _hub.replay(subscriber, last_event_id)
+            if replayed:
+                logger.info(f"[SSE] Replaying {len(replayed)} events for BOM {bom_id}")
+            for event_data in replayed:
+                replayed_through = parse_stream_id(event_data['stream_id'])
+                event_type = event_data.get('event_type', 'progress')
+                yield SSEMessage.format(event_data, event=event_type, id=_event_id(event_data))
+                if event_type in TERMINAL_EVENT_TYPES:
+                    yield SSEMessage.format(
+                        {"type": "stream_end", "reason": event_type},
+                        event="stream_end"
+                    )
+                    return
+
+        # Keepalive comment after 30 seconds without events
         keepalive_interval = 30
-        last_keepalive = asyncio.get_event_loop().time()
 
-        # Listen for messages
         while True:
             try:
-                # Non-blocking get with timeout for keepalive
-                message = await asyncio.wait_for(
-                    pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0),
-                    timeout=1.0
-                )
-
-                if message and message['type'] == 'message':
-                    # Parse and forward the event
-                    try:
-                        event_data = json.loads(message['data'])
-                        event_type = event_data.get('event_type', 'progress')
-
-                        yield SSEMessage.format(
-                            event_data,
-                            event=event_type,
-                            id=event_data.get('event_id')
-                        )
-
-                        logger.debug(f"[SSE] Sent event {event_type} for BOM {bom_id}")
-
-                        # If enrichment completed or failed, send final message and close
-                        if event_type in ['enrichment.completed', 'enrichment.failed']:
-                            yield SSEMessage.format(
-                                {"type": "stream_end", "reason": event_type},
-                                event="stream_end"
-                            )
-                            logger.info(f"[SSE] Stream ended for BOM {bom_id}: {event_type}")
-                            break
-
-                    except json.JSONDecodeError as e:
-                        logger.error(f"[SSE] Failed to decode event data: {e}")
-                        continue
-
-                # Send keepalive comment every 30 seconds
-                current_time = asyncio.get_event_loop().time()
-                if current_time - last_keepalive > keepalive_interval:
-                    yield ": keepalive\n\n"
-                    last_keepalive = current_time
-
+                event_data = await asyncio.wait_for(subscriber.queue.get(), timeout=keepalive_interval)
             except asyncio.TimeoutError:
-                # Timeout is expected for keepalive - continue listening
+                yield ": keepalive\n\n"
+                continue
+
+            stream_id = parse_stream_id(event_data.get('stream_id'))
+            if replayed_through and stream_id and stream_id <= replayed_through:
                 continue
-            except asyncio.CancelledError:
-                # Client disconnected
-                logger.info(f"[SSE] Client disconnected from BOM {bom_id}")
+
+            event_type = event_data.get('event_type', 'progress')
+            yield SSEMessage.format(event_data, event=event_type, id=_event_id(event_data))
+
+            logger.debug(f"[SSE] Sent event {event_type} for BOM {bom_id}")
+
+            # If enrichment completed or failed, send final message and close
+            if event_type in TERMINAL_EVENT_TYPES:
+                yield SSEMessage.format(
+                    {"type": "stream_end", "reason": event_type},
+                    event="stream_end"
+                )
+                logger.info(f"[SSE] Stream ended for BOM {bom_id}: {event_type}")
                 break
 
+    except asyncio.CancelledError:
+        # Client disconnected
+        logger.info(f"[SSE] Client disconnected from BOM {bom_id}")
     except RedisError as e:
         logger.error(f"[SSE] Redis error for BOM {bom_id}: {e}")
         yield SSEMessage.format(
@@ -149,14 +152,12 @@ async def enrichment_event_stream(bom_id: str) -> AsyncGenerator[str, None]:
             event="error"
         )
     finally:
-        # Cleanup
-        if pubsub:
+        if subscriber is not None:
             try:
-                await pubsub.unsubscribe()
-                await pubsub.close()
-                logger.debug(f"[SSE] Cleaned up pubsub for BOM {bom_id}")
+                await _hub.unsubscribe(subscriber)
+                logger.debug(f"[SSE] Unsubscribed from hub for BOM {bom_id}")
             except Exception as e:
-                logger.warning(f"[SSE] Error during pubsub cleanup: {e}")
+                logger.warning(f"[SSE] Error during hub cleanup: {e}")
 
 
 @router.options("/stream/{bom_id}")
@@ -190,7 +191,12 @@ async def stream_enrichment_options(request: Request, bom_id: str):
 
 
 @router.get("/stream/{bom_id}")
-async def stream_enrichment_progress(request: Request, bom_id: str, token: str = None):
+async def stream_enrichment_progress(
+    request: Request,
+    bom_id: str,
+    token: str = None,
+    last_event_id: Optional[str] = None,
+):
     """
     SSE endpoint for real-time enrichment progress updates.
 
@@ -204,6 +210,8 @@ async def stream_enrichment_progress(request: Request, bom_id: str, token: str =
     Args:
         bom_id: BOM identifier to stream events for
         token: Admin API token OR Auth0 JWT for authentication (query parameter)
+        last_event_id: Resume point for clients that can't send the
+            Last-Event-ID header (the header wins when both are present)
 
     Returns:
         StreamingResponse with text/event-stream content type
@@ -284,7 +292,7 @@ async def stream_enrichment_progress(request: Request, bom_id: str, token: str =
         allow_origin = "*"
 
     return StreamingResponse(
-        enrichment_event_stream(bom_id),
+        enrichment_event_stream(bom_id, request.headers.get("last-event-id") or last_event_id),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -305,7 +313,7 @@ async def stream_health():
     try:
         redis_client = await get_redis_client()
         await redis_client.ping()
-        return {"status": "healthy", "redis": "connected"}
+        return {"status": "healthy", "redis": "connected", "hub": _hub.stats()}
     except Exception as e:
         logger.error(f"[SSE] Health check failed: {e}")
         raise HTTPException(status_code=503, detail="Redis unavailable")
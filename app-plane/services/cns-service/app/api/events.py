@@ -8,6 +8,9 @@ Used for:
 - Organization operations (member add/remove, delete)
 - User operations (delete)
 
+Events are written to the transactional outbox (event_outbox) and published
+to RabbitMQ by the outbox relay, so the request never waits on the broker.
+
 Events are published to RabbitMQ for:
 - WebSocket notifications
 - Audit logging
@@ -18,8 +21,13 @@ Events are published to RabbitMQ for:
 import logging
 from typing import Dict, Any, Optional
 from fastapi import APIRouter, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 from datetime import datetime
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.cache.auth_context_cache import get_auth_context_cache
+from app.cache.scope_cache import get_scope_cache
 
 # Import event bus from shared library
 try:
@@ -30,6 +38,7 @@ try:
     if os.path.exists(parent_path) and parent_path not in sys.path:
         sys.path.insert(0, parent_path)
     from shared.event_bus import EventPublisher
+    from app.services.event_outbox import transactional_events
     EVENT_BUS_AVAILABLE = True
 except ImportError as e:
     logging.warning(f"Failed to import event_bus: {e}. Events will be logged but not published.")
@@ -39,6 +48,21 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/events", tags=["events"])
 
+# Membership events: routing key -> (data field with the user id, data field with the org id)
+AUTH_CONTEXT_EVENTS = {
+    'customer.organization.deleted': (None, 'organization_id'),
+    'customer.organization.member_added': ('new_member_id', None),
+    'customer.organization.member_removed': ('removed_member_id', None),
+    'customer.user.deleted': ('deleted_user_id', None),
+}
+
+# Ownership-change events: routing key -> (scope cache level, data field with the resource id)
+SCOPE_EVENTS = {
+    'customer.organization.deleted': ('organization', 'organization_id'),
+    'customer.project.deleted': ('project', 'project_id'),
+    'customer.bom.deleted': ('bom', 'bom_id'),
+}
+
 
 class PublishEventRequest(BaseModel):
     """Request model for event publishing"""
@@ -81,6 +105,11 @@ async def publish_event(request: PublishEventRequest):
             }
         )
 
+        if request.routing_key in AUTH_CONTEXT_EVENTS:
+            await _invalidate_auth_context(request)
+        if request.routing_key in SCOPE_EVENTS:
+            _invalidate_scope_cache(request)
+
         if not EVENT_BUS_AVAILABLE:
             logger.warning(
                 f"Event bus not available, event logged only: {request.routing_key}",
@@ -92,23 +121,13 @@ async def publish_event(request: PublishEventRequest):
                 timestamp=datetime.utcnow().isoformat()
             )
 
-        # Publish event using EventPublisher helpers
-        event_published = False
-
-        # Route to appropriate event publisher based on routing key
-        if request.routing_key.startswith('customer.bom.'):
-            event_published = await _publish_bom_event(request)
-        elif request.routing_key.startswith('customer.project.'):
-            event_published = await _publish_project_event(request)
-        elif request.routing_key.startswith('customer.organization.'):
-            event_published = await _publish_organization_event(request)
-        elif request.routing_key.startswith('customer.user.'):
-            event_published = await _publish_user_event(request)
-        else:
-            # Generic event publishing
-            logger.info(f"Publishing generic event: {request.routing_key}")
-            # Use EventPublisher's generic publish method if needed
-            event_published = True
+        # Publish event using EventPublisher helpers, via the outbox
+        try:
+            event_published = await run_in_threadpool(_dispatch_via_outbox, request)
+        except SQLAlchemyError as e:
+            # Outbox unavailable: hand the event to the in-process publisher instead
+            logger.warning(f"Outbox write failed, publishing {request.routing_key} directly: {e}")
+            event_published = await run_in_threadpool(_dispatch_event, request)
 
         if event_published:
             logger.info(f"Successfully published event: {request.routing_key}")
@@ -142,7 +161,65 @@ async def publish_event(request: PublishEventRequest):
         )
 
 
-async def _publish_bom_event(request: PublishEventRequest) -> bool:
+async def _invalidate_auth_context(request: PublishEventRequest) -> None:
+    """Drop cached user/org context for a membership change made outside this service"""
+    user_field, org_field = AUTH_CONTEXT_EVENTS[request.routing_key]
+    await get_auth_context_cache().invalidate(
+        user_ids=[request.data.get(user_field)] if user_field else [],
+        org_ids=[request.data.get(org_field)] if org_field else [],
+    )
+
+
+def _invalidate_scope_cache(request: PublishEventRequest) -> None:
+    """Drop cached scope hierarchies for a resource deleted or re-parented outside this service"""
+    level, field = SCOPE_EVENTS[request.routing_key]
+    get_scope_cache().invalidate(**{f"{level}_ids": [request.data.get(field)]})
+
+
+def _dispatch_event(request: PublishEventRequest) -> bool:
+    """Route to the appropriate event publisher based on routing key (blocking)"""
+    if request.routing_key.startswith('customer.bom.'):
+        return _publish_bom_event(request)
+    elif request.routing_key.startswith('customer.project.'):
+        return _publish_project_event(request)
+    elif request.routing_key.startswith('customer.organization.'):
+        return _publish_organization_event(request)
+    elif request.routing_key.startswith('customer.user.'):
+        return _publish_user_event(request)
+
+    # Generic event publishing
+    logger.info(f"Publishing generic event: {request.routing_key}")
+    # Use EventPublisher's generic publish method if needed
+    return True
+
+
+def _dispatch_via_outbox(request: PublishEventRequest) -> bool:
+    """
+    Write the event to event_outbox and commit; the outbox relay publishes it.
+
+    Blocking (DB session); call through run_in_threadpool. A failed outbox
+    INSERT raises SQLAlchemyError after rolling back.
+    """
+    from app.models.dual_database import get_dual_database
+
+    db_gen = get_dual_database().get_session("supabase")
+    db = next(db_gen)
+    try:
+        with transactional_events(db):
+            event_published = _dispatch_event(request)
+        db.commit()
+        return event_published
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        try:
+            next(db_gen)
+        except StopIteration:
+            pass
+
+
+def _publish_bom_event(request: PublishEventRequest) -> bool:
     """Publish BOM-related event"""
     try:
         data = request.data
@@ -180,12 +257,15 @@ async def _publish_bom_event(request: PublishEventRequest) -> bool:
             )
 
         return True
+    except SQLAlchemyError:
+        # Outbox INSERT failed: let the caller roll back
+        raise
     except Exception as e:
         logger.error(f"Error publishing BOM event: {e}", exc_info=True)
         return False
 
 
-async def _publish_project_event(request: PublishEventRequest) -> bool:
+def _publish_project_event(request: PublishEventRequest) -> bool:
     """Publish Project-related event"""
     try:
         data = request.data
@@ -214,12 +294,15 @@ async def _publish_project_event(request: PublishEventRequest) -> bool:
             )
 
         return True
+    except SQLAlchemyError:
+        # Outbox INSERT failed: let the caller roll back
+        raise
     except Exception as e:
         logger.error(f"Error publishing Project event: {e}", exc_info=True)
         return False
 
 
-async def _publish_organization_event(request: PublishEventRequest) -> bool:
+def _publish_organization_event(request: PublishEventRequest) -> bool:
     """Publish Organization-related event"""
     try:
         data = request.data
@@ -245,12 +328,15 @@ async def _publish_organization_event(request: PublishEventRequest) -> bool:
             )
 
         return True
+    except SQLAlchemyError:
+        # Outbox INSERT failed: let the caller roll back
+        raise
     except Exception as e:
         logger.error(f"Error publishing Organization event: {e}", exc_info=True)
         return False
 
 
-async def _publish_user_event(request: PublishEventRequest) -> bool:
+def _publish_user_event(request: PublishEventRequest) -> bool:
     """Publish User-related event"""
     try:
         data = request.data
@@ -263,6 +349,9 @@ async def _publish_user_event(request: PublishEventRequest) -> bool:
             )
 
         return True
+    except SQLAlchemyError:
+        # Outbox INSERT failed: let the caller roll back
+        raise
     except Exception as e:
         logger.error(f"Error publishing User event: {e}", exc_info=True)
         return False
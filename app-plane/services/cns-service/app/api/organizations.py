@@ -32,6 +32,7 @@ from ..auth.dependencies import (
     require_owner,
     get_supabase_session,
 )
+from ..cache.auth_context_cache import invalidate_after_commit
 
 logger = logging.getLogger(__name__)
 
@@ -282,6 +283,7 @@ async def create_organization(
             """),
             {"org_id": org_id, "user_id": user.id}
         )
+        invalidate_after_commit(session, user_ids=[user.id])
 
         # Set as user's last active org
         session.execute(
@@ -373,6 +375,7 @@ async def update_organization(
             """),
             params
         )
+        invalidate_after_commit(session, org_ids=[context.organization.id])
 
         logger.info(f"[Orgs] Organization updated: id={context.organization.id}")
 
@@ -398,6 +401,7 @@ async def delete_organization(
             """),
             {"org_id": context.organization.id}
         )
+        invalidate_after_commit(session, org_ids=[context.organization.id])
 
         logger.info(f"[Orgs] Organization deleted: id={context.organization.id}")
 
@@ -643,6 +647,7 @@ async def accept_invitation(
             """),
             {"org_id": str(invite.organization_id), "user_id": user.id, "role": invite.role}
         )
+        invalidate_after_commit(session, user_ids=[user.id])
 
         # Mark invitation as accepted
         session.execute(
@@ -730,6 +735,7 @@ async def remove_member(
             """),
             {"org_id": context.organization.id, "user_id": user_id}
         )
+        invalidate_after_commit(session, user_ids=[user_id])
 
         logger.info(f"[Orgs] Member removed: org={context.organization.id}, user={user_id}")
 
@@ -770,6 +776,7 @@ async def leave_organization(
             """),
             {"org_id": context.organization.id, "user_id": context.user.id}
         )
+        invalidate_after_commit(session, user_ids=[context.user.id])
 
         logger.info(f"[Orgs] User left org: org={context.organization.id}, user={context.user.id}")
 
@@ -846,6 +853,7 @@ async def transfer_ownership(
             """),
             {"org_id": context.organization.id, "user_id": context.user.id}
         )
+        invalidate_after_commit(session, user_ids=[new_owner_id, context.user.id])
 
         logger.info(
             f"[Orgs] Ownership transferred: org={context.organization.id}, "
@@ -1130,6 +1138,7 @@ async def update_member_role(
             """),
             {"org_id": context.organization.id, "user_id": user_id, "role": data.role}
         )
+        invalidate_after_commit(session, user_ids=[user_id])
 
         # Get user's Auth0 ID for role sync
         user_auth0_id = session.execute(
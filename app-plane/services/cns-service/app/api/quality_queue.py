@@ -15,6 +15,8 @@ from app.cache.redis_cache import get_cache
 from app.cache.component_redis_storage import (
     get_low_quality_component,
     delete_low_quality_component,
+    get_quality_queue_stats as get_queue_index_stats,
+    query_quality_queue,
 )
 from app.services.component_catalog import ComponentCatalogService
 
@@ -40,53 +42,8 @@ async def get_quality_queue_stats():
         raise HTTPException(status_code=503, detail="Redis cache not available")
 
     try:
-        client = cache.get_client()
-        if not client:
-            raise HTTPException(status_code=503, detail="Redis client not available")
-
-        stats = {
-            "total": 0,
-            "staging_count": 0,  # 70-94%
-            "rejected_count": 0,  # <70%
-            "average_quality": 0.0,
-            "by_source": {},
-        }
-
-        quality_scores = []
-
-        pattern = "low_quality_component:*"
-        cursor = 0
-
-        while True:
-            cursor, keys = client.scan(cursor, match=pattern, count=100)
-
-            for key in keys:
-                key_str = key.decode('utf-8') if isinstance(key, bytes) else key
-                component_record = cache.get(key_str)
-
-                if not component_record:
-                    continue
-
-                stats["total"] += 1
-                quality_score = float(component_record.get('quality_score', 0))
-                quality_scores.append(quality_score)
-
-                if quality_score >= 70:
-                    stats["staging_count"] += 1
-                else:
-                    stats["rejected_count"] += 1
-
-                # Track by source
-                source = component_record.get('api_source') or component_record.get('enrichment_source') or 'unknown'
-                stats["by_source"][source] = stats["by_source"].get(source, 0) + 1
-
-            if cursor == 0:
-                break
-
-        if quality_scores:
-            stats["average_quality"] = round(sum(quality_scores) / len(quality_scores), 1)
-
-        return stats
+        # Counters come from the queue indexes, no per-component reads
+        return get_queue_index_stats()
 
     except Exception as e:
         logger.error(f"Error fetching quality queue stats: {e}", exc_info=True)
@@ -114,7 +71,7 @@ class QueueItem(BaseModel):
 
 class QueueListResponse(BaseModel):
     """Queue list response"""
-    total: int
+    total: int  # All items matching the filter, not just this page
     items: List[QueueItem]
 
 
@@ -181,30 +138,33 @@ async def get_quality_queue(
     min_quality: Optional[float] = Query(None, description="Minimum quality score"),
     max_quality: Optional[float] = Query(None, description="Maximum quality score"),
     limit: int = Query(100, description="Maximum results", ge=1, le=500),
+    offset: int = Query(0, description="Results to skip (pagination)", ge=0),
+    source: Optional[str] = Query(None, description="Filter by enrichment source"),
+    job_id: Optional[str] = Query(None, description="Filter by enrichment job"),
 ):
     """
     Get components from Redis quality queue.
 
-    Scans Redis for all low-quality components and returns them filtered by quality score.
+    Pages through the quality-score index (lowest quality first), optionally
+    restricted to one enrichment source or job.
 
     Args:
         status: Filter preset - 'staging' (70-94%), 'rejected' (<70%), 'all'
         min_quality: Optional minimum quality score override
         max_quality: Optional maximum quality score override
         limit: Maximum results to return
+        offset: Results to skip
+        source: Optional enrichment source filter
+        job_id: Optional enrichment job filter
 
     Returns:
-        List of queue items with quality scores and metadata
+        Page of queue items plus the total number of matching items
     """
     cache = get_cache()
     if not cache or not cache.is_connected:
         raise HTTPException(status_code=503, detail="Redis cache not available")
 
     try:
-        client = cache.get_client()
-        if not client:
-            raise HTTPException(status_code=503, detail="Redis client not available")
-
         # Determine quality score range based on filter
         if min_quality is None and max_quality is None:
             if status == "staging":
@@ -223,65 +183,49 @@ async def get_quality_queue(
         if max_quality is None:
             max_quality = 100.0
 
-        # Scan for low-quality component keys
-        pattern = "low_quality_component:*"
-        items: List[QueueItem] = []
-
-        cursor = 0
-        while len(items) < limit:
-            cursor, keys = client.scan(cursor, match=pattern, count=100)
-
-            for key in keys:
-                if len(items) >= limit:
-                    break
-
-                # Decode key if bytes
-                key_str = key.decode('utf-8') if isinstance(key, bytes) else key
-
-                component_record = cache.get(key_str)
-                if not component_record:
-                    continue
-
-                quality_score = float(component_record.get('quality_score', 0))
-
-                # Apply quality score filter
-                if quality_score < min_quality or quality_score > max_quality:
-                    continue
-
-                enrichment_data = component_record.get('enrichment_data', {})
-
-                # Extract sources used
-                sources = []
-                api_source = component_record.get('api_source') or enrichment_data.get('api_source')
-                if api_source:
-                    sources.append(api_source)
-                enrichment_source = component_record.get('enrichment_source') or enrichment_data.get('enrichment_source')
-                if enrichment_source and enrichment_source not in sources:
-                    sources.append(enrichment_source)
-
-                items.append(QueueItem(
-                    id=key_str,
-                    mpn=component_record.get('mpn', ''),
-                    manufacturer=component_record.get('manufacturer', ''),
-                    category=enrichment_data.get('category'),
-                    quality_score=quality_score,
-                    flagged_reason=_get_flagged_reason(quality_score),
-                    data_completeness=_calculate_data_completeness(enrichment_data),
-                    sources_used=sources,
-                    submitted_at=component_record.get('stored_at', datetime.utcnow().isoformat()),
-                    job_id=enrichment_data.get('job_id'),
-                ))
-
-            if cursor == 0:
-                break
-
-        # Sort by quality score (lowest first for review priority)
-        items.sort(key=lambda x: x.quality_score)
+        page = query_quality_queue(
+            min_quality,
+            max_quality,
+            offset=offset,
+            limit=limit,
+            source=source,
+            job_id=job_id,
+        )
 
-        logger.info(f"Quality queue: Found {len(items)} items (filter={status}, range={min_quality}-{max_quality})")
+        items: List[QueueItem] = []
+        for key_str, component_record in page["items"]:
+            quality_score = float(component_record.get('quality_score', 0))
+            enrichment_data = component_record.get('enrichment_data', {})
+
+            # Extract sources used
+            sources = []
+            api_source = component_record.get('api_source') or enrichment_data.get('api_source')
+            if api_source:
+                sources.append(api_source)
+            enrichment_source = component_record.get('enrichment_source') or enrichment_data.get('enrichment_source')
+            if enrichment_source and enrichment_source not in sources:
+                sources.append(enrichment_source)
+
+            items.append(QueueItem(
+                id=key_str,
+                mpn=component_record.get('mpn', ''),
+                manufacturer=component_record.get('manufacturer', ''),
+                category=enrichment_data.get('category'),
+                quality_score=quality_score,
+                flagged_reason=_get_flagged_reason(quality_score),
+                data_completeness=_calculate_data_completeness(enrichment_data),
+                sources_used=sources,
+                submitted_at=component_record.get('stored_at', datetime.utcnow().isoformat()),
+                job_id=enrichment_data.get('job_id'),
+            ))
+
+        logger.info(
+            f"Quality queue: {len(items)} of {page['total']} items "
+            f"(filter={status}, range={min_quality}-{max_quality}, offset={offset})"
+        )
 
         return QueueListResponse(
-            total=len(items),
+            total=page["total"],
             items=items
         )
 
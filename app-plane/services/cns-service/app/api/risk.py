@@ -11,7 +11,9 @@ Risk scores are calculated using weighted factors:
 
 Caching Strategy (Cache-Aside Pattern):
 - Individual risk scores are cached in Redis for fast lookups
-- Portfolio summaries have separate cache with shorter TTL
+- Portfolio and BOM risk responses are served from the versioned response
+  cache (app/cache/response_cache.py) with ETags; risk writes bump the
+  versions, so If-None-Match polls get a 304 until something changes
 - Cache is populated by:
   1. On-demand: Cache miss triggers DB read + cache write
   2. Event-driven: risk.calculated events populate cache asynchronously
@@ -27,11 +29,21 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from pydantic import BaseModel, Field
 from sqlalchemy import text
-
+from starlette.background import BackgroundTask
+
+from app.cache.response_cache import (
+    bom_risk_namespaces,
+    conditional_response,
+    etag_response,
+    get_response_cache,
+    invalidate_risk,
+    portfolio_risk_namespaces,
+)
 from app.models.dual_database import get_dual_database
+from app.core.responses import NDJSONResponse, wants_ndjson
 from app.core.authorization import (
     AuthContext,
     get_auth_context,
@@ -54,6 +66,9 @@ logger = logging.getLogger(__name__)
 # Cache settings
 PORTFOLIO_CACHE_TTL = 300  # 5 minutes
 
+# Rows fetched per round trip when streaming line items
+LINE_ITEM_STREAM_BATCH_SIZE = 500
+
 
 def _get_portfolio_cache_key(org_id: str) -> str:
     """Generate cache key for portfolio risk summary."""
@@ -509,8 +524,23 @@ async def calculate_bulk_risk(
     )
 
 
+def _risk_cache_scope(auth: AuthContext) -> Optional[str]:
+    """
+    Response cache scope for the caller's tenant filter.
+
+    None (don't cache) for a non-admin without an organization: their
+    filtered result must never share an entry with the all-org view.
+    """
+    if auth.is_super_admin:
+        return "all"
+    if auth.organization_id:
+        return f"org:{auth.organization_id}"
+    return None
+
+
 @router.get("/portfolio", response_model=PortfolioRiskSummary)
 async def get_portfolio_risk(
+    request: Request,
     force_refresh: bool = Query(default=False, description="Force bypass of cache"),
     auth: AuthContext = Depends(get_auth_context)
 ):
@@ -524,18 +554,23 @@ async def get_portfolio_risk(
     - Top high-risk components
     - Most common risk factors
 
-    Results are cached for 5 minutes to improve performance.
+    Results are cached until risk scores change and carry an ETag.
     Use force_refresh=true to bypass cache.
     """
     try:
         logger.info(f"[Risk] get_portfolio_risk: user={auth.user_id} org={auth.organization_id}")
 
         # Check cache first (unless force refresh requested)
-        if not force_refresh and auth.organization_id:
-            cached = _get_cached_portfolio(auth.organization_id)
+        scope = _risk_cache_scope(auth)
+        scope_org_id = None if auth.is_super_admin else auth.organization_id
+        slot = get_response_cache().slot(
+            scope and f"risk:portfolio:{scope}", portfolio_risk_namespaces(scope_org_id)
+        )
+        if not force_refresh:
+            cached = slot.get()
             if cached:
                 logger.info(f"[Risk] Returning cached portfolio risk: org={auth.organization_id}")
-                return PortfolioRiskSummary(**cached)
+                return conditional_response(request, cached)
 
         db = next(get_dual_database().get_session("supabase"))
 
@@ -570,14 +605,14 @@ async def get_portfolio_risk(
         rows = db.execute(text(sql), params).fetchall()
 
         if not rows:
-            return PortfolioRiskSummary(
+            return conditional_response(request, slot.put(PortfolioRiskSummary(
                 total_components=0,
                 risk_distribution={"low": 0, "medium": 0, "high": 0, "critical": 0},
                 average_risk_score=0.0,
                 trend="stable",
                 high_risk_components=[],
                 top_risk_factors=[],
-            )
+            )))
 
         # Calculate distribution
         distribution = {"low": 0, "medium": 0, "high": 0, "critical": 0}
@@ -679,11 +714,7 @@ async def get_portfolio_risk(
         )
 
         # Cache the result for future requests
-        if auth.organization_id:
-            _set_portfolio_cache(auth.organization_id, result.model_dump())
-            logger.debug(f"[Risk] Cached portfolio risk summary: org={auth.organization_id}")
-
-        return result
+        return conditional_response(request, slot.put(result))
 
     except Exception as e:
         # Handle missing tables gracefully - return empty data
@@ -1481,6 +1512,7 @@ async def get_boms_with_risk(
 @router.get("/boms/{bom_id}", response_model=BOMRiskSummaryResponse)
 async def get_bom_risk_detail(
     bom_id: str,
+    request: Request,
     auth: AuthContext = Depends(get_auth_context)
 ):
     """
@@ -1488,6 +1520,9 @@ async def get_bom_risk_detail(
 
     Returns risk summary if available, or empty/default values if risk tables
     haven't been created or no risk analysis has been run for this BOM.
+    Served with an ETag; If-None-Match gets a 304. Only the risk summary row
+    comes from the response cache: BOM edits don't bump risk:bom:{bom_id}, so
+    the BOM row (name, project, org check) is read on every request.
     """
     try:
         logger.info(f"[Risk] get_bom_risk_detail: user={auth.user_id} bom={bom_id}")
@@ -1516,27 +1551,33 @@ async def get_bom_risk_detail(
 
         bom_m = bom_row._mapping
 
-        # Try to get risk summary if table exists
-        risk_data = None
-        try:
-            risk_sql = """
-                SELECT total_line_items, low_risk_count, medium_risk_count,
-                       high_risk_count, critical_risk_count, average_risk_score,
-                       weighted_risk_score, health_grade, score_trend, top_risk_components
-                FROM bom_risk_summaries
-                WHERE bom_id = :bom_id
-            """
-            risk_row = db.execute(text(risk_sql), {"bom_id": bom_id}).fetchone()
-            if risk_row:
-                risk_data = risk_row._mapping
-        except Exception as risk_err:
-            # Risk table doesn't exist or query failed - use defaults
-            error_msg = str(risk_err).lower()
-            if "relation" not in error_msg or "does not exist" not in error_msg:
-                logger.warning(f"[Risk] Error querying risk summary: {risk_err}")
+        # Risk summary (None if not analyzed yet), cached until risk writes bump the BOM
+        slot = get_response_cache().slot(f"risk:bom:{bom_id}:summary", bom_risk_namespaces(bom_id))
+        cached = slot.get()
+        if cached:
+            risk_data = json.loads(cached.body)
+        else:
+            risk_data = None
+            try:
+                risk_sql = """
+                    SELECT total_line_items, low_risk_count, medium_risk_count,
+                           high_risk_count, critical_risk_count, average_risk_score,
+                           weighted_risk_score, health_grade, score_trend, top_risk_components
+                    FROM bom_risk_summaries
+                    WHERE bom_id = :bom_id
+                """
+                risk_row = db.execute(text(risk_sql), {"bom_id": bom_id}).fetchone()
+                if risk_row:
+                    risk_data = dict(risk_row._mapping)
+                slot.put(risk_data)
+            except Exception as risk_err:
+                # Risk table doesn't exist or query failed - use defaults (not cached)
+                error_msg = str(risk_err).lower()
+                if "relation" not in error_msg or "does not exist" not in error_msg:
+                    logger.warning(f"[Risk] Error querying risk summary: {risk_err}")
 
         # Build response with BOM data + risk data (or defaults)
-        return BOMRiskSummaryResponse(
+        return etag_response(request, BOMRiskSummaryResponse(
             bom_id=str(bom_m["id"]),
             bom_name=bom_m.get("name"),
             project_id=str(bom_m["project_id"]) if bom_m.get("project_id") else None,
@@ -1551,7 +1592,7 @@ async def get_bom_risk_detail(
             health_grade=risk_data["health_grade"] if risk_data else "N/A",
             score_trend=risk_data["score_trend"] if risk_data else "stable",
             top_risk_components=risk_data["top_risk_components"] if risk_data and isinstance(risk_data["top_risk_components"], list) else [],
-        )
+        ))
 
     except HTTPException:
         raise
@@ -1577,9 +1618,26 @@ async def get_bom_risk_detail(
         raise HTTPException(status_code=500, detail="Failed to get BOM risk detail")
 
 
+def _line_item_risk_response(m) -> BOMLineItemRiskResponse:
+    return BOMLineItemRiskResponse(
+        line_item_id=str(m["line_item_id"]),
+        mpn=m.get("mpn"),
+        manufacturer=m.get("manufacturer"),
+        quantity=m["quantity"],
+        base_risk_score=m["base_risk_score"],
+        contextual_risk_score=m["contextual_risk_score"],
+        risk_level=m["risk_level"],
+        user_criticality_level=m["user_criticality_level"],
+        quantity_modifier=m["quantity_modifier"],
+        lead_time_modifier=m["lead_time_modifier"],
+        criticality_modifier=m["criticality_modifier"],
+    )
+
+
 @router.get("/boms/{bom_id}/line-items", response_model=List[BOMLineItemRiskResponse])
 async def get_bom_line_items_with_risk(
     bom_id: str,
+    request: Request,
     risk_level: Optional[str] = Query(None, description="Filter by risk level"),
     limit: int = Query(default=100, ge=1, le=500),
     offset: int = Query(default=0, ge=0),
@@ -1587,13 +1645,16 @@ async def get_bom_line_items_with_risk(
 ):
     """
     Get all line items for a BOM with their contextual risk scores.
+
+    limit/offset page the JSON array. With ``Accept: application/x-ndjson``
+    every matching line item is streamed as newline-delimited JSON instead.
     """
     try:
         logger.info(f"[Risk] get_bom_line_items_with_risk: user={auth.user_id} bom={bom_id}")
 
         db = next(get_dual_database().get_session("supabase"))
 
-        params: Dict[str, Any] = {"bom_id": bom_id, "limit": limit, "offset": offset}
+        params: Dict[str, Any] = {"bom_id": bom_id}
         filters = ["bli.bom_id = :bom_id"]
 
         if not auth.is_super_admin:
@@ -1623,29 +1684,20 @@ async def get_bom_line_items_with_risk(
             LEFT JOIN bom_line_item_risk_scores blirs ON bli.id = blirs.bom_line_item_id
             {where_clause}
             ORDER BY blirs.contextual_risk_score DESC NULLS LAST
-            LIMIT :limit OFFSET :offset
         """
 
-        rows = db.execute(text(sql), params).fetchall()
+        if wants_ndjson(request):
+            result = db.execute(text(sql), params, execution_options={"yield_per": LINE_ITEM_STREAM_BATCH_SIZE})
+            # The session stays open while the response streams; closed once it is sent
+            return NDJSONResponse(
+                (_line_item_risk_response(row._mapping) for row in result),
+                background=BackgroundTask(db.close),
+            )
 
-        results = []
-        for row in rows:
-            m = row._mapping
-            results.append(BOMLineItemRiskResponse(
-                line_item_id=str(m["line_item_id"]),
-                mpn=m.get("mpn"),
-                manufacturer=m.get("manufacturer"),
-                quantity=m["quantity"],
-                base_risk_score=m["base_risk_score"],
-                contextual_risk_score=m["contextual_risk_score"],
-                risk_level=m["risk_level"],
-                user_criticality_level=m["user_criticality_level"],
-                quantity_modifier=m["quantity_modifier"],
-                lead_time_modifier=m["lead_time_modifier"],
-                criticality_modifier=m["criticality_modifier"],
-            ))
+        params.update(limit=limit, offset=offset)
+        rows = db.execute(text(sql + " LIMIT :limit OFFSET :offset"), params).fetchall()
 
-        return results
+        return [_line_item_risk_response(row._mapping) for row in rows]
 
     except Exception as e:
         error_msg = str(e).lower()
@@ -1711,6 +1763,7 @@ async def update_line_item_criticality(
 
         if not row:
             raise HTTPException(status_code=404, detail=f"Line item {line_item_id} not found")
+        invalidate_risk(auth.organization_id, [bom_id])
 
         logger.info(f"[Risk] Updated criticality: line_item={line_item_id} level={request.criticality_level}")
 
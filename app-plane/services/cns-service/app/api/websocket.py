@@ -8,83 +8,291 @@ for their BOM enrichment jobs without polling.
 import logging
 import asyncio
 import json
-from typing import Dict, Set
+from collections import deque
+from typing import Any, Dict, Optional
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
 from datetime import datetime
 
+from redis.exceptions import RedisError
+
+from app.cache.invalidation import reconnect_delay
+from app.cache.redis_cache import get_cache, get_redis_client
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Redis channels used to reach clients attached to any instance
+CHANNEL_PREFIX = "job-progress:"
+CHANNEL_PATTERN = f"{CHANNEL_PREFIX}*"
+
+# Frames that carry a full snapshot: a newer one replaces a queued older one
+SUPERSEDABLE_EVENTS = {"progress", "ping"}
+# Frames never dropped for a slow client
+ESSENTIAL_EVENTS = {"connected", "status_change", "completed", "error"}
+
+SEND_QUEUE_SIZE = 64
+
+
+def _get_metrics():
+    try:
+        from app.observability import get_metrics
+        return get_metrics()
+    except Exception:
+        return None
+
+
+class JobConnection:
+    """
+    One client socket with a bounded outbound queue and its own writer task.
+
+    A slow client only backs up its own queue. Superseded progress frames
+    are merged in place, and when the queue is full the oldest non-essential
+    frame is dropped.
+    """
+
+    def __init__(self, websocket: WebSocket, job_id: str, max_queue: int = SEND_QUEUE_SIZE):
+        self.websocket = websocket
+        self.job_id = job_id
+        self.max_queue = max_queue
+        self.frames: deque = deque()
+        self.merged = 0
+        self.dropped = 0
+        self._ready = asyncio.Event()
+        self._writer: Optional[asyncio.Task] = None
+
+    def offer(self, message: Dict[str, Any]) -> None:
+        """Queue a frame without waiting on the socket."""
+        event = message.get("event")
+        if event in SUPERSEDABLE_EVENTS:
+            for i, queued in enumerate(self.frames):
+                if queued.get("event") == event:
+                    del self.frames[i]
+                    self.frames.append(message)
+                    self.merged += 1
+                    self._record_shed("merged")
+                    return
+
+        if len(self.frames) >= self.max_queue:
+            victim = next((f for f in self.frames if f.get("event") not in ESSENTIAL_EVENTS), None)
+            if victim is not None:
+                self.frames.remove(victim)
+                self.dropped += 1
+                self._record_shed("dropped")
+            elif event not in ESSENTIAL_EVENTS:
+                self.dropped += 1
+                self._record_shed("dropped")
+                return
+
+        self.frames.append(message)
+        self._ready.set()
+
+    def _record_shed(self, reason: str) -> None:
+        metrics = _get_metrics()
+        if metrics:
+            metrics.record_websocket_frames_shed(reason)
+
+    def start(self, on_failure) -> None:
+        self._writer = asyncio.create_task(self._write_loop(on_failure))
+
+    async def stop(self) -> None:
+        writer, self._writer = self._writer, None
+        if writer is not None and writer is not asyncio.current_task() and not writer.done():
+            writer.cancel()
+            try:
+                await writer
+            except (asyncio.CancelledError, Exception):
+                pass
+
+    async def _write_loop(self, on_failure) -> None:
+        while True:
+            await self._ready.wait()
+            while self.frames:
+                message = self.frames.popleft()
+                try:
+                    await self.websocket.send_json(message)
+                except Exception as e:
+                    logger.warning(f"Failed to send to WebSocket for job {self.job_id}: {e}")
+                    await on_failure(self)
+                    return
+            self._ready.clear()
+
+
 # Global connection manager
 class ConnectionManager:
     """
     Manages WebSocket connections for BOM job progress tracking.
 
-    Supports multiple clients per job_id and broadcasting updates to all
-    connected clients for a specific job.
+    Supports multiple clients per job_id. Broadcasts go through Redis
+    (`job-progress:{job_id}`), and each instance holds one pattern
+    subscription that delivers them to its own clients, so a job can be
+    published from any pod. Without Redis, broadcasts are delivered to this
+    instance's clients only.
     """
 
-    def __init__(self):
-        # job_id -> Set[WebSocket]
-        self.active_connections: Dict[str, Set[WebSocket]] = {}
+    def __init__(self, max_queue: int = SEND_QUEUE_SIZE):
+        # job_id -> {WebSocket: JobConnection}
+        self.active_connections: Dict[str, Dict[WebSocket, JobConnection]] = {}
+        self.max_queue = max_queue
         self._lock = asyncio.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
 
-    async def connect(self, websocket: WebSocket, job_id: str):
+    async def connect(self, websocket: WebSocket, job_id: str) -> JobConnection:
         """Accept and register a new WebSocket connection"""
         await websocket.accept()
+        self._loop = asyncio.get_running_loop()
+        connection = JobConnection(websocket, job_id, self.max_queue)
+        connection.start(self._drop_connection)
         async with self._lock:
-            if job_id not in self.active_connections:
-                self.active_connections[job_id] = set()
-            self.active_connections[job_id].add(websocket)
-        logger.info(f"✅ WebSocket connected for job {job_id} (total: {len(self.active_connections[job_id])} clients)")
+            self.active_connections.setdefault(job_id, {})[websocket] = connection
+            await self._ensure_listener()
+        self._update_metrics(job_id)
+        logger.info(f"✅ WebSocket connected for job {job_id} (total: {self.get_connection_count(job_id)} clients)")
+        return connection
 
     async def disconnect(self, websocket: WebSocket, job_id: str):
         """Remove a WebSocket connection"""
         async with self._lock:
-            if job_id in self.active_connections:
-                self.active_connections[job_id].discard(websocket)
-                if not self.active_connections[job_id]:
-                    # Remove empty job_id entry
-                    del self.active_connections[job_id]
+            connection = self.active_connections.get(job_id, {}).pop(websocket, None)
+            if job_id in self.active_connections and not self.active_connections[job_id]:
+                # Remove empty job_id entry
+                del self.active_connections[job_id]
+            if not self.active_connections:
+                await self._stop_listener()
+        if connection is not None:
+            await connection.stop()
+        self._update_metrics(job_id)
         logger.info(f"❌ WebSocket disconnected for job {job_id}")
 
+    async def _drop_connection(self, connection: JobConnection) -> None:
+        await self.disconnect(connection.websocket, connection.job_id)
+
     async def broadcast_to_job(self, job_id: str, message: dict):
         """
-        Broadcast a message to all clients watching a specific job.
+        Broadcast a message to all clients watching a specific job, on every instance.
 
         Args:
             job_id: The job ID to broadcast to
             message: Dictionary to send as JSON
         """
-        async with self._lock:
-            if job_id not in self.active_connections:
-                return
-
-            # Create list of connections to avoid modification during iteration
-            connections = list(self.active_connections[job_id])
+        try:
+            redis_client = await get_redis_client()
+            await redis_client.publish(f"{CHANNEL_PREFIX}{job_id}", json.dumps(message, default=str))
+            return
+        except (RedisError, OSError) as e:
+            logger.warning(f"Redis broadcast failed for job {job_id}, delivering locally: {e}")
+        self.deliver_local(job_id, message)
+
+    def publish_sync(self, job_id: str, message: dict) -> None:
+        """
+        Broadcast from a worker thread (no running event loop).
 
-        # Broadcast outside the lock to avoid blocking
-        disconnected = []
-        for websocket in connections:
+        Publishes through the sync Redis client; without Redis, hands the
+        frame to this instance's event loop.
+        """
+        cache = get_cache()
+        if cache and cache.is_connected:
             try:
-                await websocket.send_json(message)
-            except Exception as e:
-                logger.warning(f"Failed to send to WebSocket for job {job_id}: {e}")
-                disconnected.append(websocket)
-
-        # Clean up disconnected clients
-        if disconnected:
-            async with self._lock:
-                if job_id in self.active_connections:
-                    for ws in disconnected:
-                        self.active_connections[job_id].discard(ws)
-                    if not self.active_connections[job_id]:
-                        del self.active_connections[job_id]
+                cache.get_client().publish(f"{CHANNEL_PREFIX}{job_id}", json.dumps(message, default=str))
+                return
+            except RedisError as e:
+                logger.warning(f"Redis broadcast failed for job {job_id}, delivering locally: {e}")
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self.deliver_local, job_id, message)
+
+    def deliver_local(self, job_id: str, message: dict) -> None:
+        """Queue a frame for every client of `job_id` attached to this instance."""
+        connections = list(self.active_connections.get(job_id, {}).values())
+        for connection in connections:
+            connection.offer(message)
+        if connections:
+            self._update_metrics(job_id)
 
     def get_connection_count(self, job_id: str) -> int:
-        """Get number of active connections for a job"""
-        return len(self.active_connections.get(job_id, set()))
+        """Get number of active connections for a job on this instance"""
+        return len(self.active_connections.get(job_id, {}))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-job connection counts and queued frames on this instance."""
+        return {
+            job_id: {
+                "connections": len(connections),
+                "queue_depth": sum(len(c.frames) for c in connections.values()),
+                "merged": sum(c.merged for c in connections.values()),
+                "dropped": sum(c.dropped for c in connections.values()),
+            }
+            for job_id, connections in self.active_connections.items()
+        }
+
+    def _update_metrics(self, job_id: str) -> None:
+        metrics = _get_metrics()
+        if not metrics:
+            return
+        connections = self.active_connections.get(job_id, {})
+        metrics.set_websocket_job_stats(
+            job_id,
+            len(connections),
+            sum(len(c.frames) for c in connections.values()),
+        )
+
+    # -- Redis listener (one per instance) -----------------------------------
+
+    async def _ensure_listener(self) -> None:
+        if self._listener is not None and not self._listener.done():
+            return
+        self._listener = asyncio.create_task(self._listen())
+
+    async def _stop_listener(self) -> None:
+        listener, self._listener = self._listener, None
+        if listener is not None and not listener.done():
+            listener.cancel()
+            try:
+                await listener
+            except (asyncio.CancelledError, Exception):
+                pass
+
+    async def _listen(self) -> None:
+        failures = 0
+        while self.active_connections:
+            pubsub = None
+            try:
+                redis_client = await get_redis_client()
+                pubsub = redis_client.pubsub()
+                await pubsub.psubscribe(CHANNEL_PATTERN)
+                failures = 0
+                while self.active_connections:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message and message.get("type") == "pmessage":
+                        self._on_redis_message(message)
+            except asyncio.CancelledError:
+                raise
+            except (RedisError, OSError) as e:
+                delay = reconnect_delay(failures)
+                failures += 1
+                logger.warning(f"WebSocket broadcast listener lost Redis, retrying in {delay}s: {e}")
+                await asyncio.sleep(delay)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.punsubscribe()
+                        await pubsub.close()
+                    except Exception:
+                        pass
+
+    def _on_redis_message(self, message: Dict[str, Any]) -> None:
+        channel = message["channel"]
+        channel = channel.decode() if isinstance(channel, bytes) else channel
+        job_id = channel[len(CHANNEL_PREFIX):]
+        if job_id not in self.active_connections:
+            return
+        try:
+            payload = json.loads(message["data"])
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Ignoring malformed broadcast for job {job_id}: {e}")
+            return
+        self.deliver_local(job_id, payload)
 
 
 # Global singleton manager
@@ -153,10 +361,10 @@ async def websocket_job_progress(
     ws.onclose = () => console.log('Connection closed');
     ```
     """
-    await manager.connect(websocket, job_id)
+    connection = await manager.connect(websocket, job_id)
 
     # Send initial connection confirmation
-    await websocket.send_json({
+    connection.offer({
         "event": "connected",
         "job_id": job_id,
         "message": f"Connected to job {job_id} progress stream",
@@ -175,7 +383,7 @@ async def websocket_job_progress(
                 try:
                     msg = json.loads(data)
                     if msg.get("type") == "ping":
-                        await websocket.send_json({
+                        connection.offer({
                             "event": "pong",
                             "timestamp": datetime.utcnow().isoformat() + "Z"
                         })
@@ -184,7 +392,7 @@ async def websocket_job_progress(
 
             except asyncio.TimeoutError:
                 # Send keep-alive ping
-                await websocket.send_json({
+                connection.offer({
                     "event": "ping",
                     "timestamp": datetime.utcnow().isoformat() + "Z"
                 })
@@ -214,5 +422,8 @@ def get_connection_manager() -> ConnectionManager:
         "timestamp": datetime.utcnow().isoformat() + "Z"
     })
     ```
+
+    From a worker thread without an event loop, use
+    `manager.publish_sync(job_id, message)` instead.
     """
     return manager
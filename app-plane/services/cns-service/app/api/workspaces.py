@@ -37,6 +37,7 @@ from ..auth.dependencies import (
     require_admin,
 )
 # CNS Projects Alignment - Phase 3: Workspace Scope Validation
+from app.cache.scope_cache import invalidate_after_commit as invalidate_scope_after_commit
 from app.core.scope_decorators import require_workspace
 from app.dependencies.scope_deps import get_supabase_session, get_supabase_session_cm
 
@@ -905,6 +906,7 @@ async def delete_workspace(
         """),
         {"workspace_id": workspace_id}
     )
+    invalidate_scope_after_commit(db, workspace_ids=[workspace_id])
 
     db.commit()
     logger.info(f"[Workspaces] Workspace deleted: id={workspace_id}")
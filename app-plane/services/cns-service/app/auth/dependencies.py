@@ -21,7 +21,7 @@ Usage:
 
 import logging
 import asyncio
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from typing import Optional, List
 from contextlib import contextmanager
 import re
@@ -33,6 +33,7 @@ from sqlalchemy.orm import Session
 
 from ..models.dual_database import get_dual_database
 from ..config import settings
+from ..cache.auth_context_cache import get_auth_context_cache
 
 # Import for Novu sync
 try:
@@ -342,6 +343,25 @@ async def get_current_user(
                 detail="Invalid token: missing email claim (provide X-User-Email header or configure Auth0/Keycloak to include email in access token)"
             )
 
+    # Known users are served from the auth context cache (no database round trips)
+    auth_cache = get_auth_context_cache()
+    cached_user = await auth_cache.get_user(auth0_user_id)
+    if cached_user and (claims.get("org_id") or "default_org_id" in cached_user):
+        user = User(
+            id=cached_user["id"],
+            auth0_user_id=cached_user["auth0_user_id"],
+            email=cached_user["email"],
+            full_name=cached_user["full_name"],
+            is_platform_admin=cached_user["is_platform_admin"],
+            is_new=False,
+            tenant_id=claims.get("org_id") or cached_user["default_org_id"]
+        )
+        request.state.current_user = user
+        return user
+
+    cache_entry = None
+    generation = await auth_cache.generation()
+
     # Look up or provision user
     with get_supabase_session() as session:
         # Check if user exists
@@ -417,6 +437,18 @@ async def get_current_user(
                 is_new=False,
                 tenant_id=tenant_id_from_jwt  # From JWT or organization_memberships
             )
+            cache_entry = {
+                "id": user.id,
+                "auth0_user_id": user.auth0_user_id,
+                "email": user.email,
+                "full_name": user.full_name,
+                "is_platform_admin": user.is_platform_admin,
+            }
+            if not claims.get("org_id"):
+                cache_entry["default_org_id"] = tenant_id_from_jwt
+            if user.is_platform_admin:
+                # Set and revoked outside this service: always read it fresh
+                cache_entry = None
         else:
             # Lazy provision new user (or update if exists by email)
             # Keycloak is the source of truth - sync user data to database
@@ -520,6 +552,9 @@ async def get_current_user(
                 # Fire and forget - don't await
                 asyncio.create_task(sync_novu_subscriber())
 
+    if cache_entry:
+        await auth_cache.set_user(auth0_user_id, cache_entry, generation)
+
     # Attach user to request for later use
     request.state.current_user = user
 
@@ -563,6 +598,12 @@ async def get_org_context(
             detail="Invalid organization ID format"
         )
 
+    auth_cache = get_auth_context_cache()
+    cached = await auth_cache.get_org(user.id, org_id)
+    if cached:
+        return OrgContext(user=user, organization=Organization(**cached["organization"]), role=cached["role"])
+
+    generation = await auth_cache.generation(user_id=user.id, org_id=org_id)
     with get_supabase_session() as session:
         # Get membership and org in one query
         result = session.execute(
@@ -598,7 +639,7 @@ async def get_org_context(
             if not org_row:
                 raise HTTPException(status_code=404, detail="Organization not found")
 
-            return OrgContext(
+            context = OrgContext(
                 user=user,
                 organization=Organization(
                     id=str(org_row.id),
@@ -608,23 +649,27 @@ async def get_org_context(
                 ),
                 role="super_admin"
             )
-
-        if not row:
+            # Granted by is_platform_admin, not membership: not cached
+            return context
+        elif not row:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not a member of this organization"
             )
+        else:
+            context = OrgContext(
+                user=user,
+                organization=Organization(
+                    id=str(row.org_id),
+                    name=row.org_name,
+                    slug=row.org_slug,
+                    plan_type=row.plan_type
+                ),
+                role=row.role
+            )
 
-        return OrgContext(
-            user=user,
-            organization=Organization(
-                id=str(row.org_id),
-                name=row.org_name,
-                slug=row.org_slug,
-                plan_type=row.plan_type
-            ),
-            role=row.role
-        )
+    await auth_cache.set_org(user.id, org_id, {"organization": asdict(context.organization), "role": context.role}, generation)
+    return context
 
 
 async def get_user_organizations(
@@ -635,6 +680,12 @@ async def get_user_organizations(
 
     Returns list of orgs with role info.
     """
+    auth_cache = get_auth_context_cache()
+    cached = await auth_cache.get_organizations(user.id)
+    if cached is not None:
+        return cached
+
+    generation = await auth_cache.generation()
     with get_supabase_session() as session:
         result = session.execute(
             text("""
@@ -653,7 +704,7 @@ async def get_user_organizations(
             {"user_id": user.id}
         )
 
-        return [
+        organizations = [
             {
                 "id": str(row.id),
                 "name": row.name,
@@ -666,6 +717,9 @@ async def get_user_organizations(
             for row in result.fetchall()
         ]
 
+    await auth_cache.set_organizations(user.id, organizations, generation)
+    return organizations
+
 
 # ============================================================================
 # Role Requirement Decorators
@@ -6,18 +6,24 @@ Provides Redis-based caching for supplier APIs and AI suggestions.
 
 from app.cache.redis_cache import (
     RedisCache,
+    RedisSerializer,
     init_cache,
     get_cache,
     build_supplier_cache_key,
     build_ai_cache_key,
     build_category_cache_key,
+    serialize,
+    deserialize,
 )
 
 __all__ = [
     "RedisCache",
+    "RedisSerializer",
     "init_cache",
     "get_cache",
     "build_supplier_cache_key",
     "build_ai_cache_key",
     "build_category_cache_key",
+    "serialize",
+    "deserialize",
 ]
@@ -0,0 +1,437 @@
+"""
+Auth Context Cache
+
+Short-TTL cache for the user and organization context resolved by the auth
+dependencies (app/auth/dependencies.py), so a dashboard page load does not
+repeat the same user / membership / plan tier queries for every request.
+
+Cache Key Pattern:
+    auth_ctx:sub:{subject}      user row + default organization, by token sub
+    auth_ctx:user:{user_id}     hash: "subject", "org:{org_id}" (role + org),
+                                "orgs" (membership list)
+    auth_ctx:members:{org_id}   set of user ids with cached entries for the org
+    auth_ctx:gen:all            counters bumped by invalidations: every one,
+    auth_ctx:gen:user:{user_id} or those of one user / organization
+    auth_ctx:gen:org:{org_id}
+
+Two layers:
+    in-process  AUTH_CONTEXT_LOCAL_TTL_SECONDS, LRU bounded by
+                AUTH_CONTEXT_LOCAL_SIZE
+    Redis       AUTH_CONTEXT_CACHE_TTL_SECONDS, shared by all pods
+
+Invalidation:
+    Membership and role changes call invalidate() (or invalidate_after_commit()
+    from inside a Supabase transaction). That deletes the Redis entries of the
+    affected users - for an organization, every user in its members set - and
+    publishes the user ids on auth_ctx:invalidate. Every pod runs a listener
+    (start_auth_context_listener) that drops those users from its local layer;
+    after a Redis reconnect the local layer is cleared, since invalidations may
+    have been missed. The local TTL bounds staleness if a message is lost.
+
+    A request that read the old rows before the change committed could cache
+    them again after the invalidation. Callers take generation() before
+    querying and pass it to the set_* method, which writes Redis in a
+    WATCH/MULTI transaction on those counters and skips the write if any of
+    them moved. An org entry is guarded by its user's and organization's
+    counters; user and membership-list entries, whose ids are only known
+    after the query, by auth_ctx:gen:all. Local writes check a per-process
+    counter bumped whenever local entries are dropped.
+
+Platform admins are never cached: is_platform_admin is changed outside this
+service, and their user entry and super-admin org contexts would otherwise
+outlive a revoked flag.
+
+When Redis is unreachable, writes fill only the local layer. With
+REDIS_ENABLED=false the cache is off, since invalidations could not reach
+other pods.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from redis.exceptions import RedisError, WatchError
+
+from app.cache.invalidation import after_commit, listen
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+SUBJECT_KEY = "auth_ctx:sub:{subject}"
+USER_KEY = "auth_ctx:user:{user_id}"
+MEMBERS_KEY = "auth_ctx:members:{org_id}"
+GENERATION_KEY = "auth_ctx:gen:{scope}"
+INVALIDATION_CHANNEL = "auth_ctx:invalidate"
+
+# Local key -> (expires_at, user_id, org_id, payload)
+_LocalEntry = Tuple[float, str, Optional[str], str]
+
+
+class Generation(NamedTuple):
+    """Invalidation counters seen before a database read (see generation())."""
+
+    local: int
+    keys: Tuple[str, ...]
+    values: Optional[Tuple[str, ...]]  # None: Redis unavailable, don't write it
+
+
+class AuthContextCache:
+    """Two-level (in-process + Redis) cache of resolved auth context."""
+
+    def __init__(
+        self,
+        client_factory: Optional[Callable[[], Awaitable[Any]]] = None,
+        ttl_seconds: Optional[int] = None,
+        local_ttl_seconds: Optional[int] = None,
+        local_size: Optional[int] = None,
+    ):
+        self._client_factory = client_factory or _default_client
+        self.ttl_seconds = ttl_seconds or settings.auth_context_cache_ttl_seconds
+        self.local_ttl_seconds = local_ttl_seconds or settings.auth_context_local_ttl_seconds
+        self.local_size = local_size or settings.auth_context_local_size
+        self.enabled = settings.auth_context_cache_enabled and settings.redis_enabled
+        self._local: "OrderedDict[Tuple[str, ...], _LocalEntry]" = OrderedDict()
+        self._local_generation = 0
+
+    # -- lookups -------------------------------------------------------------
+
+    async def get_user(self, subject: str) -> Optional[Dict[str, Any]]:
+        """Cached user entry for a token subject (includes "id")."""
+        if not self.enabled:
+            return None
+        local_key = ("sub", subject)
+        payload = self._get_local(local_key)
+        if payload is not None:
+            return json.loads(payload)
+        local_generation = self._local_generation
+        try:
+            client = await self._client_factory()
+            payload = await client.get(SUBJECT_KEY.format(subject=subject))
+        except (RedisError, OSError) as e:
+            logger.warning(f"[AuthCache] Redis unavailable, user lookup uncached: {e}")
+            return None
+        if payload is None:
+            return None
+        value = json.loads(payload)
+        self._put_local(local_key, value["id"], value.get("default_org_id"), payload, local_generation)
+        return value
+
+    async def set_user(self, subject: str, value: Dict[str, Any], generation: Generation) -> None:
+        """Cache a user entry; generation comes from generation() taken before the query."""
+        if not self.enabled:
+            return
+        payload = json.dumps(value)
+        user_id = value["id"]
+        default_org_id = value.get("default_org_id")
+
+        def write(pipe) -> None:
+            pipe.set(SUBJECT_KEY.format(subject=subject), payload, ex=self.ttl_seconds)
+            pipe.hset(USER_KEY.format(user_id=user_id), "subject", subject)
+            pipe.expire(USER_KEY.format(user_id=user_id), self.ttl_seconds)
+            if default_org_id:
+                pipe.sadd(MEMBERS_KEY.format(org_id=default_org_id), user_id)
+                pipe.expire(MEMBERS_KEY.format(org_id=default_org_id), self.ttl_seconds)
+
+        if await self._set_shared(write, generation, f"user {user_id}"):
+            self._put_local(("sub", subject), user_id, default_org_id, payload, generation.local)
+
+    async def get_org(self, user_id: str, org_id: str) -> Optional[Dict[str, Any]]:
+        """Cached organization + role of a user in one organization."""
+        return await self._get_field(("org", user_id, org_id), user_id, org_id, f"org:{org_id}")
+
+    async def set_org(self, user_id: str, org_id: str, value: Dict[str, Any], generation: Generation) -> None:
+        """generation: generation(user_id=..., org_id=...) taken before the query."""
+        await self._set_field(("org", user_id, org_id), user_id, org_id, f"org:{org_id}", value, [org_id], generation)
+
+    async def get_organizations(self, user_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Cached membership list of a user."""
+        return await self._get_field(("orgs", user_id), user_id, None, "orgs")
+
+    async def set_organizations(self, user_id: str, value: List[Dict[str, Any]], generation: Generation) -> None:
+        """generation: generation() taken before the query."""
+        org_ids = [org["id"] for org in value]
+        await self._set_field(("orgs", user_id), user_id, None, "orgs", value, org_ids, generation)
+
+    async def generation(self, user_id: Optional[str] = None, org_id: Optional[str] = None) -> Generation:
+        """
+        Take before querying what a set_* call will cache.
+
+        Pass user_id and org_id for set_org(); set_user() and
+        set_organizations() use the counter every invalidation bumps.
+        """
+        if user_id or org_id:
+            keys = tuple(
+                GENERATION_KEY.format(scope=scope)
+                for scope in (user_id and f"user:{user_id}", org_id and f"org:{org_id}")
+                if scope
+            )
+        else:
+            keys = (GENERATION_KEY.format(scope="all"),)
+        local = self._local_generation
+        if not self.enabled:
+            return Generation(local, keys, None)
+        try:
+            client = await self._client_factory()
+            values = tuple(_as_str(v) for v in await client.mget(list(keys)))
+        except (RedisError, OSError) as e:
+            logger.warning(f"[AuthCache] Redis unavailable, generation unknown: {e}")
+            values = None
+        return Generation(local, keys, values)
+
+    async def _get_field(self, local_key, user_id: str, org_id: Optional[str], field: str) -> Any:
+        if not self.enabled:
+            return None
+        payload = self._get_local(local_key)
+        if payload is not None:
+            return json.loads(payload)["value"]
+        local_generation = self._local_generation
+        try:
+            client = await self._client_factory()
+            payload = await client.hget(USER_KEY.format(user_id=user_id), field)
+        except (RedisError, OSError) as e:
+            logger.warning(f"[AuthCache] Redis unavailable, {field} lookup uncached: {e}")
+            return None
+        if payload is None:
+            return None
+        entry = json.loads(payload)
+        # Hash fields share the key's TTL, which every write extends
+        if entry["expires_at"] <= time.time():
+            return None
+        self._put_local(local_key, user_id, org_id, payload, local_generation)
+        return entry["value"]
+
+    async def _set_field(
+        self,
+        local_key,
+        user_id: str,
+        org_id: Optional[str],
+        field: str,
+        value: Any,
+        org_ids: List[str],
+        generation: Generation,
+    ) -> None:
+        if not self.enabled:
+            return
+        payload = json.dumps({"expires_at": time.time() + self.ttl_seconds, "value": value})
+
+        def write(pipe) -> None:
+            pipe.hset(USER_KEY.format(user_id=user_id), field, payload)
+            pipe.expire(USER_KEY.format(user_id=user_id), self.ttl_seconds)
+            for member_of in org_ids:
+                pipe.sadd(MEMBERS_KEY.format(org_id=member_of), user_id)
+                pipe.expire(MEMBERS_KEY.format(org_id=member_of), self.ttl_seconds)
+
+        if await self._set_shared(write, generation, f"{field} for {user_id}"):
+            self._put_local(local_key, user_id, org_id, payload, generation.local)
+
+    async def _set_shared(self, write: Callable[[Any], None], generation: Generation, what: str) -> bool:
+        """Queue write() in a transaction unless invalidated since generation; False if stale."""
+        if generation.values is None:
+            return True
+        try:
+            client = await self._client_factory()
+            async with client.pipeline() as pipe:
+                await pipe.watch(*generation.keys)
+                current = tuple(_as_str(v) for v in await pipe.mget(list(generation.keys)))
+                if current != generation.values:
+                    logger.debug(f"[AuthCache] Invalidated during lookup, {what} not cached")
+                    return False
+                pipe.multi()
+                write(pipe)
+                await pipe.execute()
+        except WatchError:
+            logger.debug(f"[AuthCache] Invalidated during write, {what} not cached")
+            return False
+        except (RedisError, OSError) as e:
+            logger.warning(f"[AuthCache] Failed to cache {what}: {e}")
+        return True
+
+    # -- invalidation --------------------------------------------------------
+
+    async def invalidate(self, user_ids: Iterable[str] = (), org_ids: Iterable[str] = ()) -> None:
+        """Drop cached context of the given users and of every member of the given orgs."""
+        users: Set[str] = {str(u) for u in user_ids if u}
+        orgs: Set[str] = {str(o) for o in org_ids if o}
+        self.drop_local(users, orgs)
+        if not users and not orgs:
+            return
+        try:
+            client = await self._client_factory()
+            # Bump first: a set_* call that read before this one can't land after it
+            await self._bump_generations(client, users, orgs)
+            if orgs:
+                pipe = client.pipeline(transaction=False)
+                for org_id in orgs:
+                    pipe.smembers(MEMBERS_KEY.format(org_id=org_id))
+                members_of_orgs = set()
+                for members in await pipe.execute():
+                    members_of_orgs.update(members or ())
+                await self._bump_generations(client, members_of_orgs - users, ())
+                users.update(members_of_orgs)
+            user_list = sorted(users)
+            subjects = []
+            if user_list:
+                pipe = client.pipeline(transaction=False)
+                for user_id in user_list:
+                    pipe.hget(USER_KEY.format(user_id=user_id), "subject")
+                subjects = [s for s in await pipe.execute() if s]
+            keys = [USER_KEY.format(user_id=u) for u in user_list]
+            keys += [SUBJECT_KEY.format(subject=s) for s in subjects]
+            keys += [MEMBERS_KEY.format(org_id=o) for o in orgs]
+            if keys:
+                await client.delete(*keys)
+            await client.publish(INVALIDATION_CHANNEL, json.dumps({"user_ids": user_list, "org_ids": sorted(orgs)}))
+            logger.debug(f"[AuthCache] Invalidated users={len(user_list)} orgs={len(orgs)}")
+        except (RedisError, OSError) as e:
+            logger.warning(f"[AuthCache] Failed to invalidate users={sorted(users)} orgs={sorted(orgs)}: {e}")
+
+    async def _bump_generations(self, client, users: Iterable[str], orgs: Iterable[str]) -> None:
+        scopes = [f"user:{u}" for u in users] + [f"org:{o}" for o in orgs]
+        pipe = client.pipeline(transaction=False)
+        pipe.incr(GENERATION_KEY.format(scope="all"))
+        for scope in scopes:
+            pipe.incr(GENERATION_KEY.format(scope=scope))
+            # A reset counter also fails the comparison, so these can expire
+            pipe.expire(GENERATION_KEY.format(scope=scope), self.ttl_seconds)
+        await pipe.execute()
+
+    def drop_local(self, user_ids: Iterable[str] = (), org_ids: Iterable[str] = ()) -> None:
+        users = set(user_ids)
+        orgs = set(org_ids)
+        self._local_generation += 1
+        stale = [
+            key for key, (_, user_id, org_id, _) in self._local.items()
+            if user_id in users or (org_id is not None and org_id in orgs)
+        ]
+        for key in stale:
+            del self._local[key]
+
+    def clear_local(self) -> None:
+        self._local_generation += 1
+        self._local.clear()
+
+    def handle_invalidation(self, data: str) -> None:
+        """Apply an invalidation message published by any pod."""
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError):
+            logger.warning(f"[AuthCache] Ignoring malformed invalidation: {data!r}")
+            return
+        self.drop_local(message.get("user_ids", ()), message.get("org_ids", ()))
+
+    # -- local layer ---------------------------------------------------------
+
+    def _get_local(self, key) -> Optional[str]:
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._local[key]
+            return None
+        self._local.move_to_end(key)
+        return entry[3]
+
+    def _put_local(self, key, user_id: str, org_id: Optional[str], payload: str, generation: int) -> None:
+        if generation != self._local_generation:
+            return  # Local entries were dropped since the read
+        self._local[key] = (time.monotonic() + self.local_ttl_seconds, user_id, org_id, payload)
+        self._local.move_to_end(key)
+        while len(self._local) > self.local_size:
+            self._local.popitem(last=False)  # Evict oldest
+
+
+async def _default_client():
+    from app.cache.redis_cache import get_redis_client
+
+    return await get_redis_client()
+
+
+def _as_str(value: Any) -> str:
+    """Generation counter as text; a missing key reads as "0"."""
+    if value is None:
+        return "0"
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+_auth_context_cache: Optional[AuthContextCache] = None
+_pending_invalidations: Set[asyncio.Task] = set()
+_listener_task: Optional[asyncio.Task] = None
+
+
+def get_auth_context_cache() -> AuthContextCache:
+    global _auth_context_cache
+    if _auth_context_cache is None:
+        _auth_context_cache = AuthContextCache()
+    return _auth_context_cache
+
+
+def invalidate_after_commit(session, user_ids: Iterable[Any] = (), org_ids: Iterable[Any] = ()) -> None:
+    """
+    Invalidate cached auth context once the session's transaction commits.
+
+    Call from inside the transaction that changes memberships or roles.
+    Invalidating before the commit would let other requests cache the old
+    rows again; lookups that already read them are handled by the
+    generation check in the set_* methods.
+    """
+    users = [str(u) for u in user_ids if u]
+    orgs = [str(o) for o in org_ids if o]
+
+    def _invalidate() -> None:
+        cache = get_auth_context_cache()
+        cache.drop_local(users, orgs)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            logger.warning(f"[AuthCache] No event loop, shared invalidation skipped for users={users} orgs={orgs}")
+            return
+        task = loop.create_task(cache.invalidate(users, orgs))
+        _pending_invalidations.add(task)
+        task.add_done_callback(_pending_invalidations.discard)
+
+    after_commit(session, _invalidate)
+
+
+# -- invalidation listener ---------------------------------------------------
+
+def start_auth_context_listener() -> Optional[asyncio.Task]:
+    """Subscribe to invalidations from other pods. Returns None if disabled or already running."""
+    global _listener_task
+
+    if not settings.auth_context_cache_enabled:
+        logger.info("[AuthCache] Disabled (AUTH_CONTEXT_CACHE_ENABLED=false)")
+        return None
+    if _listener_task is not None and not _listener_task.done():
+        logger.warning("[AuthCache] Invalidation listener already running")
+        return None
+
+    _listener_task = asyncio.get_running_loop().create_task(_listen(get_auth_context_cache()))
+    return _listener_task
+
+
+async def _listen(cache: AuthContextCache) -> None:
+    await listen(
+        INVALIDATION_CHANNEL,
+        cache._client_factory,
+        cache.handle_invalidation,
+        # Invalidations published while disconnected were missed
+        on_reconnect=cache.clear_local,
+        log_prefix="[AuthCache]",
+    )
+
+
+async def stop_auth_context_listener() -> None:
+    global _listener_task
+
+    task, _listener_task = _listener_task, None
+    if task is None:
+        return
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    logger.info("[AuthCache] Invalidation listener stopped")
@@ -3,16 +3,118 @@ Component Redis Storage
 
 Temporary storage for low-quality enriched components that need re-enrichment.
 High-quality components go to permanent database, low-quality stay in Redis.
+
+Indexes (maintained on write, so lookups never SCAN the keyspace):
+    low_quality_components:index              - Component keys by stored time
+    low_quality_components:by_quality         - Component keys by quality score
+    low_quality_components:by_source:{source} - Same, per enrichment source
+    low_quality_components:by_job:{job_id}    - Same, per enrichment job
+    low_quality_components:expires            - Component keys by TTL expiry time
+    low_quality_components:sources            - Set of sources seen
+    low_quality_components:meta               - Hash key -> indexed [quality, source, job]
+    low_quality_components:stats              - Hash with the running quality_sum
+
+Counts come from ZCARD/ZCOUNT on the indexes; the meta hash lets a rewrite or
+delete undo the previous entry's contribution. Each index update or removal
+runs as one Lua script (read the old meta, undo it, write the new entries),
+so concurrent writers never interleave or conflict with each other.
+Components whose TTL ran out are found through the expiry index and dropped
+before the queue is read.
 """
 
 import json
 import logging
-from typing import Optional, Dict, Any
-from datetime import datetime
-from .redis_cache import get_cache
+import time
+from typing import Optional, Dict, Any, List
+from datetime import datetime, timezone
+
+from .redis_cache import get_cache, deserialize
 
 logger = logging.getLogger(__name__)
 
+# Kept outside the low_quality_component:* namespace on purpose
+LOW_QUALITY_INDEX_KEY = "low_quality_components:index"
+QUALITY_INDEX_KEY = "low_quality_components:by_quality"
+SOURCE_INDEX_PREFIX = "low_quality_components:by_source:"
+JOB_INDEX_PREFIX = "low_quality_components:by_job:"
+EXPIRY_INDEX_KEY = "low_quality_components:expires"
+SOURCES_KEY = "low_quality_components:sources"
+INDEX_META_KEY = "low_quality_components:meta"
+STATS_KEY = "low_quality_components:stats"
+# Bump the suffix when adding indexes so existing components are re-indexed
+LOW_QUALITY_BACKFILLED_KEY = "low_quality_components:backfilled:v3"
+
+# Quality bands used by the review queue
+STAGING_MIN_QUALITY = 70.0
+
+# Keys per MGET when reading indexed components
+_MGET_BATCH_SIZE = 500
+
+# Fixed keys of the index scripts, in KEYS order
+_SCRIPT_KEYS = [
+    INDEX_META_KEY,
+    STATS_KEY,
+    LOW_QUALITY_INDEX_KEY,
+    QUALITY_INDEX_KEY,
+    EXPIRY_INDEX_KEY,
+    SOURCES_KEY,
+]
+
+# undo(member): remove a key's previous source/job entries and quality from
+# the running sum, per its meta entry [quality, source, job_id]
+# ARGV[1], ARGV[2] = source and job index prefixes
+_UNDO_LUA = """
+local function undo(member)
+    local old = redis.call('HGET', KEYS[1], member)
+    if not old then
+        return
+    end
+    local meta = cjson.decode(old)
+    redis.call('ZREM', ARGV[1] .. meta[2], member)
+    if meta[3] ~= '' then
+        redis.call('ZREM', ARGV[2] .. meta[3], member)
+    end
+    redis.call('HINCRBYFLOAT', KEYS[2], 'quality_sum', -tonumber(meta[1]))
+end
+"""
+
+# ARGV[3..] = member, quality, source, job_id, stored_at, expires_at ('' = no TTL), meta
+INDEX_SCRIPT = _UNDO_LUA + """
+local member, quality, source, job_id = ARGV[3], ARGV[4], ARGV[5], ARGV[6]
+undo(member)
+redis.call('ZADD', KEYS[3], 'NX', ARGV[7], member)
+redis.call('ZADD', KEYS[4], quality, member)
+redis.call('ZADD', ARGV[1] .. source, quality, member)
+redis.call('SADD', KEYS[6], source)
+if job_id ~= '' then
+    redis.call('ZADD', ARGV[2] .. job_id, quality, member)
+end
+if ARGV[8] ~= '' then
+    redis.call('ZADD', KEYS[5], ARGV[8], member)
+else
+    redis.call('ZREM', KEYS[5], member)
+end
+redis.call('HSET', KEYS[1], member, ARGV[9])
+redis.call('HINCRBYFLOAT', KEYS[2], 'quality_sum', quality)
+"""
+
+# KEYS[7..] = component keys; those that exist again are left indexed
+UNINDEX_SCRIPT = _UNDO_LUA + """
+local removed = 0
+for i = 7, #KEYS do
+    local member = KEYS[i]
+    if redis.call('EXISTS', member) == 0 then
+        undo(member)
+        redis.call('HDEL', KEYS[1], member)
+        redis.call('ZREM', KEYS[3], member)
+        redis.call('ZREM', KEYS[4], member)
+        redis.call('ZREM', KEYS[5], member)
+        removed = removed + 1
+    end
+end
+return removed
+"""
+
 
 def build_component_redis_key(mpn: str, manufacturer: str) -> str:
     """
@@ -31,6 +133,222 @@ def build_component_redis_key(mpn: str, manufacturer: str) -> str:
     return f"low_quality_component:{manufacturer_normalized}:{mpn_normalized}"
 
 
+def _stored_at_timestamp(record: Dict[str, Any]) -> float:
+    """Epoch seconds of a record's stored_at (naive UTC ISO string)"""
+    stored_at = record.get('stored_at')
+    if not stored_at:
+        return time.time()
+    try:
+        return datetime.fromisoformat(stored_at).replace(tzinfo=timezone.utc).timestamp()
+    except ValueError:
+        return time.time()
+
+
+def record_source(record: Dict[str, Any]) -> str:
+    """Primary enrichment source of a component record"""
+    return record.get('api_source') or record.get('enrichment_source') or 'unknown'
+
+
+def _decode(value) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _index_component(cache, redis_key: str, record: Dict[str, Any], ttl_seconds: Optional[int] = None) -> None:
+    """
+    Add or refresh a component key in all indexes
+
+    The stored-time entry keeps its original score; quality, source, job and
+    expiry entries follow the latest record.
+    """
+    client = cache.get_client()
+    if not client:
+        return
+
+    quality = float(record.get('quality_score', 0) or 0)
+    source = record_source(record)
+    job_id = (record.get('enrichment_data') or {}).get('job_id') or ''
+    expires_at = time.time() + ttl_seconds if ttl_seconds else ''
+
+    client.register_script(INDEX_SCRIPT)(
+        keys=_SCRIPT_KEYS,
+        args=[
+            SOURCE_INDEX_PREFIX, JOB_INDEX_PREFIX,
+            redis_key, quality, source, job_id, _stored_at_timestamp(record), expires_at,
+            json.dumps([quality, source, job_id]),
+        ],
+    )
+
+
+def _unindex_components(cache, *redis_keys: str) -> None:
+    """
+    Remove component keys from all indexes
+
+    Keys whose component exists again (re-saved since it was deleted or
+    expired) keep their index entries.
+    """
+    client = cache.get_client()
+    if not client or not redis_keys:
+        return
+
+    client.register_script(UNINDEX_SCRIPT)(
+        keys=_SCRIPT_KEYS + list(redis_keys),
+        args=[SOURCE_INDEX_PREFIX, JOB_INDEX_PREFIX],
+    )
+
+
+def _prune_expired(cache) -> None:
+    """Drop components whose TTL has run out from the indexes and the quality sum"""
+    client = cache.get_client()
+    if not client:
+        return
+
+    expired = [_decode(key) for key in client.zrangebyscore(EXPIRY_INDEX_KEY, "-inf", time.time())]
+    for start in range(0, len(expired), _MGET_BATCH_SIZE):
+        _unindex_components(cache, *expired[start:start + _MGET_BATCH_SIZE])
+
+
+def _backfill_index(cache) -> None:
+    """
+    Index components stored before the indexes existed (one SCAN per Redis)
+
+    Also drops index entries of components that expired before the expiry
+    index existed. Guarded by a marker key so only the first caller scans.
+    """
+    client = cache.get_client()
+    if not client or not client.set(LOW_QUALITY_BACKFILLED_KEY, "1", nx=True):
+        return
+
+    indexed = 0
+    for key in client.scan_iter(match="low_quality_component:*", count=1000):
+        record = cache.get(key)
+        if record:
+            ttl = client.ttl(key)
+            _index_component(cache, _decode(key), record, ttl if ttl > 0 else None)
+            indexed += 1
+
+    stale = [_decode(key) for key in client.hkeys(INDEX_META_KEY)]
+    for start in range(0, len(stale), _MGET_BATCH_SIZE):
+        _unindex_components(cache, *stale[start:start + _MGET_BATCH_SIZE])
+
+    if indexed:
+        logger.info(f"Low-quality component index backfilled with {indexed} existing components")
+
+
+def get_indexed_components(redis_keys: List[str]) -> List[Optional[Dict[str, Any]]]:
+    """
+    Fetch component records for indexed keys with batched MGET
+
+    Keys whose component has expired are dropped from the index.
+
+    Returns:
+        Records in key order (None where the component has expired)
+    """
+    cache = get_cache()
+    if not cache or not cache.is_connected or not redis_keys:
+        return [None] * len(redis_keys)
+
+    client = cache.get_binary_client()
+    records: List[Optional[Dict[str, Any]]] = []
+    expired: List[str] = []
+    for start in range(0, len(redis_keys), _MGET_BATCH_SIZE):
+        batch = redis_keys[start:start + _MGET_BATCH_SIZE]
+        for key, raw in zip(batch, client.mget(batch)):
+            if raw is None:
+                expired.append(key)
+                records.append(None)
+            else:
+                records.append(deserialize(raw))
+
+    if expired:
+        _unindex_components(cache, *expired)
+
+    return records
+
+
+def query_quality_queue(
+    min_quality: float,
+    max_quality: float,
+    offset: int = 0,
+    limit: int = 100,
+    source: Optional[str] = None,
+    job_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Page through queued components in ascending quality order
+
+    Uses the job index when job_id is given, else the source index when
+    source is given, else the global quality index.
+
+    Returns:
+        {"total": matching count, "items": [(redis_key, record), ...]}
+    """
+    cache = get_cache()
+    if not cache or not cache.is_connected:
+        return {"total": 0, "items": []}
+
+    client = cache.get_client()
+    _backfill_index(cache)
+
+    if job_id:
+        index_key = JOB_INDEX_PREFIX + job_id
+    elif source:
+        index_key = SOURCE_INDEX_PREFIX + source
+    else:
+        index_key = QUALITY_INDEX_KEY
+
+    _prune_expired(cache)
+    total = client.zcount(index_key, min_quality, max_quality)
+    keys = [
+        _decode(key)
+        for key in client.zrangebyscore(index_key, min_quality, max_quality, start=offset, num=limit)
+    ]
+    records = get_indexed_components(keys)
+
+    return {
+        "total": total,
+        "items": [(key, record) for key, record in zip(keys, records) if record],
+    }
+
+
+def get_quality_queue_stats() -> Dict[str, Any]:
+    """
+    Queue counters from the indexes (no per-component reads)
+
+    Returns:
+        total, staging_count (>= 70), rejected_count (< 70), average_quality, by_source
+    """
+    cache = get_cache()
+    if not cache or not cache.is_connected:
+        return {"total": 0, "staging_count": 0, "rejected_count": 0, "average_quality": 0.0, "by_source": {}}
+
+    client = cache.get_client()
+    _backfill_index(cache)
+    _prune_expired(cache)
+
+    sources = sorted(_decode(source) for source in client.smembers(SOURCES_KEY))
+
+    pipe = client.pipeline()
+    pipe.zcard(QUALITY_INDEX_KEY)
+    pipe.zcount(QUALITY_INDEX_KEY, STAGING_MIN_QUALITY, "+inf")
+    pipe.hget(STATS_KEY, 'quality_sum')
+    for source in sources:
+        pipe.zcard(SOURCE_INDEX_PREFIX + source)
+    total, staging, quality_sum, *source_counts = pipe.execute()
+
+    by_source = {source: count for source, count in zip(sources, source_counts) if count}
+    empty_sources = [source for source, count in zip(sources, source_counts) if not count]
+    if empty_sources:
+        client.srem(SOURCES_KEY, *empty_sources)
+
+    return {
+        "total": total,
+        "staging_count": staging,
+        "rejected_count": total - staging,
+        "average_quality": round(float(quality_sum or 0) / total, 1) if total else 0.0,
+        "by_source": by_source,
+    }
+
+
 def save_low_quality_component(
     mpn: str,
     manufacturer: str,
@@ -76,6 +394,7 @@ def save_low_quality_component(
         success = cache.set(redis_key, component_record, ttl=ttl_seconds)
 
         if success:
+            _index_component(cache, redis_key, component_record, ttl_seconds)
             logger.info(
                 f"✅ Saved low-quality component to Redis: {mpn} "
                 f"(quality={enrichment_data.get('quality_score', 0)}, TTL={ttl_days}d)"
@@ -142,6 +461,7 @@ def delete_low_quality_component(mpn: str, manufacturer: str) -> bool:
         success = cache.delete(redis_key)
 
         if success:
+            _unindex_components(cache, redis_key)
             logger.info(f"Deleted low-quality component from Redis: {mpn}")
 
         return success
@@ -195,6 +515,7 @@ def update_low_quality_component(
         success = cache.set(redis_key, updated_record, ttl=ttl_seconds)
 
         if success:
+            _index_component(cache, redis_key, updated_record, ttl_seconds)
             logger.info(f"Updated low-quality component in Redis: {mpn}")
 
         return success
@@ -208,11 +529,8 @@ def get_low_quality_components_for_reenrichment(max_age_days: int = 1) -> list:
     """
     Get all low-quality components from Redis that need re-enrichment.
 
-    This is a placeholder - Redis doesn't support efficient scanning by pattern
-    without SCAN command. For production, consider:
-    1. Maintaining a separate Redis SET of keys needing re-enrichment
-    2. Using a background job to periodically check and re-enrich
-    3. Re-enriching on-demand when components are accessed
+    Reads the stored-time index, so cost is proportional to the number of
+    old-enough components rather than to the Redis keyspace.
 
     Args:
         max_age_days: Only return components older than this many days
@@ -229,33 +547,18 @@ def get_low_quality_components_for_reenrichment(max_age_days: int = 1) -> list:
         if not client:
             return []
 
-        # Scan for low-quality component keys
-        # Note: This is inefficient for large datasets, use with caution
-        pattern = "low_quality_component:*"
-        components_to_reenrich = []
-
-        cursor = 0
-        while True:
-            cursor, keys = client.scan(cursor, match=pattern, count=100)
-
-            for key in keys:
-                component_record = cache.get(key)
-                if component_record:
-                    # Check age
-                    stored_at = component_record.get('stored_at')
-                    if stored_at:
-                        stored_datetime = datetime.fromisoformat(stored_at)
-                        age_days = (datetime.utcnow() - stored_datetime).days
+        _backfill_index(cache)
 
-                        if age_days >= max_age_days:
-                            components_to_reenrich.append(component_record)
+        cutoff = time.time() - max_age_days * 24 * 60 * 60
+        keys = client.zrangebyscore(LOW_QUALITY_INDEX_KEY, "-inf", cutoff)
 
-            if cursor == 0:
-                break
+        components_to_reenrich = [
+            record for record in get_indexed_components(keys) if record
+        ]
 
         logger.info(f"Found {len(components_to_reenrich)} low-quality components for re-enrichment")
         return components_to_reenrich
 
     except Exception as e:
-        logger.error(f"Error scanning for low-quality components: {e}", exc_info=True)
+        logger.error(f"Error reading low-quality component index: {e}", exc_info=True)
         return []
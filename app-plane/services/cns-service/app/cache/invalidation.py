@@ -0,0 +1,83 @@
+"""
+Cross-Pod Cache Invalidation Helpers
+
+Shared by the caches that are invalidated on every pod through Redis pub/sub
+(app/cache/scope_cache.py, app/cache/auth_context_cache.py). The pub/sub
+fan-outs (app/services/enrichment_event_hub.py, app/api/websocket.py) use
+reconnect_delay() as well.
+
+    after_commit(session, callback)   run callback once the transaction commits
+    listen(...)                       subscribe to a channel and apply messages,
+                                      reconnecting with RECONNECT_BACKOFF_SECONDS
+    reconnect_delay(failures)         the backoff step for a reconnect attempt
+
+Invalidating after commit keeps other requests from re-reading the old rows
+from the cache, but a request that read them from the database before the
+commit can still write them back afterwards. The caches therefore also
+guard their writes with generation counters that every invalidation bumps.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Optional
+
+from redis.exceptions import RedisError
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+RECONNECT_BACKOFF_SECONDS = (1, 2, 5, 10)
+
+
+def reconnect_delay(failures: int) -> int:
+    """Seconds to wait before reconnect attempt number failures + 1."""
+    return RECONNECT_BACKOFF_SECONDS[min(failures, len(RECONNECT_BACKOFF_SECONDS) - 1)]
+
+
+def after_commit(session, callback: Callable[[], None]) -> None:
+    """Run callback once, after the session's current transaction commits."""
+    event.listen(session, "after_commit", lambda _session: callback(), once=True)
+
+
+async def listen(
+    channel: str,
+    client_factory: Callable[[], Awaitable[Any]],
+    on_message: Callable[[Any], None],
+    on_reconnect: Optional[Callable[[], None]] = None,
+    log_prefix: str = "[Invalidation]",
+) -> None:
+    """
+    Apply every message published on channel until cancelled.
+
+    on_reconnect runs after a dropped subscription is re-established, since
+    messages published while disconnected were missed.
+    """
+    pubsub = None
+    failures = 0
+    while True:
+        try:
+            if pubsub is None:
+                client = await client_factory()
+                pubsub = client.pubsub()
+                await pubsub.subscribe(channel)
+                if failures and on_reconnect is not None:
+                    on_reconnect()
+                logger.info(f"{log_prefix} Subscribed to {channel}")
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            failures = 0
+            if message:
+                on_message(message["data"])
+        except asyncio.CancelledError:
+            if pubsub is not None:
+                try:
+                    await pubsub.unsubscribe()
+                    await pubsub.close()
+                except Exception as e:
+                    logger.warning(f"{log_prefix} Error during pubsub cleanup: {e}")
+            raise
+        except (RedisError, OSError) as e:
+            delay = reconnect_delay(failures)
+            failures += 1
+            pubsub = None
+            logger.warning(f"{log_prefix} Redis error, reconnecting in {delay}s: {e}")
+            await asyncio.sleep(delay)
@@ -0,0 +1,106 @@
+"""
+Stream Message Dedup Store
+
+Shared, bounded record of stream messages a consumer has already handled,
+so a replayed offset (redeploy, reconnect, another replica) does not start
+the same workflow twice.
+
+Cache Key Pattern:
+    stream_dedup:{consumer_name}:{message_id}
+
+Lifecycle of a key:
+    claim()    SET NX with a short TTL ("processing"); fails if the message
+               is done or being handled elsewhere
+    complete() SET "done" with the dedup window TTL (STREAM_DEDUP_TTL_SECONDS)
+    release()  DEL, so a failed message can be retried on replay
+
+A consumer that crashes mid-message leaves a "processing" key that expires
+after STREAM_DEDUP_CLAIM_TTL_SECONDS, after which the message may run again.
+Memory is bounded by the TTL window; each check is a single O(1) command.
+
+When Redis is unavailable, the store falls back to a per-process LRU of the
+most recent message ids (evicting oldest first).
+"""
+
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+from redis.exceptions import RedisError
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEDUP_KEY_PREFIX = "stream_dedup:{consumer_name}:{message_id}"
+STATE_PROCESSING = "processing"
+STATE_DONE = "done"
+
+
+class MessageDedupStore:
+    """Redis-backed claim/complete dedup with an in-process LRU fallback."""
+
+    def __init__(
+        self,
+        consumer_name: str,
+        client_factory: Optional[Callable[[], Awaitable[Any]]] = None,
+        ttl_seconds: Optional[int] = None,
+        claim_ttl_seconds: Optional[int] = None,
+        local_size: Optional[int] = None,
+    ):
+        self.consumer_name = consumer_name
+        self._client_factory = client_factory or _default_client
+        self.ttl_seconds = ttl_seconds or settings.stream_dedup_ttl_seconds
+        self.claim_ttl_seconds = claim_ttl_seconds or settings.stream_dedup_claim_ttl_seconds
+        self.local_size = local_size or settings.stream_dedup_local_size
+        self._local: "OrderedDict[str, str]" = OrderedDict()
+
+    def _key(self, message_id: str) -> str:
+        return DEDUP_KEY_PREFIX.format(consumer_name=self.consumer_name, message_id=message_id)
+
+    async def claim(self, message_id: str) -> bool:
+        """Reserve a message for handling. False means it's a duplicate."""
+        try:
+            client = await self._client_factory()
+            claimed = await client.set(self._key(message_id), STATE_PROCESSING, nx=True, ex=self.claim_ttl_seconds)
+            return bool(claimed)
+        except (RedisError, OSError) as e:
+            logger.warning(f"[Dedup] Redis unavailable, using local dedup for {message_id}: {e}")
+            return self._claim_local(message_id)
+
+    async def complete(self, message_id: str) -> None:
+        """Mark a message handled for the dedup window."""
+        self._remember(message_id, STATE_DONE)
+        try:
+            client = await self._client_factory()
+            await client.set(self._key(message_id), STATE_DONE, ex=self.ttl_seconds)
+        except (RedisError, OSError) as e:
+            logger.warning(f"[Dedup] Failed to mark {message_id} done: {e}")
+
+    async def release(self, message_id: str) -> None:
+        """Drop a claim so the message can be handled again (e.g. after a transient failure)."""
+        self._local.pop(message_id, None)
+        try:
+            client = await self._client_factory()
+            await client.delete(self._key(message_id))
+        except (RedisError, OSError) as e:
+            logger.warning(f"[Dedup] Failed to release {message_id}: {e}")
+
+    def _claim_local(self, message_id: str) -> bool:
+        if message_id in self._local:
+            self._local.move_to_end(message_id)
+            return False
+        self._remember(message_id, STATE_PROCESSING)
+        return True
+
+    def _remember(self, message_id: str, state: str) -> None:
+        self._local[message_id] = state
+        self._local.move_to_end(message_id)
+        while len(self._local) > self.local_size:
+            self._local.popitem(last=False)  # Evict oldest
+
+
+async def _default_client():
+    from app.cache.redis_cache import get_redis_client
+
+    return await get_redis_client()
@@ -2,17 +2,39 @@
 Redis Cache Layer
 
 Provides caching for supplier API responses and AI suggestions.
+
+Payload format:
+    Values written through RedisSerializer start with one header byte:
+    the codec (0x01 = JSON via orjson, 0x02 = msgpack), with 0x80 set when
+    the body is zstd-compressed. Values without a known header are legacy
+    plain JSON and are still readable, so existing keys migrate as they
+    are rewritten.
 """
 
 import json
 import logging
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, Union
 from decimal import Decimal
 from uuid import UUID
 from datetime import datetime
 from redis import Redis
 from redis.exceptions import RedisError
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,6 +50,127 @@ class DecimalEncoder(json.JSONEncoder):
         return super(DecimalEncoder, self).default(obj)
 
 
+# ============================================================================
+# PAYLOAD SERIALIZATION
+# ============================================================================
+
+CODEC_JSON = 0x01
+CODEC_MSGPACK = 0x02
+FLAG_ZSTD = 0x80
+
+_KNOWN_HEADERS = {CODEC_JSON, CODEC_MSGPACK, CODEC_JSON | FLAG_ZSTD, CODEC_MSGPACK | FLAG_ZSTD}
+
+
+def _encode_default(obj: Any) -> Any:
+    """Fallback for types orjson/msgpack don't handle (same rules as DecimalEncoder)"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, UUID):
+        return str(obj)
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+
+
+class RedisSerializer:
+    """
+    Encodes cache values as compact bytes with a one-byte format header
+
+    Usage:
+        serializer = RedisSerializer(codec="msgpack", compression_threshold=2048)
+        raw = serializer.dumps({"mpn": "LM358N"})
+        data = serializer.loads(raw)
+    """
+
+    def __init__(self, codec: str = "json", compression_threshold: int = 2048, compression_level: int = 3):
+        """
+        Args:
+            codec: "json" (orjson) or "msgpack"; falls back to json if msgpack is missing
+            compression_threshold: zstd-compress payloads at least this many bytes (0 = never)
+            compression_level: zstd compression level
+        """
+        if codec == "msgpack" and msgpack is None:
+            logger.warning("REDIS_SERIALIZER=msgpack but msgpack is not installed, using json")
+            codec = "json"
+        if codec not in ("json", "msgpack"):
+            raise ValueError(f"Unknown Redis serializer codec: {codec}")
+        if compression_threshold and zstandard is None:
+            logger.info("zstandard not installed, Redis payload compression disabled")
+            compression_threshold = 0
+
+        self.codec = codec
+        self.compression_threshold = compression_threshold
+        self.compression_level = compression_level
+
+    def dumps(self, value: Any) -> bytes:
+        """Serialize value to header byte + (optionally compressed) body"""
+        if self.codec == "msgpack":
+            header = CODEC_MSGPACK
+            body = msgpack.packb(value, default=_encode_default, use_bin_type=True)
+        else:
+            header = CODEC_JSON
+            if orjson is not None:
+                body = orjson.dumps(value, default=_encode_default, option=orjson.OPT_NON_STR_KEYS)
+            else:
+                body = json.dumps(value, cls=DecimalEncoder, separators=(",", ":")).encode("utf-8")
+
+        if self.compression_threshold and len(body) >= self.compression_threshold:
+            header |= FLAG_ZSTD
+            body = zstandard.ZstdCompressor(level=self.compression_level).compress(body)
+
+        return bytes((header,)) + body
+
+    def loads(self, raw: Union[bytes, str]) -> Any:
+        """Deserialize a value written by dumps() or a legacy plain-JSON value"""
+        if isinstance(raw, str):
+            return json.loads(raw)
+        if not raw or raw[0] not in _KNOWN_HEADERS:
+            return json.loads(raw)
+
+        header, body = raw[0], raw[1:]
+        if header & FLAG_ZSTD:
+            if zstandard is None:
+                raise ValueError("Compressed Redis payload but zstandard is not installed")
+            try:
+                body = zstandard.ZstdDecompressor().decompress(body)
+            except zstandard.ZstdError as e:
+                raise ValueError(f"Corrupt compressed Redis payload: {e}") from e
+
+        if header & ~FLAG_ZSTD == CODEC_MSGPACK:
+            if msgpack is None:
+                raise ValueError("msgpack Redis payload but msgpack is not installed")
+            return msgpack.unpackb(body, raw=False, strict_map_key=False)
+        return orjson.loads(body) if orjson is not None else json.loads(body)
+
+
+_serializer: Optional[RedisSerializer] = None
+
+
+def get_serializer() -> RedisSerializer:
+    """
+    Get the shared serializer configured from settings
+    (REDIS_SERIALIZER, REDIS_COMPRESSION_THRESHOLD, REDIS_COMPRESSION_LEVEL)
+    """
+    global _serializer
+    if _serializer is None:
+        _serializer = RedisSerializer(
+            codec=settings.redis_serializer,
+            compression_threshold=settings.redis_compression_threshold,
+            compression_level=settings.redis_compression_level,
+        )
+    return _serializer
+
+
+def serialize(value: Any) -> bytes:
+    """Serialize a cache value with the shared serializer"""
+    return get_serializer().dumps(value)
+
+
+def deserialize(raw: Union[bytes, str]) -> Any:
+    """Deserialize a cache value with the shared serializer"""
+    return get_serializer().loads(raw)
+
+
 class RedisCache:
     """
     Redis cache client
@@ -49,6 +192,8 @@ class RedisCache:
         self.redis_url = redis_url
         self.default_ttl = default_ttl
         self._client: Optional[Redis] = None
+        # Same server, no response decoding: serialized values are binary
+        self._binary_client: Optional[Redis] = None
 
     def connect(self):
         """Connect to Redis"""
@@ -60,10 +205,16 @@ class RedisCache:
             )
             # Test connection
             self._client.ping()
+            self._binary_client = Redis.from_url(
+                self.redis_url,
+                decode_responses=False,
+                socket_connect_timeout=5
+            )
             logger.info(f"✅ Redis connected: {self.redis_url}")
         except RedisError as e:
             logger.error(f"❌ Redis connection failed: {e}")
             self._client = None
+            self._binary_client = None
 
     def disconnect(self):
         """Disconnect from Redis"""
@@ -71,6 +222,9 @@ class RedisCache:
             self._client.close()
             self._client = None
             logger.info("Redis disconnected")
+        if self._binary_client:
+            self._binary_client.close()
+            self._binary_client = None
 
     @property
     def is_connected(self) -> bool:
@@ -92,6 +246,15 @@ class RedisCache:
         """
         return self._client if self.is_connected else None
 
+    def get_binary_client(self) -> Optional[Redis]:
+        """
+        Get Redis client that returns raw bytes (for serialized values).
+
+        Returns:
+            Redis client if connected, None otherwise
+        """
+        return self._binary_client if self.is_connected else None
+
     def get(self, key: str) -> Optional[Any]:
         """
         Get value from cache
@@ -106,11 +269,11 @@ class RedisCache:
             return None
 
         try:
-            value = self._client.get(key)
+            value = self._binary_client.get(key)
             if value is None:
                 return None
-            return json.loads(value)
-        except (RedisError, json.JSONDecodeError) as e:
+            return deserialize(value)
+        except (RedisError, ValueError) as e:
             logger.warning(f"Cache GET error for key '{key}': {e}")
             return None
 
@@ -120,7 +283,7 @@ class RedisCache:
 
         Args:
             key: Cache key
-            value: Value to cache (must be JSON serializable)
+            value: Value to cache (JSON-compatible, plus Decimal/UUID/datetime)
             ttl: Time-to-live in seconds (None = use default)
 
         Returns:
@@ -131,8 +294,7 @@ class RedisCache:
 
         try:
             ttl = ttl if ttl is not None else self.default_ttl
-            serialized = json.dumps(value, cls=DecimalEncoder)
-            self._client.setex(key, ttl, serialized)
+            self._binary_client.setex(key, ttl, serialize(value))
             return True
         except (RedisError, TypeError) as e:
             logger.warning(f"Cache SET error for key '{key}': {e}")
@@ -315,6 +477,20 @@ def get_sync_redis_client() -> Optional[SyncRedis]:
     return None
 
 
+def get_sync_binary_client() -> Optional[SyncRedis]:
+    """
+    Get synchronous Redis client returning raw bytes, for reading values
+    written by RedisCache.set / serialize().
+
+    Returns:
+        redis.Redis client if cache is initialized, otherwise None.
+    """
+    cache = get_cache()
+    if cache and cache.is_connected:
+        return cache._binary_client  # type: ignore[attr-defined]
+    return None
+
+
 async def get_redis_client() -> AsyncRedis:
     """
     Get async Redis client for Pub/Sub operations (SSE streaming).
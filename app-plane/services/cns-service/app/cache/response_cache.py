@@ -0,0 +1,241 @@
+"""
+HTTP Response Cache
+
+Serialized JSON bodies of read-heavy GET endpoints (catalog component detail,
+BOM and portfolio risk), stored in Redis under versioned keys and served with
+strong ETags so dashboard polls revalidate with If-None-Match and get a 304.
+
+Cache Key Pattern:
+    resp_ver:{namespace}             version of a namespace (set on writes)
+    resp:{key}:{v1}.{v2}...          {"etag", "body"} for the namespace versions
+                                     the response was built from
+
+Namespaces:
+    catalog:id:{component_id}        catalog upserts (component_catalog.py,
+    catalog:mpn:{mpn}                catalog search save, single-component workflow)
+    risk:org:{org_id}, risk:all      risk cache writes (app/cache/risk_cache.py)
+    risk:bom:{bom_id}                BOM risk summary writes
+
+Writes never delete responses: bumping a namespace version changes the key
+every reader computes, and superseded entries expire after
+RESPONSE_CACHE_TTL_SECONDS. Versions are write timestamps kept for twice the
+entry TTL, so a version that expires can never collide with a live entry.
+
+ETags hash the body, so an unchanged payload keeps its ETag across version
+bumps and clients still get a 304. When Redis is unavailable responses are
+rebuilt per request but still carry ETags.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from typing import Any, Callable, Iterable, List, NamedTuple, Optional
+
+from fastapi.encoders import jsonable_encoder
+from redis.exceptions import RedisError
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.config import settings
+from app.core.responses import dumps
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "resp_ver:{namespace}"
+ENTRY_KEY = "resp:{key}:{versions}"
+
+# Clients may store the response but must revalidate before every reuse
+CACHE_CONTROL_REVALIDATE = "private, no-cache"
+
+
+class CachedResponse(NamedTuple):
+    etag: str
+    body: bytes
+
+
+def render_json(payload: Any) -> bytes:
+    """Serialize a response model / dict exactly as the default response class would."""
+    return dumps(jsonable_encoder(payload))
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses weak comparison (RFC 9110 13.1.2)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+def conditional_response(
+    request: Request,
+    cached: CachedResponse,
+    cache_control: str = CACHE_CONTROL_REVALIDATE,
+) -> Response:
+    """200 with the body, or 304 when the client's If-None-Match already has it."""
+    headers = {"ETag": cached.etag, "Cache-Control": cache_control}
+    if etag_matches(request.headers.get("if-none-match"), cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
+
+def etag_response(request: Request, payload: Any, cache_control: str = CACHE_CONTROL_REVALIDATE) -> Response:
+    """Conditional response for a payload that is built on every request."""
+    body = render_json(payload)
+    return conditional_response(request, CachedResponse(make_etag(body), body), cache_control)
+
+
+class ResponseSlot:
+    """One cacheable response at the current versions of its namespaces."""
+
+    def __init__(self, cache: "ResponseCache", key: Optional[str]):
+        self._cache = cache
+        self.key = key
+
+    def get(self) -> Optional[CachedResponse]:
+        if self.key is None:
+            return None
+        return self._cache._get(self.key)
+
+    def put(self, payload: Any) -> CachedResponse:
+        body = render_json(payload)
+        cached = CachedResponse(make_etag(body), body)
+        if self.key is not None:
+            self._cache._set(self.key, cached)
+        return cached
+
+
+class ResponseCache:
+    """Versioned Redis cache of serialized JSON responses."""
+
+    def __init__(self, client_factory: Optional[Callable[[], Any]] = None, ttl_seconds: Optional[int] = None):
+        self._client_factory = client_factory or _default_client
+        self.ttl_seconds = ttl_seconds or settings.response_cache_ttl_seconds
+        self.enabled = settings.response_cache_enabled and settings.redis_enabled
+
+    def slot(self, key: Optional[str], namespaces: Iterable[str]) -> ResponseSlot:
+        """
+        Resolve the entry key for the current namespace versions (one MGET).
+
+        key=None gives an uncached slot: get() misses and put() only renders.
+        """
+        if key is None:
+            return ResponseSlot(self, None)
+        namespaces = list(namespaces)
+        client = self._client()
+        if client is None:
+            return ResponseSlot(self, None)
+        try:
+            versions = client.mget([VERSION_KEY.format(namespace=ns) for ns in namespaces])
+        except (RedisError, OSError) as e:
+            logger.warning(f"[ResponseCache] Redis unavailable, {key} uncached: {e}")
+            return ResponseSlot(self, None)
+        tag = ".".join(str(v) if v is not None else "0" for v in versions)
+        return ResponseSlot(self, ENTRY_KEY.format(key=key, versions=tag))
+
+    def bump(self, namespaces: Iterable[str]) -> None:
+        """Move namespaces to a new version so every response built from them is rebuilt."""
+        namespaces = [ns for ns in dict.fromkeys(namespaces) if ns]
+        if not namespaces:
+            return
+        client = self._client()
+        if client is None:
+            return
+        version = time.time_ns()
+        try:
+            pipe = client.pipeline(transaction=False)
+            for ns in namespaces:
+                pipe.set(VERSION_KEY.format(namespace=ns), version, ex=self.ttl_seconds * 2)
+            pipe.execute()
+            logger.debug(f"[ResponseCache] Bumped {namespaces}")
+        except (RedisError, OSError) as e:
+            logger.warning(f"[ResponseCache] Failed to bump {namespaces}: {e}")
+
+    def _get(self, key: str) -> Optional[CachedResponse]:
+        client = self._client()
+        if client is None:
+            return None
+        try:
+            payload = client.get(key)
+        except (RedisError, OSError) as e:
+            logger.warning(f"[ResponseCache] Read failed for {key}: {e}")
+            return None
+        if payload is None:
+            return None
+        entry = json.loads(payload)
+        return CachedResponse(entry["etag"], entry["body"].encode())
+
+    def _set(self, key: str, cached: CachedResponse) -> None:
+        client = self._client()
+        if client is None:
+            return
+        try:
+            payload = json.dumps({"etag": cached.etag, "body": cached.body.decode()})
+            client.set(key, payload, ex=self.ttl_seconds)
+        except (RedisError, OSError) as e:
+            logger.warning(f"[ResponseCache] Write failed for {key}: {e}")
+
+    def _client(self):
+        if not self.enabled:
+            return None
+        try:
+            return self._client_factory()
+        except (RedisError, OSError) as e:
+            logger.warning(f"[ResponseCache] Redis unavailable: {e}")
+            return None
+
+
+def _default_client():
+    from app.cache.redis_cache import get_sync_redis_client
+
+    return get_sync_redis_client()
+
+
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache()
+    return _response_cache
+
+
+# -- namespaces --------------------------------------------------------------
+
+def catalog_namespaces(component_id: Optional[str] = None, mpn: Optional[str] = None) -> List[str]:
+    namespaces = []
+    if component_id:
+        namespaces.append(f"catalog:id:{str(component_id).lower()}")
+    if mpn:
+        namespaces.append(f"catalog:mpn:{mpn.strip().lower()}")
+    return namespaces
+
+
+def portfolio_risk_namespaces(org_id: Optional[str] = None) -> List[str]:
+    """Namespaces of an organization's risk portfolio; org_id=None means all organizations."""
+    return [f"risk:org:{org_id}" if org_id else "risk:all"]
+
+
+def bom_risk_namespaces(bom_id: str) -> List[str]:
+    return [f"risk:bom:{bom_id}"]
+
+
+def invalidate_catalog_component(component_id: Optional[str] = None, mpn: Optional[str] = None) -> None:
+    """Call after a catalog component is inserted or updated."""
+    get_response_cache().bump(catalog_namespaces(component_id, mpn))
+
+
+def invalidate_risk(org_id: Optional[str] = None, bom_ids: Iterable[str] = ()) -> None:
+    """Call after risk scores or BOM risk summaries change."""
+    namespaces = ["risk:all"]
+    if org_id:
+        namespaces.append(f"risk:org:{org_id}")
+    namespaces.extend(f"risk:bom:{bom_id}" for bom_id in bom_ids if bom_id)
+    get_response_cache().bump(namespaces)
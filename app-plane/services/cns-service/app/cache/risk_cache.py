@@ -13,9 +13,11 @@ Data Flow:
     2. risk.calculated event published to RabbitMQ
     3. RiskCacheConsumer populates Redis cache
     4. Catalog search enriches results from Redis cache
+
+Every write also bumps the org's risk response-cache version
+(app/cache/response_cache.py), so cached risk API responses are rebuilt.
 """
 
-import json
 import logging
 from datetime import datetime
 from typing import Any, Dict, List, Optional
@@ -23,7 +25,8 @@ from dataclasses import dataclass
 
 from redis.exceptions import RedisError
 
-from app.cache.redis_cache import get_cache, DecimalEncoder
+from app.cache.redis_cache import get_cache, deserialize
+from app.cache.response_cache import invalidate_risk
 
 logger = logging.getLogger(__name__)
 
@@ -144,6 +147,7 @@ def cache_risk_score(
         success = cache.set(key, score_data, ttl=effective_ttl)
 
         if success:
+            invalidate_risk(org_id)
             logger.debug(
                 f"[RiskCache] Cached risk score: component={component_id}, "
                 f"score={score_data.get('total_risk_score')}, ttl={effective_ttl}s"
@@ -220,6 +224,7 @@ def delete_cached_risk(org_id: str, component_id: str) -> bool:
     try:
         key = build_risk_cache_key(org_id, component_id)
         success = cache.delete(key)
+        invalidate_risk(org_id)
 
         if success:
             logger.debug(f"[RiskCache] Invalidated cache: component={component_id}")
@@ -250,7 +255,7 @@ def get_cached_risks_batch(
         return {cid: None for cid in component_ids}
 
     results = {}
-    client = cache.get_client()
+    client = cache.get_binary_client()
 
     if not client:
         return {cid: None for cid in component_ids}
@@ -267,9 +272,9 @@ def get_cached_risks_batch(
                 results[cid] = None
             else:
                 try:
-                    data = json.loads(value)
+                    data = deserialize(value)
                     results[cid] = CachedRiskScore.from_dict(data)
-                except (json.JSONDecodeError, KeyError) as e:
+                except (ValueError, KeyError) as e:
                     logger.warning(f"[RiskCache] Invalid cached data for {cid}: {e}")
                     results[cid] = None
 
@@ -309,6 +314,7 @@ def invalidate_org_risk_cache(org_id: str) -> int:
             client.delete(key)
             deleted_count += 1
 
+        invalidate_risk(org_id)
         if deleted_count > 0:
             logger.info(f"[RiskCache] Invalidated {deleted_count} cached scores for org={org_id}")
 
@@ -0,0 +1,390 @@
+"""
+Scope Hierarchy Cache
+
+Two-level cache of the resolved FK chain (tenant -> organization -> workspace
+-> project -> BOM) used by the scope validators (app/core/scope_validators.py),
+so every pod shares one warm cache and an ownership change is visible
+everywhere within seconds instead of after a per-process TTL.
+
+Entries hold the hierarchy of one resource, not a yes/no answer for one
+(child, parent) pair, so any check on that resource is answered from the
+same entry:
+
+    workspace   {"workspace_id", "organization_id", "tenant_id"}
+    project     {"project_id", "workspace_id", "organization_id", "tenant_id"}
+    bom         {"bom_id", "project_id", "workspace_id", "organization_id", "tenant_id"}
+
+Cache Key Pattern:
+    scope:{kind}:{id}            JSON hierarchy of a workspace, project or BOM
+    scope:deps:{level}:{id}      set of entry keys below an organization,
+                                 workspace or project
+    scope:generation             counter bumped by every invalidation
+
+Two layers:
+    in-process  SCOPE_CACHE_LOCAL_TTL_SECONDS, LRU bounded by
+                SCOPE_CACHE_LOCAL_SIZE
+    Redis       SCOPE_CACHE_TTL_SECONDS, shared by all pods
+
+Invalidation:
+    Deletes and ownership changes call invalidate() (or invalidate_after_commit()
+    from inside the Supabase transaction). That deletes the entries of the
+    given resources and of everything below them (via the deps sets), and
+    publishes the ids on scope:invalidate. Every pod runs a listener
+    (start_scope_cache_listener) that drops entries mentioning those ids from
+    its local layer; after a Redis reconnect the local layer is cleared. The
+    local TTL bounds staleness if a message is lost or Redis is unreachable.
+
+    A request that read the hierarchy from the database before the change
+    committed could otherwise cache it again after the invalidation. Callers
+    take generation() before querying and pass it to set_many(), which skips
+    the write if an invalidation ran in between: the Redis write is a
+    WATCH/MULTI transaction on scope:generation, the local write checks a
+    per-process counter bumped whenever local entries are dropped.
+
+Only resources that exist are cached; a miss for an unknown id always goes
+to the database.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+
+from redis.exceptions import RedisError, WatchError
+
+from app.cache.invalidation import after_commit, listen
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+ENTRY_KEY = "scope:{kind}:{id}"
+DEPS_KEY = "scope:deps:{level}:{id}"
+GENERATION_KEY = "scope:generation"
+INVALIDATION_CHANNEL = "scope:invalidate"
+
+# Cached resource kinds and the levels above each of them
+KINDS = ("workspace", "project", "bom")
+ANCESTORS = {
+    "workspace": ("organization",),
+    "project": ("organization", "workspace"),
+    "bom": ("organization", "workspace", "project"),
+}
+
+# Local (kind, id) -> (expires_at, every id in the hierarchy, hierarchy)
+_LocalEntry = Tuple[float, FrozenSet[str], Dict[str, Optional[str]]]
+
+
+class Generation(NamedTuple):
+    """Invalidation counters seen before a database read (see set_many)."""
+
+    local: int
+    shared: Optional[str]  # None: Redis unavailable, don't write it
+
+
+class ScopeHierarchyCache:
+    """Two-level (in-process + Redis) cache of resolved scope hierarchies."""
+
+    def __init__(
+        self,
+        client_factory: Optional[Callable[[], Any]] = None,
+        ttl_seconds: Optional[int] = None,
+        local_ttl_seconds: Optional[int] = None,
+        local_size: Optional[int] = None,
+    ):
+        self._client_factory = client_factory or _default_client
+        self.ttl_seconds = ttl_seconds or settings.scope_cache_ttl_seconds
+        self.local_ttl_seconds = local_ttl_seconds or settings.scope_cache_local_ttl_seconds
+        self.local_size = local_size or settings.scope_cache_local_size
+        self.enabled = settings.scope_cache_enabled
+        self._local: "OrderedDict[Tuple[str, str], _LocalEntry]" = OrderedDict()
+        self._local_generation = 0
+        # Sync validators also run from threadpool endpoints
+        self._lock = threading.Lock()
+
+    # -- lookups -------------------------------------------------------------
+
+    def get_many(self, kind: str, ids: Iterable[str]) -> Dict[str, Dict[str, Optional[str]]]:
+        """Cached hierarchies for the given ids of one kind; misses are left out."""
+        if not self.enabled:
+            return {}
+        found: Dict[str, Dict[str, Optional[str]]] = {}
+        missing: List[str] = []
+        for resource_id in dict.fromkeys(ids):
+            hierarchy = self._get_local((kind, resource_id))
+            if hierarchy is not None:
+                found[resource_id] = hierarchy
+            else:
+                missing.append(resource_id)
+        if not missing:
+            return found
+
+        client = self._client()
+        if client is None:
+            return found
+        local_generation = self._local_generation
+        try:
+            payloads = client.mget([ENTRY_KEY.format(kind=kind, id=i) for i in missing])
+        except (RedisError, OSError) as e:
+            logger.warning(f"[ScopeCache] Redis unavailable, {kind} lookup uncached: {e}")
+            return found
+        for resource_id, payload in zip(missing, payloads):
+            if payload is None:
+                continue
+            hierarchy = json.loads(payload)
+            self._put_local((kind, resource_id), hierarchy, local_generation)
+            found[resource_id] = dict(hierarchy)
+        return found
+
+    def generation(self) -> Generation:
+        """Take before reading hierarchies from the database; pass to set_many()."""
+        local = self._local_generation
+        client = self._client() if self.enabled else None
+        if client is None:
+            return Generation(local, None)
+        try:
+            return Generation(local, _as_str(client.get(GENERATION_KEY)))
+        except (RedisError, OSError) as e:
+            logger.warning(f"[ScopeCache] Redis unavailable, generation unknown: {e}")
+            return Generation(local, None)
+
+    def set_many(self, kind: str, hierarchies: Dict[str, Dict[str, Optional[str]]], generation: Generation) -> None:
+        """
+        Cache hierarchies of one kind, keyed by resource id.
+
+        generation is what generation() returned before the hierarchies were
+        read; if an invalidation ran since, they may be stale and are not cached.
+        """
+        if not self.enabled or not hierarchies:
+            return
+        if self._set_shared(kind, hierarchies, generation):
+            for resource_id, hierarchy in hierarchies.items():
+                self._put_local((kind, resource_id), hierarchy, generation.local)
+
+    def _set_shared(self, kind: str, hierarchies: Dict[str, Dict[str, Optional[str]]], generation: Generation) -> bool:
+        """Write hierarchies to Redis unless invalidated since generation; False if they are stale."""
+        client = self._client()
+        if client is None or generation.shared is None:
+            return True
+        try:
+            with client.pipeline() as pipe:
+                pipe.watch(GENERATION_KEY)
+                if _as_str(pipe.get(GENERATION_KEY)) != generation.shared:
+                    logger.debug(f"[ScopeCache] Invalidated during lookup, {kind} hierarchies not cached")
+                    return False
+                pipe.multi()
+                for resource_id, hierarchy in hierarchies.items():
+                    entry_key = ENTRY_KEY.format(kind=kind, id=resource_id)
+                    pipe.set(entry_key, json.dumps(hierarchy), ex=self.ttl_seconds)
+                    for level in ANCESTORS[kind]:
+                        ancestor_id = hierarchy.get(f"{level}_id")
+                        if ancestor_id:
+                            deps_key = DEPS_KEY.format(level=level, id=ancestor_id)
+                            pipe.sadd(deps_key, entry_key)
+                            pipe.expire(deps_key, self.ttl_seconds)
+                pipe.execute()
+        except WatchError:
+            logger.debug(f"[ScopeCache] Invalidated during write, {kind} hierarchies not cached")
+            return False
+        except (RedisError, OSError) as e:
+            logger.warning(f"[ScopeCache] Failed to cache {len(hierarchies)} {kind} hierarchies: {e}")
+        return True
+
+    # -- invalidation --------------------------------------------------------
+
+    def invalidate(
+        self,
+        organization_ids: Iterable[Any] = (),
+        workspace_ids: Iterable[Any] = (),
+        project_ids: Iterable[Any] = (),
+        bom_ids: Iterable[Any] = (),
+    ) -> None:
+        """Drop cached hierarchies of the given resources and of everything below them."""
+        levels = {
+            "organization": {str(i) for i in organization_ids if i},
+            "workspace": {str(i) for i in workspace_ids if i},
+            "project": {str(i) for i in project_ids if i},
+            "bom": {str(i) for i in bom_ids if i},
+        }
+        all_ids = set().union(*levels.values())
+        if not all_ids:
+            return
+        self.drop_local(all_ids)
+
+        client = self._client()
+        if client is None:
+            return
+        try:
+            # Bump first: a set_many() that read before this call can't land after it
+            client.incr(GENERATION_KEY)
+            deps_keys = [
+                DEPS_KEY.format(level=level, id=i)
+                for level in ("organization", "workspace", "project")
+                for i in sorted(levels[level])
+            ]
+            keys = set(deps_keys)
+            keys.update(ENTRY_KEY.format(kind=kind, id=i) for kind in KINDS for i in levels[kind])
+            if deps_keys:
+                pipe = client.pipeline(transaction=False)
+                for deps_key in deps_keys:
+                    pipe.smembers(deps_key)
+                for members in pipe.execute():
+                    keys.update(members or ())
+            client.delete(*sorted(keys))
+            client.publish(INVALIDATION_CHANNEL, json.dumps({"ids": sorted(all_ids)}))
+            logger.debug(f"[ScopeCache] Invalidated ids={len(all_ids)} keys={len(keys)}")
+        except (RedisError, OSError) as e:
+            logger.warning(f"[ScopeCache] Failed to invalidate ids={sorted(all_ids)}: {e}")
+
+    def drop_local(self, ids: Iterable[str]) -> None:
+        """Drop local entries whose hierarchy mentions any of the ids."""
+        ids = set(ids)
+        with self._lock:
+            self._local_generation += 1
+            stale = [key for key, (_, entry_ids, _) in self._local.items() if entry_ids & ids]
+            for key in stale:
+                del self._local[key]
+
+    def clear_local(self) -> None:
+        with self._lock:
+            self._local_generation += 1
+            self._local.clear()
+
+    def handle_invalidation(self, data: str) -> None:
+        """Apply an invalidation message published by any pod."""
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError):
+            logger.warning(f"[ScopeCache] Ignoring malformed invalidation: {data!r}")
+            return
+        self.drop_local(message.get("ids", ()))
+
+    # -- local layer ---------------------------------------------------------
+
+    def _get_local(self, key: Tuple[str, str]) -> Optional[Dict[str, Optional[str]]]:
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._local[key]
+                return None
+            self._local.move_to_end(key)
+            return dict(entry[2])
+
+    def _put_local(self, key: Tuple[str, str], hierarchy: Dict[str, Optional[str]], generation: int) -> None:
+        entry_ids = frozenset(v for k, v in hierarchy.items() if k != "tenant_id" and v)
+        with self._lock:
+            if generation != self._local_generation:
+                return  # Local entries were dropped since the read
+            self._local[key] = (time.monotonic() + self.local_ttl_seconds, entry_ids, dict(hierarchy))
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_size:
+                self._local.popitem(last=False)  # Evict oldest
+
+    def _client(self):
+        if not settings.redis_enabled:
+            return None
+        try:
+            return self._client_factory()
+        except (RedisError, OSError) as e:
+            logger.warning(f"[ScopeCache] Redis unavailable: {e}")
+            return None
+
+
+def _default_client():
+    from app.cache.redis_cache import get_sync_redis_client
+
+    return get_sync_redis_client()
+
+
+def _as_str(value: Any) -> str:
+    """Generation counter as text; a missing key reads as "0"."""
+    if value is None:
+        return "0"
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+_scope_cache: Optional[ScopeHierarchyCache] = None
+_listener_task: Optional[asyncio.Task] = None
+
+
+def get_scope_cache() -> ScopeHierarchyCache:
+    global _scope_cache
+    if _scope_cache is None:
+        _scope_cache = ScopeHierarchyCache()
+    return _scope_cache
+
+
+def invalidate_after_commit(
+    session,
+    organization_ids: Iterable[Any] = (),
+    workspace_ids: Iterable[Any] = (),
+    project_ids: Iterable[Any] = (),
+    bom_ids: Iterable[Any] = (),
+) -> None:
+    """
+    Invalidate cached scope hierarchies once the session's transaction commits.
+
+    Call from inside the transaction that deletes or re-parents resources.
+    Invalidating before the commit would let other requests cache the old
+    rows again; lookups that already read them are handled by set_many().
+    """
+    ids = {
+        "organization_ids": [str(i) for i in organization_ids if i],
+        "workspace_ids": [str(i) for i in workspace_ids if i],
+        "project_ids": [str(i) for i in project_ids if i],
+        "bom_ids": [str(i) for i in bom_ids if i],
+    }
+
+    after_commit(session, lambda: get_scope_cache().invalidate(**ids))
+
+
+# -- invalidation listener ---------------------------------------------------
+
+def start_scope_cache_listener() -> Optional[asyncio.Task]:
+    """Subscribe to invalidations from other pods. Returns None if disabled or already running."""
+    global _listener_task
+
+    if not settings.scope_cache_enabled:
+        logger.info("[ScopeCache] Disabled (SCOPE_CACHE_ENABLED=false)")
+        return None
+    if _listener_task is not None and not _listener_task.done():
+        logger.warning("[ScopeCache] Invalidation listener already running")
+        return None
+
+    _listener_task = asyncio.get_running_loop().create_task(_listen(get_scope_cache(), _default_async_client))
+    return _listener_task
+
+
+async def _default_async_client():
+    from app.cache.redis_cache import get_redis_client
+
+    return await get_redis_client()
+
+
+async def _listen(cache: ScopeHierarchyCache, client_factory) -> None:
+    await listen(
+        INVALIDATION_CHANNEL,
+        client_factory,
+        cache.handle_invalidation,
+        # Invalidations published while disconnected were missed
+        on_reconnect=cache.clear_local,
+        log_prefix="[ScopeCache]",
+    )
+
+
+async def stop_scope_cache_listener() -> None:
+    global _listener_task
+
+    task, _listener_task = _listener_task, None
+    if task is None:
+        return
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    logger.info("[ScopeCache] Invalidation listener stopped")
@@ -12,7 +12,7 @@ import logging
 from typing import Optional, Dict, Any
 from datetime import datetime
 
-from .redis_cache import get_cache, DecimalEncoder
+from .redis_cache import get_cache
 
 logger = logging.getLogger(__name__)
 
@@ -83,13 +83,15 @@ def get_cached_supplier_response(
             return None
 
         key = _build_supplier_cache_key(supplier_name, mpn, manufacturer)
-        cached_json = cache.get(key)
+        cached_data = cache.get(key)
 
-        if not cached_json:
+        if not cached_data:
             logger.debug(f"Cache MISS: {supplier_name}/{mpn}")
             return None
 
-        cached_data = json.loads(cached_json)
+        # Entries written before the shared serializer were stored as a JSON string
+        if isinstance(cached_data, str):
+            cached_data = json.loads(cached_data)
 
         # Check cache age
         cached_at = cached_data.get('cached_at')
@@ -146,11 +148,8 @@ def set_cached_supplier_response(
             'manufacturer': manufacturer
         }
 
-        # Serialize with DecimalEncoder
-        cache_json = json.dumps(cache_data, cls=DecimalEncoder)
-
-        # Store with TTL
-        cache.set(key, cache_json, ttl)
+        # Store with TTL (RedisCache serializes Decimal/UUID/datetime)
+        cache.set(key, cache_data, ttl)
 
         logger.info(
             f"💾 Cached supplier response: {supplier_name}/{mpn} "
@@ -43,6 +43,27 @@ class Settings(BaseSettings):
     redis_url: str = Field(default="redis://localhost:6379/0", alias="REDIS_URL")
     cache_ttl_seconds: int = Field(default=3600, alias="CACHE_TTL_SECONDS")  # 1 hour
     redis_cache_ttl: int = Field(default=3600, alias="REDIS_CACHE_TTL")  # Backward compat
+    redis_serializer: str = Field(default="json", alias="REDIS_SERIALIZER")  # json (orjson) | msgpack
+    redis_compression_threshold: int = Field(default=2048, alias="REDIS_COMPRESSION_THRESHOLD")  # Bytes; 0 = off
+    redis_compression_level: int = Field(default=3, alias="REDIS_COMPRESSION_LEVEL")  # zstd level
+
+    # Enrichment progress stream (SSE fan-out + replay)
+    enrichment_stream_maxlen: int = Field(default=1000, alias="ENRICHMENT_STREAM_MAXLEN")  # Events kept per BOM
+    enrichment_stream_ttl_seconds: int = Field(default=86400, alias="ENRICHMENT_STREAM_TTL_SECONDS")
+    enrichment_stream_queue_size: int = Field(default=256, alias="ENRICHMENT_STREAM_QUEUE_SIZE")  # Per SSE client
+    enrichment_event_flush_ms: int = Field(default=500, alias="ENRICHMENT_EVENT_FLUSH_MS")  # Component event sink interval
+    enrichment_event_buffer_max: int = Field(default=5000, alias="ENRICHMENT_EVENT_BUFFER_MAX")  # Oldest dropped beyond this
+
+    # Transactional outbox relay (event_outbox -> RabbitMQ)
+    outbox_relay_enabled: bool = Field(default=True, alias="OUTBOX_RELAY_ENABLED")
+    outbox_relay_batch_size: int = Field(default=200, alias="OUTBOX_RELAY_BATCH_SIZE")
+    outbox_relay_poll_ms: int = Field(default=500, alias="OUTBOX_RELAY_POLL_MS")  # Idle poll interval
+    outbox_retention_hours: int = Field(default=72, alias="OUTBOX_RETENTION_HOURS")  # Published rows kept this long
+
+    # Stream consumer message dedup (app/cache/message_dedup.py)
+    stream_dedup_ttl_seconds: int = Field(default=86400, alias="STREAM_DEDUP_TTL_SECONDS")  # Dedup window
+    stream_dedup_claim_ttl_seconds: int = Field(default=600, alias="STREAM_DEDUP_CLAIM_TTL_SECONDS")  # In-progress claim
+    stream_dedup_local_size: int = Field(default=10000, alias="STREAM_DEDUP_LOCAL_SIZE")  # LRU fallback without Redis
 
     # ===================================
     # Temporal Workflow Configuration
@@ -130,6 +151,8 @@ class Settings(BaseSettings):
     minio_bucket_uploads: str = Field(default="bulk-uploads", alias="MINIO_BUCKET_UPLOADS")
     minio_bucket_results: str = Field(default="enriched-results", alias="MINIO_BUCKET_RESULTS")
     minio_bucket_archive: str = Field(default="bulk-uploads-archive", alias="MINIO_BUCKET_ARCHIVE")
+    # Multipart part size for streamed uploads (S3 minimum is 5 MiB); bounds per-upload memory
+    minio_upload_part_size_mb: int = Field(default=8, alias="MINIO_UPLOAD_PART_SIZE_MB")
 
     # ===================================
     # Directus Integration
@@ -318,6 +341,23 @@ class Settings(BaseSettings):
     jwt_secret_key: str = Field(..., alias="JWT_SECRET_KEY")
     jwt_algorithm: str = Field(default="HS256", alias="JWT_ALGORITHM")
     jwt_expiration: int = Field(default=3600, alias="JWT_EXPIRATION")  # 1 hour
+    # Verified bearer tokens (sha256 digest -> AuthContext), kept until the token's exp
+    auth_token_cache_size: int = Field(default=10000, alias="AUTH_TOKEN_CACHE_SIZE")
+    # JWKS keys are refreshed in the background this long before the JWKS cache expires
+    jwks_refresh_ahead_seconds: int = Field(default=300, alias="JWKS_REFRESH_AHEAD_SECONDS")
+    # Resolved user/org context for the auth dependencies (app/cache/auth_context_cache.py)
+    auth_context_cache_enabled: bool = Field(default=True, alias="AUTH_CONTEXT_CACHE_ENABLED")
+    auth_context_cache_ttl_seconds: int = Field(default=60, alias="AUTH_CONTEXT_CACHE_TTL_SECONDS")  # Redis layer
+    auth_context_local_ttl_seconds: int = Field(default=5, alias="AUTH_CONTEXT_LOCAL_TTL_SECONDS")  # In-process layer
+    auth_context_local_size: int = Field(default=10000, alias="AUTH_CONTEXT_LOCAL_SIZE")
+    # Resolved scope hierarchies for the scope validators (app/cache/scope_cache.py)
+    scope_cache_enabled: bool = Field(default=True, alias="SCOPE_CACHE_ENABLED")
+    scope_cache_ttl_seconds: int = Field(default=300, alias="SCOPE_CACHE_TTL_SECONDS")  # Redis layer
+    scope_cache_local_ttl_seconds: int = Field(default=5, alias="SCOPE_CACHE_LOCAL_TTL_SECONDS")  # In-process layer
+    scope_cache_local_size: int = Field(default=10000, alias="SCOPE_CACHE_LOCAL_SIZE")
+    # Versioned ETag response cache for read-heavy GET endpoints (app/cache/response_cache.py)
+    response_cache_enabled: bool = Field(default=True, alias="RESPONSE_CACHE_ENABLED")
+    response_cache_ttl_seconds: int = Field(default=300, alias="RESPONSE_CACHE_TTL_SECONDS")
 
     # ===================================
     # Auth0 Configuration
@@ -567,6 +607,14 @@ class Settings(BaseSettings):
         description="Comma-separated list of IPs allowed to use admin token (empty = all allowed)"
     )
 
+    # API rate limiting (app/middleware/rate_limit.py)
+    # After a Redis error the limiter runs in-process for this long, then retries Redis
+    rate_limit_redis_retry_seconds: float = Field(default=5.0, alias="RATE_LIMIT_REDIS_RETRY_SECONDS")
+    # Tokens reserved per Redis call and spent locally (0/1 = one call per request);
+    # capped at a tenth of the limit, unused tokens lapse after RATE_LIMIT_LEASE_SECONDS
+    rate_limit_lease_size: int = Field(default=0, alias="RATE_LIMIT_LEASE_SIZE")
+    rate_limit_lease_seconds: float = Field(default=1.0, alias="RATE_LIMIT_LEASE_SECONDS")
+
     # ===================================
     # Development & Testing
     # ===================================
@@ -12,9 +12,11 @@ from datetime import datetime
 from pydantic import BaseModel, Field
 from fastapi import Request, Response, HTTPException
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import Receive, Scope, Send
 import uuid
 
+from app.core.request_context import ASGIMiddleware, RequestContext
+
 logger = logging.getLogger(__name__)
 
 
@@ -527,34 +529,27 @@ class ErrorLogger:
 # ERROR MIDDLEWARE
 # ============================================================================
 
-class ErrorHandlingMiddleware(BaseHTTPMiddleware):
+class ErrorHandlingMiddleware(ASGIMiddleware):
     """
     Global error handling middleware
     Catches all exceptions and converts to standardized error responses
+
+    Pure ASGI: request.state.request_id and the X-Request-ID header come
+    from the shared RequestContext (see app.core.request_context).
     """
     
-    async def dispatch(self, request: Request, call_next):
-        # Generate request ID if not already present
-        if not hasattr(request.state, "request_id"):
-            request.state.request_id = str(uuid.uuid4())
-        
-        # Record start time
-        import time
-        start_time = time.time()
+    async def handle(self, scope: Scope, receive: Receive, send: Send, ctx: RequestContext) -> None:
+        # Add standard headers
+        ctx.response_headers["X-Response-Time-Ms"] = lambda: str(ctx.elapsed * 1000)
         
         try:
-            response = await call_next(request)
-            response_time_ms = (time.time() - start_time) * 1000
-            
-            # Add standard headers
-            response.headers["X-Request-ID"] = request.state.request_id
-            response.headers["X-Response-Time-Ms"] = str(response_time_ms)
-            
-            return response
+            await self.app(scope, receive, send)
         
         except HTTPException as exc:
             # Handle FastAPI HTTPException
-            response_time_ms = (time.time() - start_time) * 1000
+            if ctx.response_started:
+                raise
+            request = Request(scope)
             
             error_response = ErrorHandler.create_internal_error(
                 request=request,
@@ -566,18 +561,20 @@ class ErrorHandlingMiddleware(BaseHTTPMiddleware):
             ErrorLogger.log_error(
                 error_response=error_response,
                 request=request,
-                response_time_ms=response_time_ms,
+                response_time_ms=ctx.elapsed * 1000,
             )
             
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=error_response.status_code,
                 content=error_response.dict(),
-                headers={"X-Request-ID": request.state.request_id},
             )
+            await response(scope, receive, send)
         
         except Exception as exc:
             # Handle all other exceptions
-            response_time_ms = (time.time() - start_time) * 1000
+            if ctx.response_started:
+                raise
+            request = Request(scope)
             
             error_response = ErrorHandler.create_internal_error(
                 request=request,
@@ -589,15 +586,15 @@ class ErrorHandlingMiddleware(BaseHTTPMiddleware):
             ErrorLogger.log_error(
                 error_response=error_response,
                 request=request,
-                response_time_ms=response_time_ms,
+                response_time_ms=ctx.elapsed * 1000,
                 traceback_str=tb_str,
             )
             
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=500,
                 content=error_response.dict(),
-                headers={"X-Request-ID": request.state.request_id},
             )
+            await response(scope, receive, send)
 
 
 # ============================================================================
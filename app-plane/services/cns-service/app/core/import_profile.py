@@ -0,0 +1,147 @@
+"""
+Startup Import-Time Profile
+
+Imports a module in a fresh interpreter with `python -X importtime` and
+summarizes where the time goes: the slowest modules (cumulative and self
+time) and the third-party packages they belong to.
+
+Usage (from the service root, with the usual settings in the environment):
+    python -m app.core.import_profile                  # profiles app.main
+    python -m app.core.import_profile app.api.risk --top 30
+    python -m app.core.import_profile --check pandas --check minio
+
+--check NAME exits with status 1 when NAME is imported, so a deploy check
+can catch a heavy dependency that became eager again.
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+DEFAULT_MODULE = "app.main"
+SERVICE_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# import time:       412 |        933 |   pandas.core.frame
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+@dataclass
+class ImportRecord:
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+    @property
+    def package(self) -> str:
+        return self.name.split(".", 1)[0]
+
+
+@dataclass
+class ImportProfile:
+    module: str
+    wall_seconds: float
+    records: List[ImportRecord] = field(default_factory=list)
+
+    @property
+    def total_us(self) -> int:
+        return sum(r.self_us for r in self.records)
+
+    @property
+    def modules(self) -> List[str]:
+        return [r.name for r in self.records]
+
+    def imported(self, name: str) -> bool:
+        """True when name or any of its submodules was imported."""
+        return any(m == name or m.startswith(name + ".") for m in self.modules)
+
+    def slowest(self, top: int = 20, by: str = "cumulative_us") -> List[ImportRecord]:
+        return sorted(self.records, key=lambda r: getattr(r, by), reverse=True)[:top]
+
+    def by_package(self) -> Dict[str, int]:
+        """Self time per top-level package, in microseconds, slowest first."""
+        totals: Dict[str, int] = defaultdict(int)
+        for r in self.records:
+            totals[r.package] += r.self_us
+        return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def parse_importtime(output: str) -> List[ImportRecord]:
+    """Parse the stderr of `python -X importtime`."""
+    records = []
+    for line in output.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            # Nested imports are indented two spaces per level
+            records.append(ImportRecord(name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return records
+
+
+def profile_imports(module: str = DEFAULT_MODULE, env: Optional[Dict[str, str]] = None, timeout: float = 120) -> ImportProfile:
+    """Import module in a fresh interpreter and collect its import timings."""
+    code = (
+        "import time; _t = time.perf_counter(); "
+        f"import {module}; "
+        "print(time.perf_counter() - _t)"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=SERVICE_ROOT,
+        env={**os.environ, **(env or {})},
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+    )
+    if proc.returncode != 0:
+        errors = [line for line in proc.stderr.splitlines() if not _LINE.match(line)]
+        raise RuntimeError(f"import {module} failed:\n" + "\n".join(errors[-20:]))
+    wall = float(proc.stdout.strip().splitlines()[-1])
+    return ImportProfile(module, wall, parse_importtime(proc.stderr))
+
+
+def format_report(profile: ImportProfile, top: int = 20) -> str:
+    lines = [
+        f"import {profile.module}: {profile.wall_seconds * 1000:.0f} ms wall, "
+        f"{profile.total_us / 1000:.0f} ms in {len(profile.records)} modules",
+        "",
+        f"Top {top} modules by cumulative time:",
+    ]
+    for r in profile.slowest(top):
+        lines.append(f"  {r.cumulative_us / 1000:9.1f} ms  {r.name}")
+
+    lines += ["", f"Top {top} modules by self time:"]
+    for r in profile.slowest(top, by="self_us"):
+        lines.append(f"  {r.self_us / 1000:9.1f} ms  {r.name}")
+
+    lines += ["", f"Top {top} packages by self time:"]
+    for package, self_us in list(profile.by_package().items())[:top]:
+        lines.append(f"  {self_us / 1000:9.1f} ms  {package}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Summarize `python -X importtime` for a CNS module")
+    parser.add_argument("module", nargs="?", default=DEFAULT_MODULE, help=f"module to import (default: {DEFAULT_MODULE})")
+    parser.add_argument("--top", type=int, default=20, help="rows per table (default: 20)")
+    parser.add_argument("--check", action="append", default=[], metavar="NAME",
+                        help="fail when this module is imported (repeatable)")
+    args = parser.parse_args(argv)
+
+    profile = profile_imports(args.module)
+    print(format_report(profile, args.top))
+
+    eager = [name for name in args.check if profile.imported(name)]
+    if eager:
+        print(f"\nImported at startup: {', '.join(eager)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,6 +12,9 @@ from typing import Callable
 
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import Receive, Scope, Send
+
+from app.core.request_context import ASGIMiddleware, RequestContext
 
 logger = logging.getLogger(__name__)
 
@@ -29,7 +32,7 @@ def get_correlation_id() -> str:
     return correlation_id_var.get() or "no-correlation-id"
 
 
-class CorrelationIDMiddleware(BaseHTTPMiddleware):
+class CorrelationIDMiddleware(ASGIMiddleware):
     """
     Adds correlation ID to all requests for tracing
 
@@ -39,6 +42,9 @@ class CorrelationIDMiddleware(BaseHTTPMiddleware):
     - Stores correlation ID in context variable for logging
     - Logs request start/end with correlation ID
 
+    Pure ASGI: the correlation ID is kept on the shared RequestContext
+    (see app.core.request_context) and the response is not re-wrapped.
+
     Usage:
         from app.core.middleware import CorrelationIDMiddleware
         from fastapi import FastAPI
@@ -51,50 +57,42 @@ class CorrelationIDMiddleware(BaseHTTPMiddleware):
         logger.info(f"Processing request {get_correlation_id()}")
     """
 
-    def __init__(self, app):
-        super().__init__(app)
-
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def handle(self, scope: Scope, receive: Receive, send: Send, ctx: RequestContext) -> None:
         # Get or generate correlation ID
-        correlation_id = request.headers.get("X-Correlation-ID")
-        if not correlation_id:
-            correlation_id = str(uuid.uuid4())
+        correlation_id = ctx.headers.get("x-correlation-id") or str(uuid.uuid4())
+        ctx.correlation_id = correlation_id
 
         # Set in context variable (accessible throughout request lifecycle)
         correlation_id_var.set(correlation_id)
 
         # Add to request state for easy access
-        request.state.correlation_id = correlation_id
+        ctx.set_state("correlation_id", correlation_id)
+
+        # Add correlation ID to response headers
+        ctx.response_headers["X-Correlation-ID"] = correlation_id
 
         # Log request start
-        start_time = time.time()
         logger.info(
-            f"[{correlation_id}] {request.method} {request.url.path} - START",
+            f"[{correlation_id}] {ctx.method} {ctx.path} - START",
             extra={"correlation_id": correlation_id}
         )
 
-        # Process request
-        response = await call_next(request)
+        # Process request (includes streaming the body)
+        await self.app(scope, receive, send)
 
-        # Calculate duration
-        duration_ms = int((time.time() - start_time) * 1000)
-
-        # Add correlation ID to response headers
-        response.headers["X-Correlation-ID"] = correlation_id
+        duration_ms = int(ctx.elapsed * 1000)
 
         # Log request end
         logger.info(
-            f"[{correlation_id}] {request.method} {request.url.path} - "
-            f"COMPLETE ({response.status_code}) in {duration_ms}ms",
+            f"[{correlation_id}] {ctx.method} {ctx.path} - "
+            f"COMPLETE ({ctx.status_code}) in {duration_ms}ms",
             extra={
                 "correlation_id": correlation_id,
                 "duration_ms": duration_ms,
-                "status_code": response.status_code
+                "status_code": ctx.status_code
             }
         )
 
-        return response
-
 
 class RequestLoggingMiddleware(BaseHTTPMiddleware):
     """
@@ -0,0 +1,126 @@
+"""
+Request Context for pure-ASGI middleware
+
+The first middleware that sees an HTTP request creates one RequestContext
+and stores it in scope["state"], which is what request.state reads, so
+endpoints keep using request.state.correlation_id, .routing_context, etc.
+The creator also assigns the request ID: request.state.request_id and the
+X-Request-ID response header come from here and nowhere else.
+
+Middlewares register response headers on the context instead of each
+wrapping `send` (or the whole response, as BaseHTTPMiddleware does). The
+creating middleware wraps `send` once, applies the headers on
+http.response.start and records the status code. Response bodies are
+passed through untouched, so streaming responses (SSE) are not buffered.
+
+Usage:
+    class MyMiddleware(ASGIMiddleware):
+        async def handle(self, scope, receive, send, ctx):
+            ctx.set_state("tenant", ctx.headers.get("x-tenant-id"))
+            ctx.response_headers["X-Tenant"] = "..."
+            await self.app(scope, receive, send)
+"""
+
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+REQUEST_CONTEXT_KEY = "request_context"
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# A header value, or a callable evaluated when the response starts
+HeaderValue = Union[str, Callable[[], str]]
+
+
+@dataclass
+class RequestContext:
+    """Per-request data shared by the middleware pipeline."""
+
+    method: str
+    path: str
+    headers: Headers
+    state: Dict[str, Any]
+    start_time: float = field(default_factory=time.perf_counter)
+    request_id: str = field(default_factory=lambda: f"req-{uuid.uuid4().hex}")
+    correlation_id: Optional[str] = None
+    status_code: Optional[int] = None
+    response_headers: Dict[str, HeaderValue] = field(default_factory=dict)
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the request entered the pipeline."""
+        return time.perf_counter() - self.start_time
+
+    @property
+    def response_started(self) -> bool:
+        return self.status_code is not None
+
+    def set_state(self, name: str, value: Any) -> None:
+        """Expose a value to endpoints as request.state.<name>."""
+        self.state[name] = value
+
+
+def get_request_context(scope: Scope) -> Optional[RequestContext]:
+    return scope.get("state", {}).get(REQUEST_CONTEXT_KEY)
+
+
+def bind_request_context(scope: Scope, send: Send) -> Tuple[RequestContext, Send]:
+    """
+    Return the request's context, creating it if this is the first middleware.
+
+    Only the creator gets a wrapped `send`; later middlewares get `send` back
+    unchanged, so the response is intercepted once per request.
+    """
+    state = scope.setdefault("state", {})
+    ctx = state.get(REQUEST_CONTEXT_KEY)
+    if ctx is not None:
+        return ctx, send
+
+    ctx = RequestContext(
+        method=scope["method"],
+        path=scope["path"],
+        headers=Headers(scope=scope),
+        state=state,
+    )
+    state[REQUEST_CONTEXT_KEY] = ctx
+    state["request_id"] = ctx.request_id
+    ctx.response_headers[REQUEST_ID_HEADER] = ctx.request_id
+
+    async def send_with_context(message: Message) -> None:
+        if message["type"] == "http.response.start":
+            ctx.status_code = message["status"]
+            if ctx.response_headers:
+                headers = MutableHeaders(scope=message)
+                for name, value in ctx.response_headers.items():
+                    headers[name] = value() if callable(value) else value
+        await send(message)
+
+    return ctx, send_with_context
+
+
+class ASGIMiddleware(ABC):
+    """
+    Base for pure-ASGI HTTP middleware.
+
+    Subclasses implement handle(); non-HTTP scopes (websocket, lifespan)
+    pass straight through.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        ctx, send = bind_request_context(scope, send)
+        await self.handle(scope, receive, send, ctx)
+
+    @abstractmethod
+    async def handle(self, scope: Scope, receive: Receive, send: Send, ctx: RequestContext) -> None:
+        ...
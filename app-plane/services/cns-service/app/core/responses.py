@@ -0,0 +1,181 @@
+"""
+JSON Response Classes
+
+FastJSONResponse is the application's default response class. Bodies are
+encoded with orjson (stdlib json when orjson is not installed), and Decimal,
+UUID and datetime values follow the same rules as DecimalEncoder.
+
+For very large collections, StreamingJSONResponse (JSON array) and
+NDJSONResponse (one JSON document per line) encode items as they are
+produced, so the first bytes reach the client before the last row is
+fetched:
+
+    @router.get("/{bom_id}/line_items")
+    def list_line_items(request: Request, ...):
+        if wants_ndjson(request):
+            return NDJSONResponse(iter_line_items(db, bom_id))
+        ...
+
+Encoded items are sent in chunks of up to STREAM_CHUNK_BYTES. Once the first
+chunk is out the status code is fixed, so an error mid-stream truncates the
+body; NDJSON clients see an incomplete last line, array clients invalid JSON.
+"""
+
+import json
+import logging
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Iterator, Mapping, Optional, Union
+from uuid import UUID
+
+from pydantic import BaseModel
+from starlette.background import BackgroundTask
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+STREAM_CHUNK_BYTES = 64 * 1024
+
+Items = Union[Iterable[Any], AsyncIterable[Any]]
+
+
+def json_default(obj: Any) -> Any:
+    """Fallback for types the JSON encoder doesn't handle (same rules as DecimalEncoder)"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, UUID):
+        return str(obj)
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode content as compact UTF-8 JSON"""
+    if orjson is not None:
+        return orjson.dumps(content, default=json_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content, default=json_default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded with orjson"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def wants_ndjson(request: Request) -> bool:
+    """True when the client asked for newline-delimited JSON"""
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+class _Encoder:
+    """Joins encoded items into chunks of about STREAM_CHUNK_BYTES"""
+
+    def __init__(self, separator: bytes, terminator: bytes):
+        self.separator = separator
+        self.terminator = terminator
+        self.buffer = bytearray()
+        self.count = 0
+
+    def add(self, item: Any) -> Optional[bytes]:
+        if self.count:
+            self.buffer += self.separator
+        self.buffer += dumps(item) + self.terminator
+        self.count += 1
+        if len(self.buffer) >= STREAM_CHUNK_BYTES:
+            return self.flush()
+        return None
+
+    def flush(self) -> bytes:
+        chunk = bytes(self.buffer)
+        self.buffer.clear()
+        return chunk
+
+
+def _encode_items(items: Iterable[Any], opening: bytes, separator: bytes, terminator: bytes, closing: bytes) -> Iterator[bytes]:
+    encoder = _Encoder(separator, terminator)
+    encoder.buffer += opening
+    try:
+        for item in items:
+            chunk = encoder.add(item)
+            if chunk:
+                yield chunk
+    except Exception as e:
+        logger.error(f"[Streaming] Response aborted after {encoder.count} items: {e}", exc_info=True)
+        raise
+    encoder.buffer += closing
+    yield encoder.flush()
+
+
+async def _aencode_items(items: AsyncIterable[Any], opening: bytes, separator: bytes, terminator: bytes, closing: bytes) -> AsyncIterator[bytes]:
+    encoder = _Encoder(separator, terminator)
+    encoder.buffer += opening
+    try:
+        async for item in items:
+            chunk = encoder.add(item)
+            if chunk:
+                yield chunk
+    except Exception as e:
+        logger.error(f"[Streaming] Response aborted after {encoder.count} items: {e}", exc_info=True)
+        raise
+    encoder.buffer += closing
+    yield encoder.flush()
+
+
+def _encode(items: Items, opening: bytes, separator: bytes, terminator: bytes, closing: bytes):
+    # Sync iterables (e.g. DB cursors) are run in the threadpool by StreamingResponse
+    if hasattr(items, "__aiter__"):
+        return _aencode_items(items, opening, separator, terminator, closing)
+    return _encode_items(items, opening, separator, terminator, closing)
+
+
+class StreamingJSONResponse(StreamingResponse):
+    """Streams items as one JSON array"""
+
+    def __init__(
+        self,
+        items: Items,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        background: Optional[BackgroundTask] = None,
+    ):
+        super().__init__(
+            _encode(items, b"[", b",", b"", b"]"),
+            status_code=status_code,
+            headers=headers,
+            media_type="application/json",
+            background=background,
+        )
+
+
+class NDJSONResponse(StreamingResponse):
+    """Streams items as newline-delimited JSON, one item per line"""
+
+    def __init__(
+        self,
+        items: Items,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        background: Optional[BackgroundTask] = None,
+    ):
+        super().__init__(
+            _encode(items, b"", b"", b"\n", b""),
+            status_code=status_code,
+            headers=headers,
+            media_type=NDJSON_MEDIA_TYPE,
+            background=background,
+        )
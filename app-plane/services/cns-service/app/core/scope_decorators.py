@@ -54,6 +54,8 @@ from .scope_validators import (
     validate_workspace_in_tenant,
     validate_project_in_workspace,
     validate_full_scope_chain,
+    get_bom_hierarchy,
+    get_project_hierarchy,
 )
 from .auth_utils import (
     get_tenant_id_from_auth_context,
@@ -358,13 +360,9 @@ def require_project(enforce: bool = True, log_access: bool = True):
                     f"(project_id={project_id}, tenant_id={tenant_id})"
                 )
                 # Still fetch workspace_id for completeness
-                from sqlalchemy import text
-                result = db.execute(
-                    text("SELECT workspace_id FROM projects WHERE id = :project_id"),
-                    {"project_id": project_id}
-                ).fetchone()
-                if result:
-                    scope["workspace_id"] = str(result[0])
+                hierarchy = get_project_hierarchy(db, project_id)
+                if hierarchy:
+                    scope["workspace_id"] = hierarchy["workspace_id"]
 
                 # Set validated scope and proceed without validation
                 request.state.validated_scope = scope
@@ -381,16 +379,12 @@ def require_project(enforce: bool = True, log_access: bool = True):
             is_valid = validation_result["valid"]
             errors = validation_result.get("errors", [])
 
-            # Extract workspace_id from validation result if available
-            # We need to query it since validate_full_scope_chain doesn't return it
+            # Extract workspace_id from the hierarchy resolved during validation
+            # (super admin validation only checks existence, so look it up)
             if is_valid:
-                from sqlalchemy import text
-                result = db.execute(
-                    text("SELECT workspace_id FROM projects WHERE id = :project_id"),
-                    {"project_id": project_id}
-                ).fetchone()
-                if result:
-                    scope["workspace_id"] = str(result[0])
+                hierarchy = validation_result.get("hierarchy") or get_project_hierarchy(db, project_id)
+                if hierarchy:
+                    scope["workspace_id"] = hierarchy["workspace_id"]
 
             # Log access
             if log_access:
@@ -609,19 +603,10 @@ def require_bom(enforce: bool = True, log_access: bool = True):
                     f"(bom_id={bom_id}, tenant_id={tenant_id})"
                 )
                 # Still fetch project_id and workspace_id for completeness
-                from sqlalchemy import text
-                result = db.execute(
-                    text("""
-                        SELECT p.id, p.workspace_id
-                        FROM boms b
-                        JOIN projects p ON b.project_id = p.id
-                        WHERE b.id = :bom_id
-                    """),
-                    {"bom_id": bom_id}
-                ).fetchone()
-                if result:
-                    scope["project_id"] = str(result[0])
-                    scope["workspace_id"] = str(result[1])
+                hierarchy = get_bom_hierarchy(db, bom_id)
+                if hierarchy:
+                    scope["project_id"] = hierarchy["project_id"]
+                    scope["workspace_id"] = hierarchy["workspace_id"]
 
                 # Set validated scope and proceed without validation
                 request.state.validated_scope = scope
@@ -637,21 +622,13 @@ def require_bom(enforce: bool = True, log_access: bool = True):
             is_valid = validation_result["valid"]
             errors = validation_result.get("errors", [])
 
-            # Extract workspace_id and project_id from DB
+            # Extract workspace_id and project_id from the hierarchy resolved during validation
+            # (super admin validation only checks existence, so look it up)
             if is_valid:
-                from sqlalchemy import text
-                result = db.execute(
-                    text("""
-                        SELECT p.id, p.workspace_id
-                        FROM boms b
-                        JOIN projects p ON b.project_id = p.id
-                        WHERE b.id = :bom_id
-                    """),
-                    {"bom_id": bom_id}
-                ).fetchone()
-                if result:
-                    scope["project_id"] = str(result[0])
-                    scope["workspace_id"] = str(result[1])
+                hierarchy = validation_result.get("hierarchy") or get_bom_hierarchy(db, bom_id)
+                if hierarchy:
+                    scope["project_id"] = hierarchy["project_id"]
+                    scope["workspace_id"] = hierarchy["workspace_id"]
 
             # Log access
             if log_access:
@@ -6,7 +6,9 @@ Validates multi-tenant scope hierarchy using FK relationships:
 
 This module provides the foundation for all scope validation in the CNS service.
 All validation functions check the actual database FK constraints to ensure
-data integrity and proper multi-tenant isolation.
+data integrity and proper multi-tenant isolation. Resolved hierarchies are
+cached per resource (see "Cache" below); validate_scope_chains() checks many
+chains with one query per resource kind.
 
 Database Schema:
     organizations.control_plane_tenant_id → FK to Control Plane tenants (UUID)
@@ -45,90 +47,38 @@ Usage:
 """
 
 import logging
-import threading
 import uuid
-from collections import OrderedDict
-from datetime import datetime, timedelta, timezone
-from functools import lru_cache
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional
 
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from app.cache.scope_cache import get_scope_cache
+
 logger = logging.getLogger(__name__)
 
 
 # =============================================================================
-# Cache Configuration
+# Cache
 # =============================================================================
-
-# Validation results cache TTL (5 minutes)
-VALIDATION_CACHE_TTL = timedelta(minutes=5)
-
-# Maximum cache size to prevent unbounded memory growth
-MAX_CACHE_SIZE = 10000
-
-# Thread-safe cache for validation results (key: composite key, value: (result, timestamp))
-# Using OrderedDict for LRU eviction when max size exceeded
-_validation_cache: OrderedDict[str, Tuple[bool, datetime]] = OrderedDict()
-_cache_lock = threading.Lock()
-
-
-def _get_cached_validation(cache_key: str) -> Optional[bool]:
-    """
-    Get cached validation result if still valid (thread-safe).
-
-    Args:
-        cache_key: Composite cache key
-
-    Returns:
-        Cached boolean result, or None if expired/not found
-    """
-    with _cache_lock:
-        if cache_key in _validation_cache:
-            result, timestamp = _validation_cache[cache_key]
-            # Use timezone-aware datetime
-            if datetime.now(timezone.utc) - timestamp < VALIDATION_CACHE_TTL:
-                logger.debug(f"Cache hit for validation: {cache_key}")
-                return result
-            else:
-                # Expired, remove from cache
-                del _validation_cache[cache_key]
-                logger.debug(f"Cache expired for validation: {cache_key}")
-    return None
-
-
-def _set_cached_validation(cache_key: str, result: bool):
-    """
-    Cache validation result with LRU eviction (thread-safe).
-
-    Args:
-        cache_key: Composite cache key
-        result: Boolean validation result
-    """
-    with _cache_lock:
-        _validation_cache[cache_key] = (result, datetime.now(timezone.utc))
-
-        # Evict oldest entries if cache exceeds max size
-        if len(_validation_cache) > MAX_CACHE_SIZE:
-            # Remove oldest 10% of entries
-            evict_count = MAX_CACHE_SIZE // 10
-            for _ in range(evict_count):
-                _validation_cache.popitem(last=False)  # Remove oldest (FIFO)
-            logger.info(f"Cache size exceeded {MAX_CACHE_SIZE}, evicted {evict_count} oldest entries")
-
-        logger.debug(f"Cached validation result: {cache_key} = {result}")
+#
+# Validators resolve the hierarchy of a resource (workspace/project/BOM up to
+# its organization and tenant) and check it in Python. Hierarchies are cached
+# in app/cache/scope_cache.py: a short-lived in-process LRU in front of a
+# Redis layer shared by all pods, invalidated when resources are deleted or
+# re-parented (see invalidate_after_commit() and the events API).
 
 
 def clear_validation_cache():
     """
-    Clear all cached validation results (thread-safe).
+    Clear this process's cached scope hierarchies.
 
-    Useful for testing or when data changes require cache invalidation.
+    Useful for testing. Data changes should use
+    app.cache.scope_cache.invalidate_after_commit() instead, which also
+    reaches Redis and the other pods.
     """
-    with _cache_lock:
-        _validation_cache.clear()
-        logger.info("Validation cache cleared")
+    get_scope_cache().clear_local()
+    logger.info("Validation cache cleared")
 
 
 # =============================================================================
@@ -157,6 +107,119 @@ def _validate_uuid(value: str, param_name: str) -> None:
         raise ValueError(f"Invalid UUID format for {param_name}: {value}")
 
 
+# =============================================================================
+# Hierarchy Resolution
+# =============================================================================
+
+# One query per kind: the resource joined up to its organization, for many ids
+_HIERARCHY_QUERIES = {
+    "workspace": """
+        SELECT
+            w.id AS workspace_id,
+            w.organization_id,
+            o.control_plane_tenant_id AS tenant_id
+        FROM workspaces w
+        JOIN organizations o ON w.organization_id = o.id
+        WHERE w.id = ANY(CAST(:ids AS UUID[]))
+    """,
+    "project": """
+        SELECT
+            p.id AS project_id,
+            p.workspace_id,
+            w.organization_id,
+            o.control_plane_tenant_id AS tenant_id
+        FROM projects p
+        JOIN workspaces w ON p.workspace_id = w.id
+        JOIN organizations o ON w.organization_id = o.id
+        WHERE p.id = ANY(CAST(:ids AS UUID[]))
+    """,
+    "bom": """
+        SELECT
+            b.id AS bom_id,
+            b.project_id,
+            p.workspace_id,
+            w.organization_id,
+            o.control_plane_tenant_id AS tenant_id
+        FROM boms b
+        JOIN projects p ON b.project_id = p.id
+        JOIN workspaces w ON p.workspace_id = w.id
+        JOIN organizations o ON w.organization_id = o.id
+        WHERE b.id = ANY(CAST(:ids AS UUID[]))
+    """,
+}
+
+_KIND_LABELS = {"workspace": "Workspace", "project": "Project", "bom": "BOM"}
+
+
+def _canonical_uuid(value: Any) -> Optional[str]:
+    """Lowercase hyphenated form of a UUID string, or None if malformed."""
+    try:
+        return str(uuid.UUID(str(value)))
+    except (ValueError, AttributeError, TypeError):
+        return None
+
+
+def _same_id(left: Optional[str], right: Optional[str]) -> bool:
+    return left is not None and right is not None and _canonical_uuid(left) == _canonical_uuid(right)
+
+
+def get_scope_hierarchies(
+    db: Session,
+    kind: str,
+    ids: Iterable[str],
+) -> Dict[str, Dict[str, Optional[str]]]:
+    """
+    Resolve the hierarchies of many workspaces, projects or BOMs at once.
+
+    Cached hierarchies are served from the scope cache; all misses are
+    fetched with a single query and cached. Malformed and unknown ids are
+    left out of the result. Database errors propagate to the caller.
+
+    Args:
+        db: SQLAlchemy database session
+        kind: "workspace", "project" or "bom"
+        ids: Resource UUIDs
+
+    Returns:
+        Dict of id (as given) -> hierarchy, e.g. for a project:
+        {"project_id", "workspace_id", "organization_id", "tenant_id"}
+    """
+    canonical = {}
+    for resource_id in ids:
+        canonical_id = _canonical_uuid(resource_id)
+        if canonical_id is not None:
+            canonical[resource_id] = canonical_id
+    if not canonical:
+        return {}
+
+    cache = get_scope_cache()
+    found = cache.get_many(kind, canonical.values())
+    missing = sorted(set(canonical.values()) - found.keys())
+    if missing:
+        generation = cache.generation()
+        rows = db.execute(text(_HIERARCHY_QUERIES[kind]), {"ids": missing}).fetchall()
+        fetched = {}
+        for row in rows:
+            hierarchy = {
+                key: str(value) if value is not None else None
+                for key, value in row._mapping.items()
+            }
+            fetched[hierarchy[f"{kind}_id"]] = hierarchy
+        cache.set_many(kind, fetched, generation)
+        found.update(fetched)
+        logger.debug(f"Scope hierarchies fetched: kind={kind} requested={len(missing)} found={len(fetched)}")
+
+    return {
+        resource_id: found[canonical_id]
+        for resource_id, canonical_id in canonical.items()
+        if canonical_id in found
+    }
+
+
+def _get_scope_hierarchy(db: Session, kind: str, resource_id: str) -> Optional[Dict[str, Optional[str]]]:
+    return get_scope_hierarchies(db, kind, [resource_id]).get(resource_id)
+
+
 # =============================================================================
 # Individual Scope Validators
 # =============================================================================
@@ -169,11 +232,8 @@ def validate_workspace_in_tenant(
     """
     Validate workspace belongs to tenant via FK chain.
 
-    Query:
-        SELECT 1 FROM workspaces w
-        JOIN organizations o ON w.organization_id = o.id
-        WHERE w.id = :workspace_id
-        AND o.control_plane_tenant_id = :tenant_id
+    Resolves the workspace's hierarchy through get_scope_hierarchies(), so
+    repeat checks are served from the scope cache.
 
     Args:
         db: SQLAlchemy database session
@@ -191,28 +251,9 @@ def validate_workspace_in_tenant(
         logger.warning(f"UUID validation failed: {e}")
         return False
 
-    # Check cache
-    cache_key = f"workspace:{workspace_id}:tenant:{tenant_id}"
-    cached_result = _get_cached_validation(cache_key)
-    if cached_result is not None:
-        return cached_result
-
     try:
-        # SECURITY: Uses parameterized queries - workspace_id/tenant_id are safely escaped
-        query = text("""
-            SELECT 1 FROM workspaces w
-            JOIN organizations o ON w.organization_id = o.id
-            WHERE w.id = :workspace_id
-            AND o.control_plane_tenant_id = :tenant_id
-            LIMIT 1
-        """)
-
-        result = db.execute(query, {
-            "workspace_id": workspace_id,
-            "tenant_id": tenant_id
-        }).fetchone()
-
-        is_valid = result is not None
+        hierarchy = _get_scope_hierarchy(db, "workspace", workspace_id)
+        is_valid = hierarchy is not None and _same_id(hierarchy["tenant_id"], tenant_id)
 
         if not is_valid:
             logger.warning(
@@ -225,9 +266,6 @@ def validate_workspace_in_tenant(
                 f"in tenant_id={tenant_id}"
             )
 
-        # Cache result
-        _set_cached_validation(cache_key, is_valid)
-
         return is_valid
 
     except Exception as e:
@@ -251,10 +289,8 @@ def validate_project_in_workspace(
     """
     Validate project belongs to workspace via FK.
 
-    Query:
-        SELECT 1 FROM projects
-        WHERE id = :project_id
-        AND workspace_id = :workspace_id
+    Resolves the project's hierarchy through get_scope_hierarchies(), so
+    repeat checks are served from the scope cache.
 
     Args:
         db: SQLAlchemy database session
@@ -272,27 +308,9 @@ def validate_project_in_workspace(
         logger.warning(f"UUID validation failed: {e}")
         return False
 
-    # Check cache
-    cache_key = f"project:{project_id}:workspace:{workspace_id}"
-    cached_result = _get_cached_validation(cache_key)
-    if cached_result is not None:
-        return cached_result
-
     try:
-        # SECURITY: Uses parameterized queries - IDs are safely escaped
-        query = text("""
-            SELECT 1 FROM projects
-            WHERE id = :project_id
-            AND workspace_id = :workspace_id
-            LIMIT 1
-        """)
-
-        result = db.execute(query, {
-            "project_id": project_id,
-            "workspace_id": workspace_id
-        }).fetchone()
-
-        is_valid = result is not None
+        hierarchy = _get_scope_hierarchy(db, "project", project_id)
+        is_valid = hierarchy is not None and _same_id(hierarchy["workspace_id"], workspace_id)
 
         if not is_valid:
             logger.warning(
@@ -305,9 +323,6 @@ def validate_project_in_workspace(
                 f"in workspace_id={workspace_id}"
             )
 
-        # Cache result
-        _set_cached_validation(cache_key, is_valid)
-
         return is_valid
 
     except Exception as e:
@@ -331,10 +346,8 @@ def validate_bom_in_project(
     """
     Validate BOM belongs to project via FK.
 
-    Query:
-        SELECT 1 FROM boms
-        WHERE id = :bom_id
-        AND project_id = :project_id
+    Resolves the BOM's hierarchy through get_scope_hierarchies(), so
+    repeat checks are served from the scope cache.
 
     Args:
         db: SQLAlchemy database session
@@ -352,27 +365,9 @@ def validate_bom_in_project(
         logger.warning(f"UUID validation failed: {e}")
         return False
 
-    # Check cache
-    cache_key = f"bom:{bom_id}:project:{project_id}"
-    cached_result = _get_cached_validation(cache_key)
-    if cached_result is not None:
-        return cached_result
-
     try:
-        # SECURITY: Uses parameterized queries - IDs are safely escaped
-        query = text("""
-            SELECT 1 FROM boms
-            WHERE id = :bom_id
-            AND project_id = :project_id
-            LIMIT 1
-        """)
-
-        result = db.execute(query, {
-            "bom_id": bom_id,
-            "project_id": project_id
-        }).fetchone()
-
-        is_valid = result is not None
+        hierarchy = _get_scope_hierarchy(db, "bom", bom_id)
+        is_valid = hierarchy is not None and _same_id(hierarchy["project_id"], project_id)
 
         if not is_valid:
             logger.warning(
@@ -385,9 +380,6 @@ def validate_bom_in_project(
                 f"in project_id={project_id}"
             )
 
-        # Cache result
-        _set_cached_validation(cache_key, is_valid)
-
         return is_valid
 
     except Exception as e:
@@ -437,6 +429,7 @@ def validate_full_scope_chain(
             "workspace_valid": bool | None,
             "project_valid": bool | None,
             "bom_valid": bool | None,
+            "hierarchy": Dict | None,  # Resolved IDs of the deepest resource, when valid
             "errors": List[str]  # List of validation error messages
         }
 
@@ -464,6 +457,7 @@ def validate_full_scope_chain(
         "workspace_valid": None,
         "project_valid": None,
         "bom_valid": None,
+        "hierarchy": None,
         "errors": errors
     }
 
@@ -564,194 +558,21 @@ def validate_full_scope_chain(
         validation_result["valid"] = False
         return validation_result
 
-    # Validate UUID formats for all provided IDs
+    # Workspace, project or BOM: one lookup of the deepest resource covers the chain
+    if workspace_id or project_id or bom_id:
+        return validate_scope_chains(
+            db,
+            tenant_id,
+            [{"workspace_id": workspace_id, "project_id": project_id, "bom_id": bom_id}],
+        )[0]
+
     try:
         _validate_uuid(tenant_id, "tenant_id")
-        if workspace_id:
-            _validate_uuid(workspace_id, "workspace_id")
-        if project_id:
-            _validate_uuid(project_id, "project_id")
-        if bom_id:
-            _validate_uuid(bom_id, "bom_id")
     except ValueError as e:
         errors.append(str(e))
         validation_result["valid"] = False
         return validation_result
 
-    # If BOM is provided, we need to validate the entire chain
-    if bom_id:
-        # First, fetch the BOM and its project_id
-        try:
-            query = text("""
-                SELECT
-                    b.project_id,
-                    p.workspace_id,
-                    w.organization_id,
-                    o.control_plane_tenant_id
-                FROM boms b
-                JOIN projects p ON b.project_id = p.id
-                JOIN workspaces w ON p.workspace_id = w.id
-                JOIN organizations o ON w.organization_id = o.id
-                WHERE b.id = :bom_id
-                LIMIT 1
-            """)
-
-            result = db.execute(query, {"bom_id": bom_id}).fetchone()
-
-            if not result:
-                errors.append(f"BOM not found: {bom_id}")
-                validation_result["valid"] = False
-                validation_result["bom_valid"] = False
-                return validation_result
-
-            # Extract IDs from the chain
-            fetched_project_id = str(result[0])
-            fetched_workspace_id = str(result[1])
-            fetched_organization_id = str(result[2])
-            fetched_tenant_id = str(result[3])
-
-            # Validate tenant matches
-            if fetched_tenant_id != tenant_id:
-                errors.append(
-                    f"BOM {bom_id} does not belong to tenant {tenant_id} "
-                    f"(belongs to {fetched_tenant_id})"
-                )
-                validation_result["valid"] = False
-                validation_result["bom_valid"] = False
-            else:
-                validation_result["bom_valid"] = True
-                logger.debug(
-                    f"Full BOM chain validated: bom_id={bom_id}, "
-                    f"project_id={fetched_project_id}, "
-                    f"workspace_id={fetched_workspace_id}, "
-                    f"tenant_id={tenant_id}"
-                )
-
-            # If specific project_id or workspace_id was provided, validate they match
-            if project_id and fetched_project_id != project_id:
-                errors.append(
-                    f"BOM {bom_id} belongs to project {fetched_project_id}, "
-                    f"not {project_id}"
-                )
-                validation_result["valid"] = False
-                validation_result["project_valid"] = False
-            elif project_id:
-                validation_result["project_valid"] = True
-
-            if workspace_id and fetched_workspace_id != workspace_id:
-                errors.append(
-                    f"BOM {bom_id} belongs to workspace {fetched_workspace_id}, "
-                    f"not {workspace_id}"
-                )
-                validation_result["valid"] = False
-                validation_result["workspace_valid"] = False
-            elif workspace_id:
-                validation_result["workspace_valid"] = True
-
-        except Exception as e:
-            logger.error(
-                f"Error validating BOM chain: {e}",
-                exc_info=True,
-                extra={
-                    "bom_id": bom_id,
-                    "tenant_id": tenant_id,
-                    "error_type": type(e).__name__
-                }
-            )
-            errors.append(f"Database error during BOM validation: {type(e).__name__}")
-            validation_result["valid"] = False
-            validation_result["bom_valid"] = False
-
-        return validation_result
-
-    # If project_id is provided (without BOM), validate project → workspace → tenant
-    if project_id:
-        try:
-            query = text("""
-                SELECT
-                    p.workspace_id,
-                    w.organization_id,
-                    o.control_plane_tenant_id
-                FROM projects p
-                JOIN workspaces w ON p.workspace_id = w.id
-                JOIN organizations o ON w.organization_id = o.id
-                WHERE p.id = :project_id
-                LIMIT 1
-            """)
-
-            result = db.execute(query, {"project_id": project_id}).fetchone()
-
-            if not result:
-                errors.append(f"Project not found: {project_id}")
-                validation_result["valid"] = False
-                validation_result["project_valid"] = False
-                return validation_result
-
-            fetched_workspace_id = str(result[0])
-            fetched_organization_id = str(result[1])
-            fetched_tenant_id = str(result[2])
-
-            # Validate tenant matches
-            if fetched_tenant_id != tenant_id:
-                errors.append(
-                    f"Project {project_id} does not belong to tenant {tenant_id} "
-                    f"(belongs to {fetched_tenant_id})"
-                )
-                validation_result["valid"] = False
-                validation_result["project_valid"] = False
-            else:
-                validation_result["project_valid"] = True
-                logger.debug(
-                    f"Project chain validated: project_id={project_id}, "
-                    f"workspace_id={fetched_workspace_id}, "
-                    f"tenant_id={tenant_id}"
-                )
-
-            # If specific workspace_id was provided, validate it matches
-            if workspace_id and fetched_workspace_id != workspace_id:
-                errors.append(
-                    f"Project {project_id} belongs to workspace {fetched_workspace_id}, "
-                    f"not {workspace_id}"
-                )
-                validation_result["valid"] = False
-                validation_result["workspace_valid"] = False
-            elif workspace_id:
-                validation_result["workspace_valid"] = True
-
-        except Exception as e:
-            logger.error(
-                f"Error validating project chain: {e}",
-                exc_info=True,
-                extra={
-                    "project_id": project_id,
-                    "tenant_id": tenant_id,
-                    "error_type": type(e).__name__
-                }
-            )
-            errors.append(f"Database error during project validation: {type(e).__name__}")
-            validation_result["valid"] = False
-            validation_result["project_valid"] = False
-
-        return validation_result
-
-    # If only workspace_id is provided, validate workspace → tenant
-    if workspace_id:
-        is_valid = validate_workspace_in_tenant(
-            db=db,
-            workspace_id=workspace_id,
-            tenant_id=tenant_id
-        )
-
-        validation_result["workspace_valid"] = is_valid
-
-        if not is_valid:
-            errors.append(
-                f"Workspace {workspace_id} does not belong to tenant {tenant_id}"
-            )
-            validation_result["valid"] = False
-
-        return validation_result
-
     # If only tenant_id is provided, just validate it exists
     try:
         query = text("""
@@ -783,6 +604,150 @@ def validate_full_scope_chain(
     return validation_result
 
 
+def validate_scope_chains(
+    db: Session,
+    tenant_id: str,
+    chains: List[Dict[str, Optional[str]]],
+) -> List[Dict[str, Any]]:
+    """
+    Validate many scope chains for one tenant in a batch.
+
+    Each chain is a dict with optional "workspace_id", "project_id" and
+    "bom_id". Only the deepest resource of a chain is looked up: its
+    hierarchy (BOM -> project -> workspace -> organization -> tenant) comes
+    from a single joined query, and the other IDs of the chain are checked
+    against it. Lookups are grouped by kind, so N chains cost at most one
+    query per kind on a cold cache and none on a warm one.
+
+    Args:
+        db: SQLAlchemy database session
+        tenant_id: Control Plane tenant UUID (required)
+        chains: Chains to validate
+
+    Returns:
+        One result per chain, in order, shaped like validate_full_scope_chain()
+    """
+    results: List[Dict[str, Any]] = []
+    pending: Dict[str, Dict[str, List[int]]] = {kind: {} for kind in _KIND_LABELS}
+
+    for index, chain in enumerate(chains):
+        errors: List[str] = []
+        result = {
+            "valid": True,
+            "tenant_id": tenant_id,
+            "workspace_valid": None,
+            "project_valid": None,
+            "bom_valid": None,
+            "hierarchy": None,
+            "errors": errors
+        }
+        results.append(result)
+
+        if not tenant_id:
+            errors.append("tenant_id is required")
+            result["valid"] = False
+            continue
+
+        try:
+            _validate_uuid(tenant_id, "tenant_id")
+            for kind in ("workspace", "project", "bom"):
+                if chain.get(f"{kind}_id"):
+                    _validate_uuid(chain[f"{kind}_id"], f"{kind}_id")
+        except ValueError as e:
+            errors.append(str(e))
+            result["valid"] = False
+            continue
+
+        kind = next((k for k in ("bom", "project", "workspace") if chain.get(f"{k}_id")), None)
+        if kind is None:
+            errors.append("workspace_id, project_id or bom_id is required")
+            result["valid"] = False
+            continue
+        pending[kind].setdefault(chain[f"{kind}_id"], []).append(index)
+
+    for kind, by_id in pending.items():
+        if not by_id:
+            continue
+        label = _KIND_LABELS[kind]
+        try:
+            hierarchies = get_scope_hierarchies(db, kind, by_id.keys())
+        except Exception as e:
+            logger.error(
+                f"Error validating {kind} chain: {e}",
+                exc_info=True,
+                extra={
+                    f"{kind}_ids": list(by_id),
+                    "tenant_id": tenant_id,
+                    "error_type": type(e).__name__
+                }
+            )
+            for indexes in by_id.values():
+                for index in indexes:
+                    results[index]["errors"].append(
+                        f"Database error during {label} validation: {type(e).__name__}"
+                    )
+                    results[index]["valid"] = False
+                    results[index][f"{kind}_valid"] = False
+            continue
+
+        for resource_id, indexes in by_id.items():
+            for index in indexes:
+                _check_chain(
+                    results[index], chains[index], kind, resource_id, hierarchies.get(resource_id), tenant_id
+                )
+
+    return results
+
+
+def _check_chain(
+    result: Dict[str, Any],
+    chain: Dict[str, Optional[str]],
+    kind: str,
+    resource_id: str,
+    hierarchy: Optional[Dict[str, Optional[str]]],
+    tenant_id: str,
+) -> None:
+    """Check a chain's IDs against the resolved hierarchy of its deepest resource."""
+    errors = result["errors"]
+    label = _KIND_LABELS[kind]
+
+    if hierarchy is None:
+        errors.append(f"{label} not found: {resource_id}")
+        result["valid"] = False
+        result[f"{kind}_valid"] = False
+        return
+
+    # Validate tenant matches
+    if not _same_id(hierarchy["tenant_id"], tenant_id):
+        errors.append(
+            f"{label} {resource_id} does not belong to tenant {tenant_id} "
+            f"(belongs to {hierarchy['tenant_id']})"
+        )
+        result["valid"] = False
+        result[f"{kind}_valid"] = False
+    else:
+        result[f"{kind}_valid"] = True
+        logger.debug(f"Scope chain validated: {hierarchy}")
+
+    # If specific parent IDs were provided, validate they match
+    for parent in ("project", "workspace"):
+        parent_id = chain.get(f"{parent}_id")
+        if parent == kind or not parent_id or f"{parent}_id" not in hierarchy:
+            continue
+        if not _same_id(hierarchy[f"{parent}_id"], parent_id):
+            errors.append(
+                f"{label} {resource_id} belongs to {parent} {hierarchy[f'{parent}_id']}, "
+                f"not {parent_id}"
+            )
+            result["valid"] = False
+            result[f"{parent}_valid"] = False
+        else:
+            result[f"{parent}_valid"] = True
+
+    if result["valid"]:
+        result["hierarchy"] = dict(hierarchy)
+
+
 # =============================================================================
 # Convenience Functions
 # =============================================================================
@@ -806,35 +771,12 @@ def get_bom_hierarchy(db: Session, bom_id: str) -> Optional[Dict[str, str]]:
         }
     """
     try:
-        query = text("""
-            SELECT
-                b.id as bom_id,
-                b.project_id,
-                p.workspace_id,
-                w.organization_id,
-                o.control_plane_tenant_id as tenant_id
-            FROM boms b
-            JOIN projects p ON b.project_id = p.id
-            JOIN workspaces w ON p.workspace_id = w.id
-            JOIN organizations o ON w.organization_id = o.id
-            WHERE b.id = :bom_id
-            LIMIT 1
-        """)
+        hierarchy = _get_scope_hierarchy(db, "bom", bom_id)
 
-        result = db.execute(query, {"bom_id": bom_id}).fetchone()
-
-        if not result:
+        if hierarchy is None:
             logger.warning(f"BOM not found: {bom_id}")
             return None
 
-        hierarchy = {
-            "bom_id": str(result[0]),
-            "project_id": str(result[1]),
-            "workspace_id": str(result[2]),
-            "organization_id": str(result[3]),
-            "tenant_id": str(result[4])
-        }
-
         logger.debug(f"BOM hierarchy fetched: {hierarchy}")
         return hierarchy
 
@@ -868,32 +810,12 @@ def get_project_hierarchy(db: Session, project_id: str) -> Optional[Dict[str, st
         }
     """
     try:
-        query = text("""
-            SELECT
-                p.id as project_id,
-                p.workspace_id,
-                w.organization_id,
-                o.control_plane_tenant_id as tenant_id
-            FROM projects p
-            JOIN workspaces w ON p.workspace_id = w.id
-            JOIN organizations o ON w.organization_id = o.id
-            WHERE p.id = :project_id
-            LIMIT 1
-        """)
-
-        result = db.execute(query, {"project_id": project_id}).fetchone()
+        hierarchy = _get_scope_hierarchy(db, "project", project_id)
 
-        if not result:
+        if hierarchy is None:
             logger.warning(f"Project not found: {project_id}")
             return None
 
-        hierarchy = {
-            "project_id": str(result[0]),
-            "workspace_id": str(result[1]),
-            "organization_id": str(result[2]),
-            "tenant_id": str(result[3])
-        }
-
         logger.debug(f"Project hierarchy fetched: {hierarchy}")
         return hierarchy
 
@@ -49,9 +49,11 @@ from datetime import datetime
 from typing import Dict, Any, Optional, Callable
 from functools import wraps
 from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import Receive, Scope, Send
 import time
 
+from app.core.request_context import ASGIMiddleware, RequestContext
+
 # Optional dependencies (fail gracefully if not installed)
 try:
     from pythonjsonlogger import jsonlogger
@@ -431,14 +433,14 @@ def with_logging(operation: str, **default_context):
 # FastAPI Request Logging Middleware
 # ============================================================================
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+class RequestLoggingMiddleware(ASGIMiddleware):
     """
     Middleware to log all API requests and responses.
 
     Logs:
     - Request method, path, query params
     - Response status code
-    - Request duration
+    - Request duration (including the response body, e.g. a whole SSE stream)
     - Client IP
     - User agent
     - Tenant/user context (if available)
@@ -453,30 +455,28 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         super().__init__(app)
         self.logger = get_logger("app.api.requests")
 
-    async def dispatch(self, request: Request, call_next):
-        # Generate request ID
-        request_id = f"req-{int(time.time() * 1000)}"
-
-        # Capture request start time
-        start_time = time.time()
+    async def handle(self, scope: Scope, receive: Receive, send: Send, ctx: RequestContext) -> None:
+        # Request ID is assigned once per request by the shared RequestContext
+        request_id = ctx.request_id
 
         # Extract client info
-        client_ip = request.client.host if request.client else "unknown"
-        user_agent = request.headers.get("user-agent", "unknown")
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
+        user_agent = ctx.headers.get("user-agent", "unknown")
 
         # Extract tenant/user context from headers if available
-        organization_id = request.headers.get("x-tenant-id")
-        user_id = request.headers.get("x-user-id")
+        organization_id = ctx.headers.get("x-tenant-id")
+        user_id = ctx.headers.get("x-user-id")
 
         # Log request
         self.logger.info(
-            f"{request.method} {request.url.path}",
+            f"{ctx.method} {ctx.path}",
             extra={
                 'event': 'request_started',
                 'request_id': request_id,
-                'method': request.method,
-                'path': request.url.path,
-                'query_params': str(request.query_params),
+                'method': ctx.method,
+                'path': ctx.path,
+                'query_params': scope.get("query_string", b"").decode("latin-1"),
                 'client_ip': client_ip,
                 'user_agent': user_agent,
                 'organization_id': organization_id,
@@ -486,51 +486,18 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
 
         # Process request
         try:
-            response = await call_next(request)
-
-            # Calculate duration
-            duration_ms = (time.time() - start_time) * 1000
-
-            # Determine log level based on status code
-            if response.status_code >= 500:
-                level = logging.ERROR
-            elif response.status_code >= 400:
-                level = logging.WARNING
-            else:
-                level = logging.INFO
-
-            # Log response
-            self.logger.log(
-                level,
-                f"{request.method} {request.url.path} -> {response.status_code}",
-                extra={
-                    'event': 'request_completed',
-                    'request_id': request_id,
-                    'method': request.method,
-                    'path': request.url.path,
-                    'status_code': response.status_code,
-                    'duration_ms': round(duration_ms, 2),
-                    'client_ip': client_ip,
-                    'organization_id': organization_id,
-                    'user_id': user_id
-                }
-            )
-
-            # Add request ID to response headers
-            response.headers['X-Request-ID'] = request_id
-
-            return response
+            await self.app(scope, receive, send)
 
         except Exception as e:
-            duration_ms = (time.time() - start_time) * 1000
+            duration_ms = ctx.elapsed * 1000
 
             log_exception(
                 self.logger,
-                f"{request.method} {request.url.path} failed",
+                f"{ctx.method} {ctx.path} failed",
                 e,
                 request_id=request_id,
-                method=request.method,
-                path=request.url.path,
+                method=ctx.method,
+                path=ctx.path,
                 duration_ms=round(duration_ms, 2),
                 client_ip=client_ip,
                 organization_id=organization_id,
@@ -539,6 +506,35 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
 
             raise
 
+        # Calculate duration
+        duration_ms = ctx.elapsed * 1000
+        status_code = ctx.status_code or 0
+
+        # Determine log level based on status code
+        if status_code >= 500:
+            level = logging.ERROR
+        elif status_code >= 400:
+            level = logging.WARNING
+        else:
+            level = logging.INFO
+
+        # Log response
+        self.logger.log(
+            level,
+            f"{ctx.method} {ctx.path} -> {status_code}",
+            extra={
+                'event': 'request_completed',
+                'request_id': request_id,
+                'method': ctx.method,
+                'path': ctx.path,
+                'status_code': status_code,
+                'duration_ms': round(duration_ms, 2),
+                'client_ip': client_ip,
+                'organization_id': organization_id,
+                'user_id': user_id
+            }
+        )
+
 
 # ============================================================================
 # Pre-configured Loggers for Common Areas
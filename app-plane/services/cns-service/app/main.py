@@ -16,9 +16,10 @@ from app.config import settings
 from app import __version__
 from app.core.validation import ConfigValidator, ConfigValidationError
 from app.core.middleware import CorrelationIDMiddleware
+from app.core.responses import FastJSONResponse
 
-# Import API routers
-from app.api import api_router
+# API routers are imported by include_api_routers() below
+from app.api import include_api_routers
 
 # Import comprehensive logging and error handling
 from app.logging_config import (
@@ -338,6 +339,42 @@ async def lifespan(app: FastAPI):
         logger.warning("[WARN] Continuing without single component stream consumer")
         single_component_stream_task = None
 
+    # Start transactional outbox relay (publishes event_outbox rows to RabbitMQ)
+    from app.workers.outbox_relay import start_outbox_relay, stop_outbox_relay
+    outbox_relay_task = None
+    try:
+        outbox_relay_task = start_outbox_relay()
+        if outbox_relay_task:
+            logger.info("[OK] Outbox relay started successfully")
+    except Exception as e:
+        logger.error(f"[FAIL] Failed to start outbox relay: {e}", exc_info=True)
+        logger.warning("[WARN] Continuing without outbox relay")
+        outbox_relay_task = None
+
+    # Listen for auth context invalidations (membership/role changes on any pod)
+    from app.cache.auth_context_cache import start_auth_context_listener, stop_auth_context_listener
+    auth_context_listener_task = None
+    if settings.redis_enabled:
+        try:
+            auth_context_listener_task = start_auth_context_listener()
+            if auth_context_listener_task:
+                logger.info("[OK] Auth context invalidation listener started")
+        except Exception as e:
+            logger.error(f"[FAIL] Failed to start auth context listener: {e}", exc_info=True)
+            auth_context_listener_task = None
+
+    # Listen for scope cache invalidations (resource deletes on any pod)
+    from app.cache.scope_cache import start_scope_cache_listener, stop_scope_cache_listener
+    scope_cache_listener_task = None
+    if settings.redis_enabled:
+        try:
+            scope_cache_listener_task = start_scope_cache_listener()
+            if scope_cache_listener_task:
+                logger.info("[OK] Scope cache invalidation listener started")
+        except Exception as e:
+            logger.error(f"[FAIL] Failed to start scope cache listener: {e}", exc_info=True)
+            scope_cache_listener_task = None
+
     logger.info("CNS service started successfully")
 
     yield
@@ -355,6 +392,15 @@ async def lifespan(app: FastAPI):
     if single_component_stream_task:
         await stop_single_component_stream_consumer()
 
+    if outbox_relay_task:
+        await stop_outbox_relay()
+
+    if auth_context_listener_task:
+        await stop_auth_context_listener()
+
+    if scope_cache_listener_task:
+        await stop_scope_cache_listener()
+
     # Shutdown
     logger.info("Shutting down CNS service...")
 
@@ -366,6 +412,16 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"[FAIL] Error shutting down observability: {e}")
 
+    # Flush buffered RabbitMQ events (async publisher); leftovers spill to disk
+    try:
+        from shared.event_bus import get_async_event_bus
+        async_bus = get_async_event_bus()
+        if async_bus is not None:
+            await async_bus.close()
+            logger.info("✅ Event publisher flushed")
+    except Exception as e:
+        logger.error(f"❌ Error flushing event publisher: {e}")
+
     # Close database connections
     from app.models.base import get_database
     try:
@@ -412,6 +468,7 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    default_response_class=FastJSONResponse,
     lifespan=lifespan
 )
 
@@ -635,7 +692,7 @@ app.add_exception_handler(Exception, error_handler_generic)
 
 
 # Include API routers
-app.include_router(api_router, prefix="/api")
+include_api_routers(app, prefix="/api")
 
 # Include Prometheus metrics router (observability)
 if OBSERVABILITY_AVAILABLE:
@@ -28,20 +28,22 @@ Usage:
     setup_auth_middleware(app)
 """
 
+import asyncio
+import dataclasses
 import hashlib
 import hmac
 import logging
 import secrets
 import time
-from collections import defaultdict
-from typing import Callable, Dict, List, Optional, Set
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, List, Optional, Set
 
 import httpx
 from fastapi import FastAPI, Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from app.core.authorization import AuthContext, AuthContextError, AuthErrorCode, Role
+from app.core.request_context import ASGIMiddleware, RequestContext
 from app.config import settings
 
 logger = logging.getLogger(__name__)
@@ -397,14 +399,25 @@ async def validate_supabase_token(token: str, verify_signature: bool = True) ->
 # JWKS cache: stores {domain: {"keys": [...], "fetched_at": timestamp}}
 _jwks_cache: Dict[str, dict] = {}
 _JWKS_CACHE_TTL_SECONDS = 3600  # 1 hour
+# Minimum gap between JWKS fetches triggered by an unknown kid (key rotation)
+_JWKS_MIN_REFETCH_SECONDS = 30
+# Last unknown-kid refetch attempt per domain, successful or not
+_jwks_refetch_attempted_at: Dict[str, float] = {}
 
+# RSA public keys built once per JWKS fetch: {domain: {kid: public_key}}
+_rsa_key_cache: Dict[str, Dict[str, Any]] = {}
+_jwks_refresh_tasks: Dict[str, asyncio.Task] = {}
 
-async def _fetch_jwks(domain: str) -> Optional[dict]:
+
+async def _fetch_jwks(domain: str, force: bool = False) -> Optional[dict]:
     """
     Fetch JWKS from Auth0/Keycloak domain with caching.
 
+    Also rebuilds the per-kid RSA key cache for the domain.
+
     Args:
         domain: Auth0/Keycloak domain (e.g., your-tenant.us.auth0.com or localhost:8080/realms/ananta-saas)
+        force: Skip the cache and fetch now
 
     Returns:
         JWKS dict with "keys" array, or None on failure
@@ -413,7 +426,7 @@ async def _fetch_jwks(domain: str) -> Optional[dict]:
 
     # Check cache
     cached = _jwks_cache.get(domain)
-    if cached and (now - cached.get("fetched_at", 0)) < _JWKS_CACHE_TTL_SECONDS:
+    if not force and cached and (now - cached.get("fetched_at", 0)) < _JWKS_CACHE_TTL_SECONDS:
         logger.debug(f"[AuthMiddleware] Using cached JWKS for {domain}")
         return cached
 
@@ -435,6 +448,7 @@ async def _fetch_jwks(domain: str) -> Optional[dict]:
             # Cache with timestamp
             jwks["fetched_at"] = now
             _jwks_cache[domain] = jwks
+            _rsa_key_cache[domain] = _build_rsa_keys(jwks)
 
             logger.debug(f"[AuthMiddleware] Fetched {len(jwks.get('keys', []))} keys from JWKS")
             return jwks
@@ -447,49 +461,76 @@ async def _fetch_jwks(domain: str) -> Optional[dict]:
         return None
 
 
-def _get_rsa_public_key(jwks: dict, kid: str):
-    """
-    Extract RSA public key from JWKS matching the key ID.
+def _rsa_public_key_from_jwk(key: dict):
+    """Build an RSA public key object from a JWK's n (modulus) and e (exponent)."""
+    from cryptography.hazmat.backends import default_backend
+    from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicNumbers
+    import base64
 
-    Args:
-        jwks: JWKS dict with "keys" array
-        kid: Key ID to match
+    n_bytes = base64.urlsafe_b64decode(key["n"] + "==")
+    e_bytes = base64.urlsafe_b64decode(key["e"] + "==")
 
-    Returns:
-        RSA public key object or None
-    """
-    try:
-        from cryptography.hazmat.primitives.asymmetric import rsa
-        from cryptography.hazmat.backends import default_backend
-        import base64
+    n = int.from_bytes(n_bytes, byteorder="big")
+    e = int.from_bytes(e_bytes, byteorder="big")
 
-        for key in jwks.get("keys", []):
-            if key.get("kid") == kid and key.get("kty") == "RSA":
-                # Build RSA public key from n (modulus) and e (exponent)
-                n_bytes = base64.urlsafe_b64decode(key["n"] + "==")
-                e_bytes = base64.urlsafe_b64decode(key["e"] + "==")
+    return RSAPublicNumbers(e, n).public_key(default_backend())
 
-                n = int.from_bytes(n_bytes, byteorder="big")
-                e = int.from_bytes(e_bytes, byteorder="big")
 
-                from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicNumbers
-                public_numbers = RSAPublicNumbers(e, n)
-                public_key = public_numbers.public_key(default_backend())
-
-                return public_key
+def _build_rsa_keys(jwks: dict) -> Dict[str, Any]:
+    """Build every RSA key in a JWKS once, keyed by kid."""
+    keys = {}
+    for key in jwks.get("keys", []):
+        kid = key.get("kid")
+        if kid and key.get("kty") == "RSA":
+            try:
+                keys[kid] = _rsa_public_key_from_jwk(key)
+            except Exception as e:
+                logger.error(f"[AuthMiddleware] Failed to build RSA public key for kid={kid}: {e}")
+    return keys
 
-        logger.warning(f"[AuthMiddleware] No matching key found for kid={kid}")
-        return None
 
-    except ImportError:
-        logger.error(
-            "[AuthMiddleware] cryptography package not installed. "
-            "Install with: pip install cryptography"
+def _schedule_jwks_refresh(domain: str) -> None:
+    """Refresh a domain's JWKS in the background (one refresh at a time)."""
+    task = _jwks_refresh_tasks.get(domain)
+    if task is None or task.done():
+        logger.debug(f"[AuthMiddleware] Refreshing JWKS for {domain} ahead of expiry")
+        _jwks_refresh_tasks[domain] = asyncio.get_running_loop().create_task(
+            _fetch_jwks(domain, force=True)
         )
-        return None
-    except Exception as e:
-        logger.error(f"[AuthMiddleware] Failed to build RSA public key: {e}")
-        return None
+
+
+async def _get_signing_key(domain: str, kid: str):
+    """
+    RSA public key for `kid`, from the per-kid key cache.
+
+    Keys are built once per JWKS fetch. Within JWKS_REFRESH_AHEAD_SECONDS of
+    the JWKS TTL a background refresh starts while the current keys keep
+    serving. An unknown kid (key rotation) triggers a fetch, at most once per
+    _JWKS_MIN_REFETCH_SECONDS since the last fetch or attempt, so a failing
+    JWKS endpoint isn't hit on every request.
+
+    Returns:
+        RSA public key object or None
+    """
+    cached = _jwks_cache.get(domain)
+    age = time.time() - cached.get("fetched_at", 0) if cached else None
+
+    if age is None or age >= _JWKS_CACHE_TTL_SECONDS:
+        if not await _fetch_jwks(domain, force=True):
+            return None
+    elif age >= _JWKS_CACHE_TTL_SECONDS - settings.jwks_refresh_ahead_seconds:
+        _schedule_jwks_refresh(domain)
+
+    public_key = _rsa_key_cache.get(domain, {}).get(kid)
+    if public_key is None and age is not None and age >= _JWKS_MIN_REFETCH_SECONDS:
+        now = time.time()
+        if now - _jwks_refetch_attempted_at.get(domain, 0) < _JWKS_MIN_REFETCH_SECONDS:
+            return None
+        _jwks_refetch_attempted_at[domain] = now
+        logger.info(f"[AuthMiddleware] Unknown kid={kid}, refetching JWKS for {domain}")
+        if await _fetch_jwks(domain, force=True):
+            public_key = _rsa_key_cache.get(domain, {}).get(kid)
+    return public_key
 
 
 def _verify_rs256_signature(token: str, public_key) -> bool:
@@ -593,13 +634,8 @@ async def validate_auth0_token(token: str) -> Optional[dict]:
             logger.warning("[AuthMiddleware] Auth0 token missing kid")
             return None
 
-        # Fetch JWKS and get public key
-        jwks = await _fetch_jwks(auth0_domain)
-        if not jwks:
-            logger.error("[AuthMiddleware] Failed to fetch Auth0 JWKS")
-            return None
-
-        public_key = _get_rsa_public_key(jwks, kid)
+        # Get the pre-built public key for this kid (fetches JWKS if needed)
+        public_key = await _get_signing_key(auth0_domain, kid)
         if not public_key:
             logger.warning(f"[AuthMiddleware] No matching key in JWKS for kid={kid}")
             return None
@@ -1189,11 +1225,100 @@ async def build_auth_context_from_token(claims: dict, provider: str) -> AuthCont
     )
 
 
+# =============================================================================
+# Verified Token Cache
+# =============================================================================
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of verified bearer tokens.
+
+    Maps sha256(token) to the AuthContext built for it, so repeat requests
+    with the same token skip signature verification, claim parsing and the
+    auto-provisioning lookups. An entry is dropped at the token's `exp`;
+    tokens without `exp` are not cached.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, tuple[float, AuthContext]]" = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> Optional[AuthContext]:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, auth_ctx = entry
+        if time.time() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        # Copy so per-request changes never leak into the cached context
+        return dataclasses.replace(auth_ctx)
+
+    def put(self, token: str, auth_ctx: AuthContext) -> None:
+        exp = (auth_ctx.extra or {}).get("exp")
+        if not isinstance(exp, (int, float)) or exp <= time.time() or self.max_size <= 0:
+            return
+        key = self._key(token)
+        self._entries[key] = (float(exp), dataclasses.replace(auth_ctx))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)  # Evict least recently used
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_verified_tokens = VerifiedTokenCache(getattr(settings, "auth_token_cache_size", 10000))
+
+
+def _apply_auth0_header_fallbacks(auth_ctx: AuthContext, request: Request) -> AuthContext:
+    """Fill org/email from request headers when an Auth0 access token lacks them."""
+    needs_rebuild = False
+    new_org_id = auth_ctx.organization_id
+    new_email = auth_ctx.email
+
+    if not auth_ctx.organization_id:
+        # Try X-Organization-ID first, then X-Tenant-Id (same entity, different names)
+        header_org_id = request.headers.get(ORG_ID_HEADER) or request.headers.get(TENANT_ID_HEADER)
+        if header_org_id:
+            logger.info(f"[AuthMiddleware] Using org header: {header_org_id}")
+            new_org_id = header_org_id
+            needs_rebuild = True
+
+    if not auth_ctx.email:
+        header_email = request.headers.get(USER_EMAIL_HEADER)
+        if header_email:
+            logger.info(f"[AuthMiddleware] Using X-User-Email header: {header_email}")
+            new_email = header_email
+            needs_rebuild = True
+
+    if needs_rebuild:
+        auth_ctx = AuthContext(
+            user_id=auth_ctx.user_id,
+            organization_id=new_org_id,
+            role=auth_ctx.role,
+            email=new_email,
+            username=auth_ctx.username,
+            auth_provider=auth_ctx.auth_provider,
+            extra=auth_ctx.extra,
+        )
+    return auth_ctx
+
+
 # =============================================================================
 # Middleware Implementation
 # =============================================================================
 
-class AuthMiddleware(BaseHTTPMiddleware):
+class AuthMiddleware(ASGIMiddleware):
     """
     FastAPI middleware for authentication.
 
@@ -1288,20 +1413,22 @@ class AuthMiddleware(BaseHTTPMiddleware):
 
         return "unknown"
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable[[Request], Response]
-    ) -> Response:
+    async def handle(self, scope: Scope, receive: Receive, send: Send, ctx: RequestContext) -> None:
+        response = await self.authenticate(Request(scope, receive))
+        if response is not None:
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+    async def authenticate(self, request: Request) -> Optional[Response]:
         """
-        Process the request through the middleware.
+        Authenticate the request and attach request.state.auth_context.
 
         Args:
             request: Incoming request
-            call_next: Next middleware/handler in chain
 
         Returns:
-            Response from downstream handler
+            Error response (401/429) to send instead, or None to continue
         """
         path = request.url.path
         method = request.method
@@ -1379,7 +1506,7 @@ class AuthMiddleware(BaseHTTPMiddleware):
             )
 
         # Continue to handler
-        return await call_next(request)
+        return None
 
     async def _authenticate_request(self, request: Request) -> Optional[AuthContext]:
         """
@@ -1423,6 +1550,13 @@ class AuthMiddleware(BaseHTTPMiddleware):
                     auth_provider="admin_token",
                 )
 
+            # Token already verified and not yet expired
+            cached_ctx = _verified_tokens.get(token)
+            if cached_ctx is not None:
+                if cached_ctx.auth_provider == "auth0":
+                    return _apply_auth0_header_fallbacks(cached_ctx, request)
+                return cached_ctx
+
             # Determine provider by checking JWT algorithm
             import json
             try:
@@ -1440,45 +1574,22 @@ class AuthMiddleware(BaseHTTPMiddleware):
                         if claims:
                             logger.info(f"[AuthMiddleware] Auth0 validation SUCCESS: sub={claims.get('sub')}")
                             auth_ctx = await build_auth_context_from_token(claims, "auth0")
+                            # Without an org the context came from a failed auto-provision;
+                            # don't cache it so the next request retries
+                            if auth_ctx.organization_id:
+                                _verified_tokens.put(token, auth_ctx)
 
                             # Use header fallbacks for Auth0 tokens (email/org often not in access tokens)
-                            needs_rebuild = False
-                            new_org_id = auth_ctx.organization_id
-                            new_email = auth_ctx.email
-
-                            if not auth_ctx.organization_id:
-                                # Try X-Organization-ID first, then X-Tenant-Id (same entity, different names)
-                                header_org_id = request.headers.get(ORG_ID_HEADER) or request.headers.get(TENANT_ID_HEADER)
-                                if header_org_id:
-                                    logger.info(f"[AuthMiddleware] Using org header: {header_org_id}")
-                                    new_org_id = header_org_id
-                                    needs_rebuild = True
-
-                            if not auth_ctx.email:
-                                header_email = request.headers.get(USER_EMAIL_HEADER)
-                                if header_email:
-                                    logger.info(f"[AuthMiddleware] Using X-User-Email header: {header_email}")
-                                    new_email = header_email
-                                    needs_rebuild = True
-
-                            if needs_rebuild:
-                                auth_ctx = AuthContext(
-                                    user_id=auth_ctx.user_id,
-                                    organization_id=new_org_id,
-                                    role=auth_ctx.role,
-                                    email=new_email,
-                                    username=auth_ctx.username,
-                                    auth_provider=auth_ctx.auth_provider,
-                                    extra=auth_ctx.extra,
-                                )
-                            return auth_ctx
+                            return _apply_auth0_header_fallbacks(auth_ctx, request)
                         logger.warning("[AuthMiddleware] Auth0 validation FAILED")
                     elif alg == "HS256":
                         # Supabase uses HS256
                         logger.info("[AuthMiddleware] Detected HS256 token, trying Supabase")
                         claims = await validate_supabase_token(token)
                         if claims:
-                            return await build_auth_context_from_token(claims, "supabase")
+                            auth_ctx = await build_auth_context_from_token(claims, "supabase")
+                            _verified_tokens.put(token, auth_ctx)
+                            return auth_ctx
                     else:
                         logger.warning(f"[AuthMiddleware] Unsupported JWT algorithm: {alg}")
             except Exception as e:
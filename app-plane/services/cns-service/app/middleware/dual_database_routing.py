@@ -5,10 +5,9 @@ Ensures all API endpoints route to correct database based on organization contex
 
 import logging
 import time
-from typing import Optional, Callable
 from fastapi import Request, HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import JSONResponse
+from starlette.types import Receive, Scope, Send
 
 from app.core.dual_database_routing import (
     RoutingContext,
@@ -16,11 +15,12 @@ from app.core.dual_database_routing import (
     get_router,
     log_routing_decision
 )
+from app.core.request_context import ASGIMiddleware, RequestContext
 
 logger = logging.getLogger(__name__)
 
 
-class DualDatabaseRoutingMiddleware(BaseHTTPMiddleware):
+class DualDatabaseRoutingMiddleware(ASGIMiddleware):
     """
     Middleware to enforce dual database routing on all endpoints
     
@@ -35,62 +35,58 @@ class DualDatabaseRoutingMiddleware(BaseHTTPMiddleware):
     def __init__(self, app):
         super().__init__(app)
         self.router = get_router()
-        self.request_counter = 0
     
-    async def dispatch(self, request: Request, call_next: Callable) -> JSONResponse:
+    async def handle(self, scope: Scope, receive: Receive, send: Send, ctx: RequestContext) -> None:
         """Process request and apply routing"""
-        start_time = time.time()
-        self.request_counter += 1
+        request_id = ctx.request_id
         
         try:
             # Extract routing context
-            context = self._extract_context(request)
+            context = self._extract_context(Request(scope))
             
             # Determine database
             db_type = context.determine_database()
             
             # Store in request state
-            request.state.routing_context = context
-            request.state.database_type = db_type
-            request.state.request_id = str(self.request_counter)  # Convert int to str
+            ctx.set_state("routing_context", context)
+            ctx.set_state("database_type", db_type)
             
             # Log routing decision
             log_routing_decision(
-                endpoint=f"{request.method} {request.url.path}",
+                endpoint=f"{ctx.method} {ctx.path}",
                 context=context,
                 database_type=db_type
             )
             
-            # Call next middleware/endpoint
-            response = await call_next(request)
-            
             # Add routing info to response headers
-            elapsed = time.time() - start_time
-            response.headers["X-Database-Type"] = db_type.value
-            response.headers["X-Request-Id"] = str(self.request_counter)
-            response.headers["X-Response-Time"] = f"{elapsed:.3f}s"
+            ctx.response_headers["X-Database-Type"] = db_type.value
+            ctx.response_headers["X-Response-Time"] = lambda: f"{ctx.elapsed:.3f}s"
+            
+            # Call next middleware/endpoint
+            await self.app(scope, receive, send)
             
             logger.info(
-                f"✅ [{self.request_counter}] {request.method} {request.url.path} "
-                f"→ {db_type.value} ({elapsed:.3f}s)"
+                f"✅ [{request_id}] {ctx.method} {ctx.path} "
+                f"→ {db_type.value} ({ctx.elapsed:.3f}s)"
             )
             
-            return response
-            
         except HTTPException:
             raise
         except Exception as e:
             logger.error(
-                f"❌ [{self.request_counter}] Routing middleware error: {str(e)}"
+                f"❌ [{request_id}] Routing middleware error: {str(e)}"
             )
-            return JSONResponse(
+            if ctx.response_started:
+                raise
+            response = JSONResponse(
                 status_code=500,
                 content={
                     "error": "Internal server error",
                     "message": str(e),
-                    "request_id": str(self.request_counter)  # Convert int to str
+                    "request_id": request_id
                 }
             )
+            await response(scope, receive, send)
     
     def _extract_context(self, request: Request) -> RoutingContext:
         """Extract routing context from request"""
@@ -152,7 +148,7 @@ class DualDatabaseRoutingMiddleware(BaseHTTPMiddleware):
             logger.debug(f"Routing headers: {routing_headers}")
 
 
-class OrganizationContextMiddleware(BaseHTTPMiddleware):
+class OrganizationContextMiddleware(ASGIMiddleware):
     """
     Middleware to validate and enrich organization context
     
@@ -165,15 +161,15 @@ class OrganizationContextMiddleware(BaseHTTPMiddleware):
         self.default_org_type = "staff"
         self.default_role = "user"
     
-    async def dispatch(self, request: Request, call_next: Callable) -> JSONResponse:
+    async def handle(self, scope: Scope, receive: Receive, send: Send, ctx: RequestContext) -> None:
         """Process request and validate organization context"""
         
         # If no organization context, apply defaults
-        if not hasattr(request.state, "routing_context"):
-            logger.warning(f"No routing context for {request.method} {request.url.path}")
-            return await call_next(request)
-        
-        context = request.state.routing_context
+        context = ctx.state.get("routing_context")
+        if context is None:
+            logger.warning(f"No routing context for {ctx.method} {ctx.path}")
+            await self.app(scope, receive, send)
+            return
         
         # Validate context
         if not context.organization_type:
@@ -183,13 +179,10 @@ class OrganizationContextMiddleware(BaseHTTPMiddleware):
         if not context.user_role:
             context.user_role = self.default_role
         
-        # Set back to state
-        request.state.routing_context = context
-        
-        return await call_next(request)
+        await self.app(scope, receive, send)
 
 
-class DatabaseConnectionValidationMiddleware(BaseHTTPMiddleware):
+class DatabaseConnectionValidationMiddleware(ASGIMiddleware):
     """
     Middleware to validate database connection before processing request
     
@@ -199,34 +192,29 @@ class DatabaseConnectionValidationMiddleware(BaseHTTPMiddleware):
     def __init__(self, app):
         super().__init__(app)
         self.router = get_router()
-        self.skip_paths = {
+        self.skip_paths = (
             "/health",
             "/readiness",
             "/docs",
             "/redoc",
             "/openapi.json"
-        }
+        )
     
-    async def dispatch(self, request: Request, call_next: Callable) -> JSONResponse:
+    async def handle(self, scope: Scope, receive: Receive, send: Send, ctx: RequestContext) -> None:
         """Validate database connection"""
         
         # Skip health check endpoints
-        if any(request.url.path.startswith(p) for p in self.skip_paths):
-            return await call_next(request)
-        
-        if not hasattr(request.state, "database_type"):
-            return await call_next(request)
+        if not ctx.path.startswith(self.skip_paths):
+            db_type = ctx.state.get("database_type")
+            if db_type is not None:
+                # Here you would check database connectivity
+                # For now, just log it
+                logger.debug(f"Database {db_type.value} will be used for this request")
         
-        db_type = request.state.database_type
-        
-        # Here you would check database connectivity
-        # For now, just log it
-        logger.debug(f"Database {db_type.value} will be used for this request")
-        
-        return await call_next(request)
+        await self.app(scope, receive, send)
 
 
-class RoutingAuditMiddleware(BaseHTTPMiddleware):
+class RoutingAuditMiddleware(ASGIMiddleware):
     """
     Middleware to audit all routing decisions
     
@@ -237,30 +225,28 @@ class RoutingAuditMiddleware(BaseHTTPMiddleware):
         super().__init__(app)
         self.audit_log_path = "/var/log/components-platform/routing-audit.log"
     
-    async def dispatch(self, request: Request, call_next: Callable) -> JSONResponse:
+    async def handle(self, scope: Scope, receive: Receive, send: Send, ctx: RequestContext) -> None:
         """Audit routing decisions"""
         
-        response = await call_next(request)
+        await self.app(scope, receive, send)
         
         # Log routing decision if context available
-        if hasattr(request.state, "routing_context"):
-            context = request.state.routing_context
-            db_type = request.state.database_type
+        context = ctx.state.get("routing_context")
+        if context is not None:
+            db_type = ctx.state["database_type"]
             
             audit_entry = {
                 "timestamp": time.time(),
-                "request_id": getattr(request.state, "request_id", "unknown"),
-                "method": request.method,
-                "path": request.url.path,
+                "request_id": ctx.state.get("request_id", "unknown"),
+                "method": ctx.method,
+                "path": ctx.path,
                 "organization_type": context.organization_type,
                 "user_role": context.user_role,
                 "database": db_type.value,
-                "status_code": response.status_code
+                "status_code": ctx.status_code
             }
             
             logger.info(f"AUDIT: {audit_entry}")
-        
-        return response
 
 
 def create_dual_database_middleware_stack(app):
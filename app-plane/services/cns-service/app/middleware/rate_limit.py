@@ -8,7 +8,10 @@ Implements Redis-backed rate limiting to protect endpoints from abuse:
 - IP whitelisting for admin token usage (optional)
 - Constant-time token comparison to prevent timing attacks
 
-Uses slowapi library for distributed rate limiting with Redis backend.
+Limits are enforced with GCRA (a smoothed token bucket) in a Redis Lua
+script - one async round trip per request - falling back to the same
+algorithm in-process while Redis is unreachable. Responses carry
+X-RateLimit-Limit/-Remaining/-Reset from the same check.
 
 Security Features:
 - Per-endpoint rate limits
@@ -19,21 +22,27 @@ Security Features:
 - Structured logging of rate limit violations
 - 429 responses with Retry-After header
 
+Configuration: RATE_LIMIT_REDIS_RETRY_SECONDS, RATE_LIMIT_LEASE_SIZE,
+RATE_LIMIT_LEASE_SECONDS (see RateLimitStore)
+
 Usage:
     from app.middleware.rate_limit import setup_rate_limit_middleware
     setup_rate_limit_middleware(app)
 """
 
 import logging
+import math
 import secrets
 import time
-from typing import Callable, List, Optional
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 from fastapi import FastAPI, Request, Response, HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from redis.exceptions import RedisError
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from app.config import settings
+from app.core.request_context import ASGIMiddleware, RequestContext, get_request_context
 
 logger = logging.getLogger(__name__)
 
@@ -100,105 +109,187 @@ RATE_LIMIT_EXEMPT_PREFIXES = [
 # Rate Limiting Storage (Redis-backed)
 # ============================================================================
 
+# GCRA (generic cell rate algorithm): one key per client holding the
+# "theoretical arrival time" (TAT) in ms. A limit of L per window W admits a
+# burst of L, then one request every W/L - no 2x bursts at window edges.
+# Up to ARGV[3] tokens are granted in one call (local leases); the script
+# uses the Redis clock so pods with skewed clocks agree.
+#
+# KEYS[1] = rate limit key
+# ARGV    = emission interval (ms), window (ms), tokens requested
+# Returns {granted, remaining, retry_after_ms, reset_after_ms}
+GCRA_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then
+    tat = now
+end
+local available = math.floor((now + window - tat) / interval + 1e-9)
+local granted = math.min(requested, available)
+if granted < 1 then
+    return {0, 0, math.ceil(tat + interval - window - now), math.ceil(tat - now)}
+end
+tat = tat + granted * interval
+redis.call('SET', KEYS[1], string.format('%.3f', tat), 'PX', math.ceil(tat - now))
+return {granted, available - granted, 0, math.ceil(tat - now)}
+"""
+
+# In-memory keys are pruned of expired entries once the store grows past this
+MEMORY_STORE_PRUNE_SIZE = 10000
+
+
+@dataclass
+class RateLimitDecision:
+    """Outcome of one rate limit check, with everything the response headers need."""
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float = 0.0  # Seconds until a request would be allowed again
+    reset_after: float = 0.0  # Seconds until the full limit is available again
+
+    def headers(self) -> Dict[str, str]:
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(math.ceil(self.reset_after)),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(self.retry_after)))
+        return headers
+
+
+@dataclass
+class _Lease:
+    tokens: int
+    remaining: int  # Tokens left in Redis when the lease was granted
+    reset_at: float
+    expires_at: float
+
+
 class RateLimitStore:
     """
-    Redis-backed rate limiting storage with fallback to in-memory.
-
-    Uses Redis for distributed rate limiting across multiple workers/nodes.
-    Falls back to in-memory dict if Redis is unavailable.
+    Async GCRA rate limiting on Redis, with an in-memory fallback.
+
+    Each check is one EVALSHA round trip on the async client. After a Redis
+    error the store limits in-process for RATE_LIMIT_REDIS_RETRY_SECONDS,
+    then goes back to Redis. With RATE_LIMIT_LEASE_SIZE > 1, a call reserves
+    several tokens and the following requests spend them locally until the
+    lease lapses (RATE_LIMIT_LEASE_SECONDS); unspent tokens are not returned,
+    so leasing can under-admit slightly but never over-admits.
     """
 
-    def __init__(self):
-        self.redis_client = None
-        self.memory_store = {}  # Fallback storage
-        self.use_redis = False
-
-        # Try to initialize Redis
-        try:
-            from app.cache.redis_cache import get_cache
-            cache = get_cache()
-            if cache and cache.is_connected:
-                self.redis_client = cache._client
-                self.use_redis = True
-                logger.info("[RateLimit] Using Redis for distributed rate limiting")
-            else:
-                logger.warning(
-                    "[RateLimit] Redis not available, using in-memory rate limiting "
-                    "(NOT suitable for production with multiple workers)"
-                )
-        except Exception as e:
-            logger.warning(f"[RateLimit] Failed to initialize Redis: {e}, using in-memory")
+    def __init__(self, client_factory: Optional[Callable[[], Awaitable[Any]]] = None):
+        self.use_redis = settings.redis_enabled
+        self.memory_store: Dict[str, float] = {}  # key -> TAT (monotonic seconds)
+        self.retry_seconds = settings.rate_limit_redis_retry_seconds
+        self.lease_size = settings.rate_limit_lease_size
+        self.lease_seconds = settings.rate_limit_lease_seconds
+        self._client_factory = client_factory or _default_client
+        self._script = None
+        self._script_client = None
+        self._leases: Dict[str, _Lease] = {}
+        self._redis_retry_at = 0.0
+        self._redis_failed = False
+
+        if self.use_redis:
+            logger.info("[RateLimit] Using Redis for distributed rate limiting")
+        else:
+            logger.warning(
+                "[RateLimit] Redis not available, using in-memory rate limiting "
+                "(NOT suitable for production with multiple workers)"
+            )
 
-    def increment(self, key: str, window_seconds: int) -> int:
+    async def hit(self, key: str, limit: int, window_seconds: int) -> RateLimitDecision:
         """
-        Increment the counter for a key and return the current count.
+        Spend one request for a key.
 
         Args:
             key: Rate limit key (e.g., "rate_limit:admin_token:192.168.1.1")
+            limit: Requests allowed per window
             window_seconds: Time window in seconds
 
         Returns:
-            Current count within the window
+            Decision with the remaining quota, for the response headers
         """
-        if self.use_redis and self.redis_client:
+        now = time.monotonic()
+        lease = self._leases.get(key)
+        if lease is not None:
+            if lease.tokens > 0 and lease.expires_at > now:
+                lease.tokens -= 1
+                return RateLimitDecision(True, limit, lease.remaining + lease.tokens, 0.0, lease.reset_at - now)
+            del self._leases[key]
+
+        if self.use_redis and now >= self._redis_retry_at:
+            requested = self._lease_quantity(limit)
             try:
-                # Use Redis pipeline for atomic operations
-                pipe = self.redis_client.pipeline()
-                pipe.incr(key)
-                pipe.expire(key, window_seconds)
-                results = pipe.execute()
-                return results[0]  # Return count from INCR
-            except Exception as e:
-                logger.error(f"[RateLimit] Redis increment failed: {e}, falling back to memory")
-                self.use_redis = False  # Disable Redis on error
-
-        # Fallback to in-memory
-        now = time.time()
-        if key not in self.memory_store:
-            self.memory_store[key] = {"count": 1, "expires_at": now + window_seconds}
-            return 1
+                granted, remaining, retry_ms, reset_ms = await self._run_script(key, limit, window_seconds, requested)
+            except (RedisError, OSError) as e:
+                self._redis_retry_at = now + self.retry_seconds
+                self._redis_failed = True
+                logger.error(
+                    f"[RateLimit] Redis rate limit check failed: {e}, "
+                    f"using in-memory for {self.retry_seconds}s"
+                )
+            else:
+                if self._redis_failed:
+                    self._redis_failed = False
+                    logger.info("[RateLimit] Redis rate limiting recovered")
+                if granted < 1:
+                    return RateLimitDecision(False, limit, 0, retry_ms / 1000, reset_ms / 1000)
+                if granted > 1:
+                    self._leases[key] = _Lease(
+                        tokens=granted - 1,
+                        remaining=remaining,
+                        reset_at=now + reset_ms / 1000,
+                        expires_at=now + self.lease_seconds,
+                    )
+                return RateLimitDecision(True, limit, remaining + granted - 1, 0.0, reset_ms / 1000)
 
-        entry = self.memory_store[key]
-        if now > entry["expires_at"]:
-            # Window expired, reset
-            entry["count"] = 1
-            entry["expires_at"] = now + window_seconds
-            return 1
-        else:
-            # Increment within window
-            entry["count"] += 1
-            return entry["count"]
+        return self._hit_memory(key, limit, window_seconds)
 
-    def get(self, key: str) -> int:
-        """
-        Get the current count for a key.
+    def _lease_quantity(self, limit: int) -> int:
+        if self.lease_size <= 1:
+            return 1
+        return max(1, min(self.lease_size, limit // 10))
+
+    async def _run_script(self, key: str, limit: int, window_seconds: int, requested: int) -> List[int]:
+        client = await self._client_factory()
+        if self._script is None or self._script_client is not client:
+            self._script = client.register_script(GCRA_SCRIPT)
+            self._script_client = client
+        window_ms = window_seconds * 1000
+        result = await self._script(keys=[key], args=[window_ms / limit, window_ms, requested])
+        return [int(value) for value in result]
+
+    def _hit_memory(self, key: str, limit: int, window_seconds: int) -> RateLimitDecision:
+        """Same GCRA as the Lua script, in-process."""
+        now = time.monotonic()
+        interval = window_seconds / limit
+        tat = max(self.memory_store.get(key, now), now)
+        if tat + interval - window_seconds > now:
+            return RateLimitDecision(False, limit, 0, tat + interval - window_seconds - now, tat - now)
+
+        tat += interval
+        if key not in self.memory_store and len(self.memory_store) >= MEMORY_STORE_PRUNE_SIZE:
+            self._prune_memory(now)
+        self.memory_store[key] = tat
+        remaining = math.floor((now + window_seconds - tat) / interval + 1e-9)
+        return RateLimitDecision(True, limit, remaining, 0.0, tat - now)
+
+    def _prune_memory(self, now: float) -> None:
+        expired = [key for key, tat in self.memory_store.items() if tat <= now]
+        for key in expired:
+            del self.memory_store[key]
 
-        Args:
-            key: Rate limit key
 
-        Returns:
-            Current count or 0 if not found/expired
-        """
-        if self.use_redis and self.redis_client:
-            try:
-                count = self.redis_client.get(key)
-                return int(count) if count else 0
-            except Exception as e:
-                logger.error(f"[RateLimit] Redis get failed: {e}")
-                return 0
-
-        # Fallback to in-memory
-        now = time.time()
-        if key not in self.memory_store:
-            return 0
-
-        entry = self.memory_store[key]
-        if now > entry["expires_at"]:
-            # Expired
-            del self.memory_store[key]
-            return 0
+async def _default_client():
+    from app.cache.redis_cache import get_redis_client
 
-        return entry["count"]
+    return await get_redis_client()
 
 
 # Global rate limit store
@@ -308,7 +399,7 @@ def is_ip_whitelisted(ip: str) -> bool:
 # Rate Limiting Middleware
 # ============================================================================
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
+class RateLimitMiddleware(ASGIMiddleware):
     """
     FastAPI middleware for rate limiting.
 
@@ -329,6 +420,13 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
     def __init__(self, app: ASGIApp):
         super().__init__(app)
 
+    async def handle(self, scope: Scope, receive: Receive, send: Send, ctx: RequestContext) -> None:
+        response = await self.check(Request(scope, receive))
+        if response is not None:
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
     def is_exempt_path(self, path: str) -> bool:
         """Check if path is exempt from rate limiting."""
         if path in RATE_LIMIT_EXEMPT_PATHS:
@@ -354,26 +452,28 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 return True
         return False
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable[[Request], Response]
-    ) -> Response:
+    @staticmethod
+    def _add_headers(request: Request, decision: RateLimitDecision) -> None:
+        """Send the quota from this request's check on the eventual response."""
+        ctx = get_request_context(request.scope)
+        if ctx is not None:
+            ctx.response_headers.update(decision.headers())
+
+    async def check(self, request: Request) -> Optional[Response]:
         """
-        Process request through rate limiting middleware.
+        Apply rate limits to a request.
 
         Args:
             request: Incoming request
-            call_next: Next middleware/handler
 
         Returns:
-            Response (may be 429 if rate limited)
+            Error response (401/403/429) to send instead, or None to continue
         """
         path = request.url.path
 
         # Skip rate limiting for exempt paths
         if self.is_exempt_path(path):
-            return await call_next(request)
+            return None
 
         # Extract client IP
         client_ip = get_client_ip(request)
@@ -427,24 +527,25 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 
             # Step 3: Check rate limit (10 requests per minute)
             rate_key = f"rate_limit:admin_token:{client_ip}"
-            count = _rate_limit_store.increment(rate_key, ADMIN_TOKEN_WINDOW_SECONDS)
+            decision = await _rate_limit_store.hit(rate_key, ADMIN_TOKEN_RATE_LIMIT, ADMIN_TOKEN_WINDOW_SECONDS)
 
-            if count > ADMIN_TOKEN_RATE_LIMIT:
+            if not decision.allowed:
                 logger.warning(
                     f"[RateLimit] Admin token rate limit exceeded: ip={client_ip} "
-                    f"path={path} count={count} limit={ADMIN_TOKEN_RATE_LIMIT}"
+                    f"path={path} limit={ADMIN_TOKEN_RATE_LIMIT} retry_after={decision.retry_after:.1f}s"
                 )
                 return Response(
                     content='{"detail": "Admin token rate limit exceeded. Please try again later."}',
                     status_code=429,
-                    headers={"Retry-After": str(ADMIN_TOKEN_WINDOW_SECONDS)},
+                    headers=decision.headers(),
                     media_type="application/json",
                 )
 
             logger.debug(
                 f"[RateLimit] Admin token request allowed: ip={client_ip} "
-                f"count={count}/{ADMIN_TOKEN_RATE_LIMIT}"
+                f"remaining={decision.remaining}/{ADMIN_TOKEN_RATE_LIMIT}"
             )
+            self._add_headers(request, decision)
 
         else:
             # REGULAR AUTHENTICATED REQUEST OR PUBLIC REQUEST
@@ -459,49 +560,51 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             if has_auth:
                 # Apply authenticated rate limit
                 rate_key = f"rate_limit:auth:{client_ip}"
-                count = _rate_limit_store.increment(rate_key, AUTHENTICATED_WINDOW_SECONDS)
+                decision = await _rate_limit_store.hit(rate_key, AUTHENTICATED_RATE_LIMIT, AUTHENTICATED_WINDOW_SECONDS)
 
-                if count > AUTHENTICATED_RATE_LIMIT:
+                if not decision.allowed:
                     logger.warning(
                         f"[RateLimit] Authenticated rate limit exceeded: ip={client_ip} "
-                        f"path={path} count={count} limit={AUTHENTICATED_RATE_LIMIT}"
+                        f"path={path} limit={AUTHENTICATED_RATE_LIMIT} retry_after={decision.retry_after:.1f}s"
                     )
                     return Response(
                         content='{"detail": "Rate limit exceeded. Please try again later."}',
                         status_code=429,
-                        headers={"Retry-After": str(AUTHENTICATED_WINDOW_SECONDS)},
+                        headers=decision.headers(),
                         media_type="application/json",
                     )
 
                 logger.debug(
                     f"[RateLimit] Authenticated request allowed: ip={client_ip} "
-                    f"count={count}/{AUTHENTICATED_RATE_LIMIT}"
+                    f"remaining={decision.remaining}/{AUTHENTICATED_RATE_LIMIT}"
                 )
+                self._add_headers(request, decision)
 
             # Check if this is a public endpoint that needs rate limiting
             elif self.is_public_rate_limited_path(path):
                 rate_key = f"rate_limit:public:{client_ip}"
-                count = _rate_limit_store.increment(rate_key, PUBLIC_WINDOW_SECONDS)
+                decision = await _rate_limit_store.hit(rate_key, PUBLIC_RATE_LIMIT, PUBLIC_WINDOW_SECONDS)
 
-                if count > PUBLIC_RATE_LIMIT:
+                if not decision.allowed:
                     logger.warning(
                         f"[RateLimit] Public endpoint rate limit exceeded: ip={client_ip} "
-                        f"path={path} count={count} limit={PUBLIC_RATE_LIMIT}"
+                        f"path={path} limit={PUBLIC_RATE_LIMIT} retry_after={decision.retry_after:.1f}s"
                     )
                     return Response(
                         content='{"detail": "Rate limit exceeded. Please try again later."}',
                         status_code=429,
-                        headers={"Retry-After": str(PUBLIC_WINDOW_SECONDS)},
+                        headers=decision.headers(),
                         media_type="application/json",
                     )
 
                 logger.debug(
                     f"[RateLimit] Public endpoint request allowed: ip={client_ip} "
-                    f"count={count}/{PUBLIC_RATE_LIMIT}"
+                    f"remaining={decision.remaining}/{PUBLIC_RATE_LIMIT}"
                 )
+                self._add_headers(request, decision)
 
         # Continue to next middleware/handler
-        return await call_next(request)
+        return None
 
 
 # ============================================================================
@@ -290,6 +290,34 @@ class CNSMetrics:
             registry=REGISTRY,
         )
 
+        # ========================================
+        # WEBSOCKET METRICS
+        # ========================================
+
+        # Open job progress connections on this instance
+        self.websocket_connections = Gauge(
+            f"{_PREFIX}_websocket_connections",
+            "Open job progress WebSocket connections",
+            labelnames=["job_id"],
+            registry=REGISTRY,
+        )
+
+        # Frames waiting in per-connection send queues
+        self.websocket_queue_depth = Gauge(
+            f"{_PREFIX}_websocket_queue_depth",
+            "Frames queued for WebSocket clients",
+            labelnames=["job_id"],
+            registry=REGISTRY,
+        )
+
+        # Frames merged into a newer frame or dropped for slow clients
+        self.websocket_frames_shed_total = Counter(
+            f"{_PREFIX}_websocket_frames_shed_total",
+            "WebSocket frames merged or dropped before sending",
+            labelnames=["reason"],
+            registry=REGISTRY,
+        )
+
         logger.info(f"CNS metrics initialized: {_PREFIX}_* metrics available")
 
     # ========================================
@@ -426,6 +454,22 @@ class CNSMetrics:
             operation=operation,
         ).observe(duration_seconds)
 
+    def set_websocket_job_stats(self, job_id: str, connections: int, queue_depth: int):
+        """Set connection count and queued frames for a job; clears the series at zero."""
+        if connections:
+            self.websocket_connections.labels(job_id=job_id).set(connections)
+            self.websocket_queue_depth.labels(job_id=job_id).set(queue_depth)
+            return
+        for gauge in (self.websocket_connections, self.websocket_queue_depth):
+            try:
+                gauge.remove(job_id)
+            except KeyError:
+                pass
+
+    def record_websocket_frames_shed(self, reason: str, count: int = 1):
+        """Record frames merged ("merged") or dropped ("dropped") for slow clients."""
+        self.websocket_frames_shed_total.labels(reason=reason).inc(count)
+
 
 def init_metrics(
     service_name: str = "cns-service",
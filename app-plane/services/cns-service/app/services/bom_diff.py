@@ -0,0 +1,314 @@
+"""BOM Revision Diff Engine
+
+Compares the line items of a new BOM revision against the previous
+revision's parsed snapshot and carries unchanged results forward, so a
+re-upload only enriches and risk-scores what actually changed.
+
+Lines are matched by normalized key (MPN + manufacturer, see
+`bom_fingerprint.normalize_line_key`). Duplicate keys are paired in
+line-number order.
+
+    added      key not present in the previous revision
+    changed    key present, quantity differs
+    unchanged  key present, same quantity
+    removed    key only present in the previous revision
+
+Enrichment is a property of the component, so it is carried over for both
+``changed`` and ``unchanged`` lines. Contextual risk depends on quantity, so
+line risk rows are only carried over for ``unchanged`` lines (marked
+``carried_over`` until the next risk run); ``changed`` lines are
+risk-scored again. ``added`` lines stay pending and go through
+the enrichment workflow as usual.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.cache.response_cache import invalidate_risk
+from app.services.bom_fingerprint import ENRICHMENT_COLUMNS, normalize_line_key, normalize_quantity
+
+logger = logging.getLogger(__name__)
+
+# (new_line_id, previous_line_id)
+LinePair = Tuple[str, str]
+
+
+@dataclass
+class BOMDiff:
+    """Result of diff_line_items()"""
+    added: List[Dict[str, Any]] = field(default_factory=list)
+    changed: List[LinePair] = field(default_factory=list)
+    unchanged: List[LinePair] = field(default_factory=list)
+    removed: List[Dict[str, Any]] = field(default_factory=list)
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            "added": len(self.added),
+            "changed": len(self.changed),
+            "unchanged": len(self.unchanged),
+            "removed": len(self.removed),
+        }
+
+
+def diff_line_items(
+    previous: List[Dict[str, Any]],
+    current: List[Dict[str, Any]],
+) -> BOMDiff:
+    """Diff two line item lists by normalized key and quantity.
+
+    Both lists are line item dicts as produced by
+    `bom_ingest.build_line_items_from_rows` (``id`` is required on both sides).
+    """
+    by_key: Dict[str, Deque[Dict[str, Any]]] = defaultdict(deque)
+    for item in sorted(previous, key=lambda i: i.get("line_number") or 0):
+        by_key[normalize_line_key(item)].append(item)
+
+    diff = BOMDiff()
+    for item in sorted(current, key=lambda i: i.get("line_number") or 0):
+        candidates = by_key.get(normalize_line_key(item))
+        if not candidates:
+            diff.added.append(item)
+            continue
+
+        prev = candidates.popleft()
+        pair = (str(item["id"]), str(prev["id"]))
+        if normalize_quantity(item.get("quantity", 1)) == normalize_quantity(prev.get("quantity", 1)):
+            diff.unchanged.append(pair)
+        else:
+            diff.changed.append(pair)
+
+    for remaining in by_key.values():
+        diff.removed.extend(remaining)
+
+    return diff
+
+
+def find_previous_revision(
+    db: Session,
+    *,
+    organization_id: str,
+    project_id: Optional[str],
+    bom_name: str,
+) -> Optional[Dict[str, Any]]:
+    """Latest revision of the BOM with this name in the project, if any.
+
+    Re-uploads are renamed "name (timestamp)" on a name conflict, so the
+    name only finds the first revision; later ones are reached through
+    boms.previous_revision_id.
+    """
+    if not project_id:
+        return None
+    row = db.execute(
+        text("""
+            WITH RECURSIVE revisions AS (
+                SELECT id, parsed_file_s3_key, created_at
+                FROM boms
+                WHERE organization_id = :organization_id
+                  AND project_id = :project_id
+                  AND name = :bom_name
+                UNION
+                SELECT b.id, b.parsed_file_s3_key, b.created_at
+                FROM boms b
+                JOIN revisions r ON b.previous_revision_id = r.id
+                WHERE b.organization_id = :organization_id
+            )
+            SELECT id, parsed_file_s3_key
+            FROM revisions
+            ORDER BY created_at DESC
+            LIMIT 1
+        """),
+        {"organization_id": organization_id, "project_id": project_id, "bom_name": bom_name},
+    ).fetchone()
+    if not row:
+        return None
+    return {"bom_id": str(row[0]), "parsed_file_s3_key": row[1]}
+
+
+def get_revision(
+    db: Session,
+    bom_id: str,
+    *,
+    organization_id: str,
+    project_id: Optional[str],
+) -> Optional[Dict[str, Any]]:
+    """A caller-supplied previous revision, only if it is in the same organization and project."""
+    row = db.execute(
+        text("""
+            SELECT id, parsed_file_s3_key
+            FROM boms
+            WHERE id = CAST(:bom_id AS uuid)
+              AND organization_id = :organization_id
+              AND project_id IS NOT DISTINCT FROM CAST(:project_id AS uuid)
+        """),
+        {"bom_id": bom_id, "organization_id": organization_id, "project_id": project_id},
+    ).fetchone()
+    if not row:
+        return None
+    return {"bom_id": str(row[0]), "parsed_file_s3_key": row[1]}
+
+
+def load_revision_line_items(
+    db: Session,
+    bom_id: str,
+    *,
+    parsed_file_s3_key: Optional[str] = None,
+    bucket: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Load the line items of a previous revision.
+
+    Prefers the parsed snapshot in MinIO (what was uploaded); falls back to
+    the line rows in Supabase when the snapshot is missing.
+    """
+    if parsed_file_s3_key:
+        try:
+            from app.config import settings
+            from app.utils.minio_client import get_minio_client
+
+            raw = get_minio_client().download_file(bucket or settings.minio_bucket_uploads, parsed_file_s3_key)
+            if raw:
+                snapshot = json.loads(raw)
+                items = snapshot.get("line_items") or []
+                if items and all(item.get("id") for item in items):
+                    return items
+        except Exception as e:
+            logger.warning(f"[bom_diff] Failed to load snapshot {parsed_file_s3_key}: {e}")
+
+    rows = db.execute(
+        text("""
+            SELECT id, line_number, manufacturer_part_number, manufacturer, quantity
+            FROM bom_line_items
+            WHERE bom_id = :bom_id
+            ORDER BY line_number
+        """),
+        {"bom_id": bom_id},
+    ).fetchall()
+    return [
+        {
+            "id": str(r[0]),
+            "line_number": r[1],
+            "manufacturer_part_number": r[2],
+            "manufacturer": r[3],
+            "quantity": float(r[4]) if r[4] is not None else 1,
+        }
+        for r in rows
+    ]
+
+
+def carry_over_results(db: Session, diff: BOMDiff) -> Dict[str, int]:
+    """Copy enrichment (changed + unchanged) and risk rows (unchanged) to the new revision.
+
+    Only previous lines that finished enrichment are copied; anything else
+    stays pending on the new revision. Does not commit.
+    """
+    enrich_pairs = diff.unchanged + diff.changed
+    counts = {"enrichment_carried": 0, "risk_carried": 0}
+    if not enrich_pairs:
+        return counts
+
+    set_clause = ", ".join(f"{col} = src.{col}" for col in ENRICHMENT_COLUMNS)
+    result = db.execute(
+        text(f"""
+            UPDATE bom_line_items AS tgt
+            SET {set_clause},
+                updated_at = NOW()
+            FROM bom_line_items AS src,
+                 (SELECT UNNEST(CAST(:new_ids AS uuid[])) AS new_id,
+                         UNNEST(CAST(:old_ids AS uuid[])) AS old_id) AS pairs
+            WHERE tgt.id = pairs.new_id
+              AND src.id = pairs.old_id
+              AND src.enrichment_status = 'enriched'
+        """),
+        {
+            "new_ids": [new_id for new_id, _ in enrich_pairs],
+            "old_ids": [old_id for _, old_id in enrich_pairs],
+        },
+    )
+    counts["enrichment_carried"] = result.rowcount or 0
+
+    if diff.unchanged:
+        result = db.execute(
+            text("""
+                INSERT INTO bom_line_item_risk_scores (
+                    bom_line_item_id, organization_id,
+                    base_risk_id, base_risk_score,
+                    quantity_modifier, lead_time_modifier, criticality_modifier,
+                    user_criticality_level,
+                    contextual_risk_score, risk_level,
+                    alternates_available, alternate_risk_reduction,
+                    profile_version_used, carried_over, calculated_at, updated_at
+                )
+                SELECT
+                    pairs.new_id, r.organization_id,
+                    r.base_risk_id, r.base_risk_score,
+                    r.quantity_modifier, r.lead_time_modifier, r.criticality_modifier,
+                    r.user_criticality_level,
+                    r.contextual_risk_score, r.risk_level,
+                    r.alternates_available, r.alternate_risk_reduction,
+                    r.profile_version_used, TRUE, r.calculated_at, NOW()
+                FROM bom_line_item_risk_scores r
+                JOIN (SELECT UNNEST(CAST(:new_ids AS uuid[])) AS new_id,
+                             UNNEST(CAST(:old_ids AS uuid[])) AS old_id) AS pairs
+                  ON r.bom_line_item_id = pairs.old_id
+                ON CONFLICT (bom_line_item_id) DO NOTHING
+            """),
+            {
+                "new_ids": [new_id for new_id, _ in diff.unchanged],
+                "old_ids": [old_id for _, old_id in diff.unchanged],
+            },
+        )
+        counts["risk_carried"] = result.rowcount or 0
+
+    return counts
+
+
+def apply_revision_diff(
+    db: Session,
+    *,
+    organization_id: str,
+    previous_bom_id: str,
+    previous_parsed_s3_key: Optional[str],
+    new_bom_id: str,
+    new_line_items: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Diff a freshly inserted revision against its predecessor and carry results over.
+
+    Records the lineage in ``boms.previous_revision_id`` and commits on
+    success, then invalidates the cached risk responses for the new revision
+    when risk rows were carried over. Returns the diff summary plus carried-over counts, as stored in
+    ``boms.metadata.revision_diff``.
+    """
+    previous_items = load_revision_line_items(
+        db, previous_bom_id, parsed_file_s3_key=previous_parsed_s3_key
+    )
+    diff = diff_line_items(previous_items, new_line_items)
+    counts = carry_over_results(db, diff)
+
+    revision = {"previous_bom_id": previous_bom_id, **diff.summary(), **counts}
+    db.execute(
+        text("""
+            UPDATE boms
+            SET previous_revision_id = CAST(:previous_bom_id AS uuid),
+                metadata = COALESCE(metadata, '{}'::jsonb) || jsonb_build_object('revision_diff', CAST(:revision AS jsonb))
+            WHERE id = :bom_id
+        """),
+        {"bom_id": new_bom_id, "previous_bom_id": previous_bom_id, "revision": json.dumps(revision)},
+    )
+    db.commit()
+    if counts["risk_carried"]:
+        invalidate_risk(organization_id, [new_bom_id])
+
+    logger.info(
+        "[bom_diff] BOM %s vs previous %s: %s",
+        new_bom_id,
+        previous_bom_id,
+        revision,
+    )
+    return revision
@@ -0,0 +1,194 @@
+"""BOM Fingerprinting Helpers
+
+Content fingerprints for uploaded BOMs so repeat uploads of the same
+spreadsheet can reuse prior parse artifacts and enrichment results
+instead of re-parsing, re-inserting and re-enriching everything.
+
+Two fingerprints are recorded in ``boms.metadata``:
+
+- ``file_hash``: SHA-256 of the raw uploaded bytes (exact re-upload)
+- ``content_hash``: SHA-256 of the normalized parsed line items. This is
+  insensitive to row order, cell formatting and re-saving the file, so a
+  spreadsheet that was opened and saved again still matches.
+
+Both are indexed per organization (see
+``database/migrations/016_add_bom_fingerprint_indexes.sql``), so lookups
+are index scans rather than JSONB scans over every BOM of the tenant.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Enrichment columns copied from a prior BOM's line item to a new one with the
+# same normalized key. Mirrors the columns written by enrich_component.
+ENRICHMENT_COLUMNS = (
+    "component_id",
+    "redis_component_key",
+    "component_storage",
+    "enrichment_status",
+    "unit_price",
+    "datasheet_url",
+    "lifecycle_status",
+    "specifications",
+    "pricing",
+    "compliance_status",
+    "enriched_mpn",
+    "enriched_manufacturer",
+    "enriched_at",
+    "match_confidence",
+    "match_method",
+    "risk_level",
+    "category",
+    "subcategory",
+)
+
+
+def _norm_text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float) and math.isnan(value):
+        return ""
+    # Keep in sync with the UPPER(TRIM(...)) key used in clone_line_enrichment()
+    return str(value).strip().upper()
+
+
+def normalize_quantity(value: Any) -> float:
+    """Normalize a quantity so 10, '10', 10.0 compare equal."""
+    try:
+        qty = float(value)
+    except (TypeError, ValueError):
+        return 1.0
+    if math.isnan(qty):
+        return 1.0
+    return qty
+
+
+def normalize_line_key(item: Dict[str, Any]) -> str:
+    """Identity of a line item for matching across uploads: MPN + manufacturer."""
+    return f"{_norm_text(item.get('manufacturer_part_number'))}|{_norm_text(item.get('manufacturer'))}"
+
+
+def compute_file_hash(content: bytes) -> str:
+    """SHA-256 of raw uploaded bytes."""
+    return hashlib.sha256(content).hexdigest()
+
+
+def compute_content_hash(line_items: Iterable[Dict[str, Any]]) -> str:
+    """SHA-256 of normalized line items, independent of row order."""
+    rows = sorted(
+        (
+            normalize_line_key(item),
+            normalize_quantity(item.get("quantity", 1)),
+            _norm_text(item.get("reference_designator")),
+        )
+        for item in line_items
+    )
+    payload = json.dumps(rows, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class PriorBOM:
+    """A previously uploaded BOM with the same fingerprint."""
+    bom_id: str
+    component_count: int
+    raw_file_s3_key: Optional[str]
+    parsed_file_s3_key: Optional[str]
+    status: Optional[str]
+    matched_on: str  # 'file_hash' or 'content_hash'
+
+
+def find_prior_bom(
+    db: Session,
+    organization_id: str,
+    *,
+    file_hash: Optional[str] = None,
+    content_hash: Optional[str] = None,
+) -> Optional[PriorBOM]:
+    """Return the most recent BOM of the organization with a matching fingerprint.
+
+    ``file_hash`` is checked first (exact re-upload), then ``content_hash``.
+    """
+    for field, value in (("file_hash", file_hash), ("content_hash", content_hash)):
+        if not value:
+            continue
+        row = db.execute(
+            text(f"""
+                SELECT id, component_count, raw_file_s3_key, parsed_file_s3_key, status
+                FROM boms
+                WHERE organization_id = :organization_id
+                  AND metadata->>'{field}' = :value
+                ORDER BY created_at DESC
+                LIMIT 1
+            """),
+            {"organization_id": organization_id, "value": value},
+        ).fetchone()
+        if row:
+            return PriorBOM(
+                bom_id=str(row[0]),
+                component_count=row[1] or 0,
+                raw_file_s3_key=row[2],
+                parsed_file_s3_key=row[3],
+                status=row[4],
+                matched_on=field,
+            )
+    return None
+
+
+def clone_line_enrichment(db: Session, *, source_bom_id: str, target_bom_id: str) -> int:
+    """Copy enrichment results onto pending lines of target_bom_id.
+
+    Lines are matched by normalized MPN + manufacturer against enriched lines
+    of source_bom_id. Matched lines become 'enriched' and are skipped by the
+    enrichment workflow (which only fetches pending lines); unmatched lines
+    stay pending and are enriched as usual.
+
+    Does not commit. Returns the number of lines cloned.
+    """
+    set_clause = ",\n                ".join(f"{col} = src.{col}" for col in ENRICHMENT_COLUMNS)
+    select_cols = ", ".join(ENRICHMENT_COLUMNS)
+    result = db.execute(
+        text(f"""
+            UPDATE bom_line_items AS tgt
+            SET {set_clause},
+                updated_at = NOW()
+            FROM (
+                SELECT DISTINCT ON (norm_key) norm_key, {select_cols}
+                FROM (
+                    SELECT
+                        UPPER(TRIM(manufacturer_part_number)) || '|' ||
+                        UPPER(TRIM(COALESCE(manufacturer, ''))) AS norm_key,
+                        {select_cols},
+                        updated_at
+                    FROM bom_line_items
+                    WHERE bom_id = :source_bom_id
+                      AND enrichment_status = 'enriched'
+                ) s
+                ORDER BY norm_key, updated_at DESC
+            ) AS src
+            WHERE tgt.bom_id = :target_bom_id
+              AND (tgt.enrichment_status = 'pending' OR tgt.enrichment_status IS NULL)
+              AND UPPER(TRIM(tgt.manufacturer_part_number)) || '|' ||
+                  UPPER(TRIM(COALESCE(tgt.manufacturer, ''))) = src.norm_key
+        """),
+        {"source_bom_id": source_bom_id, "target_bom_id": target_bom_id},
+    )
+    cloned = result.rowcount or 0
+    logger.info(
+        "[bom_fingerprint] Cloned enrichment for %s line(s) from BOM %s to BOM %s",
+        cloned,
+        source_bom_id,
+        target_bom_id,
+    )
+    return cloned
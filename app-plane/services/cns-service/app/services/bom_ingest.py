@@ -137,12 +137,17 @@ def create_supabase_bom_and_items(
     line_items: List[Dict[str, Any]],
     source: str,
     uploaded_by: Optional[str],
+    file_hash: Optional[str] = None,
+    content_hash: Optional[str] = None,
 ) -> Tuple[int, Optional[Exception]]:
     """Create BOM + line items in Supabase.
 
     This helper centralizes the BOM insert + line item inserts. It is
     equivalent to the logic previously in `bulk_upload.py` step 7.5.
 
+    ``file_hash``/``content_hash`` are stored in ``boms.metadata`` so later
+    uploads can find this BOM by fingerprint (see `bom_fingerprint`).
+
     Returns the number of line items saved and an optional exception if
     anything failed (in which case the transaction is rolled back).
     """
@@ -184,7 +189,9 @@ def create_supabase_bom_and_items(
                     'uploaded_by', :uploaded_by,
                     'filename', :filename,
                     's3_bucket', :s3_bucket,
-                    's3_key', :s3_key
+                    's3_key', :s3_key,
+                    'file_hash', :file_hash,
+                    'content_hash', :content_hash
                 ),
                 NOW(),
                 NOW()
@@ -208,6 +215,8 @@ def create_supabase_bom_and_items(
                 "filename": filename,
                 "s3_bucket": s3_bucket,
                 "s3_key": s3_key,
+                "file_hash": file_hash,
+                "content_hash": content_hash,
             },
         )
 
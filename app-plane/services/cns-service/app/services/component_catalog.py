@@ -18,6 +18,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import text
 import uuid
 from app.cache.redis_cache import DecimalEncoder
+from app.cache.response_cache import invalidate_catalog_component
 
 from app.models.dual_database import get_dual_database
 
@@ -403,6 +404,7 @@ class ComponentCatalogService:
 
                 result = db.execute(query, params)
                 db.commit()
+                invalidate_catalog_component(component_id, mpn)
 
                 return str(component_id)
 
@@ -492,6 +494,7 @@ class ComponentCatalogService:
                 logger.info(f"🔵 DEBUG: INSERT executed, committing...")
                 db.commit()
                 logger.info(f"🔵 DEBUG: Commit successful, returning ID: {component_id}")
+                invalidate_catalog_component(component_id, mpn)
 
                 return component_id
 
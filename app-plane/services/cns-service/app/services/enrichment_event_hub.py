@@ -0,0 +1,310 @@
+"""
+Enrichment Event Hub
+
+Per-process fan-out for BOM enrichment progress events.
+
+Publishers append each event to a capped Redis Stream per BOM
+(`enrichment_stream:{bom_id}`) and then PUBLISH it on `enrichment:{bom_id}`
+with the stream entry id attached as `stream_id`. The SSE layer holds one
+pattern subscription to `enrichment:*` per process and fans messages out to
+in-memory, bounded per-client queues. A reconnecting client sends the last
+stream id it saw (`Last-Event-ID`) and is replayed from the stream before
+live events resume.
+"""
+
+import asyncio
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from redis.exceptions import RedisError
+
+from app.cache.invalidation import reconnect_delay
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "enrichment:"
+CHANNEL_PATTERN = f"{CHANNEL_PREFIX}*"
+STREAM_KEY_PREFIX = "enrichment_stream:"
+
+TERMINAL_EVENT_TYPES = ("enrichment.completed", "enrichment.failed")
+
+
+def stream_key(bom_id: str) -> str:
+    return f"{STREAM_KEY_PREFIX}{bom_id}"
+
+
+def parse_stream_id(value: Optional[str]) -> Optional[Tuple[int, int]]:
+    """Parse a Redis Stream id (`<ms>-<seq>`) into a comparable tuple."""
+    if not value:
+        return None
+    ms, _, seq = str(value).partition("-")
+    try:
+        return int(ms), int(seq or 0)
+    except ValueError:
+        return None
+
+
+async def append_enrichment_event(redis_client, bom_id: str, event_record: Dict[str, Any]) -> Optional[str]:
+    """
+    Persist an event to the BOM's capped stream and publish it for live viewers.
+
+    Returns:
+        The stream entry id, or None if the stream write failed (the event is
+        still published, it just can't be replayed).
+    """
+    stream_id = None
+    try:
+        stream_id = await redis_client.xadd(
+            stream_key(bom_id),
+            {"data": json.dumps(event_record)},
+            maxlen=settings.enrichment_stream_maxlen,
+            approximate=True,
+        )
+        await redis_client.expire(stream_key(bom_id), settings.enrichment_stream_ttl_seconds)
+        if isinstance(stream_id, bytes):
+            stream_id = stream_id.decode()
+        if not isinstance(stream_id, str):
+            stream_id = None
+    except RedisError as e:
+        logger.warning(f"[Enrichment Hub] Stream append failed for BOM {bom_id}: {e}")
+
+    message = dict(event_record, stream_id=stream_id) if stream_id else event_record
+    await redis_client.publish(f"{CHANNEL_PREFIX}{bom_id}", json.dumps(message))
+    return stream_id
+
+
+async def read_events_after(redis_client, bom_id: str, last_id: str) -> List[Dict[str, Any]]:
+    """Return stream events strictly after `last_id`, oldest first."""
+    after = parse_stream_id(last_id)
+    if after is None:
+        return []
+
+    entries = await redis_client.xrange(
+        stream_key(bom_id),
+        min=f"{after[0]}-{after[1]}",
+        max="+",
+        count=settings.enrichment_stream_maxlen,
+    )
+
+    events = []
+    for entry_id, fields in entries or []:
+        entry_id = entry_id.decode() if isinstance(entry_id, bytes) else entry_id
+        if parse_stream_id(entry_id) <= after:
+            continue
+        raw = fields.get("data") or fields.get(b"data")
+        try:
+            event = json.loads(raw)
+        except (TypeError, ValueError):
+            continue
+        event["stream_id"] = entry_id
+        events.append(event)
+    return events
+
+
+@dataclass(eq=False)
+class Subscriber:
+    """One SSE client: a bounded queue plus the last stream id delivered."""
+
+    bom_id: str
+    queue: asyncio.Queue
+    last_id: Optional[Tuple[int, int]] = None
+    dropped: int = 0
+
+    def offer(self, event: Dict[str, Any]) -> None:
+        """
+        Enqueue without blocking the hub. When the client falls behind, the
+        oldest queued event is dropped: progress events carry the full state
+        snapshot, so the newest one supersedes anything older.
+        """
+        event_id = parse_stream_id(event.get("stream_id"))
+        if event_id is not None:
+            if self.last_id is not None and event_id <= self.last_id:
+                return
+            self.last_id = event_id
+
+        if self.queue.full():
+            try:
+                self.queue.get_nowait()
+                self.dropped += 1
+            except asyncio.QueueEmpty:
+                pass
+        self.queue.put_nowait(event)
+
+
+class EnrichmentEventHub:
+    """
+    Single pattern subscription per process, fanned out to per-BOM subscribers.
+
+    The reader task starts with the first subscriber and stops with the last,
+    so idle pods hold no subscription. After a Redis outage, subscribers are
+    backfilled from the BOM streams so no events are lost across the gap.
+    """
+
+    def __init__(self, client_factory: Callable[[], Awaitable[Any]], queue_size: Optional[int] = None):
+        self._client_factory = client_factory
+        self._queue_size = queue_size or settings.enrichment_stream_queue_size
+        self._subscribers: Dict[str, Set[Subscriber]] = {}
+        self._client = None
+        self._pubsub = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self.delivered = 0
+
+    # -- subscriptions -------------------------------------------------------
+
+    async def subscribe(self, bom_id: str, last_event_id: Optional[str] = None) -> Subscriber:
+        """Register a subscriber, starting the shared reader if needed."""
+        self._bind_loop()
+        subscriber = Subscriber(
+            bom_id=bom_id,
+            queue=asyncio.Queue(maxsize=self._queue_size),
+            last_id=parse_stream_id(last_event_id),
+        )
+        self._subscribers.setdefault(bom_id, set()).add(subscriber)
+        try:
+            await self._ensure_reader()
+        except BaseException:
+            self._discard(subscriber)
+            raise
+        return subscriber
+
+    async def unsubscribe(self, subscriber: Subscriber) -> None:
+        self._discard(subscriber)
+        if not self._subscribers:
+            await self._stop_reader()
+
+    async def replay(self, subscriber: Subscriber, last_event_id: str) -> List[Dict[str, Any]]:
+        """
+        Events the client missed since `last_event_id`, from the BOM stream.
+
+        Live events may reach the subscriber's queue while this runs; callers
+        skip queued events at or before the last replayed id.
+        """
+        client = await self._client_factory()
+        return await read_events_after(client, subscriber.bom_id, last_event_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": bool(self._task and not self._task.done()),
+            "boms": len(self._subscribers),
+            "subscribers": sum(len(subs) for subs in self._subscribers.values()),
+            "delivered": self.delivered,
+            "dropped": sum(sub.dropped for subs in self._subscribers.values() for sub in subs),
+        }
+
+    def _discard(self, subscriber: Subscriber) -> None:
+        subs = self._subscribers.get(subscriber.bom_id)
+        if subs is not None:
+            subs.discard(subscriber)
+            if not subs:
+                del self._subscribers[subscriber.bom_id]
+
+    def _bind_loop(self) -> None:
+        # Queues and the reader task belong to one event loop; a new loop
+        # (worker restart, test run) starts from a clean slate.
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._lock = asyncio.Lock()
+            self._subscribers = {}
+            self._client = None
+            self._pubsub = None
+            self._task = None
+
+    # -- reader --------------------------------------------------------------
+
+    async def _ensure_reader(self) -> None:
+        async with self._lock:
+            if self._task is not None and not self._task.done():
+                return
+            await self._connect()
+            self._task = asyncio.create_task(self._read_loop())
+
+    async def _connect(self) -> None:
+        self._client = await self._client_factory()
+        self._pubsub = self._client.pubsub()
+        await self._pubsub.psubscribe(CHANNEL_PATTERN)
+        logger.info(f"[Enrichment Hub] Subscribed to {CHANNEL_PATTERN}")
+
+    async def _stop_reader(self) -> None:
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        await self._close_pubsub()
+
+    async def _close_pubsub(self) -> None:
+        pubsub, self._pubsub = self._pubsub, None
+        if pubsub is None:
+            return
+        try:
+            await pubsub.punsubscribe()
+            await pubsub.close()
+        except Exception as e:
+            logger.warning(f"[Enrichment Hub] Error during pubsub cleanup: {e}")
+
+    async def _read_loop(self) -> None:
+        failures = 0
+        while self._subscribers:
+            try:
+                if self._pubsub is None:
+                    await self._connect()
+                    await self._backfill()
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                failures = 0
+                if message:
+                    self._dispatch(message)
+            except asyncio.CancelledError:
+                raise
+            except (RedisError, OSError) as e:
+                delay = reconnect_delay(failures)
+                failures += 1
+                logger.warning(f"[Enrichment Hub] Redis error, reconnecting in {delay}s: {e}")
+                await self._close_pubsub()
+                await asyncio.sleep(delay)
+            except Exception as e:
+                logger.error(f"[Enrichment Hub] Unexpected reader error: {e}", exc_info=True)
+                await asyncio.sleep(1)
+        await self._close_pubsub()
+
+    async def _backfill(self) -> None:
+        """After a reconnect, deliver whatever was appended while we were away."""
+        for bom_id, subs in list(self._subscribers.items()):
+            known = [sub.last_id for sub in subs if sub.last_id is not None]
+            if not known:
+                continue
+            oldest = min(known)
+            for event in await read_events_after(self._client, bom_id, f"{oldest[0]}-{oldest[1]}"):
+                for sub in list(subs):
+                    sub.offer(event)
+
+    def _dispatch(self, message: Dict[str, Any]) -> None:
+        if message.get("type") not in ("message", "pmessage"):
+            return
+
+        bom_id = None
+        channel = message.get("channel")
+        if channel:
+            channel = channel.decode() if isinstance(channel, bytes) else channel
+            bom_id = channel[len(CHANNEL_PREFIX):] if channel.startswith(CHANNEL_PREFIX) else None
+            # Skip decoding events nobody on this pod is watching
+            if bom_id not in self._subscribers:
+                return
+
+        try:
+            event = json.loads(message["data"])
+        except (TypeError, ValueError) as e:
+            logger.error(f"[Enrichment Hub] Failed to decode event data: {e}")
+            return
+
+        subs = self._subscribers.get(bom_id or str(event.get("bom_id")))
+        for sub in list(subs or ()):
+            sub.offer(event)
+            self.delivered += 1
@@ -0,0 +1,220 @@
+"""
+Enrichment Event Sink
+
+Coalesces component-level enrichment events (`enrichment.component.*`)
+emitted by `enrich_component` activities in a worker process.
+
+Events are appended to an in-memory buffer. A flusher drains the buffer
+every ENRICHMENT_EVENT_FLUSH_MS (default 500 ms) and:
+
+1. Writes all buffered rows to `enrichment_events` with multi-row INSERTs
+2. Publishes one `enrichment.components` delta per BOM to the SSE stream
+
+This replaces one INSERT (plus retries) per component with one statement
+per interval. Events still buffered when a worker dies are lost; they are
+informational only (line item state is written by the activity itself).
+"""
+
+import asyncio
+import json
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import DataError, IntegrityError
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = (
+    "event_id", "event_type", "routing_key", "bom_id", "tenant_id",
+    "source", "state", "payload", "created_at",
+)
+MAX_ROWS_PER_INSERT = 500
+MAX_RETRIES = 3
+
+
+def build_insert(rows: List[Dict[str, Any]]):
+    """One INSERT ... VALUES (...), (...) statement for a list of event records."""
+    values = []
+    params: Dict[str, Any] = {}
+    for i, row in enumerate(rows):
+        values.append("(" + ", ".join(f":{col}_{i}" for col in COLUMNS) + ")")
+        params.update({
+            f"event_id_{i}": row["event_id"],
+            f"event_type_{i}": row["event_type"],
+            f"routing_key_{i}": row.get("routing_key"),
+            f"bom_id_{i}": row["bom_id"],
+            f"tenant_id_{i}": row["organization_id"],  # Map org_id to tenant_id column
+            f"source_{i}": row["source"],
+            f"state_{i}": json.dumps(row.get("state", {})),
+            f"payload_{i}": json.dumps(row.get("payload", {})),
+            f"created_at_{i}": row["created_at"],
+        })
+    query = text(
+        f"INSERT INTO enrichment_events ({', '.join(COLUMNS)}) VALUES {', '.join(values)}"
+    )
+    return query, params
+
+
+def build_delta(bom_id: str, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Summarize one interval of component events for a BOM as a single SSE event."""
+    first = rows[0]
+    components = []
+    counts: Dict[str, int] = {}
+    for row in rows:
+        status = row["event_type"].rsplit(".", 1)[-1]
+        counts[status] = counts.get(status, 0) + 1
+        payload = row.get("payload", {})
+        components.append({
+            **payload.get("component", {}),
+            "status": status,
+            "error": payload.get("error"),
+        })
+    return {
+        "event_id": f"{bom_id}:{first['event_id']}",
+        "event_type": "enrichment.components",
+        "bom_id": bom_id,
+        "organization_id": first["organization_id"],
+        "source": first["source"],
+        "state": counts,
+        "payload": {"components": components},
+        "created_at": datetime.utcnow().isoformat(),
+    }
+
+
+class EnrichmentEventSink:
+    """Per-process buffer for component events with a periodic flusher."""
+
+    def __init__(self, flush_interval_ms: Optional[int] = None, max_buffer: Optional[int] = None):
+        self.flush_interval = (flush_interval_ms or settings.enrichment_event_flush_ms) / 1000.0
+        self.max_buffer = max_buffer or settings.enrichment_event_buffer_max
+        self._buffer: deque = deque()
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self.dropped = 0
+        self.written = 0
+
+    def add(self, event_record: Dict[str, Any]) -> None:
+        """Buffer an event; never blocks the enrichment activity."""
+        if len(self._buffer) >= self.max_buffer:
+            self._buffer.popleft()
+            self.dropped += 1
+            if self.dropped % 100 == 1:
+                logger.warning(f"[Event Sink] Buffer full, dropped {self.dropped} component events so far")
+        self._buffer.append(event_record)
+        self._ensure_flusher()
+
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def _ensure_flusher(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._flush_lock = asyncio.Lock()
+            self._task = None
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        while self._buffer:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"[Event Sink] Flush failed: {e}", exc_info=True)
+
+    async def flush(self) -> int:
+        """Write and publish everything buffered so far. Returns rows written."""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            rows = list(self._buffer)
+            self._buffer.clear()
+            if not rows:
+                return 0
+
+            written = await self._write_with_retry(rows)
+            await self._publish_deltas(rows)
+            self.written += written
+            logger.info(f"[Event Sink] Flushed {written}/{len(rows)} component events")
+            return written
+
+    async def _write_with_retry(self, rows: List[Dict[str, Any]]) -> int:
+        for attempt in range(MAX_RETRIES):
+            try:
+                return await asyncio.to_thread(self._write_rows, rows)
+            except (IntegrityError, DataError) as e:
+                # A bad or duplicate row fails the whole statement; isolate it
+                logger.warning(f"[Event Sink] Multi-row insert rejected, writing rows individually: {e}")
+                return await asyncio.to_thread(self._write_rows_individually, rows)
+            except Exception as e:
+                if attempt == MAX_RETRIES - 1:
+                    logger.error(f"[Event Sink] Dropping {len(rows)} component events after {MAX_RETRIES} attempts: {e}")
+                    return 0
+                wait_time = 2 ** attempt  # Exponential backoff: 1, 2 seconds
+                logger.warning(
+                    f"[Event Sink] Write failed (attempt {attempt + 1}/{MAX_RETRIES}), retrying in {wait_time}s: {e}"
+                )
+                await asyncio.sleep(wait_time)
+        return 0
+
+    def _write_rows(self, rows: List[Dict[str, Any]]) -> int:
+        from app.models.dual_database import get_dual_database
+
+        session_gen = get_dual_database().get_session("supabase")
+        db = next(session_gen)
+        try:
+            for start in range(0, len(rows), MAX_ROWS_PER_INSERT):
+                query, params = build_insert(rows[start:start + MAX_ROWS_PER_INSERT])
+                db.execute(query, params)
+            db.commit()
+            return len(rows)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            try:
+                next(session_gen)
+            except StopIteration:
+                pass
+
+    def _write_rows_individually(self, rows: List[Dict[str, Any]]) -> int:
+        written = 0
+        for row in rows:
+            try:
+                written += self._write_rows([row])
+            except (IntegrityError, DataError) as e:
+                logger.warning(f"[Event Sink] Skipping component event {row.get('event_id')}: {e}")
+        return written
+
+    async def _publish_deltas(self, rows: List[Dict[str, Any]]) -> None:
+        by_bom: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            by_bom.setdefault(row["bom_id"], []).append(row)
+
+        try:
+            from app.cache.redis_cache import get_redis_client
+            from app.services.enrichment_event_hub import append_enrichment_event
+
+            redis_client = await get_redis_client()
+            for bom_id, bom_rows in by_bom.items():
+                await append_enrichment_event(redis_client, bom_id, build_delta(bom_id, bom_rows))
+        except Exception as e:
+            logger.warning(f"[Event Sink] Failed to publish component deltas: {e}")
+
+
+_sink: Optional[EnrichmentEventSink] = None
+
+
+def get_enrichment_event_sink() -> EnrichmentEventSink:
+    """Get the process-wide component event sink."""
+    global _sink
+    if _sink is None:
+        _sink = EnrichmentEventSink()
+    return _sink
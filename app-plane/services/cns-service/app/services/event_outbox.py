@@ -0,0 +1,123 @@
+"""
+Transactional Event Outbox
+
+Stores domain events in `event_outbox` inside the caller's DB transaction,
+so an event commits (or rolls back) together with the change that produced
+it. The outbox relay (app/workers/outbox_relay.py) publishes committed rows
+to RabbitMQ; request handlers never wait on the broker.
+
+Usage:
+    with transactional_events(db):
+        db.execute(...)                           # domain change
+        EventPublisher.customer_bom_deleted(...)  # -> event_outbox row
+        db.commit()
+
+Delivery is at-least-once: a relay that dies after publishing but before
+marking rows published sends them again. Consumers dedupe on event_id.
+"""
+
+import json
+import logging
+from contextlib import contextmanager
+from typing import Any, Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from shared.event_bus import DecimalEncoder, capture_events
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRY_DELAY_SECONDS = 300
+
+INSERT_EVENT = text("""
+    INSERT INTO event_outbox (event_id, routing_key, payload, priority)
+    VALUES (:event_id, :routing_key, CAST(:payload AS jsonb), :priority)
+    ON CONFLICT (event_id) DO NOTHING
+""")
+
+CLAIM_EVENTS = text("""
+    SELECT id, event_id, routing_key, payload::text AS payload, priority
+    FROM event_outbox
+    WHERE published_at IS NULL
+      AND available_at <= NOW()
+    ORDER BY id
+    LIMIT :limit
+    FOR UPDATE SKIP LOCKED
+""")
+
+MARK_PUBLISHED = text("""
+    UPDATE event_outbox
+    SET published_at = NOW(), attempts = attempts + 1, last_error = NULL
+    WHERE id = ANY(:ids)
+""")
+
+MARK_FAILED = text(f"""
+    UPDATE event_outbox
+    SET attempts = attempts + 1,
+        last_error = :error,
+        available_at = NOW() + make_interval(secs => LEAST({MAX_RETRY_DELAY_SECONDS}, power(2, attempts)))
+    WHERE id = ANY(:ids)
+""")
+
+PURGE_PUBLISHED = text("""
+    DELETE FROM event_outbox
+    WHERE published_at < NOW() - make_interval(hours => :hours)
+""")
+
+
+def add_event(db: Session, routing_key: str, event: Dict[str, Any], priority: int = 0) -> None:
+    """Insert a built event envelope in the session's current transaction (no commit)."""
+    db.execute(INSERT_EVENT, {
+        "event_id": event["event_id"],
+        "routing_key": routing_key,
+        "payload": json.dumps(event, cls=DecimalEncoder),
+        "priority": priority,
+    })
+
+
+@contextmanager
+def transactional_events(db: Session):
+    """Write EventPublisher / publish_event() calls in this block to the outbox via `db`."""
+    def write(routing_key: str, event: Dict[str, Any], priority: int) -> None:
+        add_event(db, routing_key, event, priority)
+        logger.debug(f"[Outbox] Queued {routing_key} ({event['event_id']})")
+
+    with capture_events(write):
+        yield
+
+
+def claim_events(db: Session, limit: int) -> List[Dict[str, Any]]:
+    """
+    Lock up to `limit` unpublished rows, skipping rows other relays hold.
+
+    Returns publisher messages ({id, routing_key, body, message_id, priority}).
+    The locks last until the caller commits or rolls back.
+    """
+    rows = db.execute(CLAIM_EVENTS, {"limit": limit}).fetchall()
+    return [
+        {
+            "id": row.id,
+            "routing_key": row.routing_key,
+            "body": row.payload,
+            "message_id": str(row.event_id),
+            "priority": row.priority,
+        }
+        for row in rows
+    ]
+
+
+def mark_published(db: Session, ids: List[int]) -> None:
+    if ids:
+        db.execute(MARK_PUBLISHED, {"ids": ids})
+
+
+def mark_failed(db: Session, ids: List[int], error: str) -> None:
+    """Record a failed attempt and push the rows back with exponential backoff."""
+    if ids:
+        db.execute(MARK_FAILED, {"ids": ids, "error": error[:1000]})
+
+
+def purge_published(db: Session, older_than_hours: int) -> int:
+    result = db.execute(PURGE_PUBLISHED, {"hours": older_than_hours})
+    return result.rowcount or 0
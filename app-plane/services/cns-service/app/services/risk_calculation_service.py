@@ -35,6 +35,7 @@ from uuid import UUID
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from app.cache.response_cache import invalidate_risk
 from app.models.dual_database import get_dual_database
 
 # Import existing risk calculator for base calculations
@@ -1111,6 +1112,7 @@ class RiskCalculationService:
                     contextual_risk_score = EXCLUDED.contextual_risk_score,
                     risk_level = EXCLUDED.risk_level,
                     profile_version_used = EXCLUDED.profile_version_used,
+                    carried_over = FALSE,
                     calculated_at = NOW(),
                     updated_at = NOW()
                 RETURNING id
@@ -1407,6 +1409,7 @@ class RiskCalculationService:
             result = db.execute(text(sql), params)
             row = result.fetchone()
             db.commit()
+            invalidate_risk(summary.organization_id, [summary.bom_id])
 
             # Record history
             await self._record_bom_history(summary, db)
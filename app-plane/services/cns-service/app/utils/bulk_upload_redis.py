@@ -5,22 +5,38 @@ Stores CNS staff bulk upload data in Redis (temporary processing storage).
 Keeps Supabase clean for customer BOMs only.
 
 Data Structure:
-    bulk_upload:{upload_id}:metadata      - Upload metadata (JSON)
-    bulk_upload:{upload_id}:line_items    - List of line items (Redis List)
+    bulk_upload:{upload_id}:metadata      - Upload metadata
+    bulk_upload:{upload_id}:line_items_by_id - Line items keyed by line item id (Redis Hash)
+    bulk_upload:{upload_id}:line_item_ids    - Line item ids in upload order (Redis List)
     bulk_upload:{upload_id}:status        - Current status string
-    bulk_upload:{upload_id}:progress      - Processing progress (JSON)
+    bulk_upload:{upload_id}:progress      - Processing progress
+
+Values are encoded with the shared cache serializer (app/cache/redis_cache.py).
+
+Registry (maintained on write, so listing/cleanup never SCAN the keyspace):
+    bulk_upload_registry:created  - Sorted set of upload ids by creation time
+    bulk_upload_registry:expires  - Sorted set of upload ids by metadata expiry time
 
 All keys have TTL (24 hours default) and auto-expire after processing.
+
+Line items are stored as a hash plus an ordered id list, so updating one item
+is a single HGET/HSET instead of rewriting the whole list, and range reads
+(LRANGE ids + HMGET) keep upload order. Updates write each item with a
+compare-and-set script, so a concurrent update of the same item is merged
+again instead of overwritten, and updates of different items never
+conflict. Uploads written with the older single-list layout (bulk_upload:{upload_id}:line_items) are converted on
+first access.
 """
 
-import json
 import logging
+import time
+import uuid
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from redis import Redis
 from redis.exceptions import RedisError
 
-from app.cache.redis_cache import get_cache, DecimalEncoder  # Reuse shared encoder
+from app.cache.redis_cache import get_cache, serialize, deserialize
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +44,44 @@ logger = logging.getLogger(__name__)
 DEFAULT_TTL_HOURS = 24  # Bulk uploads expire after 24 hours
 PROCESSING_TTL_HOURS = 48  # Extend TTL during processing
 
+# Writes each item whose value is still the one read (id, read value, merged
+# value triples after the TTL) and returns the ids another writer changed
+# KEYS = line_items_by_id hash, line_item_ids list
+UPDATE_ITEMS_SCRIPT = """
+local changed = {}
+for i = 2, #ARGV, 3 do
+    if redis.call('HGET', KEYS[1], ARGV[i]) == ARGV[i + 1] then
+        redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 2])
+    else
+        table.insert(changed, ARGV[i])
+    end
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+redis.call('EXPIRE', KEYS[2], ARGV[1])
+return changed
+"""
+
+# Registry sorted sets (outside the bulk_upload:* namespace on purpose)
+REGISTRY_CREATED_KEY = "bulk_upload_registry:created"
+REGISTRY_EXPIRES_KEY = "bulk_upload_registry:expires"
+REGISTRY_BACKFILLED_KEY = "bulk_upload_registry:backfilled"
+
+# Per-upload key suffixes: bulk_upload:{upload_id}:{suffix}
+UPLOAD_KEY_SUFFIXES = (
+    "metadata",
+    "line_items_by_id",
+    "line_item_ids",
+    "line_items",  # pre-hash layout
+    "status",
+    "progress",
+    "enrichment_config",
+)
+
+
+def bulk_upload_keys(upload_id: str) -> List[str]:
+    """All Redis keys belonging to an upload"""
+    return [f"bulk_upload:{upload_id}:{suffix}" for suffix in UPLOAD_KEY_SUFFIXES]
+
 
 class BulkUploadRedisStorage:
     """
@@ -53,7 +107,8 @@ class BulkUploadRedisStorage:
         if not self.cache or not self.cache.is_connected:
             raise RuntimeError("Redis cache not initialized or connected")
 
-        self.redis_client: Redis = self.cache.get_client()
+        # Binary client: values are written with the shared cache serializer
+        self.redis_client: Redis = self.cache.get_binary_client()
 
     # ============================================================================
     # KEY BUILDERS
@@ -64,9 +119,21 @@ class BulkUploadRedisStorage:
         return f"bulk_upload:{self.upload_id}:metadata"
 
     def _key_line_items(self) -> str:
-        """Redis key for line items list"""
+        """Redis key for line items hash (line item id -> JSON)"""
+        return f"bulk_upload:{self.upload_id}:line_items_by_id"
+
+    def _key_line_item_ids(self) -> str:
+        """Redis key for ordered line item id list"""
+        return f"bulk_upload:{self.upload_id}:line_item_ids"
+
+    def _key_legacy_line_items(self) -> str:
+        """Redis key for line items list (pre-hash layout)"""
         return f"bulk_upload:{self.upload_id}:line_items"
 
+    def _all_keys(self) -> List[str]:
+        """All Redis keys belonging to this upload"""
+        return bulk_upload_keys(self.upload_id)
+
     def _key_status(self) -> str:
         """Redis key for status string"""
         return f"bulk_upload:{self.upload_id}:status"
@@ -102,11 +169,12 @@ class BulkUploadRedisStorage:
             if 'created_at' not in metadata:
                 metadata['created_at'] = datetime.utcnow().isoformat()
 
-            self.redis_client.setex(
-                key,
-                ttl_seconds,
-                json.dumps(metadata, cls=DecimalEncoder)
-            )
+            now = time.time()
+            pipe = self.redis_client.pipeline()
+            pipe.setex(key, ttl_seconds, serialize(metadata))
+            pipe.zadd(REGISTRY_CREATED_KEY, {self.upload_id: now}, nx=True)
+            pipe.zadd(REGISTRY_EXPIRES_KEY, {self.upload_id: now + ttl_seconds})
+            pipe.execute()
 
             logger.info(f"[Bulk Upload Redis] Metadata saved: {self.upload_id} (TTL: {ttl_hours}h)")
             return True
@@ -129,9 +197,9 @@ class BulkUploadRedisStorage:
             if not value:
                 return None
 
-            return json.loads(value)
+            return deserialize(value)
 
-        except (RedisError, json.JSONDecodeError) as e:
+        except (RedisError, ValueError) as e:
             logger.error(f"[Bulk Upload Redis] Failed to get metadata: {e}")
             return None
 
@@ -139,9 +207,57 @@ class BulkUploadRedisStorage:
     # LINE ITEMS OPERATIONS
     # ============================================================================
 
+    def _queue_line_items(self, pipe, line_items: List[Dict[str, Any]], ttl_seconds: int) -> int:
+        """
+        Queue HSET + RPUSH commands for new line items on a pipeline
+
+        Items without an 'id' get one assigned. Ids repeated within the batch
+        are stored once (last value wins, first position kept).
+        """
+        mapping: Dict[str, str] = {}
+        order: List[str] = []
+        for item in line_items:
+            item_id = str(item.get('id') or uuid.uuid4())
+            if item_id not in mapping:
+                order.append(item_id)
+            mapping[item_id] = serialize({**item, 'id': item_id})
+
+        if not mapping:
+            return 0
+
+        pipe.hset(self._key_line_items(), mapping=mapping)
+        pipe.rpush(self._key_line_item_ids(), *order)
+        pipe.expire(self._key_line_items(), ttl_seconds)
+        pipe.expire(self._key_line_item_ids(), ttl_seconds)
+        return len(order)
+
+    def _migrate_legacy_line_items(self) -> bool:
+        """
+        Convert line items stored in the old single-list layout
+
+        Returns:
+            True if legacy items were found and converted
+        """
+        legacy_key = self._key_legacy_line_items()
+        raw_items = self.redis_client.lrange(legacy_key, 0, -1)
+        if not raw_items:
+            return False
+
+        ttl_seconds = self.redis_client.ttl(legacy_key)
+        if ttl_seconds is None or ttl_seconds <= 0:
+            ttl_seconds = DEFAULT_TTL_HOURS * 3600
+
+        pipe = self.redis_client.pipeline()
+        self._queue_line_items(pipe, [deserialize(item) for item in raw_items], ttl_seconds)
+        pipe.delete(legacy_key)
+        pipe.execute()
+
+        logger.info(f"[Bulk Upload Redis] Converted {len(raw_items)} legacy line items: {self.upload_id}")
+        return True
+
     def add_line_item(self, line_item: Dict[str, Any], ttl_hours: int = DEFAULT_TTL_HOURS) -> bool:
         """
-        Add single line item to Redis list
+        Add single line item
 
         Args:
             line_item: Line item data (dict)
@@ -151,14 +267,9 @@ class BulkUploadRedisStorage:
             True if added successfully
         """
         try:
-            key = self._key_line_items()
-            ttl_seconds = ttl_hours * 3600
-
-            # Push to Redis list
-            self.redis_client.rpush(key, json.dumps(line_item, cls=DecimalEncoder))
-
-            # Set/refresh TTL
-            self.redis_client.expire(key, ttl_seconds)
+            pipe = self.redis_client.pipeline()
+            self._queue_line_items(pipe, [line_item], ttl_hours * 3600)
+            pipe.execute()
 
             return True
 
@@ -181,21 +292,12 @@ class BulkUploadRedisStorage:
             if not line_items:
                 return True
 
-            key = self._key_line_items()
-            ttl_seconds = ttl_hours * 3600
-
-            # Use pipeline for bulk insert
+            # One HSET + one RPUSH for the whole batch
             pipe = self.redis_client.pipeline()
-
-            for item in line_items:
-                pipe.rpush(key, json.dumps(item, cls=DecimalEncoder))
-
-            # Set TTL
-            pipe.expire(key, ttl_seconds)
-
+            added = self._queue_line_items(pipe, line_items, ttl_hours * 3600)
             pipe.execute()
 
-            logger.info(f"[Bulk Upload Redis] {len(line_items)} line items saved in bulk")
+            logger.info(f"[Bulk Upload Redis] {added} line items saved in bulk")
             return True
 
         except (RedisError, TypeError) as e:
@@ -204,7 +306,7 @@ class BulkUploadRedisStorage:
 
     def get_line_items(self, start: int = 0, end: int = -1) -> List[Dict[str, Any]]:
         """
-        Get line items from Redis list
+        Get line items in upload order
 
         Args:
             start: Start index (default 0 = first item)
@@ -214,12 +316,16 @@ class BulkUploadRedisStorage:
             List of line item dicts
         """
         try:
-            key = self._key_line_items()
-            items = self.redis_client.lrange(key, start, end)
+            ids = self.redis_client.lrange(self._key_line_item_ids(), start, end)
+            if not ids and self._migrate_legacy_line_items():
+                ids = self.redis_client.lrange(self._key_line_item_ids(), start, end)
+            if not ids:
+                return []
 
-            return [json.loads(item) for item in items]
+            values = self.redis_client.hmget(self._key_line_items(), ids)
+            return [deserialize(value) for value in values if value is not None]
 
-        except (RedisError, json.JSONDecodeError) as e:
+        except (RedisError, ValueError) as e:
             logger.error(f"[Bulk Upload Redis] Failed to get line items: {e}")
             return []
 
@@ -231,8 +337,10 @@ class BulkUploadRedisStorage:
             Number of line items
         """
         try:
-            key = self._key_line_items()
-            return self.redis_client.llen(key)
+            count = self.redis_client.llen(self._key_line_item_ids())
+            if not count and self._migrate_legacy_line_items():
+                count = self.redis_client.llen(self._key_line_item_ids())
+            return count
 
         except RedisError as e:
             logger.error(f"[Bulk Upload Redis] Failed to get line items count: {e}")
@@ -245,7 +353,7 @@ class BulkUploadRedisStorage:
         ttl_hours: int = PROCESSING_TTL_HOURS
     ) -> bool:
         """
-        Update specific line item in Redis list
+        Update specific line item by ID
 
         Args:
             line_item_id: Line item ID to update
@@ -254,60 +362,77 @@ class BulkUploadRedisStorage:
 
         Returns:
             True if updated successfully
+        """
+        return self.update_line_items_bulk({line_item_id: updates}, ttl_hours=ttl_hours) == 1
 
-        Note: Redis lists don't support in-place updates by ID.
-        This method:
-        1. Fetches all line items
-        2. Finds and updates the matching item
-        3. Replaces the entire list
-        4. Extends TTL
+    def update_line_items_bulk(
+        self,
+        updates: Dict[str, Dict[str, Any]],
+        ttl_hours: int = PROCESSING_TTL_HOURS
+    ) -> int:
         """
-        try:
-            # Get all line items
-            line_items = self.get_line_items()
+        Update many line items in one round trip each for read and write
 
-            if not line_items:
-                logger.warning(f"[Bulk Upload Redis] No line items found for upload: {self.upload_id}")
-                return False
+        Args:
+            updates: Line item ID -> dict of fields to update
+            ttl_hours: TTL to extend
 
-            # Find and update matching item
-            updated = False
-            for item in line_items:
-                if item.get('id') == line_item_id:
-                    item.update(updates)
-                    updated = True
-                    logger.debug(f"[Bulk Upload Redis] Updated line item: {line_item_id}")
-                    break
+        Returns:
+            Number of line items updated (IDs not found are skipped)
 
-            if not updated:
-                logger.warning(f"[Bulk Upload Redis] Line item not found: {line_item_id}")
-                return False
+        Example:
+            storage.update_line_items_bulk({
+                "item-1": {"enrichment_status": "completed"},
+                "item-2": {"enrichment_status": "error", "enrichment_error": "timeout"},
+            })
+        """
+        if not updates:
+            return 0
 
-            # Replace entire list
+        try:
             key = self._key_line_items()
             ttl_seconds = ttl_hours * 3600
+            update_items = self.redis_client.register_script(UPDATE_ITEMS_SCRIPT)
+            pending = dict(updates)
+            updated: List[str] = []
+            migrated = False
+
+            while pending:
+                ids = list(pending)
+                values = self.redis_client.hmget(key, ids)
+                if not migrated:
+                    migrated = True
+                    if all(value is None for value in values) and self._migrate_legacy_line_items():
+                        continue
+
+                args: List[Any] = [ttl_seconds]
+                for line_item_id, value in zip(ids, values):
+                    if value is None:
+                        logger.warning(f"[Bulk Upload Redis] Line item not found: {line_item_id}")
+                        continue
+                    item = deserialize(value)
+                    item.update(pending[line_item_id])
+                    args += [line_item_id, value, serialize(item)]
+
+                if len(args) == 1:
+                    break
 
-            # Use pipeline for atomic operation
-            pipe = self.redis_client.pipeline()
-
-            # Delete old list
-            pipe.delete(key)
-
-            # Add updated items
-            for item in line_items:
-                pipe.rpush(key, json.dumps(item, cls=DecimalEncoder))
-
-            # Set TTL
-            pipe.expire(key, ttl_seconds)
-
-            pipe.execute()
+                changed = {_decode(line_item_id) for line_item_id in update_items(
+                    keys=[key, self._key_line_item_ids()], args=args
+                )}
+                updated += [line_item_id for line_item_id in args[1::3] if line_item_id not in changed]
+                # Items another writer changed since we read them are merged again
+                pending = {line_item_id: pending[line_item_id] for line_item_id in changed}
 
-            logger.info(f"[Bulk Upload Redis] Line item updated: {line_item_id}")
-            return True
+            if len(updated) == 1:
+                logger.info(f"[Bulk Upload Redis] Line item updated: {updated[0]}")
+            elif updated:
+                logger.info(f"[Bulk Upload Redis] {len(updated)} line items updated")
+            return len(updated)
 
         except Exception as e:
-            logger.error(f"[Bulk Upload Redis] Failed to update line item {line_item_id}: {e}")
-            return False
+            logger.error(f"[Bulk Upload Redis] Failed to update line items: {e}")
+            return 0
 
     # ============================================================================
     # STATUS OPERATIONS
@@ -402,7 +527,7 @@ class BulkUploadRedisStorage:
             self.redis_client.setex(
                 key,
                 ttl_seconds,
-                json.dumps(progress, cls=DecimalEncoder)
+                serialize(progress)
             )
 
             # Align TTLs across all keys to prevent drift
@@ -428,7 +553,7 @@ class BulkUploadRedisStorage:
             if not value:
                 return None
 
-            progress = json.loads(value)
+            progress = deserialize(value)
 
             # Add redis_expires_at timestamp
             expires_at = self.get_redis_expires_at()
@@ -437,7 +562,7 @@ class BulkUploadRedisStorage:
 
             return progress
 
-        except (RedisError, json.JSONDecodeError) as e:
+        except (RedisError, ValueError) as e:
             logger.error(f"[Bulk Upload Redis] Failed to get progress: {e}")
             return None
 
@@ -463,7 +588,7 @@ class BulkUploadRedisStorage:
             self.redis_client.setex(
                 key,
                 ttl_seconds,
-                json.dumps(config, cls=DecimalEncoder)
+                serialize(config)
             )
 
             logger.info(f"[Bulk Upload Redis] Enrichment config saved: {self.upload_id}")
@@ -487,9 +612,9 @@ class BulkUploadRedisStorage:
             if not value:
                 return None
 
-            return json.loads(value)
+            return deserialize(value)
 
-        except (RedisError, json.JSONDecodeError) as e:
+        except (RedisError, ValueError) as e:
             logger.error(f"[Bulk Upload Redis] Failed to get enrichment config: {e}")
             return None
 
@@ -505,15 +630,11 @@ class BulkUploadRedisStorage:
             True if deleted successfully
         """
         try:
-            keys = [
-                self._key_metadata(),
-                self._key_line_items(),
-                self._key_status(),
-                self._key_progress(),
-                self._key_enrichment_config()
-            ]
-
-            self.redis_client.delete(*keys)
+            pipe = self.redis_client.pipeline()
+            pipe.delete(*self._all_keys())
+            pipe.zrem(REGISTRY_CREATED_KEY, self.upload_id)
+            pipe.zrem(REGISTRY_EXPIRES_KEY, self.upload_id)
+            pipe.execute()
 
             logger.info(f"[Bulk Upload Redis] All keys deleted for upload: {self.upload_id}")
             return True
@@ -533,19 +654,13 @@ class BulkUploadRedisStorage:
             True if extended successfully
         """
         try:
-            keys = [
-                self._key_metadata(),
-                self._key_line_items(),
-                self._key_status(),
-                self._key_progress(),
-                self._key_enrichment_config()
-            ]
-
+            keys = self._all_keys()
             ttl_seconds = ttl_hours * 3600
 
             pipe = self.redis_client.pipeline()
             for key in keys:
                 pipe.expire(key, ttl_seconds)
+            pipe.zadd(REGISTRY_EXPIRES_KEY, {self.upload_id: time.time() + ttl_seconds}, xx=True)
             pipe.execute()
 
             logger.info(f"[Bulk Upload Redis] TTL extended: {self.upload_id} -> {ttl_hours}h")
@@ -617,6 +732,8 @@ class BulkUploadRedisStorage:
             # Apply same TTL to all related keys
             keys_to_align = [
                 self._key_line_items(),
+                self._key_line_item_ids(),
+                self._key_legacy_line_items(),
                 self._key_status(),
                 self._key_progress(),
                 self._key_enrichment_config()
@@ -673,9 +790,39 @@ def get_bulk_upload_storage(upload_id: str) -> Optional[BulkUploadRedisStorage]:
         return None
 
 
+def _decode(value) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _backfill_registry(redis_client: Redis) -> None:
+    """
+    Register uploads created before the registry existed (one SCAN per Redis)
+
+    Guarded by a marker key so only the first caller scans.
+    """
+    if not redis_client.set(REGISTRY_BACKFILLED_KEY, "1", nx=True):
+        return
+
+    now = time.time()
+    registered = 0
+    pipe = redis_client.pipeline()
+    for key in redis_client.scan_iter(match="bulk_upload:*:metadata", count=1000):
+        # key format: bulk_upload:{upload_id}:metadata
+        upload_id = _decode(key).split(':')[1]
+        ttl = redis_client.ttl(key)
+        expires_at = now + ttl if ttl and ttl > 0 else now + DEFAULT_TTL_HOURS * 3600
+        pipe.zadd(REGISTRY_CREATED_KEY, {upload_id: now}, nx=True)
+        pipe.zadd(REGISTRY_EXPIRES_KEY, {upload_id: expires_at}, nx=True)
+        registered += 1
+    pipe.execute()
+
+    if registered:
+        logger.info(f"Bulk upload registry backfilled with {registered} existing uploads")
+
+
 def list_active_bulk_uploads() -> List[str]:
     """
-    List all active bulk upload IDs in Redis
+    List all active bulk upload IDs in Redis, newest first
 
     Returns:
         List of upload IDs
@@ -686,18 +833,13 @@ def list_active_bulk_uploads() -> List[str]:
 
     try:
         redis_client = cache.get_client()
+        _backfill_registry(redis_client)
 
-        # Use scan_iter instead of keys() to avoid blocking Redis
-        upload_ids = []
-        for key in redis_client.scan_iter(match="bulk_upload:*:metadata", count=100):
-            # Decode bytes to string if needed
-            key_str = key.decode() if isinstance(key, bytes) else key
-            # key format: bulk_upload:{upload_id}:metadata
-            parts = key_str.split(':')
-            if len(parts) >= 3:
-                upload_ids.append(parts[1])
+        now = time.time()
+        active = set(redis_client.zrangebyscore(REGISTRY_EXPIRES_KEY, now, "+inf"))
+        newest_first = redis_client.zrevrange(REGISTRY_CREATED_KEY, 0, -1)
 
-        return upload_ids
+        return [_decode(upload_id) for upload_id in newest_first if upload_id in active]
 
     except RedisError as e:
         logger.error(f"Failed to list bulk uploads: {e}")
@@ -706,7 +848,9 @@ def list_active_bulk_uploads() -> List[str]:
 
 def cleanup_expired_bulk_uploads() -> int:
     """
-    Cleanup expired bulk uploads (those without metadata key)
+    Cleanup expired bulk uploads (metadata expired, other keys may linger)
+
+    Only uploads whose registered expiry has passed are examined.
 
     Returns:
         Number of uploads cleaned up
@@ -717,28 +861,32 @@ def cleanup_expired_bulk_uploads() -> int:
 
     try:
         redis_client = cache.get_client()
+        _backfill_registry(redis_client)
+
+        now = time.time()
+        candidates = [
+            _decode(upload_id)
+            for upload_id in redis_client.zrangebyscore(REGISTRY_EXPIRES_KEY, "-inf", now)
+        ]
 
-        # Use scan_iter instead of keys() to avoid blocking Redis
-        uploads: Dict[str, List[str]] = {}
-        for key in redis_client.scan_iter(match="bulk_upload:*", count=100):
-            # Decode bytes to string if needed
-            key_str = key.decode() if isinstance(key, bytes) else key
-            parts = key_str.split(':')
-            if len(parts) >= 3:
-                upload_id = parts[1]
-                if upload_id not in uploads:
-                    uploads[upload_id] = []
-                uploads[upload_id].append(key_str)
-
-        # Delete uploads without metadata key (expired/orphaned)
         cleaned = 0
-        for upload_id, keys in uploads.items():
+        for upload_id in candidates:
             metadata_key = f"bulk_upload:{upload_id}:metadata"
-            if metadata_key not in keys:
-                # Metadata expired - delete all related keys
-                redis_client.delete(*keys)
-                cleaned += 1
-                logger.info(f"Cleaned up expired bulk upload: {upload_id}")
+            ttl = redis_client.ttl(metadata_key)
+            if ttl > 0 or ttl == -1:
+                # Metadata refreshed outside the registry - fix the score instead
+                expires_at = now + ttl if ttl > 0 else now + DEFAULT_TTL_HOURS * 3600
+                redis_client.zadd(REGISTRY_EXPIRES_KEY, {upload_id: expires_at})
+                continue
+
+            # Metadata expired - delete all related keys
+            pipe = redis_client.pipeline()
+            pipe.delete(*bulk_upload_keys(upload_id))
+            pipe.zrem(REGISTRY_CREATED_KEY, upload_id)
+            pipe.zrem(REGISTRY_EXPIRES_KEY, upload_id)
+            pipe.execute()
+            cleaned += 1
+            logger.info(f"Cleaned up expired bulk upload: {upload_id}")
 
         if cleaned > 0:
             logger.info(f"Bulk upload cleanup: {cleaned} expired uploads removed")
@@ -9,13 +9,31 @@ import io
 import logging
 from typing import Optional, Tuple, BinaryIO
 from datetime import timedelta
-from minio import Minio
-from minio.error import S3Error
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
 
+class _MinIOSDKNotLoaded(Exception):
+    """Placeholder for minio.error.S3Error until the SDK is imported."""
+
+
+# The MinIO SDK pulls in pycryptodome, so it is imported by the first
+# MinIOClient() rather than at module import. Every method that catches
+# S3Error runs on an initialized client, after _load_sdk() rebinds it.
+S3Error = _MinIOSDKNotLoaded
+
+
+def _load_sdk():
+    """Import the MinIO SDK and bind S3Error; returns the Minio class."""
+    global S3Error
+    from minio import Minio
+    from minio.error import S3Error as SDKS3Error
+
+    S3Error = SDKS3Error
+    return Minio
+
+
 class MinIOClient:
     """MinIO/S3 client wrapper with error handling"""
 
@@ -29,6 +47,7 @@ class MinIOClient:
             return
 
         try:
+            Minio = _load_sdk()
             self.client = Minio(
                 endpoint=settings.minio_endpoint,
                 access_key=settings.minio_access_key,
@@ -106,6 +125,62 @@ class MinIOClient:
             logger.error(error_msg, exc_info=True)
             return False, error_msg
 
+    def upload_stream(
+        self,
+        bucket: str,
+        object_name: str,
+        stream: BinaryIO,
+        content_type: str = 'application/octet-stream',
+        part_size: Optional[int] = None
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Upload a file-like object to MinIO as a multipart upload of unknown length.
+
+        The stream is read one part at a time, so memory stays bounded by
+        part_size regardless of the file size.
+
+        Args:
+            bucket: Bucket name (e.g., 'bulk-uploads')
+            object_name: Object key/path
+            stream: Readable binary file-like object
+            content_type: MIME type
+            part_size: Multipart part size in bytes (default: MINIO_UPLOAD_PART_SIZE_MB)
+
+        Returns:
+            Tuple of (success: bool, error_message: Optional[str])
+        """
+        if not self.is_enabled():
+            return False, "MinIO is not enabled"
+
+        part_size = part_size or settings.minio_upload_part_size_mb * 1024 * 1024
+        # S3 rejects multipart parts smaller than 5 MiB
+        part_size = max(part_size, 5 * 1024 * 1024)
+
+        try:
+            if not self.ensure_bucket_exists(bucket):
+                return False, f"Bucket {bucket} does not exist and could not be created"
+
+            self.client.put_object(
+                bucket,
+                object_name,
+                stream,
+                length=-1,
+                part_size=part_size,
+                content_type=content_type
+            )
+
+            logger.info(f"Streamed file to MinIO: {bucket}/{object_name} (part_size={part_size})")
+            return True, None
+
+        except S3Error as e:
+            error_msg = f"MinIO upload failed: {e}"
+            logger.error(error_msg)
+            return False, error_msg
+        except Exception as e:
+            error_msg = f"Unexpected error during upload: {e}"
+            logger.error(error_msg, exc_info=True)
+            return False, error_msg
+
     def get_presigned_url(
         self,
         bucket: str,
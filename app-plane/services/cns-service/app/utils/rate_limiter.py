@@ -123,12 +123,15 @@ class RateLimiter:
 # FASTAPI DEPENDENCIES
 # ============================================================================
 
-# Global rate limiter instance
-_rate_limiter = RateLimiter()
+# Global rate limiter instance (created on first request, not at import)
+_rate_limiter: Optional[RateLimiter] = None
 
 
 def get_rate_limiter() -> RateLimiter:
     """Get global rate limiter instance"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter()
     return _rate_limiter
 
 
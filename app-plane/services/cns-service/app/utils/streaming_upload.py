@@ -0,0 +1,229 @@
+"""
+Streaming Upload Pipeline
+
+Streams an uploaded file to MinIO as a multipart upload while teeing the same
+bytes into the BOM parser, instead of reading the whole file into memory and
+then uploading and parsing it serially.
+
+    UploadFile.file ──► TeeReader ──► MinIO put_object (multipart, length=-1)
+                            │
+                            └──► ChunkPipe ──► pandas.read_csv (parser thread)
+
+Memory per upload is bounded by the multipart part size plus the pipe depth.
+CSV files are parsed while the upload is in flight. XLSX/XLS are zip/OLE
+containers that need random access, so they are parsed from the (disk-spooled)
+upload file once the upload completes.
+"""
+
+import hashlib
+import io
+import logging
+import queue
+import threading
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import TYPE_CHECKING, BinaryIO, Optional
+
+from app.utils.minio_client import get_minio_client, generate_s3_key
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Max bytes handed to MinIO/parser per read; keeps pipe memory bounded
+TEE_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+# Max chunks buffered between the uploader and the parser thread
+PIPE_MAX_CHUNKS = 8
+# Rows per pandas chunk when parsing CSV incrementally
+CSV_PARSE_CHUNK_ROWS = 5000
+
+_EOF = object()
+
+
+class ChunkPipe(io.RawIOBase):
+    """
+    Bounded single-producer/single-consumer byte pipe.
+
+    The producer (upload thread) calls write()/close_writer(); the consumer
+    (parser thread) reads it as a regular binary stream. If the consumer stops
+    early (parse error), further writes are discarded so the upload never
+    blocks on a dead parser.
+    """
+
+    def __init__(self, max_chunks: int = PIPE_MAX_CHUNKS):
+        super().__init__()
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_chunks)
+        self._buffer = b""
+        self._eof = False
+        self._reader_closed = threading.Event()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._buffer and not self._eof:
+            item = self._queue.get()
+            if item is _EOF:
+                self._eof = True
+            else:
+                self._buffer = item
+
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+    def write_chunk(self, chunk: bytes) -> None:
+        """Hand a chunk to the consumer, blocking while the pipe is full."""
+        while not self._reader_closed.is_set():
+            try:
+                self._queue.put(chunk, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def close_writer(self) -> None:
+        """Signal EOF to the consumer."""
+        self.write_chunk(_EOF)
+
+    def close_reader(self) -> None:
+        """Consumer is done; drop any further writes."""
+        self._reader_closed.set()
+
+
+class TeeReader:
+    """
+    File-like wrapper that hashes every byte read and copies it into a pipe.
+
+    MinIO's multipart uploader drives the reads, so the parser sees exactly
+    the bytes that were stored.
+    """
+
+    def __init__(self, source: BinaryIO, pipe: Optional[ChunkPipe] = None):
+        self._source = source
+        self._pipe = pipe
+        self.sha256 = hashlib.sha256()
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0 or size > TEE_CHUNK_SIZE:
+            size = TEE_CHUNK_SIZE
+        data = self._source.read(size)
+        if data:
+            self.sha256.update(data)
+            self.bytes_read += len(data)
+            if self._pipe is not None:
+                self._pipe.write_chunk(data)
+        return data
+
+
+@dataclass
+class StreamedUpload:
+    """Outcome of stream_upload_to_minio()"""
+    s3_key: Optional[str]
+    s3_url: Optional[str]
+    file_size: int
+    sha256: str
+    dataframe: Optional["pd.DataFrame"] = None
+    error: Optional[str] = None  # Storage error (upload failed)
+    parse_error: Optional[Exception] = None  # Parser error (upload may still have succeeded)
+
+
+def _parse_csv_from_pipe(pipe: ChunkPipe, result: dict) -> None:
+    """Parser thread body: incrementally parse CSV as chunks arrive."""
+    import pandas as pd
+
+    try:
+        reader = pd.read_csv(io.BufferedReader(pipe), chunksize=CSV_PARSE_CHUNK_ROWS)
+        chunks = list(reader)
+        result['dataframe'] = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+    except Exception as e:
+        result['error'] = e
+    finally:
+        pipe.close_reader()
+
+
+def stream_upload_to_minio(
+    source: BinaryIO,
+    organization_id: str,
+    upload_id: str,
+    filename: str,
+    content_type: str = 'application/octet-stream',
+    bucket: str = 'bulk-uploads',
+    parse_as: Optional[str] = None,
+) -> StreamedUpload:
+    """
+    Stream a file to MinIO and optionally parse it on the fly.
+
+    Blocking; call from a worker thread (e.g. asyncio.to_thread) in async code.
+
+    Args:
+        source: Readable binary stream (e.g. UploadFile.file)
+        organization_id: Organization UUID
+        upload_id: Upload UUID
+        filename: Original filename
+        content_type: MIME type
+        bucket: MinIO bucket (default: bulk-uploads)
+        parse_as: 'csv', 'xlsx' or 'xls' to parse the file, None to only store it
+
+    Returns:
+        StreamedUpload with storage location, size, SHA-256 and parsed DataFrame
+    """
+    client = get_minio_client()
+    s3_key = generate_s3_key(organization_id, upload_id, filename)
+
+    pipe: Optional[ChunkPipe] = None
+    parser_thread: Optional[threading.Thread] = None
+    parse_result: dict = {}
+
+    if parse_as == 'csv':
+        pipe = ChunkPipe()
+        parser_thread = threading.Thread(
+            target=_parse_csv_from_pipe,
+            args=(pipe, parse_result),
+            name=f"upload-parse-{upload_id[:8]}",
+            daemon=True,
+        )
+        parser_thread.start()
+
+    tee = TeeReader(source, pipe)
+    try:
+        success, error = client.upload_stream(bucket, s3_key, tee, content_type)
+    finally:
+        if pipe is not None:
+            pipe.close_writer()
+        if parser_thread is not None:
+            parser_thread.join()
+
+    result = StreamedUpload(
+        s3_key=s3_key if success else None,
+        s3_url=None,
+        file_size=tee.bytes_read,
+        sha256=tee.sha256.hexdigest(),
+        error=error,
+    )
+    if not success:
+        return result
+
+    result.s3_url = client.get_presigned_url(bucket, s3_key, expires=timedelta(days=7))
+    if not result.s3_url:
+        result.error = "Failed to generate presigned URL"
+
+    if parse_as == 'csv':
+        result.dataframe = parse_result.get('dataframe')
+        result.parse_error = parse_result.get('error')
+    elif parse_as in ('xlsx', 'xls'):
+        # Spreadsheet containers need random access; parse from the spooled upload
+        try:
+            source.seek(0)
+            import pandas as pd
+            result.dataframe = pd.read_excel(source)
+        except Exception as e:
+            result.parse_error = e
+
+    logger.info(
+        f"Streamed upload complete: {bucket}/{s3_key} ({result.file_size} bytes, "
+        f"sha256={result.sha256[:12]}, rows={len(result.dataframe) if result.dataframe is not None else 'n/a'})"
+    )
+    return result
@@ -28,6 +28,8 @@ from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.database import get_db_session
+from app.cache.auth_context_cache import invalidate_after_commit
+from app.cache.scope_cache import invalidate_after_commit as invalidate_scope_after_commit
 from app.cache.redis_cache import DecimalEncoder
 from shared.notification.client import get_novu_client
 
@@ -205,6 +207,7 @@ async def _hard_delete_organization(
         {"org_id": org_id}
     ).rowcount
     logger.debug(f"[AccountDeletion] Deleted {deleted_projects} projects")
+    invalidate_scope_after_commit(db, organization_ids=[org_id])
 
     # Step 5: Delete alert preferences
     try:
@@ -242,6 +245,7 @@ async def _hard_delete_organization(
         """),
         {"org_id": org_id}
     )
+    invalidate_after_commit(db, org_ids=[org_id])
     logger.debug(f"[AccountDeletion] Deleted memberships for org={org_id}")
 
     # Step 8: Anonymize users (keep for audit, remove PII)
@@ -6,7 +6,13 @@ Provides common functionality for all rstream-based event consumers:
 - Temporal client connection retry
 - Database session management
 - Circuit breaker pattern
-- Message deduplication
+- Message deduplication shared across replicas and restarts (Redis, TTL window)
+- Routing-key filtering before body decode, plus broker-side stream
+  filtering (RabbitMQ 3.13+ filter values, see shared.event_bus)
+- Concurrent dispatch with per-key (BOM/organization) ordering
+- Stream offset commits that never skip unfinished or failed messages;
+  a failed message stops the subscription, which resumes from the last
+  committed offset so the message is redelivered
 - Health check endpoints
 - Prometheus metrics
 - Structured error handling
@@ -17,7 +23,8 @@ import asyncio
 import json
 import logging
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Tuple, Set, Optional
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Any, Tuple, Set, Optional
 from datetime import datetime, timedelta
 from rstream import (
     Consumer,
@@ -26,6 +33,10 @@ from rstream import (
     OffsetType,
     amqp_decoder,
 )
+from rstream.exceptions import OffsetNotFound
+
+from app.cache.message_dedup import MessageDedupStore
+from shared.event_bus import stream_filter_value
 
 # Setup logging
 logging.basicConfig(
@@ -34,6 +45,154 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Event fields used as the ordering key, in order of preference
+ORDERING_KEY_FIELDS = ('bom_id', 'workflow_id', 'organization_id', 'tenant_id')
+
+
+class MessageNotHandled(Exception):
+    """A message still failed transiently after its retries"""
+
+
+class RedeliveryRequired(Exception):
+    """A message failed; resubscribe from the last committed offset to redeliver it"""
+
+
+class ConcurrentDispatcher:
+    """
+    Runs message handlers concurrently with per-key ordering and tracks the
+    highest stream offset that is safe to commit.
+
+    - At most `concurrency` handlers run at once.
+    - Handlers sharing a key run one after another, in stream order.
+    - At most `max_pending` messages are accepted but unfinished; submit()
+      waits for a free slot, which back-pressures the stream callback.
+    - The commit offset only advances past an offset once it and every
+      earlier offset have finished, so a crash replays unfinished work.
+    - A handler that raises leaves its offset unfinished, so the commit
+      never passes it. The dispatcher is then `failed`: handlers not yet
+      started are dropped (they are replayed with the failed message) and
+      `on_failure` is called once so the consumer can resubscribe.
+    """
+
+    def __init__(
+        self,
+        concurrency: int,
+        max_pending: Optional[int] = None,
+        on_commit: Optional[Callable[[int], Awaitable[None]]] = None,
+        on_failure: Optional[Callable[[Optional[int]], None]] = None,
+    ):
+        self.concurrency = max(1, concurrency)
+        self.max_pending = max(self.concurrency, max_pending or self.concurrency * 4)
+        self.on_commit = on_commit
+        self.on_failure = on_failure
+        self.failed = False
+
+        self._running = asyncio.Semaphore(self.concurrency)
+        self._slots = asyncio.Semaphore(self.max_pending)
+        self._tails: Dict[str, asyncio.Task] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+        # offset -> finished, in arrival (stream) order
+        self._offsets: "OrderedDict[int, bool]" = OrderedDict()
+        self.safe_offset: Optional[int] = None
+        self.committed_offset: Optional[int] = None
+        self._commit_task: Optional[asyncio.Task] = None
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._tasks)
+
+    async def submit(self, offset: Optional[int], key: Optional[str], handler: Callable[[], Awaitable[None]]) -> None:
+        """Schedule `handler`; returns once it is accepted (not when it completes)."""
+        await self._slots.acquire()
+        if offset is not None:
+            self._offsets[offset] = False
+
+        previous = self._tails.get(key) if key else None
+        task = asyncio.create_task(self._run(offset, key, previous, handler))
+        if key:
+            self._tails[key] = task
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def skip(self, offset: Optional[int]) -> None:
+        """Record a message that needs no handling (filtered, duplicate, malformed)."""
+        if offset is not None:
+            self._offsets[offset] = False
+            self._finish(offset)
+
+    async def _run(self, offset, key, previous: Optional[asyncio.Task], handler) -> None:
+        try:
+            if previous is not None:
+                # Wait for the previous message with this key
+                await asyncio.wait([previous])
+            if self.failed:
+                # Replayed after the failed message; leave the offset unfinished
+                return
+            async with self._running:
+                await handler()
+        except asyncio.CancelledError:
+            # Interrupted (shutdown): leave the offset uncommitted so it's replayed
+            raise
+        except Exception as e:
+            logger.error(f"Message handler failed (offset={offset}, key={key}): {e}", exc_info=True)
+            self._fail(offset)
+        else:
+            self._finish(offset)
+        finally:
+            if key and self._tails.get(key) is asyncio.current_task():
+                del self._tails[key]
+            self._slots.release()
+
+    def _fail(self, offset: Optional[int]) -> None:
+        # The offset stays unfinished, so nothing from it on is committed
+        first = not self.failed
+        self.failed = True
+        if first and self.on_failure is not None:
+            self.on_failure(offset)
+
+    def _finish(self, offset: Optional[int]) -> None:
+        if offset is None or offset not in self._offsets:
+            return
+        self._offsets[offset] = True
+
+        advanced = False
+        while self._offsets:
+            first, done = next(iter(self._offsets.items()))
+            if not done:
+                break
+            self._offsets.popitem(last=False)
+            self.safe_offset = first
+            advanced = True
+
+        if advanced and self.on_commit is not None and (self._commit_task is None or self._commit_task.done()):
+            self._commit_task = asyncio.create_task(self._commit())
+
+    async def _commit(self) -> None:
+        # One commit at a time; offsets that finish meanwhile are picked up by the loop
+        while self.safe_offset is not None and self.safe_offset != self.committed_offset:
+            offset = self.safe_offset
+            try:
+                await self.on_commit(offset)
+                self.committed_offset = offset
+            except Exception as e:
+                logger.warning(f"Failed to store stream offset {offset}: {e}")
+                return
+
+    async def drain(self, timeout: float = 30.0) -> None:
+        """Wait for in-flight handlers (cancelling stragglers) and the final commit."""
+        if self._tasks:
+            done, pending = await asyncio.wait(set(self._tasks), timeout=timeout)
+            for task in pending:
+                task.cancel()
+            if pending:
+                logger.warning(f"Cancelled {len(pending)} unfinished message handler(s) on shutdown")
+                await asyncio.wait(pending)
+        if self._commit_task is not None:
+            await asyncio.wait([self._commit_task])
+        if self.on_commit is not None and self.safe_offset != self.committed_offset:
+            await self._commit()
+
 
 class BaseRStreamConsumer(ABC):
     """
@@ -45,12 +204,13 @@ class BaseRStreamConsumer(ABC):
     Provides:
     - Stream connection retry
     - Temporal connection retry
-    - Message deduplication
+    - Message deduplication (MessageDedupStore)
+    - Concurrent handling, ordered per ordering_key() (STREAM_CONSUMER_CONCURRENCY)
     - Error handling and logging
     - Database session management helpers
     """
 
-    def __init__(self, stream: str, consumer_name: str, routing_keys):
+    def __init__(self, stream: str, consumer_name: str, routing_keys, concurrency: Optional[int] = None):
         """
         Initialize base consumer
 
@@ -58,6 +218,8 @@ class BaseRStreamConsumer(ABC):
             stream: RabbitMQ stream name
             consumer_name: Consumer group name for offset tracking
             routing_keys: Single routing key string or list of routing keys
+            concurrency: Max messages handled in parallel
+                (default: STREAM_CONSUMER_CONCURRENCY env, 8)
         """
         self.stream = stream
         self.consumer_name = consumer_name
@@ -69,16 +231,26 @@ class BaseRStreamConsumer(ABC):
             self.routing_keys = routing_keys
         else:
             raise ValueError(f"routing_keys must be str or list, got {type(routing_keys)}")
+        self._routing_key_set = frozenset(self.routing_keys)
 
         self.consumer = None
         self.temporal_client = None
         self.messages_processed = 0
         self.messages_succeeded = 0
         self.messages_failed = 0
+        self.messages_skipped = 0  # Other routing keys on the shared stream
+
+        # Broker-side stream filtering (ignored by brokers without filter support)
+        self.stream_filtering = os.getenv('RABBITMQ_STREAM_FILTERING', 'true').lower() in ('true', '1', 'yes', 'on')
 
-        # Message deduplication (in-memory set, last 10000 messages)
-        self.processed_message_ids: Set[str] = set()
-        self.max_dedup_size = 10000
+        # Message deduplication, shared by all replicas of this consumer
+        self.dedup = MessageDedupStore(consumer_name)
+
+        # Concurrent dispatch (created per connection in start_once)
+        self.concurrency = concurrency or int(os.getenv('STREAM_CONSUMER_CONCURRENCY', '8'))
+        self.max_pending = int(os.getenv('STREAM_CONSUMER_MAX_PENDING', str(self.concurrency * 4)))
+        self.transient_retries = int(os.getenv('STREAM_CONSUMER_TRANSIENT_RETRIES', '3'))
+        self.dispatcher: Optional[ConcurrentDispatcher] = None
 
         # Health tracking
         self.is_healthy = False
@@ -185,6 +357,47 @@ class BaseRStreamConsumer(ABC):
 
         return session_context()
 
+    @staticmethod
+    def extract_routing_key(amqp_message: AMQPMessage) -> str:
+        """Routing key from message annotations (no body decode needed)"""
+        routing_key_bytes = None
+        if amqp_message.message_annotations:
+            # RabbitMQ stores routing key in message_annotations
+            routing_key_bytes = amqp_message.message_annotations.get(b'x-routing-key')
+        elif amqp_message.application_properties:
+            routing_key_bytes = amqp_message.application_properties.get(b'x-routing-key')
+        if not routing_key_bytes:
+            return ''
+        return routing_key_bytes.decode() if isinstance(routing_key_bytes, bytes) else str(routing_key_bytes)
+
+    def stream_filter_values(self) -> Optional[list]:
+        """
+        Filter values covering this consumer's routing keys, or None when a
+        key's filter value can't be known up front (wildcard in its prefix).
+        """
+        values = set()
+        for routing_key in self.routing_keys:
+            value = stream_filter_value(routing_key)
+            if '*' in value or '#' in value:
+                return None
+            values.add(value)
+        return sorted(values)
+
+    def subscription_properties(self) -> Optional[Dict[str, str]]:
+        """
+        Stream subscription properties enabling broker-side filtering.
+
+        Filtering is per chunk (bloom filter), so irrelevant messages can
+        still arrive and the routing-key check in on_message() stays.
+        Messages published without a filter value are still delivered.
+        """
+        values = self.stream_filter_values() if self.stream_filtering else None
+        if not values:
+            return None
+        properties = {f'filter.{i}': value for i, value in enumerate(values)}
+        properties['match-unfiltered'] = 'true'
+        return properties
+
     def decode_message_body(self, amqp_message: AMQPMessage) -> Optional[bytes]:
         """
         Safely decode AMQP message body to bytes
@@ -223,31 +436,6 @@ class BaseRStreamConsumer(ABC):
             logger.error(f"Error decoding message body: {e}", exc_info=True)
             return None
 
-    def is_duplicate_message(self, message_id: str) -> bool:
-        """
-        Check if message was already processed (deduplication)
-
-        Args:
-            message_id: Unique message identifier
-
-        Returns:
-            True if message was already processed
-        """
-        if message_id in self.processed_message_ids:
-            return True
-
-        # Add to set
-        self.processed_message_ids.add(message_id)
-
-        # Limit set size (FIFO-style cleanup)
-        if len(self.processed_message_ids) > self.max_dedup_size:
-            # Remove oldest 20%
-            to_remove = len(self.processed_message_ids) - int(self.max_dedup_size * 0.8)
-            for _ in range(to_remove):
-                self.processed_message_ids.pop()
-
-        return False
-
     @abstractmethod
     async def handle_message(self, event_data: Dict[str, Any], routing_key: str, priority: int) -> Tuple[bool, str]:
         """
@@ -264,70 +452,150 @@ class BaseRStreamConsumer(ABC):
         """
         pass
 
+    def ordering_key(self, event_data: Dict[str, Any], routing_key: str) -> Optional[str]:
+        """
+        Key whose messages must be handled in stream order (default: BOM,
+        then workflow, then organization). Messages without a key may run in
+        any order. Override for consumer-specific ordering.
+        """
+        for field in ORDERING_KEY_FIELDS:
+            value = event_data.get(field)
+            if value:
+                return f"{field}:{value}"
+        return None
+
+    def get_dispatcher(self) -> ConcurrentDispatcher:
+        if self.dispatcher is None:
+            self.dispatcher = ConcurrentDispatcher(
+                self.concurrency,
+                max_pending=self.max_pending,
+                on_commit=self.store_offset,
+                on_failure=self.request_redelivery,
+            )
+        return self.dispatcher
+
+    async def store_offset(self, offset: int) -> None:
+        """Persist the consumer group's offset (only called with fully handled offsets)"""
+        if self.consumer is not None:
+            await self.consumer.store_offset(self.stream, self.consumer_name, offset)
+
+    def request_redelivery(self, offset: Optional[int]) -> None:
+        """
+        Stop the subscription after a failed message. start_once() then
+        drains, commits up to the failed offset and raises
+        RedeliveryRequired; the resubscribe starts at the failed message.
+        """
+        logger.warning(f"⚠️  Message at offset {offset} not handled; stopping to redeliver it")
+        if self.consumer is not None:
+            self.consumer.stop()
+
     async def on_message(self, amqp_message: AMQPMessage, message_context):
         """
         Base message handler with common patterns
 
+        - Filters by routing key (before touching the body)
         - Decodes message body
-        - Extracts routing key and priority
-        - Filters by routing keys
+        - Extracts priority
         - Checks for duplicates
-        - Calls subclass handle_message()
-        - Updates metrics and health status
+        - Dispatches subclass handle_message() concurrently (ordered per key)
+
+        Returns once the message is accepted by the dispatcher; blocks while
+        the dispatcher is full.
 
         Args:
             amqp_message: Full AMQP message with body and properties
             message_context: Stream context with offset and timestamp
         """
+        dispatcher = self.get_dispatcher()
+        offset = getattr(message_context, 'offset', None)
+        if dispatcher.failed:
+            return  # Redelivered after the resubscribe
+
+        # Filter by routing keys first: most messages on a shared stream are
+        # for other consumers and never need their body decoded
+        routing_key = self.extract_routing_key(amqp_message)
+        if routing_key not in self._routing_key_set:
+            self.messages_skipped += 1
+            dispatcher.skip(offset)
+            return  # Not for this consumer
+
+        self.messages_processed += 1
+        message_number = self.messages_processed
+
+        # Decode message body
+        body_bytes = self.decode_message_body(amqp_message)
+        if body_bytes is None:
+            logger.error(f"[#{message_number}] Failed to decode message body")
+            self.messages_failed += 1
+            dispatcher.skip(offset)
+            return  # Skip message
+
+        # Parse JSON
         try:
-            self.messages_processed += 1
+            event_data = json.loads(body_bytes)
+        except json.JSONDecodeError as e:
+            logger.error(f"[#{message_number}] Invalid JSON: {e}")
+            self.messages_failed += 1
+            dispatcher.skip(offset)
+            return  # Skip malformed message
+
+        # Extract priority
+        priority = 5  # Default
+        if amqp_message.properties and hasattr(amqp_message.properties, 'priority'):
+            priority = amqp_message.properties.priority
+
+        # Message deduplication (use message ID if available)
+        message_id = event_data.get('event_id') or event_data.get('bom_id') or f"{self.stream}:{offset}"
+        if not await self.dedup.claim(message_id):
+            logger.info(f"[#{message_number}] Duplicate message: {message_id}")
+            dispatcher.skip(offset)
+            return  # Already processed
+
+        event_type = event_data.get('event_type', 'unknown')
+        logger.info(f"[#{message_number}] 📨 Processing: {event_type} (routing: {routing_key}, priority: {priority})")
+
+        await dispatcher.submit(
+            offset,
+            self.ordering_key(event_data, routing_key),
+            lambda: self._process_message(message_number, message_id, event_data, routing_key, priority),
+        )
 
-            # Decode message body
-            body_bytes = self.decode_message_body(amqp_message)
-            if body_bytes is None:
-                logger.error(f"[#{self.messages_processed}] Failed to decode message body")
-                self.messages_failed += 1
-                return  # Skip message
+    async def _process_message(
+        self,
+        message_number: int,
+        message_id: str,
+        event_data: Dict[str, Any],
+        routing_key: str,
+        priority: int,
+    ):
+        """
+        Run handle_message(), retrying transient errors with backoff.
+
+        Handled (and permanently failed) messages are marked done in the
+        dedup store. Anything else releases its claim and raises, which
+        leaves the offset uncommitted so the message is redelivered.
+        """
+        try:
+            done = await self._handle_with_retry(message_number, event_data, routing_key, priority)
+        except BaseException:
+            await self.dedup.release(message_id)
+            raise
+        if not done:
+            await self.dedup.release(message_id)
+            raise MessageNotHandled(f"message #{message_number} still failing after {self.transient_retries} retries")
+        await self.dedup.complete(message_id)
 
-            # Parse JSON
+    async def _handle_with_retry(self, message_number: int, event_data: Dict[str, Any], routing_key: str, priority: int) -> bool:
+        """Returns False if the message still failed transiently after all retries"""
+        attempt = 0
+        while True:
             try:
-                event_data = json.loads(body_bytes)
-            except json.JSONDecodeError as e:
-                logger.error(f"[#{self.messages_processed}] Invalid JSON: {e}")
+                success, error_type = await self.handle_message(event_data, routing_key, priority)
+            except Exception as e:
                 self.messages_failed += 1
-                return  # Skip malformed message
-
-            # Extract routing key from AMQP properties
-            routing_key = ''
-            if amqp_message.message_annotations:
-                # RabbitMQ stores routing key in message_annotations
-                routing_key_bytes = amqp_message.message_annotations.get(b'x-routing-key', b'')
-                routing_key = routing_key_bytes.decode() if routing_key_bytes else ''
-            elif amqp_message.application_properties:
-                routing_key_bytes = amqp_message.application_properties.get(b'x-routing-key', b'')
-                routing_key = routing_key_bytes.decode() if routing_key_bytes else ''
-
-            # Filter by routing keys
-            if routing_key not in self.routing_keys:
-                logger.debug(f"[#{self.messages_processed}] Skipping: routing_key={routing_key}")
-                return  # Not for this consumer
-
-            # Extract priority
-            priority = 5  # Default
-            if amqp_message.properties and hasattr(amqp_message.properties, 'priority'):
-                priority = amqp_message.properties.priority
-
-            # Message deduplication (use message ID if available)
-            message_id = event_data.get('event_id') or event_data.get('bom_id') or str(message_context)
-            if self.is_duplicate_message(message_id):
-                logger.info(f"[#{self.messages_processed}] Duplicate message: {message_id}")
-                return  # Already processed
-
-            event_type = event_data.get('event_type', 'unknown')
-            logger.info(f"[#{self.messages_processed}] 📨 Processing: {event_type} (routing: {routing_key}, priority: {priority})")
-
-            # Call subclass handler
-            success, error_type = await self.handle_message(event_data, routing_key, priority)
+                self.last_error = str(e)
+                logger.error(f"❌ Error processing message #{message_number}: {e}", exc_info=True)
+                raise
 
             # Update metrics
             self.last_message_time = datetime.now()
@@ -336,23 +604,23 @@ class BaseRStreamConsumer(ABC):
                 self.messages_succeeded += 1
                 self.is_healthy = True
                 self.last_error = None
-                logger.info(f"✅ Message #{self.messages_processed} processed successfully")
-            else:
-                self.messages_failed += 1
-                self.last_error = error_type
-                logger.warning(f"⚠️  Message #{self.messages_processed} failed: {error_type}")
+                logger.info(f"✅ Message #{message_number} processed successfully")
+                return True
 
-                # For transient errors, raise exception to prevent offset advancement
-                # (rstream advances offset after handler completes normally)
-                if error_type == 'transient':
-                    raise Exception(f"Transient error: {error_type}")
+            if error_type == 'transient' and attempt < self.transient_retries:
+                delay = min(2 ** attempt, 30)
+                attempt += 1
+                logger.warning(
+                    f"⚠️  Message #{message_number} failed: transient "
+                    f"(retry {attempt}/{self.transient_retries} in {delay}s)"
+                )
+                await asyncio.sleep(delay)
+                continue
 
-        except Exception as e:
             self.messages_failed += 1
-            self.last_error = str(e)
-            logger.error(f"❌ Error processing message #{self.messages_processed}: {e}", exc_info=True)
-            # Re-raise to prevent offset advancement for transient errors
-            raise
+            self.last_error = error_type
+            logger.warning(f"⚠️  Message #{message_number} failed: {error_type}")
+            return error_type != 'transient'
 
     async def start_once(self):
         """Start consumer once (no retry logic)"""
@@ -365,37 +633,78 @@ class BaseRStreamConsumer(ABC):
 
         # Create rstream consumer
         consumer = await self.create_consumer()
+        self.consumer = consumer
+        self.dispatcher = None  # Fresh offset tracking for this connection
 
         try:
             logger.info(f"📡 Subscribing to stream: {self.stream}")
             logger.info(f"👥 Consumer group: {self.consumer_name}")
-            logger.info(f"🔄 Starting from: LAST (most recent offset)")
-            logger.info("")
-            logger.info("✅ Consumer ready. Waiting for events...")
-            logger.info("   Press Ctrl+C to stop")
-            logger.info("==" * 40)
+            logger.info(f"⚙️  Concurrency: {self.concurrency} (max pending {self.max_pending})")
 
             async with consumer:
-                # Subscribe to stream
-                await consumer.subscribe(
-                    stream=self.stream,
-                    callback=self.on_message,
-                    decoder=amqp_decoder,
-                    offset_specification=ConsumerOffsetSpecification(
-                        offset_type=OffsetType.LAST
-                    ),
-                    subscriber_name=self.consumer_name,
-                )
+                # Resume after the last fully handled offset, or from LAST on first run
+                offset_specification = ConsumerOffsetSpecification(offset_type=OffsetType.LAST)
+                try:
+                    stored_offset = await consumer.query_offset(self.stream, self.consumer_name)
+                    offset_specification = ConsumerOffsetSpecification(
+                        offset_type=OffsetType.OFFSET,
+                        offset=stored_offset + 1,
+                    )
+                    logger.info(f"🔄 Starting from: stored offset {stored_offset + 1}")
+                except OffsetNotFound:
+                    logger.info(f"🔄 Starting from: LAST (no stored offset)")
+
+                logger.info("")
+                logger.info("✅ Consumer ready. Waiting for events...")
+                logger.info("   Press Ctrl+C to stop")
+                logger.info("==" * 40)
+
+                # Subscribe to stream (with broker-side filtering when available)
+                properties = self.subscription_properties()
+                try:
+                    await consumer.subscribe(
+                        stream=self.stream,
+                        callback=self.on_message,
+                        decoder=amqp_decoder,
+                        offset_specification=offset_specification,
+                        subscriber_name=self.consumer_name,
+                        properties=properties,
+                    )
+                    if properties:
+                        logger.info(f"🔎 Stream filter: {', '.join(self.stream_filter_values())}")
+                except Exception as e:
+                    if not properties:
+                        raise
+                    logger.warning(f"⚠️  Filtered subscribe failed ({e}); subscribing without stream filter")
+                    await consumer.subscribe(
+                        stream=self.stream,
+                        callback=self.on_message,
+                        decoder=amqp_decoder,
+                        offset_specification=offset_specification,
+                        subscriber_name=self.consumer_name,
+                    )
 
                 # Mark as healthy
                 self.is_healthy = True
 
                 # Keep running
-                await consumer.run()
+                try:
+                    await consumer.run()
+                finally:
+                    # Finish in-flight messages and commit before the connection closes
+                    if self.dispatcher is not None:
+                        await self.dispatcher.drain()
+
+                if self.dispatcher is not None and self.dispatcher.failed:
+                    raise RedeliveryRequired(
+                        f"resubscribing from committed offset {self.dispatcher.committed_offset}"
+                    )
 
         except KeyboardInterrupt:
             logger.info("")
             logger.info("⚠️  Consumer shutdown requested")
+        except RedeliveryRequired:
+            raise
         except Exception as e:
             logger.error(f"❌ Consumer error: {e}", exc_info=True)
             raise
@@ -423,6 +732,12 @@ class BaseRStreamConsumer(ABC):
                 logger.info("⚠️  Shutdown requested")
                 break
 
+            except RedeliveryRequired as e:
+                # Back off so a message that keeps failing isn't replayed in a tight loop
+                logger.warning(f"⚠️  {e} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 300)
+
             except Exception as e:
                 attempt += 1
                 logger.error(
@@ -19,12 +19,14 @@ from app.workflows.bom_enrichment import (
     bulk_prefilter_components,
     fetch_bom_line_items,
     fetch_bom_line_items_from_redis,
+    count_carried_over_line_items,
     enrich_component,
     update_bom_progress,
     load_enrichment_config,
     publish_enrichment_event,
     record_enrichment_audit_event,
     log_enrichment_audit_batch,
+    flush_enrichment_progress,
     save_bom_original_audit,
     finalize_audit_trail,
     download_parsed_snapshot,
@@ -177,12 +179,14 @@ async def main():
                 bulk_prefilter_components,
                 fetch_bom_line_items,
                 fetch_bom_line_items_from_redis,
+                count_carried_over_line_items,
                 enrich_component,
                 update_bom_progress,
                 load_enrichment_config,
                 publish_enrichment_event,
                 record_enrichment_audit_event,
                 log_enrichment_audit_batch,
+                flush_enrichment_progress,
                 save_bom_original_audit,
                 finalize_audit_trail,
                 download_parsed_snapshot,
@@ -255,12 +259,14 @@ async def main():
         logger.info("   - bulk_prefilter_components")
         logger.info("   - fetch_bom_line_items")
         logger.info("   - fetch_bom_line_items_from_redis")
+        logger.info("   - count_carried_over_line_items")
         logger.info("   - enrich_component")
         logger.info("   - update_bom_progress")
         logger.info("   - load_enrichment_config")
         logger.info("   - publish_enrichment_event")
         logger.info("   - record_enrichment_audit_event")
         logger.info("   - log_enrichment_audit_batch")
+        logger.info("   - flush_enrichment_progress")
         logger.info("   - save_bom_original_audit")
         logger.info("   - finalize_audit_trail")
         logger.info("   - download_parsed_snapshot")
@@ -287,6 +293,16 @@ async def main():
     except Exception as e:
         logger.error(f"❌ Worker error: {e}", exc_info=True)
         raise
+    finally:
+        # Activities publish through the buffered async event bus (and the
+        # component event sink); flush both before the loop goes away
+        from shared.event_bus import get_async_event_bus
+        from app.services.enrichment_event_sink import get_enrichment_event_sink
+
+        await get_enrichment_event_sink().flush()
+        async_bus = get_async_event_bus()
+        if async_bus is not None:
+            await async_bus.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,220 @@
+"""
+Outbox Relay
+
+Publishes rows from the transactional outbox (`event_outbox`, see
+app/services/event_outbox.py) to RabbitMQ.
+
+Each cycle claims up to OUTBOX_RELAY_BATCH_SIZE rows with
+FOR UPDATE SKIP LOCKED, publishes them on a confirm channel, and in the same
+transaction marks confirmed rows published and pushes failed rows back with
+backoff. Relays on several API pods split the backlog between them instead
+of sending rows twice.
+
+Runs as a background task of the API (start_outbox_relay / stop_outbox_relay
+from main.py lifespan), or standalone:
+    python -m app.workers.outbox_relay
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from app.config import settings
+from app.services.event_outbox import claim_events, mark_failed, mark_published, purge_published
+from shared.event_bus import AsyncEventBus, get_async_event_bus
+
+logger = logging.getLogger(__name__)
+
+PURGE_INTERVAL_SECONDS = 3600
+MAX_BACKOFF_SECONDS = 30.0
+
+
+def _open_session():
+    from app.models.dual_database import get_dual_database
+
+    session_gen = get_dual_database().get_session("supabase")
+    return session_gen, next(session_gen)
+
+
+def _close_session(session_gen) -> None:
+    try:
+        next(session_gen)
+    except StopIteration:
+        pass
+
+
+class OutboxRelay:
+    """Polls event_outbox and publishes committed events with confirms."""
+
+    def __init__(
+        self,
+        bus: Optional[AsyncEventBus] = None,
+        batch_size: Optional[int] = None,
+        poll_interval_ms: Optional[int] = None,
+        retention_hours: Optional[int] = None,
+    ):
+        self.bus = bus
+        self.batch_size = batch_size or settings.outbox_relay_batch_size
+        self.poll_interval = (poll_interval_ms or settings.outbox_relay_poll_ms) / 1000.0
+        self.retention_hours = retention_hours or settings.outbox_retention_hours
+        # One thread keeps each claimed transaction on a single DB connection/thread
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="outbox-relay")
+        self.stats = {"published": 0, "failed": 0, "purged": 0}
+
+    async def _db(self, fn: Callable, *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def relay_once(self) -> int:
+        """Claim and publish one batch. Returns the number of rows claimed."""
+        session_gen, db = await self._db(_open_session)
+        try:
+            messages = await self._db(claim_events, db, self.batch_size)
+            if not messages:
+                await self._db(db.rollback)
+                return 0
+
+            error = "not confirmed by broker"
+            try:
+                failed = await self.bus.publish_messages(messages)
+            except Exception as e:
+                failed, error = messages, str(e) or type(e).__name__
+                logger.warning(f"[Outbox] Publishing {len(messages)} events failed: {error}")
+
+            failed_ids = [message["id"] for message in failed]
+            unconfirmed = set(failed_ids)
+            published_ids = [message["id"] for message in messages if message["id"] not in unconfirmed]
+            await self._db(self._finish, db, published_ids, failed_ids, error)
+
+            self.stats["published"] += len(published_ids)
+            self.stats["failed"] += len(failed_ids)
+            return len(messages)
+        except Exception:
+            await self._db(db.rollback)
+            raise
+        finally:
+            await self._db(_close_session, session_gen)
+
+    @staticmethod
+    def _finish(db, published_ids: List[int], failed_ids: List[int], error: str) -> None:
+        mark_published(db, published_ids)
+        mark_failed(db, failed_ids, error)
+        db.commit()
+
+    async def purge(self) -> int:
+        def run() -> int:
+            session_gen, db = _open_session()
+            try:
+                purged = purge_published(db, self.retention_hours)
+                db.commit()
+                return purged
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                _close_session(session_gen)
+
+        purged = await self._db(run)
+        self.stats["purged"] += purged
+        if purged:
+            logger.info(f"[Outbox] Purged {purged} published events older than {self.retention_hours}h")
+        return purged
+
+    async def run(self) -> None:
+        if self.bus is None:
+            self.bus = get_async_event_bus()
+        if self.bus is None:
+            raise RuntimeError("Outbox relay requires the async event publisher (aio-pika, EVENT_BUS_ASYNC)")
+
+        logger.info(f"[Outbox] Relay started (batch={self.batch_size}, poll={self.poll_interval}s)")
+        failures = 0
+        loop = asyncio.get_running_loop()
+        next_purge = loop.time() + PURGE_INTERVAL_SECONDS
+        try:
+            while True:
+                try:
+                    claimed = await self.relay_once()
+                    failures = 0
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    delay = min(self.poll_interval * (2 ** failures), MAX_BACKOFF_SECONDS)
+                    failures += 1
+                    logger.error(f"[Outbox] Relay cycle failed, retrying in {delay:.1f}s: {e}")
+                    await asyncio.sleep(delay)
+                    continue
+
+                if loop.time() >= next_purge:
+                    next_purge = loop.time() + PURGE_INTERVAL_SECONDS
+                    try:
+                        await self.purge()
+                    except Exception as e:
+                        logger.warning(f"[Outbox] Purge failed: {e}")
+
+                # A full batch means there's likely more waiting; go again at once
+                if claimed < self.batch_size:
+                    await asyncio.sleep(self.poll_interval)
+        finally:
+            self._executor.shutdown(wait=False)
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self.stats)
+
+
+# ============================================================================
+# Background task management (main.py lifespan)
+# ============================================================================
+
+_relay_task: Optional[asyncio.Task] = None
+
+
+def start_outbox_relay() -> Optional[asyncio.Task]:
+    """Start the relay as a background task. Returns None if disabled or already running."""
+    global _relay_task
+
+    if not settings.outbox_relay_enabled:
+        logger.info("[Outbox] Relay disabled (OUTBOX_RELAY_ENABLED=false)")
+        return None
+    if _relay_task is not None and not _relay_task.done():
+        logger.warning("[Outbox] Relay already running")
+        return None
+
+    _relay_task = asyncio.get_running_loop().create_task(_run_relay())
+    return _relay_task
+
+
+async def _run_relay() -> None:
+    try:
+        await OutboxRelay().run()
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.error(f"[Outbox] Relay stopped: {e}", exc_info=True)
+
+
+async def stop_outbox_relay() -> None:
+    global _relay_task
+
+    task, _relay_task = _relay_task, None
+    if task is None:
+        return
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    logger.info("[Outbox] Relay stopped")
+
+
+async def main() -> None:
+    bus = get_async_event_bus()
+    try:
+        await OutboxRelay(bus=bus).run()
+    finally:
+        if bus is not None:
+            await bus.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
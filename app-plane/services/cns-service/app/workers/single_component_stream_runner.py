@@ -151,6 +151,7 @@ def get_consumer_stats() -> dict:
             "messages_processed": 0,
             "messages_succeeded": 0,
             "messages_failed": 0,
+            "messages_skipped": 0,
             "is_healthy": False,
         }
 
@@ -159,6 +160,7 @@ def get_consumer_stats() -> dict:
         "messages_processed": _consumer_instance.messages_processed,
         "messages_succeeded": _consumer_instance.messages_succeeded,
         "messages_failed": _consumer_instance.messages_failed,
+        "messages_skipped": _consumer_instance.messages_skipped,
         "is_healthy": _consumer_instance.is_healthy,
         "last_message_time": _consumer_instance.last_message_time.isoformat() if _consumer_instance.last_message_time else None,
         "last_error": _consumer_instance.last_error,
@@ -35,6 +35,14 @@ from app.utils.activity_log import record_audit_log_entry
 
 logger = logging.getLogger(__name__)
 
+# Temporal patch id: runs started before the coalesced progress flush replay
+# the original per-batch audit/progress/event activities
+COALESCED_PROGRESS_PATCH = "coalesced-progress-flush"
+
+# Temporal patch id: runs started before carried-over lines were counted by
+# an activity replay the total_items - pending estimate
+CARRIED_OVER_COUNT_PATCH = "count-carried-over-lines"
+
 _CATEGORY_SNAPSHOT_FLAGS = {"1", "true", "yes", "on"}
 _CATEGORY_SNAPSHOT_STATE: Dict[str, Optional[datetime]] = {
     "last_check": None,
@@ -797,6 +805,27 @@ class BOMEnrichmentWorkflow:
 
             workflow.logger.info(f"✅ Fetched {len(line_items)} line items from Supabase")
 
+            # Only pending lines are fetched; lines carried over from a previous
+            # revision (or a same-content upload) already count as enriched
+            if workflow.patched(CARRIED_OVER_COUNT_PATCH):
+                carried_items = await workflow.execute_activity(
+                    count_carried_over_line_items,
+                    request.bom_id,
+                    start_to_close_timeout=timedelta(seconds=30),
+                    retry_policy=RetryPolicy(
+                        maximum_attempts=3,
+                        initial_interval=timedelta(seconds=1),
+                        maximum_interval=timedelta(seconds=10),
+                        backoff_coefficient=2.0
+                    )
+                )
+            else:
+                carried_items = max(request.total_items - len(line_items), 0)
+            if carried_items:
+                self.progress.enriched_items += carried_items
+                self.progress.pending_items -= carried_items
+                workflow.logger.info(f"♻️  {carried_items} line items carried over, already enriched")
+
         # ============================================================================
         # AUDIT TRAIL: Save original BOM data (before enrichment)
         # ============================================================================
@@ -865,6 +894,15 @@ class BOMEnrichmentWorkflow:
         if not isinstance(delay_per_batch_ms, int) or delay_per_batch_ms < 0:
             delay_per_batch_ms = 2000
 
+        # Coalesced progress: audit rows, BOM progress and the progress event go
+        # out in one activity at most once per interval rather than per batch
+        progress_flush_ms = config_result.get('progress_flush_ms', 500)
+        if not isinstance(progress_flush_ms, int) or progress_flush_ms < 0:
+            progress_flush_ms = 500
+        progress_flush_interval = timedelta(milliseconds=progress_flush_ms)
+        last_progress_flush = workflow.now()
+        pending_audit_entries: List[Dict[str, Any]] = []
+
         if delays_enabled:
             workflow.logger.info(
                 f"⏱️ Rate limiting enabled: {delay_per_component_ms}ms per component, "
@@ -976,73 +1014,96 @@ class BOMEnrichmentWorkflow:
                     'processing_time_ms': result.get('processing_time_ms'),
                 })
 
-            if audit_entries:
-                try:
+            progress_params = {
+                'bom_id': request.bom_id,
+                'source': request.source,  # ✅ Pass source to determine storage
+                'progress': {
+                    'total_items': self.progress.total_items,
+                    'enriched_items': self.progress.enriched_items,
+                    'failed_items': self.progress.failed_items,
+                    'pending_items': self.progress.pending_items,
+                    'percent_complete': self.progress.percent_complete,
+                    'last_updated': workflow.now().isoformat()
+                }
+            }
+            progress_event = {
+                'event_id': str(workflow.uuid4()),
+                'event_type': 'enrichment.progress',
+                'routing_key': f'{request.source}.enrichment.progress',
+                'timestamp': workflow.now().isoformat(),
+                'bom_id': request.bom_id,
+                'organization_id': request.organization_id,
+                'project_id': request.project_id,
+                'source': request.source,
+                'workflow_id': workflow_id,
+                'workflow_run_id': workflow.info().run_id,
+                'state': {
+                    'status': 'enriching',
+                    'total_items': self.progress.total_items,
+                    'enriched_items': self.progress.enriched_items,
+                    'failed_items': self.progress.failed_items,
+                    'not_found_items': 0,  # TODO: Track separately
+                    'pending_items': self.progress.pending_items,
+                    'current_batch': (i // batch_size) + 1,
+                    'total_batches': (len(line_items) + batch_size - 1) // batch_size,
+                    'percent_complete': self.progress.percent_complete,
+                    'last_update': workflow.now().isoformat()
+                },
+                'payload': {
+                    'batch': {
+                        'batch_number': (i // batch_size) + 1,
+                        'batch_size': len(batch),
+                        'completed': len(batch)
+                    }
+                }
+            }
+
+            if workflow.patched(COALESCED_PROGRESS_PATCH):
+                pending_audit_entries.extend(audit_entries)
+                if (
+                    batch_number == total_batches
+                    or workflow.now() - last_progress_flush >= progress_flush_interval
+                ):
                     await workflow.execute_activity(
-                        log_enrichment_audit_batch,
+                        flush_enrichment_progress,
                         {
                             'upload_id': request.bom_id,
-                            'entries': audit_entries
+                            'audit_entries': pending_audit_entries,
+                            'progress': progress_params,
+                            'event': progress_event
                         },
-                        start_to_close_timeout=timedelta(seconds=20)
+                        start_to_close_timeout=timedelta(seconds=30)
                     )
-                except Exception as audit_error:
-                    workflow.logger.warning(f"Failed to log enrichment audit batch: {audit_error}")
+                    pending_audit_entries = []
+                    last_progress_flush = workflow.now()
+            else:
+                # Histories recorded before COALESCED_PROGRESS_PATCH: three activities per batch
+                if audit_entries:
+                    try:
+                        await workflow.execute_activity(
+                            log_enrichment_audit_batch,
+                            {
+                                'upload_id': request.bom_id,
+                                'entries': audit_entries
+                            },
+                            start_to_close_timeout=timedelta(seconds=20)
+                        )
+                    except Exception as audit_error:
+                        workflow.logger.warning(f"Failed to log enrichment audit batch: {audit_error}")
 
-            # Update progress (Supabase or Redis based on source)
-            await workflow.execute_activity(
-                update_bom_progress,
-                {
-                    'bom_id': request.bom_id,
-                    'source': request.source,  # ✅ Pass source to determine storage
-                    'progress': {
-                        'total_items': self.progress.total_items,
-                        'enriched_items': self.progress.enriched_items,
-                        'failed_items': self.progress.failed_items,
-                        'pending_items': self.progress.pending_items,
-                        'percent_complete': self.progress.percent_complete,
-                        'last_updated': workflow.now().isoformat()
-                    }
-                },
-                start_to_close_timeout=timedelta(seconds=10)
-            )
+                # Update progress (Supabase or Redis based on source)
+                await workflow.execute_activity(
+                    update_bom_progress,
+                    progress_params,
+                    start_to_close_timeout=timedelta(seconds=10)
+                )
 
-            # Publish enrichment.progress event (real-time UI update)
-            await workflow.execute_activity(
-                publish_enrichment_event,
-                {
-                    'event_id': str(workflow.uuid4()),
-                    'event_type': 'enrichment.progress',
-                    'routing_key': f'{request.source}.enrichment.progress',
-                    'timestamp': workflow.now().isoformat(),
-                    'bom_id': request.bom_id,
-                    'organization_id': request.organization_id,
-                    'project_id': request.project_id,
-                    'source': request.source,
-                    'workflow_id': workflow_id,
-                    'workflow_run_id': workflow.info().run_id,
-                    'state': {
-                        'status': 'enriching',
-                        'total_items': self.progress.total_items,
-                        'enriched_items': self.progress.enriched_items,
-                        'failed_items': self.progress.failed_items,
-                        'not_found_items': 0,  # TODO: Track separately
-                        'pending_items': self.progress.pending_items,
-                        'current_batch': (i // batch_size) + 1,
-                        'total_batches': (len(line_items) + batch_size - 1) // batch_size,
-                        'percent_complete': self.progress.percent_complete,
-                        'last_update': workflow.now().isoformat()
-                    },
-                    'payload': {
-                        'batch': {
-                            'batch_number': (i // batch_size) + 1,
-                            'batch_size': len(batch),
-                            'completed': len(batch)
-                        }
-                    }
-                },
-                start_to_close_timeout=timedelta(seconds=10)
-            )
+                # Publish enrichment.progress event (real-time UI update)
+                await workflow.execute_activity(
+                    publish_enrichment_event,
+                    progress_event,
+                    start_to_close_timeout=timedelta(seconds=10)
+                )
 
             workflow.logger.info(
                 f"📊 Progress: {self.progress.enriched_items}/{self.progress.total_items} "
@@ -1469,6 +1530,9 @@ async def load_enrichment_config() -> Dict[str, Any]:
         f"delay_per_batch={config['delay_per_batch_ms']}ms"
     )
 
+    from app.config import settings
+    config.setdefault('progress_flush_ms', settings.enrichment_event_flush_ms)
+
     return config
 
 
@@ -1531,6 +1595,44 @@ async def fetch_bom_line_items(bom_id: str) -> List[Dict[str, Any]]:
         raise
 
 
+@activity.defn
+async def count_carried_over_line_items(bom_id: str) -> int:
+    """
+    Count the line items of a BOM that are already enriched when enrichment starts.
+
+    These were carried over from a previous revision or a same-content upload
+    (see app/services/bom_diff.py and bom_fingerprint.py); fetch_bom_line_items
+    skips them.
+
+    Args:
+        bom_id: BOM ID
+
+    Returns:
+        Number of line items with enrichment_status='enriched'
+    """
+    from app.models.dual_database import get_dual_database
+    from sqlalchemy import text
+
+    dual_db = get_dual_database()
+    db = next(dual_db.get_session("supabase"))
+
+    try:
+        count = db.execute(
+            text("""
+                SELECT COUNT(*)
+                FROM bom_line_items
+                WHERE bom_id = :bom_id
+                  AND enrichment_status = 'enriched'
+            """),
+            {"bom_id": bom_id},
+        ).scalar()
+        return int(count or 0)
+
+    except Exception as e:
+        logger.error(f"Error counting carried-over line items for BOM {bom_id}: {e}", exc_info=True)
+        raise
+
+
 @activity.defn
 async def fetch_bom_line_items_from_redis(bom_id: str) -> List[Dict[str, Any]]:
     """
@@ -1741,9 +1843,8 @@ async def enrich_component(task: ComponentEnrichmentTask) -> Dict[str, Any]:
 
     # Helper function to publish component event
     async def publish_component_event(event_type: str, result: Dict[str, Any]):
-        """Publish component-level enrichment event with retry logic using dual_db"""
-        import json  # For JSONB serialization
-        from sqlalchemy.exc import OperationalError, IntegrityError, DataError
+        """Queue component-level enrichment event on the coalescing event sink"""
+        from app.services.enrichment_event_sink import get_enrichment_event_sink
 
         try:
             event_record = {
@@ -1772,75 +1873,10 @@ async def enrich_component(task: ComponentEnrichmentTask) -> Dict[str, Any]:
             # Convert Decimal/UUID/datetime objects to JSON-serializable types
             event_record = _make_json_serializable(event_record)
 
-            # Retry logic for transient failures
-            max_retries = 3
-            for attempt in range(max_retries):
-                try:
-                    # Use dual_db to insert into Supabase enrichment_events table
-                    supabase_db_gen = dual_db.get_session("supabase")
-                    supabase_db = next(supabase_db_gen)
-                    try:
-                        insert_query = text("""
-                            INSERT INTO enrichment_events (
-                                event_id, event_type, routing_key, bom_id, tenant_id,
-                                source, state, payload, created_at
-                            ) VALUES (
-                                :event_id, :event_type, :routing_key, :bom_id, :tenant_id,
-                                :source, :state, :payload, :created_at
-                            )
-                        """)
-
-                        supabase_db.execute(insert_query, {
-                            "event_id": event_record['event_id'],
-                            "event_type": event_record['event_type'],
-                            "routing_key": event_record['routing_key'],
-                            "bom_id": event_record['bom_id'],
-                            "tenant_id": event_record['organization_id'],  # Map org_id to tenant_id column
-                            "source": event_record['source'],
-                            "state": json.dumps(event_record['state']),
-                            "payload": json.dumps(event_record['payload']),
-                            "created_at": event_record['created_at']
-                        })
-                        supabase_db.commit()
-                        logger.info(f"✅ Published {event_type} event for {task.mpn}")
-                        return
-                    finally:
-                        try:
-                            next(supabase_db_gen)
-                        except StopIteration:
-                            pass
-                except IntegrityError as e:
-                    # Duplicate event_id - this is expected on retry, don't retry further
-                    logger.warning(f"Duplicate event_id prevented re-insert (expected on retry): {e}")
-                    return  # Success - event already exists
-                except DataError as e:
-                    # Malformed JSONB data - won't fix itself, don't retry
-                    logger.error(f"Malformed JSONB data in component event: {e}", exc_info=True)
-                    raise  # Fail fast - data error won't fix with retry
-                except OperationalError as retry_error:
-                    # Database connection issue - retry makes sense
-                    if attempt < max_retries - 1:
-                        wait_time = 2 ** attempt  # Exponential backoff: 1, 2, 4 seconds
-                        logger.warning(
-                            f"⚠️  DB connection error (attempt {attempt+1}/{max_retries}), "
-                            f"retrying in {wait_time}s: {retry_error}"
-                        )
-                        await asyncio.sleep(wait_time)
-                    else:
-                        logger.error(f"❌ DB connection failed after {max_retries} attempts: {retry_error}")
-                        raise
-                except Exception as retry_error:
-                    # Unknown error - retry with caution
-                    if attempt < max_retries - 1:
-                        wait_time = 2 ** attempt  # Exponential backoff: 1, 2, 4 seconds
-                        logger.warning(
-                            f"⚠️  Event publish failed (attempt {attempt+1}/{max_retries}), "
-                            f"retrying in {wait_time}s: {retry_error}"
-                        )
-                        await asyncio.sleep(wait_time)
-                    else:
-                        logger.error(f"❌ Event publish failed after {max_retries} attempts: {retry_error}")
-                        raise
+            # Written with other components' events as one multi-row INSERT
+            # and one SSE delta per flush interval (ENRICHMENT_EVENT_FLUSH_MS)
+            get_enrichment_event_sink().add(event_record)
+            logger.debug(f"Queued {event_type} event for {task.mpn}")
 
         except Exception as e:
             logger.warning(f"Failed to publish component event: {e}")
@@ -2867,18 +2903,16 @@ async def publish_enrichment_event(event_data: Dict[str, Any]) -> None:
         'created_at': event_data.get('timestamp', datetime.utcnow().isoformat())
     }
 
-    # 1. Publish to Redis Pub/Sub for real-time SSE streaming
+    # 1. Append to the BOM's Redis Stream (SSE replay) and publish for live viewers
     try:
         from app.cache.redis_cache import get_redis_client
+        from app.services.enrichment_event_hub import append_enrichment_event
 
         redis_client = await get_redis_client()
         channel = f"enrichment:{event_data['bom_id']}"
 
-        # Publish event to Redis (SSE endpoint subscribes to this)
-        await redis_client.publish(
-            channel,
-            json.dumps(event_record)
-        )
+        # SSE endpoints fan this out via one pattern subscription per pod
+        await append_enrichment_event(redis_client, str(event_data['bom_id']), event_record)
 
         logger.info(f"✅ Event published to Redis channel: {channel}")
 
@@ -2947,6 +2981,46 @@ async def publish_enrichment_event(event_data: Dict[str, Any]) -> None:
         # Non-blocking - don't fail the workflow if event publishing fails
 
 
+@activity.defn
+async def flush_enrichment_progress(params: Dict[str, Any]) -> Dict[str, int]:
+    """
+    Coalesced progress flush: audit rows, BOM progress and one progress event.
+
+    Replaces the per-batch log_enrichment_audit_batch / update_bom_progress /
+    publish_enrichment_event trio with a single activity the workflow runs at
+    most once per flush interval.
+
+    Args:
+        params: {
+            upload_id: str,
+            audit_entries: [...] (log_enrichment_audit_batch entries since last flush),
+            progress: update_bom_progress params,
+            event: publish_enrichment_event payload
+        }
+
+    Returns:
+        Audit logging stats
+    """
+    from app.services.enrichment_event_sink import get_enrichment_event_sink
+
+    # Component events buffered on this worker go out before the progress delta
+    await get_enrichment_event_sink().flush()
+
+    stats = {'total': 0, 'logged': 0, 'failed': 0, 'flagged_for_review': 0}
+    if params.get('audit_entries'):
+        try:
+            stats = await log_enrichment_audit_batch({
+                'upload_id': params['upload_id'],
+                'entries': params['audit_entries']
+            })
+        except Exception as audit_error:
+            logger.warning(f"Failed to log enrichment audit batch: {audit_error}")
+
+    await update_bom_progress(params['progress'])
+    await publish_enrichment_event(params['event'])
+    return stats
+
+
 def calculate_enrichment_quality_score(product_data) -> float:
     """
     Calculate enrichment quality score based on data completeness (0-100).
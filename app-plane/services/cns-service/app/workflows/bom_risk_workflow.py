@@ -152,8 +152,12 @@ async def calculate_bom_risk_scores(params: Dict[str, Any]) -> Dict[str, Any]:
     """
     Calculate risk scores for a single BOM.
 
+    Lines whose risk row was carried over from the previous revision of the
+    BOM are not re-scored unless force_recalculate is set. Their carried_over
+    flag is cleared, so the next analysis scores them like any other line.
+
     Args:
-        params: {bom_id, organization_id}
+        params: {bom_id, organization_id, force_recalculate}
 
     Returns:
         Result with health grade and statistics
@@ -165,6 +169,7 @@ async def calculate_bom_risk_scores(params: Dict[str, Any]) -> Dict[str, Any]:
     bom_id = params['bom_id']
     org_id = params['organization_id']
     bom_name = params.get('name', f'BOM {bom_id[:8]}')
+    force = params.get('force_recalculate', False)
 
     logger.info(f"[BOMRisk] Processing BOM: {bom_name} ({bom_id})")
 
@@ -185,8 +190,10 @@ async def calculate_bom_risk_scores(params: Dict[str, Any]) -> Dict[str, Any]:
                 bli.specifications,
                 bli.compliance_status,
                 bli.pricing,
-                bli.datasheet_url
+                bli.datasheet_url,
+                COALESCE(r.carried_over, FALSE) as carried_over
             FROM bom_line_items bli
+            LEFT JOIN bom_line_item_risk_scores r ON r.bom_line_item_id = bli.id
             WHERE bli.bom_id = :bom_id
             AND bli.enrichment_status = 'enriched'
         """
@@ -209,8 +216,12 @@ async def calculate_bom_risk_scores(params: Dict[str, Any]) -> Dict[str, Any]:
         profile = await service.get_or_create_profile(org_id, db)
 
         scored = 0
+        carried_ids = []
         for row in rows:
             m = row._mapping
+            if m["carried_over"] and not force:
+                carried_ids.append(str(m["line_item_id"]))
+                continue
             try:
                 mpn = m["mpn"] or "UNKNOWN"
                 manufacturer = m["manufacturer"] or "UNKNOWN"
@@ -270,8 +281,21 @@ async def calculate_bom_risk_scores(params: Dict[str, Any]) -> Dict[str, Any]:
                 logger.error(f"[BOMRisk] Error scoring line item {m['line_item_id']}: {e}")
                 continue
 
+        already_scored = len(carried_ids)
+        if carried_ids:
+            db.execute(
+                text("""
+                    UPDATE bom_line_item_risk_scores
+                    SET carried_over = FALSE
+                    WHERE bom_line_item_id = ANY(CAST(:ids AS uuid[]))
+                """),
+                {"ids": carried_ids},
+            )
+            db.commit()
+            logger.info(f"[BOMRisk] Kept {already_scored} risk scores carried over from the previous revision")
+
         # Calculate and store BOM summary
-        if scored > 0:
+        if scored > 0 or already_scored > 0:
             summary = await service.calculate_bom_risk_summary(bom_id, org_id, db)
             await service.store_bom_risk_summary(summary, profile_id=profile.id, db=db)
 
@@ -313,6 +337,7 @@ async def calculate_bom_risk_scores(params: Dict[str, Any]) -> Dict[str, Any]:
                 "bom_name": bom_name,
                 "total_line_items": len(rows),
                 "scored_items": scored,
+                "carried_items": already_scored,
                 "health_grade": summary.health_grade,
                 "average_risk_score": float(summary.average_risk_score),
                 "error": None
@@ -762,6 +787,7 @@ class BOMRiskAnalysisWorkflow:
                         "bom_id": bom["bom_id"],
                         "organization_id": request.organization_id,
                         "name": bom["name"],
+                        "force_recalculate": request.force_recalculate,
                     },
                     start_to_close_timeout=timedelta(minutes=5),
                     retry_policy=retry_policy,
@@ -948,6 +948,7 @@ async def save_to_catalog_activity(data: Dict[str, Any]) -> Dict[str, Any]:
     - Input: {mpn, manufacturer, data, quality_score, organization_id, tiers_used}
     - Output: {saved, component_id, location}
     """
+    from app.cache.response_cache import invalidate_catalog_component
     from app.models.dual_database import get_dual_database
     from sqlalchemy import text
     import uuid
@@ -1042,6 +1043,7 @@ async def save_to_catalog_activity(data: Dict[str, Any]) -> Dict[str, Any]:
                 logger.info(f"[Activity] Inserted new component: {component_id}")
 
             db.commit()
+            invalidate_catalog_component(component_id, mpn)
 
             return {
                 "saved": True,
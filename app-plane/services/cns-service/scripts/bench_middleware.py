@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: per-request overhead of the HTTP middleware pipeline.
+
+Builds main.py's middleware stack (error handling, dual-database routing x4,
+rate limit, auth, CORS, request logging, correlation ID) around the same
+trivial JSON endpoint and compares:
+  bare      - no middleware
+  before    - the stack as it is at --baseline (a git ref), imported from
+              that revision's app/ package
+  after     - the stack in the working tree
+
+Each stack is measured in its own interpreter, so the two revisions of the
+app package never share a process. Requests are driven straight through
+the ASGI callable (no server or socket), so the numbers are middleware +
+framework cost only.
+
+Run from the service root:
+  DATABASE_URL=postgresql://u:p@localhost/db JWT_SECRET_KEY=x \\
+      python scripts/bench_middleware.py --baseline HEAD~20 --requests 5000
+"""
+
+import argparse
+import asyncio
+import io
+import logging
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+SERVICE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_app():
+    from fastapi import FastAPI
+
+    app = FastAPI()
+
+    @app.get("/api/bench")
+    async def bench():
+        return {"ok": True}
+
+    return app
+
+
+def stack_app():
+    """main.py's middleware stack; only uses names both revisions define."""
+    from fastapi.middleware.cors import CORSMiddleware
+
+    from app.core.dual_database_routing import init_router
+    from app.core.error_handling import setup_error_handling
+    from app.core.middleware import CorrelationIDMiddleware
+    from app.logging_config import RequestLoggingMiddleware
+    from app.middleware.auth_middleware import AuthMiddleware
+    from app.middleware.dual_database_routing import create_dual_database_middleware_stack
+    from app.middleware.rate_limit import RateLimitMiddleware
+
+    init_router()
+    app = make_app()
+    setup_error_handling(app)
+    create_dual_database_middleware_stack(app)
+    app.add_middleware(RateLimitMiddleware)
+    app.add_middleware(AuthMiddleware, require_auth=False)
+    app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])
+    app.add_middleware(RequestLoggingMiddleware)
+    app.add_middleware(CorrelationIDMiddleware)
+    return app
+
+
+async def measure(app, requests: int) -> float:
+    """Mean microseconds per request."""
+    scope = {
+        "type": "http", "method": "GET", "path": "/api/bench", "raw_path": b"/api/bench",
+        "root_path": "", "scheme": "http", "query_string": b"", "http_version": "1.1",
+        "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 5000), "server": ("bench", 80),
+    }
+
+    statuses = set()
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.add(message["status"])
+
+    async def request():
+        received = False
+
+        async def receive():
+            nonlocal received
+            if not received:
+                received = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            # Like a server: block until the client disconnects (never, here)
+            await asyncio.Event().wait()
+
+        await app(dict(scope), receive, send)
+
+    for _ in range(min(200, requests)):  # Warm up (middleware stack is built lazily)
+        await request()
+    if statuses != {200}:
+        raise RuntimeError(f"benchmark endpoint returned {sorted(statuses)}, not 200")
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await request()
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def export_baseline(ref: str, dest: str) -> None:
+    """Write the service's app/ package as of `ref` into dest."""
+    def git(*args: str) -> str:
+        return subprocess.run(["git", *args], cwd=SERVICE_ROOT, capture_output=True, text=True, check=True).stdout.strip()
+
+    # Pathspecs are relative to the current directory, so archive from the top level
+    toplevel, prefix = git("rev-parse", "--show-toplevel"), git("rev-parse", "--show-prefix")
+    archive = subprocess.run(
+        ["git", "archive", "--format=tar", f"{ref}:{prefix}", "app"],
+        cwd=toplevel, capture_output=True, check=True,
+    ).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(dest)
+
+
+def run_stack(name: str, app_root: str, requests: int) -> float:
+    """Measure one stack in a fresh interpreter importing `app` from app_root."""
+    env = dict(os.environ)
+    # app_root first; SERVICE_ROOT still provides the `shared` package
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [app_root, SERVICE_ROOT, env.get("PYTHONPATH")]))
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--measure", name, "--requests", str(requests)],
+        cwd=app_root, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{name} stack failed:\n{proc.stderr[-2000:]}")
+    return float(proc.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--baseline", default="HEAD", help="git ref for the 'before' stack (default: HEAD)")
+    parser.add_argument("--measure", choices=["bare", "stack"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        # Keep per-request log lines out of the measurement
+        logging.disable(logging.CRITICAL)
+        factory = make_app if args.measure == "bare" else stack_app
+        print(asyncio.run(measure(factory(), args.requests)))
+        return
+
+    results = {"bare": run_stack("bare", SERVICE_ROOT, args.requests)}
+    with tempfile.TemporaryDirectory() as baseline_root:
+        export_baseline(args.baseline, baseline_root)
+        results["before"] = run_stack("stack", baseline_root, args.requests)
+    results["after"] = run_stack("stack", SERVICE_ROOT, args.requests)
+
+    bare = results["bare"]
+    print(f"before = {args.baseline}, after = working tree")
+    print(f"{'stack':<8} {'us/request':>11} {'overhead':>10}")
+    for name, us in results.items():
+        print(f"{name:<8} {us:>11.1f} {us - bare:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -18,25 +18,50 @@ Usage:
         }
     )
 
+    # From async code (FastAPI handlers, Temporal activities) use the
+    # non-blocking facade; it buffers on AsyncEventBus and returns at once
+    publish_event('customer.bom.uploaded', {...})
+
 Environment Variables:
     RABBITMQ_HOST: RabbitMQ hostname (default: localhost)
     RABBITMQ_PORT: RabbitMQ port (default: 27250)
     RABBITMQ_USER: RabbitMQ username (default: admin)
     RABBITMQ_PASS: RabbitMQ password
+    EVENT_BUS_ASYNC: Use the aio-pika publisher on asyncio loops (default: true)
+    EVENT_BUS_BUFFER_SIZE: Max events buffered in memory (default: 10000)
+    EVENT_BUS_BATCH_SIZE: Events per confirm batch (default: 100)
+    EVENT_BUS_CHANNEL_POOL_SIZE: Confirm-mode channels (default: 4)
+    EVENT_BUS_SPILL_PATH: JSONL file for events that overflow the buffer (default: unset)
+
+Transactional outbox:
+    Inside capture_events(writer), publish_event() hands the built event to
+    `writer` instead of the broker. The CNS service uses this to store events
+    in its event_outbox table within the caller's DB transaction.
 """
 
 import os
 import json
 import time
 import uuid
+import asyncio
+from collections import deque
 from datetime import datetime
 from decimal import Decimal
-from typing import Dict, Any, List, Optional
-from contextlib import asynccontextmanager
+from typing import Callable, Dict, Any, List, Optional
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from urllib.parse import quote
 import pika
 from pika.adapters.asyncio_connection import AsyncioConnection
 from pika import SelectConnection
 
+try:
+    import aio_pika
+    from aio_pika.pool import Pool
+except ImportError:  # Optional: publish_event() falls back to the blocking EventBus
+    aio_pika = None
+    Pool = None
+
 from .logger_config import get_logger
 
 logger = get_logger('event_bus')
@@ -63,6 +88,50 @@ RABBITMQ_CONFIG = {
     'exchange': 'platform.events'
 }
 
+ASYNC_PUBLISHER_CONFIG = {
+    'enabled': os.getenv('EVENT_BUS_ASYNC', 'true').lower() in ('true', '1', 'yes', 'on'),
+    'buffer_size': int(os.getenv('EVENT_BUS_BUFFER_SIZE', '10000')),
+    'batch_size': int(os.getenv('EVENT_BUS_BATCH_SIZE', '100')),
+    'channel_pool_size': int(os.getenv('EVENT_BUS_CHANNEL_POOL_SIZE', '4')),
+    'spill_path': os.getenv('EVENT_BUS_SPILL_PATH') or None,
+}
+
+
+# Stream filter value header; streams bound to platform.events index it per chunk
+STREAM_FILTER_HEADER = 'x-stream-filter-value'
+
+
+def stream_filter_value(routing_key: str) -> str:
+    """
+    Stream filter value for a routing key: its first two segments
+    ('customer.bom.uploaded' -> 'customer.bom').
+
+    Stream consumers subscribe with the filter values of the routing keys
+    they handle, so the broker (RabbitMQ 3.13+) skips chunks that contain
+    none of them.
+    """
+    return '.'.join(routing_key.split('.')[:2])
+
+
+def build_event(routing_key: str, event_data: Dict[str, Any], event_type: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Build the message body shared by the sync and async publishers.
+
+    Ensures core metadata fields are present for all events:
+    event_id (stable identifier for deduplication and analytics) and
+    schema_version (allows evolving event shape over time).
+    """
+    if 'event_id' not in event_data:
+        event_data['event_id'] = str(uuid.uuid4())
+    if 'schema_version' not in event_data:
+        event_data['schema_version'] = 1
+
+    return {
+        'event_type': event_type or routing_key,
+        'timestamp': datetime.utcnow().isoformat(),
+        **event_data,
+    }
+
 
 def get_retry_config(priority: int) -> dict:
     """
@@ -178,20 +247,8 @@ class EventBus:
         max_retries = retry_config['max_retries']
         initial_delay = retry_config['initial_delay']
 
-        # Ensure core metadata fields are present for all events
-        # event_id: stable identifier for deduplication and analytics
-        # schema_version: allows evolving event shape over time
-        if 'event_id' not in event_data:
-            event_data['event_id'] = str(uuid.uuid4())
-        if 'schema_version' not in event_data:
-            event_data['schema_version'] = 1
-
-        # Build event payload
-        event = {
-            'event_type': event_type or routing_key,
-            'timestamp': datetime.utcnow().isoformat(),
-            **event_data,
-        }
+        # Build event payload (adds event_id / schema_version if missing)
+        event = build_event(routing_key, event_data, event_type)
 
         last_error = None
 
@@ -215,7 +272,8 @@ class EventBus:
                         delivery_mode=2,  # Persistent
                         content_type='application/json',
                         priority=priority,
-                        timestamp=int(datetime.utcnow().timestamp())
+                        timestamp=int(datetime.utcnow().timestamp()),
+                        headers={STREAM_FILTER_HEADER: stream_filter_value(routing_key)}
                     )
                 )
 
@@ -280,6 +338,337 @@ def get_event_bus() -> EventBus:
 event_bus = get_event_bus()
 
 
+# ============================================================================
+# ASYNC PUBLISHER (aio-pika)
+# ============================================================================
+
+class AsyncEventBus:
+    """
+    Non-blocking RabbitMQ publisher for asyncio callers.
+
+    publish() only appends to a bounded in-memory buffer. A background sender
+    drains it in batches: every message in a batch is published on a pooled
+    confirm-mode channel, and the confirms are awaited together. Failed
+    messages go back to the front of the buffer and are retried with backoff.
+
+    When the buffer is full (e.g. broker outage), new events are appended to
+    a JSONL spill file (EVENT_BUS_SPILL_PATH) and replayed once the broker is
+    reachable again. Without a spill path, the oldest buffered event is
+    dropped.
+    """
+
+    def __init__(
+        self,
+        url: str = None,
+        exchange: str = None,
+        buffer_size: int = None,
+        batch_size: int = None,
+        channel_pool_size: int = None,
+        spill_path: str = None,
+        confirm_timeout: float = 10.0,
+    ):
+        self.url = url or (
+            f"amqp://{RABBITMQ_CONFIG['user']}:{RABBITMQ_CONFIG['password']}"
+            f"@{RABBITMQ_CONFIG['host']}:{RABBITMQ_CONFIG['port']}/"
+            f"{quote(RABBITMQ_CONFIG['virtual_host'], safe='')}"
+        )
+        self.exchange_name = exchange or RABBITMQ_CONFIG['exchange']
+        self.buffer_size = buffer_size or ASYNC_PUBLISHER_CONFIG['buffer_size']
+        self.batch_size = batch_size or ASYNC_PUBLISHER_CONFIG['batch_size']
+        self.channel_pool_size = channel_pool_size or ASYNC_PUBLISHER_CONFIG['channel_pool_size']
+        self.spill_path = spill_path if spill_path is not None else ASYNC_PUBLISHER_CONFIG['spill_path']
+        self.confirm_timeout = confirm_timeout
+
+        self._buffer: deque = deque()
+        self._ready: Optional[asyncio.Event] = None
+        self._sender: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._connection = None
+        self._channels = None
+
+        self.stats = {'published': 0, 'failed': 0, 'spilled': 0, 'dropped': 0, 'replayed': 0}
+
+    # -- buffering -----------------------------------------------------------
+
+    @property
+    def loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        return self._loop
+
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def publish_nowait(
+        self,
+        routing_key: str,
+        event_data: Dict[str, Any],
+        event_type: Optional[str] = None,
+        priority: int = 0
+    ) -> None:
+        """Buffer an event for publishing; never blocks. Must run on the bus loop."""
+        event = build_event(routing_key, event_data, event_type)
+        message = {
+            'routing_key': routing_key,
+            'body': json.dumps(event, cls=DecimalEncoder),
+            'message_id': event['event_id'],
+            'priority': priority,
+        }
+        self._start()
+        if len(self._buffer) >= self.buffer_size:
+            if self.spill_path:
+                self._spill([message])
+                return
+            self._buffer.popleft()
+            self.stats['dropped'] += 1
+            logger.error(f"Event buffer full, dropped oldest event (publishing {routing_key})")
+        self._buffer.append(message)
+        self._ready.set()
+
+    async def publish(
+        self,
+        routing_key: str,
+        event_data: Dict[str, Any],
+        event_type: Optional[str] = None,
+        priority: int = 0
+    ) -> None:
+        """Async-friendly alias of publish_nowait()."""
+        self.publish_nowait(routing_key, event_data, event_type, priority)
+
+    def _start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Bound to the first loop that publishes; a new loop starts fresh
+            self._loop = loop
+            self._ready = asyncio.Event()
+            self._sender = None
+            self._connection = None
+            self._channels = None
+        if self._sender is None or self._sender.done():
+            self._sender = loop.create_task(self._run())
+
+    def _spill(self, messages: List[Dict[str, Any]]) -> None:
+        try:
+            with open(self.spill_path, 'a', encoding='utf-8') as f:
+                for message in messages:
+                    f.write(json.dumps(message) + '\n')
+            self.stats['spilled'] += len(messages)
+            logger.warning(f"Event buffer full, spilled {len(messages)} event(s) to {self.spill_path}")
+        except OSError as e:
+            self.stats['dropped'] += len(messages)
+            logger.error(f"Failed to spill {len(messages)} event(s) to {self.spill_path}: {e}")
+
+    def _load_spill(self) -> List[Dict[str, Any]]:
+        """Take over the spill file, if any, and return its messages."""
+        if not self.spill_path or not os.path.exists(self.spill_path):
+            return []
+        replay_path = f"{self.spill_path}.replay"
+        try:
+            os.replace(self.spill_path, replay_path)
+            with open(replay_path, encoding='utf-8') as f:
+                messages = [json.loads(line) for line in f if line.strip()]
+            os.remove(replay_path)
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to read spilled events from {self.spill_path}: {e}")
+            return []
+        self.stats['replayed'] += len(messages)
+        logger.info(f"Replaying {len(messages)} spilled event(s) from {self.spill_path}")
+        return messages
+
+    # -- sending -------------------------------------------------------------
+
+    async def _connect(self) -> None:
+        if aio_pika is None:
+            raise RuntimeError("aio-pika is not installed")
+        if self._connection is None or self._connection.is_closed:
+            self._connection = await aio_pika.connect_robust(self.url)
+            self._channels = Pool(self._open_channel, max_size=self.channel_pool_size)
+            logger.info(f"Async event publisher connected ({self.channel_pool_size} channels)")
+
+    async def _open_channel(self):
+        return await self._connection.channel(publisher_confirms=True)
+
+    async def _run(self) -> None:
+        failures = 0
+        while True:
+            if not self._buffer:
+                self._ready.clear()
+                await self._ready.wait()
+
+            batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+            if not batch:
+                continue
+            try:
+                await self._connect()
+                failed = await self._publish_batch(batch)
+            except asyncio.CancelledError:
+                self._buffer.extendleft(reversed(batch))
+                raise
+            except Exception as e:
+                logger.warning(f"Event batch publish failed ({len(batch)} events): {e}")
+                failed = batch
+
+            if failed:
+                self.stats['failed'] += len(failed)
+                self._buffer.extendleft(reversed(failed))
+                self._trim_buffer()
+                delay = min(0.5 * (2 ** failures), 30.0)
+                failures += 1
+                await asyncio.sleep(delay)
+                continue
+
+            failures = 0
+            if not self._buffer:
+                # Broker is healthy and we've caught up: replay spilled events
+                self._buffer.extend(self._load_spill())
+                self._trim_buffer()
+
+    def _trim_buffer(self) -> None:
+        overflow = len(self._buffer) - self.buffer_size
+        if overflow <= 0:
+            return
+        newest = [self._buffer.pop() for _ in range(overflow)][::-1]
+        if self.spill_path:
+            self._spill(newest)
+        else:
+            self.stats['dropped'] += overflow
+            logger.error(f"Event buffer full, dropped {overflow} event(s)")
+
+    async def _publish_batch(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Publish a batch and await all confirms together. Returns unconfirmed messages."""
+        async with self._channels.acquire() as channel:
+            exchange = await channel.get_exchange(self.exchange_name, ensure=False)
+            now = datetime.utcnow()
+            results = await asyncio.wait_for(
+                asyncio.gather(
+                    *(
+                        exchange.publish(
+                            aio_pika.Message(
+                                body=message['body'].encode('utf-8'),
+                                content_type='application/json',
+                                delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+                                priority=message['priority'],
+                                message_id=message['message_id'],
+                                timestamp=now,
+                                headers={STREAM_FILTER_HEADER: stream_filter_value(message['routing_key'])},
+                            ),
+                            routing_key=message['routing_key'],
+                        )
+                        for message in batch
+                    ),
+                    return_exceptions=True,
+                ),
+                timeout=self.confirm_timeout,
+            )
+
+        failed = [message for message, result in zip(batch, results) if isinstance(result, BaseException)]
+        self.stats['published'] += len(batch) - len(failed)
+        if failed:
+            logger.warning(f"{len(failed)}/{len(batch)} events were not confirmed by the broker")
+        return failed
+
+    async def publish_messages(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Publish pre-built messages ({routing_key, body, message_id, priority})
+        with confirms, bypassing the buffer. Returns the unconfirmed ones.
+        """
+        await self._connect()
+        failed = []
+        for start in range(0, len(messages), self.batch_size):
+            failed.extend(await self._publish_batch(messages[start:start + self.batch_size]))
+        return failed
+
+    async def close(self, timeout: float = 5.0) -> None:
+        """Flush what we can within `timeout`; spill the rest, then disconnect."""
+        if self._sender is not None and self._buffer:
+            deadline = asyncio.get_running_loop().time() + timeout
+            while self._buffer and asyncio.get_running_loop().time() < deadline:
+                await asyncio.sleep(0.05)
+        if self._sender is not None:
+            self._sender.cancel()
+            try:
+                await self._sender
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._sender = None
+        if self._buffer:
+            remaining = list(self._buffer)
+            self._buffer.clear()
+            if self.spill_path:
+                self._spill(remaining)
+            else:
+                logger.error(f"Discarding {len(remaining)} unpublished event(s) on shutdown")
+        if self._connection is not None and not self._connection.is_closed:
+            await self._connection.close()
+        self._connection = None
+        self._channels = None
+
+
+_async_event_bus_instance = None
+
+
+def get_async_event_bus() -> Optional[AsyncEventBus]:
+    """Get singleton AsyncEventBus, or None when aio-pika is unavailable or disabled."""
+    global _async_event_bus_instance
+    if aio_pika is None or not ASYNC_PUBLISHER_CONFIG['enabled']:
+        return None
+    if _async_event_bus_instance is None:
+        _async_event_bus_instance = AsyncEventBus()
+    return _async_event_bus_instance
+
+
+# Set by capture_events(); receives (routing_key, event, priority)
+_event_writer: ContextVar[Optional[Callable[[str, Dict[str, Any], int], None]]] = ContextVar(
+    'event_writer', default=None
+)
+
+
+@contextmanager
+def capture_events(writer: Callable[[str, Dict[str, Any], int], None]):
+    """Route publish_event() calls in this context to `writer` (e.g. an outbox insert)."""
+    token = _event_writer.set(writer)
+    try:
+        yield
+    finally:
+        _event_writer.reset(token)
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+    # Temporal workflow code runs on a deterministic loop that must not do I/O
+    if type(loop).__module__.startswith('temporalio.'):
+        return None
+    return loop
+
+
+def publish_event(
+    routing_key: str,
+    event_data: Dict[str, Any],
+    event_type: Optional[str] = None,
+    priority: int = 0
+) -> None:
+    """
+    Publish from any context.
+
+    On an asyncio loop (FastAPI handlers, Temporal activities) the event is
+    buffered on the AsyncEventBus and this returns immediately. Elsewhere
+    (Flask, worker threads, workflow code) it falls back to the blocking
+    EventBus.publish(). Inside capture_events() the event goes to the
+    registered writer instead.
+    """
+    writer = _event_writer.get()
+    if writer is not None:
+        writer(routing_key, build_event(routing_key, event_data, event_type), priority)
+        return
+    loop = _running_loop()
+    async_bus = get_async_event_bus() if loop is not None else None
+    if async_bus is not None and async_bus.loop in (None, loop):
+        async_bus.publish_nowait(routing_key, event_data, event_type, priority)
+        return
+    event_bus.publish(routing_key, event_data, event_type=event_type, priority=priority)
+
+
 # ============================================================================
 # EVENT HELPERS (Pre-defined event publishers)
 # ============================================================================
@@ -287,12 +676,15 @@ event_bus = get_event_bus()
 class EventPublisher:
     """
     Helper class with pre-defined event publishers for common events
+
+    All helpers go through publish_event(), so they don't block when called
+    from async code.
     """
 
     @staticmethod
     def customer_bom_uploaded(bom_id: str, organization_id: str, user_id: str, filename: str, total_items: int, upload_id: str = None, project_id: str = None):
         """Publish customer BOM uploaded event (high priority - user waiting)"""
-        event_bus.publish(
+        publish_event(
             'customer.bom.uploaded',
             {
                 'upload_id': upload_id,  # bom_uploads.id (for workflow processing)
@@ -317,7 +709,7 @@ class EventPublisher:
         when BOM records and line items have been created in the database.
         Replaces hardcoded delays in auto-enrichment consumer.
         """
-        event_bus.publish(
+        publish_event(
             'customer.bom.upload_completed',
             {
                 'bom_id': bom_upload_id,
@@ -346,7 +738,7 @@ class EventPublisher:
         normalized into a snapshot. The ingestion workflow listens for
         this event to create Supabase BOMs and start enrichment.
         """
-        event_bus.publish(
+        publish_event(
             'bom.parsed',
             {
                 'bom_id': bom_id,
@@ -374,7 +766,7 @@ class EventPublisher:
         total_items: int = 0
     ):
         """Publish CNS bulk upload event (medium priority - background job)"""
-        event_bus.publish(
+        publish_event(
             'cns.bom.bulk_uploaded',
             {
                 'bom_id': bom_id,
@@ -395,7 +787,7 @@ class EventPublisher:
     @staticmethod
     def customer_bom_edited(bom_id: str, organization_id: str, user_id: str, changes: Dict[str, Any]):
         """Publish customer BOM edited event"""
-        event_bus.publish(
+        publish_event(
             'customer.bom.edited',
             {
                 'bom_id': bom_id,
@@ -410,7 +802,7 @@ class EventPublisher:
     @staticmethod
     def customer_bom_deleted(bom_id: str, organization_id: str, user_id: str, bom_name: str = None):
         """Publish customer BOM deleted event"""
-        event_bus.publish(
+        publish_event(
             'customer.bom.deleted',
             {
                 'bom_id': bom_id,
@@ -425,7 +817,7 @@ class EventPublisher:
     @staticmethod
     def customer_bom_validated(bom_id: str, organization_id: str, grade: str, issues: int):
         """Publish customer BOM validated event"""
-        event_bus.publish(
+        publish_event(
             'customer.bom.validated',
             {
                 'bom_id': bom_id,
@@ -440,7 +832,7 @@ class EventPublisher:
     @staticmethod
     def customer_project_created(project_id: str, organization_id: str, user_id: str, project_name: str):
         """Publish customer project created event"""
-        event_bus.publish(
+        publish_event(
             'customer.project.created',
             {
                 'project_id': project_id,
@@ -455,7 +847,7 @@ class EventPublisher:
     @staticmethod
     def customer_project_edited(project_id: str, organization_id: str, user_id: str, changes: Dict[str, Any]):
         """Publish customer project edited event"""
-        event_bus.publish(
+        publish_event(
             'customer.project.edited',
             {
                 'project_id': project_id,
@@ -470,7 +862,7 @@ class EventPublisher:
     @staticmethod
     def customer_project_deleted(project_id: str, tenant_id: str, user_id: str, project_name: str = None, bom_count: int = 0):
         """Publish customer project deleted event"""
-        event_bus.publish(
+        publish_event(
             'customer.project.deleted',
             {
                 'project_id': project_id,
@@ -486,7 +878,7 @@ class EventPublisher:
     @staticmethod
     def customer_organization_deleted(organization_id: str, user_id: str, organization_name: str = None):
         """Publish customer organization deleted event"""
-        event_bus.publish(
+        publish_event(
             'customer.organization.deleted',
             {
                 'organization_id': organization_id,
@@ -500,7 +892,7 @@ class EventPublisher:
     @staticmethod
     def customer_organization_member_added(organization_id: str, user_id: str, new_member_id: str, role: str):
         """Publish customer organization member added event"""
-        event_bus.publish(
+        publish_event(
             'customer.organization.member_added',
             {
                 'organization_id': organization_id,
@@ -515,7 +907,7 @@ class EventPublisher:
     @staticmethod
     def customer_organization_member_removed(organization_id: str, user_id: str, removed_member_id: str):
         """Publish customer organization member removed event"""
-        event_bus.publish(
+        publish_event(
             'customer.organization.member_removed',
             {
                 'organization_id': organization_id,
@@ -529,7 +921,7 @@ class EventPublisher:
     @staticmethod
     def customer_user_deleted(deleted_user_id: str, tenant_id: str, admin_id: str):
         """Publish customer user deleted event"""
-        event_bus.publish(
+        publish_event(
             'customer.user.deleted',
             {
                 'deleted_user_id': deleted_user_id,
@@ -543,7 +935,7 @@ class EventPublisher:
     @staticmethod
     def customer_bom_enrichment_started(job_id: str, bom_id: str, total_items: int):
         """Publish enrichment started event"""
-        event_bus.publish(
+        publish_event(
             'customer.bom.enrichment_started',
             {
                 'job_id': job_id,
@@ -570,7 +962,7 @@ class EventPublisher:
         """Publish enrichment progress event"""
         percent = round((processed / total * 100), 2) if total > 0 else 0.0
         pending = max(total - processed, 0)
-        event_bus.publish(
+        publish_event(
             'customer.bom.enrichment_progress',
             {
                 'job_id': job_id,
@@ -621,7 +1013,7 @@ class EventPublisher:
         """
         total = succeeded + failed
         percent = round((succeeded / total * 100), 2) if total > 0 else 0.0
-        event_bus.publish(
+        publish_event(
             'customer.bom.enrichment_completed',
             {
                 'job_id': job_id,
@@ -669,7 +1061,7 @@ class EventPublisher:
             user_id: User who triggered analysis (optional)
             total_items: Number of line items to analyze
         """
-        event_bus.publish(
+        publish_event(
             'customer.bom.risk_analysis_started',
             {
                 'bom_id': bom_id,
@@ -714,7 +1106,7 @@ class EventPublisher:
             risk_distribution: Distribution by risk level (low/medium/high/critical)
             user_id: User who triggered analysis (optional)
         """
-        event_bus.publish(
+        publish_event(
             'customer.bom.risk_analysis_completed',
             {
                 'bom_id': bom_id,
@@ -752,7 +1144,7 @@ class EventPublisher:
             error_code: Error code (optional)
             user_id: User who triggered analysis (optional)
         """
-        event_bus.publish(
+        publish_event(
             'customer.bom.risk_analysis_failed',
             {
                 'bom_id': bom_id,
@@ -774,7 +1166,7 @@ class EventPublisher:
     @staticmethod
     def customer_bom_audit_ready(job_id: str, bom_id: str, label: str, files: List[str]):
         """Publish audit-ready event after CSV generation"""
-        event_bus.publish(
+        publish_event(
             'customer.bom.audit_ready',
             {
                 'job_id': job_id,
@@ -792,7 +1184,7 @@ class EventPublisher:
     @staticmethod
     def customer_bom_field_diff_ready(job_id: str, bom_id: str, label: str, object_key: str):
         """Publish event when the field-diff CSV is ready"""
-        event_bus.publish(
+        publish_event(
             'customer.bom.field_diff_ready',
             {
                 'job_id': job_id,
@@ -824,7 +1216,7 @@ class EventPublisher:
         complete for a BOM (validation errors, workflow failures,
         supplier outages, etc.).
         """
-        event_bus.publish(
+        publish_event(
             'customer.bom.enrichment_failed',
             {
                 'job_id': job_id,
@@ -843,7 +1235,7 @@ class EventPublisher:
     @staticmethod
     def enrichment_component_enriched(job_id: str, mpn: str, quality_score: float, source: str):
         """Publish component enriched event"""
-        event_bus.publish(
+        publish_event(
             'enrichment.component.enriched',
             {
                 'job_id': job_id,
@@ -869,7 +1261,7 @@ class EventPublisher:
         error_message: Optional[str] = None,
     ):
         """Publish component-level enrichment failure event."""
-        event_bus.publish(
+        publish_event(
             'enrichment.component.failed',
             {
                 'job_id': job_id,
@@ -891,7 +1283,7 @@ class EventPublisher:
     @staticmethod
     def enrichment_catalog_hit(job_id: str, mpn: str):
         """Publish catalog hit event (component found in cache)"""
-        event_bus.publish(
+        publish_event(
             'enrichment.catalog.hit',
             {
                 'job_id': job_id,
@@ -902,7 +1294,7 @@ class EventPublisher:
     @staticmethod
     def enrichment_catalog_miss(job_id: str, mpn: str):
         """Publish catalog miss event (component not in cache)"""
-        event_bus.publish(
+        publish_event(
             'enrichment.catalog.miss',
             {
                 'job_id': job_id,
@@ -921,7 +1313,7 @@ class EventPublisher:
         error_code: Optional[str] = None,
     ):
         """Publish supplier API call event with structured metadata."""
-        event_bus.publish(
+        publish_event(
             f'enrichment.api.{supplier}_called',
             {
                 'job_id': job_id,
@@ -938,7 +1330,7 @@ class EventPublisher:
     @staticmethod
     def admin_workflow_paused(workflow_id: str, job_id: str, admin_user_id: str, reason: str):
         """Publish admin workflow paused event"""
-        event_bus.publish(
+        publish_event(
             'admin.workflow.paused',
             {
                 'workflow_id': workflow_id,
@@ -952,7 +1344,7 @@ class EventPublisher:
     @staticmethod
     def admin_workflow_cancelled(workflow_id: str, job_id: str, admin_user_id: str, reason: str, affected_user_email: str):
         """Publish admin workflow cancelled event"""
-        event_bus.publish(
+        publish_event(
             'admin.workflow.cancelled',
             {
                 'workflow_id': workflow_id,
@@ -967,7 +1359,7 @@ class EventPublisher:
     @staticmethod
     def user_login(user_id: str, email: str, ip_address: str, user_agent: str):
         """Publish user login event"""
-        event_bus.publish(
+        publish_event(
             'auth.user.login',
             {
                 'user_id': user_id,
@@ -980,7 +1372,7 @@ class EventPublisher:
     @staticmethod
     def user_logout(user_id: str, email: str):
         """Publish user logout event"""
-        event_bus.publish(
+        publish_event(
             'auth.user.logout',
             {
                 'user_id': user_id,
@@ -991,7 +1383,7 @@ class EventPublisher:
     @staticmethod
     def user_signup(user_id: str, email: str, organization_id: str, role: str = 'owner', plan: str = 'free', status: str = 'trialing', trial_end: str = None, full_name: str = None):
         """Publish new user signup event (used to trigger onboarding emails and Novu subscriber creation)."""
-        event_bus.publish(
+        publish_event(
             'auth.user.signup',
             {
                 'event_type': 'user_signup',  # Required by Novu consumer
@@ -1011,7 +1403,7 @@ class EventPublisher:
     @staticmethod
     def cns_bulk_upload_started(bulk_upload_id: str, job_id: str, admin_user_id: str, total_items: int):
         """Publish CNS bulk upload started event"""
-        event_bus.publish(
+        publish_event(
             'cns.bulk_upload.started',
             {
                 'bulk_upload_id': bulk_upload_id,
@@ -1024,7 +1416,7 @@ class EventPublisher:
     @staticmethod
     def cns_catalog_component_added(component_id: str, mpn: str, manufacturer: str, quality_score: float):
         """Publish component added to catalog event"""
-        event_bus.publish(
+        publish_event(
             'cns.catalog.component_added',
             {
                 'component_id': component_id,
@@ -1067,7 +1459,7 @@ class EventPublisher:
             total_items: Total items in the BOM (optional)
             metadata: Additional stage-specific data (optional)
         """
-        event_bus.publish(
+        publish_event(
             f'workflow.stage.{stage}.completed',
             {
                 'bom_id': bom_id,
@@ -1101,7 +1493,7 @@ class EventPublisher:
 
         Emitted when a BOM file has been successfully uploaded to storage.
         """
-        event_bus.publish(
+        publish_event(
             'workflow.stage.raw_upload.completed',
             {
                 'bom_id': bom_id,
@@ -1134,7 +1526,7 @@ class EventPublisher:
 
         Emitted when a BOM file has been successfully parsed and validated.
         """
-        event_bus.publish(
+        publish_event(
             'workflow.stage.parsing.completed',
             {
                 'bom_id': bom_id,
@@ -1170,7 +1562,7 @@ class EventPublisher:
         Emitted when all components in a BOM have been enriched (or failed).
         """
         success_rate = (enriched_items / total_items * 100) if total_items > 0 else 0.0
-        event_bus.publish(
+        publish_event(
             'workflow.stage.enrichment.completed',
             {
                 'bom_id': bom_id,
@@ -1208,7 +1600,7 @@ class EventPublisher:
 
         Emitted when risk analysis for all components is complete.
         """
-        event_bus.publish(
+        publish_event(
             'workflow.stage.risk_analysis.completed',
             {
                 'bom_id': bom_id,
@@ -1247,7 +1639,7 @@ class EventPublisher:
         This is the final event in the queue progression.
         """
         success_rate = (enriched_items / total_items * 100) if total_items > 0 else 0.0
-        event_bus.publish(
+        publish_event(
             'workflow.stage.complete.completed',
             {
                 'bom_id': bom_id,
@@ -1280,7 +1672,7 @@ class EventPublisher:
         Actions: submitted, paused, resumed, cancelled, deleted
         These events are consumed by Temporal workers to control workflow execution
         """
-        event_bus.publish(
+        publish_event(
             f'admin.workflow.{action}',
             {
                 'workflow_id': workflow_id,
@@ -1295,7 +1687,7 @@ class EventPublisher:
     @staticmethod
     def admin_bom_deleted(job_id: str, admin_id: str, filename: str = None):
         """Publish admin BOM deletion event"""
-        event_bus.publish(
+        publish_event(
             'admin.bom.deleted',
             {
                 'job_id': job_id,
@@ -1309,7 +1701,7 @@ class EventPublisher:
     @staticmethod
     def admin_bom_updated(job_id: str, admin_id: str, changes: Dict[str, Any]):
         """Publish admin BOM update event"""
-        event_bus.publish(
+        publish_event(
             'admin.bom.updated',
             {
                 'job_id': job_id,
@@ -1323,7 +1715,7 @@ class EventPublisher:
     @staticmethod
     def admin_workflow_submitted(job_id: str, admin_id: str, total_items: int):
         """Publish admin workflow submission event (trigger enrichment)"""
-        event_bus.publish(
+        publish_event(
             'admin.workflow.submitted',
             {
                 'job_id': job_id,
@@ -1337,7 +1729,7 @@ class EventPublisher:
     @staticmethod
     def admin_workflow_paused(workflow_id: str, admin_id: str):
         """Publish admin workflow pause event"""
-        event_bus.publish(
+        publish_event(
             'admin.workflow.paused',
             {
                 'workflow_id': workflow_id,
@@ -1350,7 +1742,7 @@ class EventPublisher:
     @staticmethod
     def admin_workflow_resumed(workflow_id: str, admin_id: str):
         """Publish admin workflow resume event"""
-        event_bus.publish(
+        publish_event(
             'admin.workflow.resumed',
             {
                 'workflow_id': workflow_id,
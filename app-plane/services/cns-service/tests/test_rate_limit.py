@@ -12,9 +12,12 @@ import pytest
 import time
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
+
+from redis.exceptions import ConnectionError as RedisConnectionError
 
 from app.middleware.rate_limit import (
+    RateLimitDecision,
     RateLimitMiddleware,
     setup_rate_limit_middleware,
     validate_admin_token,
@@ -176,23 +179,30 @@ class TestRateLimiting:
 
     @patch('app.middleware.rate_limit.settings')
     @patch('app.middleware.rate_limit._rate_limit_store')
+    @patch('app.middleware.rate_limit.ADMIN_TOKEN_ALLOWED_IPS', [])
     def test_admin_token_rate_limit(self, mock_store, mock_settings, client):
         """Test that admin token requests are rate limited to 10/min."""
         mock_settings.admin_api_token = "test-admin-token"
         mock_settings.admin_token_allowed_ips = None
+        mock_settings.trusted_proxy_count = 0
 
         # Mock store to simulate rate limit
-        mock_store.increment.return_value = 1
+        mock_store.hit = AsyncMock(return_value=RateLimitDecision(True, ADMIN_TOKEN_RATE_LIMIT, 9, 0.0, 6.0))
 
         # First request should succeed
         response = client.get(
             "/api/admin/default-token",
             headers={"Authorization": "Bearer test-admin-token"}
         )
-        assert response.status_code in [200, 404]  # 404 if endpoint not fully configured
+        assert response.status_code == 200
+        assert response.headers["X-RateLimit-Limit"] == str(ADMIN_TOKEN_RATE_LIMIT)
+        assert response.headers["X-RateLimit-Remaining"] == "9"
+        key, limit, window = mock_store.hit.call_args.args
+        assert key == "rate_limit:admin_token:testclient"
+        assert limit == ADMIN_TOKEN_RATE_LIMIT
 
         # Simulate exceeding rate limit
-        mock_store.increment.return_value = ADMIN_TOKEN_RATE_LIMIT + 1
+        mock_store.hit.return_value = RateLimitDecision(False, ADMIN_TOKEN_RATE_LIMIT, 0, 5.2, 60.0)
 
         # Next request should be rate limited
         response = client.get(
@@ -201,21 +211,37 @@ class TestRateLimiting:
         )
         assert response.status_code == 429
         assert "rate limit" in response.json()["detail"].lower()
-        assert "Retry-After" in response.headers
+        assert response.headers["Retry-After"] == "6"
+        assert response.headers["X-RateLimit-Remaining"] == "0"
 
     @patch('app.middleware.rate_limit.settings')
     @patch('app.middleware.rate_limit._rate_limit_store')
     def test_authenticated_rate_limit(self, mock_store, mock_settings, client):
         """Test that authenticated requests are rate limited to 100/min."""
+        mock_settings.admin_api_token = "test-admin-token"
+        mock_settings.trusted_proxy_count = 0
+
         # Mock store
-        mock_store.increment.return_value = AUTHENTICATED_RATE_LIMIT + 1
+        mock_store.hit = AsyncMock(return_value=RateLimitDecision(True, AUTHENTICATED_RATE_LIMIT, 99, 0.0, 0.6))
+
+        response = client.get(
+            "/api/data",
+            headers={"Authorization": "Bearer some-jwt-token"}
+        )
+        assert response.status_code == 200
+        assert response.headers["X-RateLimit-Limit"] == str(AUTHENTICATED_RATE_LIMIT)
+        assert response.headers["X-RateLimit-Remaining"] == "99"
+        assert mock_store.hit.call_args.args[1] == AUTHENTICATED_RATE_LIMIT
 
         # Request with auth should be rate limited after 100 requests
+        mock_store.hit.return_value = RateLimitDecision(False, AUTHENTICATED_RATE_LIMIT, 0, 0.03, 60.0)
         response = client.get(
             "/api/data",
             headers={"Authorization": "Bearer some-jwt-token"}
         )
         assert response.status_code == 429
+        assert response.headers["Retry-After"] == "1"
+        assert response.headers["X-RateLimit-Remaining"] == "0"
 
     @patch('app.middleware.rate_limit.settings')
     def test_health_check_exempt(self, mock_settings, client):
@@ -243,50 +269,89 @@ class TestRateLimiting:
 
 
 class TestRateLimitStore:
-    """Test the Redis-backed rate limit store."""
+    """Test the Redis-backed GCRA rate limit store."""
 
-    def test_increment_memory_fallback(self):
-        """Test that in-memory store works when Redis unavailable."""
+    @staticmethod
+    def _store(client=None, **overrides):
         from app.middleware.rate_limit import RateLimitStore
 
-        store = RateLimitStore()
-        store.use_redis = False  # Force in-memory mode
+        async def factory():
+            if client is None:
+                raise RedisConnectionError("Connection refused")
+            return client
 
-        # First increment
-        count = store.increment("test_key", 60)
-        assert count == 1
+        store = RateLimitStore(client_factory=factory)
+        for name, value in overrides.items():
+            setattr(store, name, value)
+        return store
 
-        # Second increment
-        count = store.increment("test_key", 60)
-        assert count == 2
+    @pytest.mark.asyncio
+    async def test_hit_memory_fallback(self):
+        """Test that in-memory store works when Redis unavailable."""
+        store = self._store(use_redis=False)  # Force in-memory mode
 
-    def test_get_nonexistent_key(self):
-        """Test getting a non-existent key returns 0."""
-        from app.middleware.rate_limit import RateLimitStore
+        first = await store.hit("test_key", 10, 60)
+        second = await store.hit("test_key", 10, 60)
 
-        store = RateLimitStore()
-        store.use_redis = False
+        assert first.allowed and first.remaining == 9
+        assert second.allowed and second.remaining == 8
 
-        count = store.get("nonexistent_key")
-        assert count == 0
+    @pytest.mark.asyncio
+    async def test_no_burst_beyond_limit(self):
+        """Test that a full burst is followed by one request per interval, not a fresh window."""
+        store = self._store(use_redis=False)
 
-    def test_expiration(self):
-        """Test that keys expire after the window."""
-        from app.middleware.rate_limit import RateLimitStore
+        decisions = [await store.hit("test_key", 10, 60) for _ in range(11)]
 
-        store = RateLimitStore()
-        store.use_redis = False
+        assert all(d.allowed for d in decisions[:10])
+        assert not decisions[10].allowed
+        assert decisions[10].retry_after == pytest.approx(6, abs=0.1)  # 60s / 10
+        assert decisions[10].headers()["Retry-After"] == "6"
 
-        # Increment with very short window
-        count = store.increment("test_key", 1)
-        assert count == 1
+    @pytest.mark.asyncio
+    async def test_expiration(self):
+        """Test that quota comes back after the window."""
+        store = self._store(use_redis=False)
+
+        assert (await store.hit("test_key", 1, 1)).allowed
+        assert not (await store.hit("test_key", 1, 1)).allowed
 
         # Wait for expiration
         time.sleep(1.1)
 
-        # Next increment should reset to 1
-        count = store.increment("test_key", 1)
-        assert count == 1
+        assert (await store.hit("test_key", 1, 1)).allowed
+
+    @pytest.mark.asyncio
+    async def test_redis_error_falls_back_then_recovers(self):
+        """Test that a Redis error only disables Redis until the retry interval passes."""
+        store = self._store(retry_seconds=0.05)
+
+        assert (await store.hit("test_key", 10, 60)).allowed  # In-memory
+        assert store._redis_failed
+
+        script = AsyncMock(return_value=[1, 7, 0, 9000])
+        store._client_factory = AsyncMock(return_value=MagicMock(register_script=MagicMock(return_value=script)))
+        await store.hit("test_key", 10, 60)
+        script.assert_not_awaited()  # Still inside the retry interval
+
+        time.sleep(0.06)
+        decision = await store.hit("test_key", 10, 60)
+        script.assert_awaited_once()
+        assert decision.remaining == 7 and decision.reset_after == 9.0
+        assert not store._redis_failed
+
+    @pytest.mark.asyncio
+    async def test_leased_tokens_spent_locally(self):
+        """Test that with leases one script call covers several requests."""
+        script = AsyncMock(return_value=[5, 100, 0, 3000])
+        client = MagicMock(register_script=MagicMock(return_value=script))
+        store = self._store(client, lease_size=5)
+
+        decisions = [await store.hit("test_key", 2000, 60) for _ in range(6)]
+
+        assert script.await_count == 2
+        assert script.await_args_list[0].kwargs["args"] == [30.0, 60000, 5]
+        assert [d.remaining for d in decisions[:5]] == [104, 103, 102, 101, 100]
 
 
 if __name__ == "__main__":
@@ -0,0 +1,159 @@
+"""
+Tests for the buffered aio-pika publisher and the publish_event facade
+"""
+
+import asyncio
+import importlib
+import json
+from contextlib import asynccontextmanager
+
+import pytest
+
+from shared.event_bus import AsyncEventBus, publish_event
+
+# `shared` re-exports the `event_bus` instance under the module's name
+event_bus_module = importlib.import_module("shared.event_bus")
+
+
+class FakeExchange:
+
+    def __init__(self, reject=()):
+        self.published = []
+        self.headers = []
+        self.reject = set(reject)
+
+    async def publish(self, message, routing_key):
+        if message.message_id in self.reject:
+            raise RuntimeError("nack")
+        self.published.append((routing_key, json.loads(message.body)))
+        self.headers.append(message.headers)
+
+
+class FakeChannel:
+
+    def __init__(self, exchange):
+        self.exchange = exchange
+
+    async def get_exchange(self, name, ensure=True):
+        return self.exchange
+
+
+class FakePool:
+
+    def __init__(self, channel):
+        self.channel = channel
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.channel
+
+
+def _bus(exchange, **kwargs):
+    bus = AsyncEventBus(url="amqp://test", **kwargs)
+
+    async def connect():
+        bus._channels = FakePool(FakeChannel(exchange))
+
+    bus._connect = connect
+    return bus
+
+
+async def _drain(bus):
+    for _ in range(50):
+        if not bus.pending():
+            return
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_events_are_published_in_confirmed_batches():
+    exchange = FakeExchange()
+    bus = _bus(exchange, batch_size=10)
+    batches = []
+    publish_batch = bus._publish_batch
+
+    async def record(batch):
+        batches.append(len(batch))
+        return await publish_batch(batch)
+
+    bus._publish_batch = record
+
+    for n in range(25):
+        bus.publish_nowait("customer.bom.edited", {"bom_id": f"bom-{n}"}, priority=5)
+    await _drain(bus)
+
+    assert batches == [10, 10, 5]
+    assert [body["bom_id"] for _, body in exchange.published] == [f"bom-{n}" for n in range(25)]
+    assert exchange.published[0][1]["event_type"] == "customer.bom.edited"
+    assert exchange.headers[0] == {"x-stream-filter-value": "customer.bom"}
+    assert bus.stats["published"] == 25
+    await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_unconfirmed_messages_are_retried():
+    exchange = FakeExchange()
+    bus = _bus(exchange)
+    bus.publish_nowait("customer.bom.deleted", {"bom_id": "bom-1", "event_id": "evt-1"})
+    bus.publish_nowait("customer.bom.deleted", {"bom_id": "bom-2", "event_id": "evt-2"})
+    exchange.reject.add("evt-2")
+    await asyncio.sleep(0.05)
+
+    assert [body["bom_id"] for _, body in exchange.published] == ["bom-1"]
+    assert bus.pending() == 1
+
+    exchange.reject.clear()
+    await asyncio.sleep(0.6)
+    assert [body["bom_id"] for _, body in exchange.published] == ["bom-1", "bom-2"]
+    await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_overflow_spills_to_disk_and_replays(tmp_path):
+    spill = tmp_path / "events.jsonl"
+    exchange = FakeExchange()
+    bus = _bus(exchange, buffer_size=2, spill_path=str(spill))
+    outage = asyncio.Event()
+
+    async def unavailable():
+        await outage.wait()
+        bus._channels = FakePool(FakeChannel(exchange))
+
+    bus._connect = unavailable
+    for n in range(5):
+        bus.publish_nowait("customer.bom.edited", {"bom_id": f"bom-{n}"})
+
+    assert bus.stats["spilled"] == 3
+    assert len(spill.read_text().splitlines()) == 3
+
+    outage.set()
+    await asyncio.sleep(0.1)
+
+    assert sorted(body["bom_id"] for _, body in exchange.published) == [f"bom-{n}" for n in range(5)]
+    assert not spill.exists()
+    await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_facade_does_not_block_async_callers(monkeypatch):
+    bus = _bus(FakeExchange())
+    monkeypatch.setattr(event_bus_module, "get_async_event_bus", lambda: bus)
+
+    def blocking_publish(*args, **kwargs):
+        raise AssertionError("sync publisher used on the event loop")
+
+    monkeypatch.setattr(event_bus_module.event_bus, "publish", blocking_publish)
+
+    publish_event("customer.bom.edited", {"bom_id": "bom-1"})
+
+    assert bus.pending() == 1
+    await bus.close()
+
+
+def test_facade_uses_blocking_publisher_without_loop(monkeypatch):
+    calls = []
+    monkeypatch.setattr(event_bus_module.event_bus, "publish", lambda *a, **kw: calls.append(a[0]))
+
+    publish_event("customer.bom.edited", {"bom_id": "bom-1"})
+
+    assert calls == ["customer.bom.edited"]
@@ -0,0 +1,148 @@
+"""
+Tests for the two-level auth context cache and its use in the auth dependencies
+"""
+
+import asyncio
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.auth import dependencies as deps
+from app.cache import auth_context_cache as acc
+from tests.utils.fake_redis import FakeAsyncRedis
+
+USER_ID = "11111111-1111-1111-1111-111111111111"
+ORG_ID = "22222222-2222-2222-2222-222222222222"
+ORG = {"organization": {"id": ORG_ID, "name": "Acme", "slug": "acme", "plan_type": "pro"}, "role": "admin"}
+
+
+def _cache(redis, **kwargs):
+    async def client():
+        return redis
+    cache = acc.AuthContextCache(client_factory=client, ttl_seconds=60, local_ttl_seconds=5, **kwargs)
+    cache.enabled = True
+    return cache
+
+
+@pytest.mark.asyncio
+async def test_entries_shared_through_redis_and_served_locally():
+    redis = FakeAsyncRedis()
+    pod_a, pod_b = _cache(redis), _cache(redis)
+
+    await pod_a.set_org(USER_ID, ORG_ID, ORG, await pod_a.generation(user_id=USER_ID, org_id=ORG_ID))
+    await pod_a.set_organizations(USER_ID, [{"id": ORG_ID, "role": "admin"}], await pod_a.generation())
+
+    assert await pod_b.get_org(USER_ID, ORG_ID) == ORG
+    assert await pod_b.get_organizations(USER_ID) == [{"id": ORG_ID, "role": "admin"}]
+    assert redis.data[f"auth_ctx:members:{ORG_ID}"] == {USER_ID}
+
+    # Second read comes from the in-process layer
+    redis.data.clear()
+    assert await pod_b.get_org(USER_ID, ORG_ID) == ORG
+
+
+@pytest.mark.asyncio
+async def test_org_invalidation_reaches_every_pod():
+    redis = FakeAsyncRedis()
+    pod_a, pod_b = _cache(redis), _cache(redis)
+    await pod_a.set_user("auth0|u1", {"id": USER_ID, "email": "u@example.com", "default_org_id": ORG_ID}, await pod_a.generation())
+    await pod_a.set_org(USER_ID, ORG_ID, ORG, await pod_a.generation(user_id=USER_ID, org_id=ORG_ID))
+    assert await pod_b.get_org(USER_ID, ORG_ID) == ORG
+
+    listener = asyncio.create_task(acc._listen(pod_b))
+    await asyncio.sleep(0)
+    await pod_a.invalidate(org_ids=[ORG_ID])
+    await asyncio.sleep(0.05)
+    listener.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await listener
+
+    assert not any(key.startswith("auth_ctx:") and ":gen:" not in key for key in redis.data)
+    assert await pod_a.get_user("auth0|u1") is None
+    assert await pod_b.get_org(USER_ID, ORG_ID) is None
+
+
+@pytest.mark.asyncio
+async def test_invalidate_after_commit_waits_for_commit(monkeypatch):
+    redis = FakeAsyncRedis()
+    cache = _cache(redis)
+    monkeypatch.setattr(acc, "_auth_context_cache", cache)
+    await cache.set_org(USER_ID, ORG_ID, ORG, await cache.generation(user_id=USER_ID, org_id=ORG_ID))
+
+    session = Session()
+    acc.invalidate_after_commit(session, user_ids=[USER_ID])
+    session.rollback()
+    assert await cache.get_org(USER_ID, ORG_ID) == ORG
+
+    session.commit()
+    await asyncio.gather(*acc._pending_invalidations)
+    assert await cache.get_org(USER_ID, ORG_ID) is None
+
+
+@pytest.mark.asyncio
+async def test_org_context_queries_database_once(monkeypatch):
+    monkeypatch.setattr(acc, "_auth_context_cache", _cache(FakeAsyncRedis()))
+    row = SimpleNamespace(org_id=ORG_ID, org_name="Acme", org_slug="acme", plan_type="pro", role="engineer")
+    queries = []
+
+    @contextmanager
+    def session():
+        yield SimpleNamespace(execute=lambda *args: queries.append(args) or SimpleNamespace(fetchone=lambda: row))
+
+    monkeypatch.setattr(deps, "get_supabase_session", session)
+    user = deps.User(id=USER_ID, auth0_user_id="auth0|u1", email="u@example.com")
+
+    first = await deps.get_org_context(ORG_ID, user)
+    second = await deps.get_org_context(ORG_ID, user)
+
+    assert len(queries) == 1
+    assert second == first
+    assert second.role == "engineer" and second.can_write
+
+
+@pytest.mark.asyncio
+async def test_lookup_that_raced_an_invalidation_is_not_cached():
+    redis = FakeAsyncRedis()
+    pod_a, pod_b = _cache(redis), _cache(redis)
+
+    # pod_a reads the old membership, then pod_b's transaction commits and invalidates
+    org_generation = await pod_a.generation(user_id=USER_ID, org_id=ORG_ID)
+    list_generation = await pod_a.generation()
+    await pod_b.invalidate(org_ids=[ORG_ID])
+    await pod_a.set_org(USER_ID, ORG_ID, ORG, org_generation)
+    await pod_a.set_organizations(USER_ID, [{"id": ORG_ID, "role": "admin"}], list_generation)
+
+    assert await pod_a.get_org(USER_ID, ORG_ID) is None
+    assert await pod_a.get_organizations(USER_ID) is None
+    assert f"auth_ctx:user:{USER_ID}" not in redis.data
+
+    # Another user's org entry is only guarded by its own counters
+    other = "33333333-3333-3333-3333-333333333333"
+    generation = await pod_a.generation(user_id=other, org_id=other)
+    await pod_b.invalidate(user_ids=[USER_ID])
+    await pod_a.set_org(other, other, ORG, generation)
+    assert await pod_b.get_org(other, other) == ORG
+
+
+@pytest.mark.asyncio
+async def test_platform_admin_is_not_cached(monkeypatch):
+    monkeypatch.setattr(acc, "_auth_context_cache", _cache(FakeAsyncRedis()))
+    org_row = SimpleNamespace(id=ORG_ID, name="Acme", slug="acme", plan_type="pro")
+    queries = []
+
+    @contextmanager
+    def session():
+        # No membership row, then the organization for the super-admin bypass
+        results = iter([None, org_row])
+        yield SimpleNamespace(execute=lambda *args: queries.append(args) or SimpleNamespace(fetchone=lambda: next(results)))
+
+    monkeypatch.setattr(deps, "get_supabase_session", session)
+    admin = deps.User(id=USER_ID, auth0_user_id="auth0|u1", email="u@example.com", is_platform_admin=True)
+
+    first = await deps.get_org_context(ORG_ID, admin)
+    second = await deps.get_org_context(ORG_ID, admin)
+
+    assert first.role == second.role == "super_admin"
+    assert len(queries) == 4
@@ -0,0 +1,153 @@
+"""
+Tests for the verified-token cache and per-kid JWKS key cache in AuthMiddleware
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from starlette.datastructures import Headers, QueryParams
+
+from app.core.authorization import AuthContext
+from app.middleware import auth_middleware as am
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _hs256_token(secret: str, **claims) -> str:
+    header = _b64(json.dumps({"alg": "HS256", "typ": "JWT"}).encode())
+    payload = _b64(json.dumps(claims).encode())
+    signature = hmac.new(secret.encode(), f"{header}.{payload}".encode(), hashlib.sha256).digest()
+    return f"{header}.{payload}.{_b64(signature)}"
+
+
+def _request(token: str, **headers):
+    return SimpleNamespace(
+        headers=Headers({"Authorization": f"Bearer {token}", **headers}),
+        query_params=QueryParams(""),
+        url=SimpleNamespace(path="/api/boms"),
+    )
+
+
+def _jwk(public_key, kid: str) -> dict:
+    numbers = public_key.public_numbers()
+    return {
+        "kid": kid,
+        "kty": "RSA",
+        "n": _b64(numbers.n.to_bytes((numbers.n.bit_length() + 7) // 8, "big")),
+        "e": _b64(numbers.e.to_bytes(3, "big")),
+    }
+
+
+@pytest.fixture(autouse=True)
+def clean_caches():
+    am._verified_tokens.clear()
+    am._jwks_cache.clear()
+    am._rsa_key_cache.clear()
+    am._jwks_refresh_tasks.clear()
+    am._jwks_refetch_attempted_at.clear()
+    yield
+    am._verified_tokens.clear()
+    am._jwks_cache.clear()
+    am._rsa_key_cache.clear()
+    am._jwks_refresh_tasks.clear()
+    am._jwks_refetch_attempted_at.clear()
+
+
+def test_cache_expires_at_token_exp_and_evicts_lru():
+    cache = am.VerifiedTokenCache(max_size=2)
+    now = time.time()
+    ctx = lambda user, exp: AuthContext(user_id=user, organization_id="org", extra={"exp": exp})
+
+    cache.put("expired", ctx("u0", now - 1))
+    cache.put("no-exp", AuthContext(user_id="u", organization_id="org"))
+    assert len(cache) == 0
+
+    cache.put("a", ctx("ua", now + 60))
+    cache.put("b", ctx("ub", now + 60))
+    assert cache.get("a").user_id == "ua"  # a is now most recent
+    cache.put("c", ctx("uc", now + 60))
+
+    assert cache.get("b") is None
+    assert cache.get("a").user_id == "ua"
+    assert cache.get("c").user_id == "uc"
+
+    # Hits are copies; mutating one never changes the cached entry
+    cache.get("a").organization_id = "other"
+    assert cache.get("a").organization_id == "org"
+
+
+@pytest.mark.asyncio
+async def test_repeat_token_skips_verification(monkeypatch):
+    monkeypatch.setattr(am.settings, "jwt_secret_key", "secret")
+    monkeypatch.setattr(am.settings, "admin_api_token", None, raising=False)
+    token = _hs256_token("secret", sub="user-1", email="u@example.com",
+                         organization_id="org-1", exp=int(time.time()) + 300)
+    middleware = am.AuthMiddleware(app=None)
+
+    first = await middleware._authenticate_request(_request(token))
+    assert first.user_id == "user-1"
+    assert first.organization_id == "org-1"
+
+    verify = AsyncMock(side_effect=AssertionError("token verified twice"))
+    monkeypatch.setattr(am, "validate_supabase_token", verify)
+    second = await middleware._authenticate_request(_request(token))
+
+    assert second.user_id == "user-1"
+    verify.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_signing_keys_built_once_and_refreshed_ahead(monkeypatch):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwks = {"keys": [_jwk(private_key.public_key(), "kid-1")]}
+    domain = "auth.example.com"
+    monkeypatch.setattr(am.settings, "jwks_refresh_ahead_seconds", 300)
+
+    async def fetch(d, force=False):
+        fetched = dict(jwks, fetched_at=time.time())
+        am._jwks_cache[d] = fetched
+        am._rsa_key_cache[d] = am._build_rsa_keys(fetched)
+        return fetched
+
+    fetch_mock = AsyncMock(side_effect=fetch)
+    monkeypatch.setattr(am, "_fetch_jwks", fetch_mock)
+
+    key = await am._get_signing_key(domain, "kid-1")
+    assert key.public_numbers() == private_key.public_key().public_numbers()
+    assert await am._get_signing_key(domain, "kid-1") is key
+    assert fetch_mock.await_count == 1
+
+    # Close to the JWKS TTL: current key still served, refresh runs in background
+    am._jwks_cache[domain]["fetched_at"] = time.time() - am._JWKS_CACHE_TTL_SECONDS + 60
+    assert await am._get_signing_key(domain, "kid-1") is key
+    await am._jwks_refresh_tasks[domain]
+    assert fetch_mock.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_unknown_kid_refetches_at_most_once_per_interval(monkeypatch):
+    domain = "auth.example.com"
+    am._jwks_cache[domain] = {"keys": [], "fetched_at": time.time()}
+    am._rsa_key_cache[domain] = {}
+    fetch_mock = AsyncMock(return_value=None)
+    monkeypatch.setattr(am, "_fetch_jwks", fetch_mock)
+
+    assert await am._get_signing_key(domain, "rotated") is None
+    fetch_mock.assert_not_awaited()  # fetched moments ago
+
+    am._jwks_cache[domain]["fetched_at"] = time.time() - am._JWKS_MIN_REFETCH_SECONDS - 1
+    assert await am._get_signing_key(domain, "rotated") is None
+    fetch_mock.assert_awaited_once_with(domain, force=True)
+
+    # The refetch failed, so fetched_at is unchanged; the attempt still throttles
+    assert await am._get_signing_key(domain, "rotated") is None
+    fetch_mock.assert_awaited_once()
@@ -0,0 +1,62 @@
+"""
+Tests for BOM revision diffing (incremental re-enrichment)
+"""
+
+from app.services.bom_diff import diff_line_items
+
+
+def _line(line_id, mpn, qty, line_number, manufacturer="ACME"):
+    return {
+        "id": line_id,
+        "line_number": line_number,
+        "manufacturer_part_number": mpn,
+        "manufacturer": manufacturer,
+        "quantity": qty,
+    }
+
+
+class TestDiffLineItems:
+
+    def test_classifies_added_changed_unchanged_removed(self):
+        previous = [
+            _line("old-1", "LM358N", 10, 1),
+            _line("old-2", "NE555P", 2, 2),
+            _line("old-3", "BC547", 5, 3),
+        ]
+        current = [
+            _line("new-1", "lm358n ", "10.0", 1),  # formatting only
+            _line("new-2", "NE555P", 4, 2),        # quantity changed
+            _line("new-3", "ATMEGA328P", 1, 3),    # new part
+        ]
+
+        diff = diff_line_items(previous, current)
+
+        assert diff.unchanged == [("new-1", "old-1")]
+        assert diff.changed == [("new-2", "old-2")]
+        assert [item["id"] for item in diff.added] == ["new-3"]
+        assert [item["id"] for item in diff.removed] == ["old-3"]
+        assert diff.summary() == {"added": 1, "changed": 1, "unchanged": 1, "removed": 1}
+
+    def test_duplicate_keys_pair_in_line_order(self):
+        previous = [_line("old-b", "LM358N", 3, 2), _line("old-a", "LM358N", 1, 1)]
+        current = [
+            _line("new-a", "LM358N", 1, 1),
+            _line("new-b", "LM358N", 3, 2),
+            _line("new-c", "LM358N", 3, 3),
+        ]
+
+        diff = diff_line_items(previous, current)
+
+        assert diff.unchanged == [("new-a", "old-a"), ("new-b", "old-b")]
+        assert [item["id"] for item in diff.added] == ["new-c"]
+        assert diff.removed == []
+
+    def test_manufacturer_is_part_of_the_key(self):
+        diff = diff_line_items(
+            [_line("old-1", "LM358N", 1, 1, manufacturer="TI")],
+            [_line("new-1", "LM358N", 1, 1, manufacturer="ON Semi")],
+        )
+
+        assert diff.unchanged == []
+        assert len(diff.added) == 1
+        assert len(diff.removed) == 1
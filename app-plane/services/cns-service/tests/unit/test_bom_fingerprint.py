@@ -0,0 +1,43 @@
+"""
+Tests for BOM upload fingerprinting (file hash + normalized content hash)
+"""
+
+from app.services.bom_fingerprint import (
+    compute_content_hash,
+    compute_file_hash,
+    normalize_line_key,
+)
+
+
+def _items():
+    return [
+        {"manufacturer_part_number": "STM32F407VGT6", "manufacturer": "STMicroelectronics", "quantity": 2, "reference_designator": "U1"},
+        {"manufacturer_part_number": "LM358N", "manufacturer": "TI", "quantity": 10, "reference_designator": "U2"},
+    ]
+
+
+class TestContentHash:
+
+    def test_row_order_does_not_matter(self):
+        items = _items()
+        assert compute_content_hash(items) == compute_content_hash(list(reversed(items)))
+
+    def test_formatting_differences_are_normalized(self):
+        items = _items()
+        reformatted = [dict(item) for item in items]
+        reformatted[0]["manufacturer_part_number"] = "  stm32f407vgt6 "
+        reformatted[1]["quantity"] = "10.0"
+        assert compute_content_hash(items) == compute_content_hash(reformatted)
+
+    def test_quantity_change_changes_hash(self):
+        items = _items()
+        changed = [dict(item) for item in items]
+        changed[1]["quantity"] = 11
+        assert compute_content_hash(items) != compute_content_hash(changed)
+
+    def test_line_key_ignores_case_and_missing_manufacturer(self):
+        assert normalize_line_key({"manufacturer_part_number": "lm358n"}) == "LM358N|"
+        assert normalize_line_key({"manufacturer_part_number": "LM358N", "manufacturer": float("nan")}) == "LM358N|"
+
+    def test_file_hash_is_sha256(self):
+        assert compute_file_hash(b"") == "e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855"
@@ -0,0 +1,163 @@
+"""
+Tests for BulkUploadRedisStorage line item layout and the upload registry
+"""
+
+import json
+
+import pytest
+
+from app.utils import bulk_upload_redis
+from app.utils.bulk_upload_redis import (
+    REGISTRY_EXPIRES_KEY,
+    BulkUploadRedisStorage,
+    cleanup_expired_bulk_uploads,
+    list_active_bulk_uploads,
+)
+from tests.utils.fake_redis import FakeCache
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    cache = FakeCache()
+    monkeypatch.setattr(bulk_upload_redis, "get_cache", lambda: cache)
+    return cache.client
+
+
+def _items(n):
+    return [{"id": f"item-{i}", "mpn": f"PART-{i}", "enrichment_status": "pending"} for i in range(n)]
+
+
+class TestLineItems:
+
+    def test_range_reads_keep_upload_order(self, redis):
+        storage = BulkUploadRedisStorage("upload-1")
+        assert storage.add_line_items_bulk(_items(5))
+
+        assert [i["id"] for i in storage.get_line_items()] == [f"item-{i}" for i in range(5)]
+        assert [i["id"] for i in storage.get_line_items(1, 2)] == ["item-1", "item-2"]
+        assert storage.get_line_items_count() == 5
+
+    def test_update_touches_only_one_item(self, redis):
+        storage = BulkUploadRedisStorage("upload-1")
+        storage.add_line_items_bulk(_items(3))
+        redis.commands.clear()
+
+        assert storage.update_line_item("item-1", {"enrichment_status": "completed"})
+
+        assert redis.commands == ["hmget", "evalsha"]
+        assert [i["enrichment_status"] for i in storage.get_line_items()] == ["pending", "completed", "pending"]
+
+    def test_update_unknown_item_fails(self, redis):
+        storage = BulkUploadRedisStorage("upload-1")
+        storage.add_line_items_bulk(_items(1))
+
+        assert storage.update_line_item("missing", {"enrichment_status": "completed"}) is False
+
+    def test_bulk_update(self, redis):
+        storage = BulkUploadRedisStorage("upload-1")
+        storage.add_line_items_bulk(_items(4))
+
+        updated = storage.update_line_items_bulk({
+            "item-0": {"enrichment_status": "completed"},
+            "item-3": {"enrichment_status": "error", "enrichment_error": "timeout"},
+            "missing": {"enrichment_status": "completed"},
+        })
+
+        assert updated == 2
+        items = storage.get_line_items()
+        assert [i["enrichment_status"] for i in items] == ["completed", "pending", "pending", "error"]
+        assert items[3]["enrichment_error"] == "timeout"
+
+    def test_concurrent_update_is_not_lost(self, redis, monkeypatch):
+        storage = BulkUploadRedisStorage("upload-1")
+        storage.add_line_items_bulk(_items(2))
+        other_worker = BulkUploadRedisStorage("upload-1")
+        hmget = redis.hmget
+
+        def hmget_then_other_write(key, fields):
+            values = hmget(key, fields)
+            # Another worker updates the same item between our read and write
+            monkeypatch.setattr(redis, "hmget", hmget)
+            other_worker.update_line_item("item-0", {"component_id": "c-1"})
+            return values
+
+        monkeypatch.setattr(redis, "hmget", hmget_then_other_write)
+
+        assert storage.update_line_item("item-0", {"enrichment_status": "completed"})
+        item = storage.get_line_items()[0]
+        assert (item["enrichment_status"], item["component_id"]) == ("completed", "c-1")
+
+    def test_updates_of_different_items_do_not_conflict(self, redis, monkeypatch):
+        storage = BulkUploadRedisStorage("upload-1")
+        storage.add_line_items_bulk(_items(2))
+        other_worker = BulkUploadRedisStorage("upload-1")
+        hmget = redis.hmget
+
+        def hmget_then_other_write(key, fields):
+            values = hmget(key, fields)
+            monkeypatch.setattr(redis, "hmget", hmget)
+            other_worker.update_line_item("item-1", {"component_id": "c-1"})
+            return values
+
+        monkeypatch.setattr(redis, "hmget", hmget_then_other_write)
+        redis.commands.clear()
+
+        assert storage.update_line_item("item-0", {"enrichment_status": "completed"})
+        # One read and one write per worker; ours was not re-read
+        assert redis.commands == ["hmget", "hmget", "evalsha", "evalsha"]
+        items = storage.get_line_items()
+        assert (items[0]["enrichment_status"], items[1]["component_id"]) == ("completed", "c-1")
+
+    def test_items_without_id_get_one(self, redis):
+        storage = BulkUploadRedisStorage("upload-1")
+        storage.add_line_item({"mpn": "LM358N"})
+
+        [item] = storage.get_line_items()
+        assert item["id"]
+        assert storage.update_line_item(item["id"], {"enrichment_status": "completed"})
+
+    def test_legacy_list_is_converted(self, redis):
+        legacy_key = "bulk_upload:upload-1:line_items"
+        redis.rpush(legacy_key, *(json.dumps(item) for item in _items(3)))
+        redis.expire(legacy_key, 3600)
+        storage = BulkUploadRedisStorage("upload-1")
+
+        assert storage.update_line_item("item-2", {"enrichment_status": "completed"})
+
+        assert legacy_key not in redis.data
+        assert [i["id"] for i in storage.get_line_items()] == ["item-0", "item-1", "item-2"]
+        assert storage.get_line_items()[2]["enrichment_status"] == "completed"
+
+
+class TestRegistry:
+
+    def test_list_uses_registry_not_scan(self, redis):
+        for upload_id in ("upload-1", "upload-2"):
+            BulkUploadRedisStorage(upload_id).save_metadata({"filename": f"{upload_id}.csv"})
+        redis.set("bulk_upload_registry:backfilled", "1")
+        redis.commands.clear()
+
+        assert sorted(list_active_bulk_uploads()) == ["upload-1", "upload-2"]
+        assert "scan_iter" not in redis.commands
+
+    def test_cleanup_removes_expired_uploads_only(self, redis):
+        expired = BulkUploadRedisStorage("expired")
+        expired.save_metadata({"filename": "old.csv"})
+        expired.set_status("completed")
+        BulkUploadRedisStorage("active").save_metadata({"filename": "new.csv"})
+
+        # Metadata expired, status key lingers
+        redis.delete("bulk_upload:expired:metadata")
+        redis.zadd(REGISTRY_EXPIRES_KEY, {"expired": 0})
+
+        assert cleanup_expired_bulk_uploads() == 1
+        assert "bulk_upload:expired:status" not in redis.data
+        assert list_active_bulk_uploads() == ["active"]
+
+    def test_existing_uploads_are_backfilled_once(self, redis):
+        redis.setex("bulk_upload:legacy:metadata", 3600, json.dumps({"filename": "legacy.csv"}))
+
+        assert list_active_bulk_uploads() == ["legacy"]
+        redis.commands.clear()
+        list_active_bulk_uploads()
+        assert "scan_iter" not in redis.commands
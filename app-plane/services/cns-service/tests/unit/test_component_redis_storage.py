@@ -0,0 +1,136 @@
+"""
+Tests for the low-quality component indexes (re-enrichment and review queue)
+"""
+
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.cache import component_redis_storage
+from app.cache.component_redis_storage import (
+    LOW_QUALITY_BACKFILLED_KEY,
+    build_component_redis_key,
+    delete_low_quality_component,
+    get_low_quality_components_for_reenrichment,
+    get_quality_queue_stats,
+    query_quality_queue,
+    save_low_quality_component,
+    update_low_quality_component,
+)
+from tests.utils.fake_redis import FakeCache
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = FakeCache()
+    monkeypatch.setattr(component_redis_storage, "get_cache", lambda: cache)
+    return cache
+
+
+def _age(cache, mpn, manufacturer, days):
+    """Pretend a component was stored `days` ago."""
+    key = build_component_redis_key(mpn, manufacturer)
+    record = cache.get(key)
+    record["stored_at"] = (datetime.utcnow() - timedelta(days=days)).isoformat()
+    cache.set(key, record)
+    cache.client.zadd(component_redis_storage.LOW_QUALITY_INDEX_KEY, {key: time.time() - days * 86400})
+
+
+class TestLowQualityIndex:
+
+    def test_reenrichment_reads_index_without_scan(self, cache):
+        cache.client.set(LOW_QUALITY_BACKFILLED_KEY, "1")
+        save_low_quality_component("LM358N", "TI", {"quality_score": 40})
+        save_low_quality_component("NE555P", "TI", {"quality_score": 55})
+        _age(cache, "LM358N", "TI", days=3)
+        _age(cache, "NE555P", "TI", days=0)
+        cache.client.commands.clear()
+
+        records = get_low_quality_components_for_reenrichment(max_age_days=1)
+
+        assert [r["mpn"] for r in records] == ["LM358N"]
+        assert "scan_iter" not in cache.client.commands
+
+    def test_delete_and_expiry_drop_index_entries(self, cache):
+        cache.client.set(LOW_QUALITY_BACKFILLED_KEY, "1")
+        save_low_quality_component("LM358N", "TI", {"quality_score": 40})
+        save_low_quality_component("NE555P", "TI", {"quality_score": 55})
+        _age(cache, "LM358N", "TI", days=3)
+        _age(cache, "NE555P", "TI", days=3)
+
+        delete_low_quality_component("LM358N", "TI")
+        cache.client.delete(build_component_redis_key("NE555P", "TI"))  # TTL expired
+
+        assert get_low_quality_components_for_reenrichment(max_age_days=1) == []
+        assert cache.client.zcard(component_redis_storage.LOW_QUALITY_INDEX_KEY) == 0
+
+
+class TestQualityQueueIndex:
+
+    @pytest.fixture(autouse=True)
+    def _components(self, cache):
+        cache.client.set(LOW_QUALITY_BACKFILLED_KEY, "1")
+        save_low_quality_component("LM358N", "TI", {"quality_score": 40, "api_source": "mouser", "job_id": "job-1"})
+        save_low_quality_component("NE555P", "TI", {"quality_score": 75, "api_source": "digikey", "job_id": "job-1"})
+        save_low_quality_component("BC547", "ON", {"quality_score": 85, "api_source": "mouser", "job_id": "job-2"})
+
+    def test_pages_in_quality_order(self, cache):
+        cache.client.commands.clear()
+
+        first = query_quality_queue(0, 100, offset=0, limit=2)
+        second = query_quality_queue(0, 100, offset=2, limit=2)
+
+        assert first["total"] == 3
+        assert [r["mpn"] for _, r in first["items"]] == ["LM358N", "NE555P"]
+        assert [r["mpn"] for _, r in second["items"]] == ["BC547"]
+        assert "scan_iter" not in cache.client.commands
+
+    def test_filters_by_source_and_job(self, cache):
+        by_source = query_quality_queue(0, 100, source="mouser")
+        by_job = query_quality_queue(70, 94.9, job_id="job-1")
+
+        assert [r["mpn"] for _, r in by_source["items"]] == ["LM358N", "BC547"]
+        assert [r["mpn"] for _, r in by_job["items"]] == ["NE555P"]
+
+    def test_stats_follow_updates_and_deletes(self, cache):
+        assert get_quality_queue_stats() == {
+            "total": 3,
+            "staging_count": 2,
+            "rejected_count": 1,
+            "average_quality": 66.7,
+            "by_source": {"digikey": 1, "mouser": 2},
+        }
+
+        update_low_quality_component("LM358N", "TI", {"quality_score": 72, "api_source": "digikey"})
+        delete_low_quality_component("BC547", "ON")
+
+        assert get_quality_queue_stats() == {
+            "total": 2,
+            "staging_count": 2,
+            "rejected_count": 0,
+            "average_quality": 73.5,
+            "by_source": {"digikey": 2},
+        }
+        assert query_quality_queue(0, 100, job_id="job-1")["total"] == 1
+
+    def test_rewrite_reindexes_in_one_script_call(self, cache):
+        cache.client.commands.clear()
+
+        update_low_quality_component("LM358N", "TI", {"quality_score": 60, "api_source": "mouser"})
+
+        assert cache.client.commands.count("evalsha") == 1
+        assert get_quality_queue_stats()["average_quality"] == round((60 + 75 + 85) / 3, 1)
+
+    def test_stats_drop_expired_components(self, cache, monkeypatch):
+        cache.client.delete(build_component_redis_key("BC547", "ON"))  # TTL expired
+        now = time.time()
+        monkeypatch.setattr(component_redis_storage.time, "time", lambda: now + 8 * 86400)
+
+        assert get_quality_queue_stats() == {
+            "total": 2,
+            "staging_count": 1,
+            "rejected_count": 1,
+            "average_quality": 57.5,
+            "by_source": {"digikey": 1, "mouser": 1},
+        }
@@ -0,0 +1,104 @@
+"""
+Tests for the enrichment SSE fan-out hub and Last-Event-ID replay
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from app.api.enrichment_stream import enrichment_event_stream
+from app.api import enrichment_stream
+from app.services.enrichment_event_hub import (
+    EnrichmentEventHub,
+    Subscriber,
+    append_enrichment_event,
+)
+from tests.utils.fake_redis import FakeAsyncRedis
+
+
+def _event(bom_id, n, event_type="enrichment.progress"):
+    return {"event_id": f"evt-{n}", "event_type": event_type, "bom_id": bom_id, "state": {"enriched_items": n}}
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    client = FakeAsyncRedis()
+    monkeypatch.setattr(enrichment_stream, "_hub", EnrichmentEventHub(lambda: _resolve(client), queue_size=4))
+    return client
+
+
+async def _resolve(client):
+    return client
+
+
+async def _next_data(stream):
+    frame = await asyncio.wait_for(stream.__anext__(), timeout=2)
+    data = [line for line in frame.splitlines() if line.startswith("data: ")][0]
+    return frame, json.loads(data[len("data: "):])
+
+
+@pytest.mark.asyncio
+async def test_one_subscription_serves_many_clients(redis):
+    streams = [enrichment_event_stream("bom-1") for _ in range(3)]
+    for stream in streams:
+        await stream.__anext__()  # connected
+
+    await append_enrichment_event(redis, "bom-1", _event("bom-1", 1))
+
+    for stream in streams:
+        frame, data = await _next_data(stream)
+        assert "id: 1700000000000-0" in frame
+        assert data["state"]["enriched_items"] == 1
+    assert redis.pattern_subscriptions == 1
+
+    for stream in streams:
+        await stream.aclose()
+    assert enrichment_stream._hub.stats()["subscribers"] == 0
+    assert redis.pubsubs == []
+
+
+@pytest.mark.asyncio
+async def test_reconnect_replays_missed_events(redis):
+    for n in range(3):
+        await append_enrichment_event(redis, "bom-1", _event("bom-1", n))
+
+    stream = enrichment_event_stream("bom-1", last_event_id="1700000000000-0")
+    await stream.__anext__()  # connected
+
+    replayed = [(await _next_data(stream))[1]["state"]["enriched_items"] for _ in range(2)]
+    assert replayed == [1, 2]
+
+    await append_enrichment_event(redis, "bom-1", _event("bom-1", 3, "enrichment.completed"))
+    _, data = await _next_data(stream)
+    assert data["event_type"] == "enrichment.completed"
+    frame, _ = await _next_data(stream)
+    assert "event: stream_end" in frame
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_events_for_other_boms_are_not_delivered(redis):
+    stream = enrichment_event_stream("bom-1")
+    await stream.__anext__()
+
+    await append_enrichment_event(redis, "bom-2", _event("bom-2", 1))
+    await append_enrichment_event(redis, "bom-1", _event("bom-1", 2))
+
+    _, data = await _next_data(stream)
+    assert data["bom_id"] == "bom-1"
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_keeps_newest_events():
+    subscriber = Subscriber(bom_id="bom-1", queue=asyncio.Queue(maxsize=2))
+
+    for n in range(5):
+        subscriber.offer(dict(_event("bom-1", n), stream_id=f"1-{n}"))
+    subscriber.offer(dict(_event("bom-1", 3), stream_id="1-3"))  # already seen
+
+    queued = [subscriber.queue.get_nowait()["state"]["enriched_items"] for _ in range(2)]
+    assert queued == [3, 4]
+    assert subscriber.dropped == 3
+    assert subscriber.queue.empty()
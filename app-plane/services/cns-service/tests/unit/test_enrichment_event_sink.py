@@ -0,0 +1,99 @@
+"""
+Tests for the coalescing component event sink
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.services.enrichment_event_sink import EnrichmentEventSink, build_delta, build_insert
+
+
+def _event(n, bom_id="bom-1", status="completed"):
+    return {
+        "event_id": f"evt-{n}",
+        "event_type": f"enrichment.component.{status}",
+        "routing_key": f"customer.enrichment.component.{status}",
+        "bom_id": bom_id,
+        "organization_id": "org-1",
+        "source": "customer",
+        "state": {},
+        "payload": {"component": {"line_item_id": f"line-{n}", "mpn": f"PART-{n}"}, "error": None},
+        "created_at": "2025-01-01T00:00:00",
+    }
+
+
+@pytest.fixture
+def sink(monkeypatch):
+    sink = EnrichmentEventSink(flush_interval_ms=10, max_buffer=100)
+    sink.statements = []
+    sink.deltas = []
+
+    def write_rows(rows):
+        sink.statements.append(len(rows))
+        return len(rows)
+
+    async def publish_deltas(rows):
+        by_bom = {}
+        for row in rows:
+            by_bom.setdefault(row["bom_id"], []).append(row)
+        sink.deltas.extend(build_delta(bom_id, bom_rows) for bom_id, bom_rows in by_bom.items())
+
+    monkeypatch.setattr(sink, "_write_rows", write_rows)
+    monkeypatch.setattr(sink, "_publish_deltas", publish_deltas)
+    return sink
+
+
+def test_build_insert_is_one_multi_row_statement():
+    query, params = build_insert([_event(1), _event(2), _event(3)])
+
+    assert str(query).count("INSERT INTO enrichment_events") == 1
+    assert ":event_id_2" in str(query)
+    assert params["tenant_id_0"] == "org-1"
+    assert params["event_id_1"] == "evt-2"
+
+
+@pytest.mark.asyncio
+async def test_interval_flush_coalesces_events(sink):
+    for n in range(20):
+        sink.add(_event(n, bom_id="bom-1" if n % 2 else "bom-2", status="failed" if n == 3 else "completed"))
+
+    await asyncio.sleep(0.05)
+
+    assert sink.statements == [20]
+    assert sink.pending() == 0
+    assert sorted(d["bom_id"] for d in sink.deltas) == ["bom-1", "bom-2"]
+    bom_1 = next(d for d in sink.deltas if d["bom_id"] == "bom-1")
+    assert bom_1["event_type"] == "enrichment.components"
+    assert bom_1["state"] == {"completed": 9, "failed": 1}
+    assert len(bom_1["payload"]["components"]) == 10
+
+
+@pytest.mark.asyncio
+async def test_rejected_batch_falls_back_to_single_rows(sink, monkeypatch):
+    written = []
+
+    def write_rows(rows):
+        if len(rows) > 1 or rows[0]["event_id"] == "evt-1":
+            raise IntegrityError("INSERT", {}, Exception("duplicate event_id"))
+        written.append(rows[0]["event_id"])
+        return 1
+
+    monkeypatch.setattr(sink, "_write_rows", write_rows)
+    for n in range(3):
+        sink.add(_event(n))
+
+    assert await sink.flush() == 2
+    assert written == ["evt-0", "evt-2"]
+
+
+@pytest.mark.asyncio
+async def test_full_buffer_drops_oldest(sink):
+    sink.max_buffer = 2
+    for n in range(3):
+        sink.add(_event(n))
+
+    assert sink.dropped == 1
+    await sink.flush()
+    assert sink.statements == [2]
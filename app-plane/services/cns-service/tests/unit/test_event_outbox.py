@@ -0,0 +1,171 @@
+"""
+Tests for the transactional event outbox and its relay
+"""
+
+import importlib
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.event_outbox import claim_events, transactional_events
+from app.workers import outbox_relay
+from app.workers.outbox_relay import OutboxRelay
+from shared.event_bus import EventPublisher
+
+event_bus_module = importlib.import_module("shared.event_bus")
+
+
+class FakeSession:
+
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.executed = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def execute(self, statement, params=None):
+        self.executed.append((str(statement), params))
+        return SimpleNamespace(fetchall=lambda: self.rows, rowcount=0)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def _outbox_row(n):
+    return SimpleNamespace(
+        id=n,
+        event_id=f"evt-{n}",
+        routing_key="customer.bom.deleted",
+        payload=json.dumps({"event_id": f"evt-{n}", "bom_id": f"bom-{n}"}),
+        priority=5,
+    )
+
+
+def test_events_in_transaction_are_written_to_outbox(monkeypatch):
+    def broker_publish(*args, **kwargs):
+        raise AssertionError("event published before commit")
+
+    monkeypatch.setattr(event_bus_module.event_bus, "publish", broker_publish)
+    db = FakeSession()
+
+    with transactional_events(db):
+        EventPublisher.customer_bom_deleted(bom_id="bom-1", organization_id="org-1", user_id="user-1")
+
+    [(statement, params)] = db.executed
+    assert "INSERT INTO event_outbox" in statement
+    assert params["routing_key"] == "customer.bom.deleted"
+    payload = json.loads(params["payload"])
+    assert payload["bom_id"] == "bom-1"
+    assert payload["event_id"] == params["event_id"]
+    assert db.commits == 0  # the caller's commit covers the event
+
+
+def test_failed_outbox_insert_rolls_back_instead_of_committing(monkeypatch):
+    from sqlalchemy.exc import OperationalError
+
+    from app.api import events
+
+    class BrokenOutbox(FakeSession):
+        def execute(self, statement, params=None):
+            raise OperationalError(str(statement), params, Exception("relation event_outbox does not exist"))
+
+    db = BrokenOutbox()
+
+    class DualDB:
+        def get_session(self, name):
+            yield db
+
+    monkeypatch.setattr("app.models.dual_database.get_dual_database", lambda: DualDB())
+    request = events.PublishEventRequest(
+        routing_key="customer.bom.edited",
+        event_type="bom_edited",
+        data={"bom_id": "bom-1", "organization_id": "org-1", "user_id": "user-1"},
+    )
+
+    with pytest.raises(OperationalError):
+        events._dispatch_via_outbox(request)
+    assert (db.commits, db.rollbacks) == (0, 1)
+
+
+def test_claim_skips_rows_locked_by_other_relays():
+    db = FakeSession(rows=[_outbox_row(1), _outbox_row(2)])
+
+    messages = claim_events(db, limit=50)
+
+    statement, params = db.executed[0]
+    assert "FOR UPDATE SKIP LOCKED" in statement
+    assert params == {"limit": 50}
+    assert [m["message_id"] for m in messages] == ["evt-1", "evt-2"]
+    assert json.loads(messages[0]["body"])["bom_id"] == "bom-1"
+
+
+class FakeBus:
+
+    def __init__(self, reject=()):
+        self.reject = set(reject)
+        self.batches = []
+
+    async def publish_messages(self, messages):
+        self.batches.append([m["id"] for m in messages])
+        return [m for m in messages if m["id"] in self.reject]
+
+
+@pytest.fixture
+def relay_db(monkeypatch):
+    db = FakeSession(rows=[_outbox_row(n) for n in (1, 2, 3)])
+    closed = []
+    monkeypatch.setattr(outbox_relay, "_open_session", lambda: ("gen", db))
+    monkeypatch.setattr(outbox_relay, "_close_session", closed.append)
+    db.closed = closed
+    return db
+
+
+def _updates(db, table_statement):
+    return [params for statement, params in db.executed if table_statement in statement]
+
+
+@pytest.mark.asyncio
+async def test_relay_marks_confirmed_rows_and_retries_the_rest(relay_db):
+    bus = FakeBus(reject={2})
+    relay = OutboxRelay(bus=bus, batch_size=10)
+
+    claimed = await relay.relay_once()
+
+    assert claimed == 3
+    assert bus.batches == [[1, 2, 3]]
+    assert _updates(relay_db, "SET published_at = NOW()") == [{"ids": [1, 3]}]
+    [failed] = _updates(relay_db, "last_error = :error")
+    assert failed["ids"] == [2]
+    assert relay_db.commits == 1
+    assert relay_db.closed == ["gen"]
+    assert relay.get_stats()["published"] == 2
+
+
+@pytest.mark.asyncio
+async def test_relay_backs_off_whole_batch_when_broker_is_down(relay_db):
+    class DownBus:
+        async def publish_messages(self, messages):
+            raise ConnectionError("broker unreachable")
+
+    relay = OutboxRelay(bus=DownBus(), batch_size=10)
+
+    await relay.relay_once()
+
+    assert _updates(relay_db, "SET published_at = NOW()") == []
+    [failed] = _updates(relay_db, "last_error = :error")
+    assert failed == {"ids": [1, 2, 3], "error": "broker unreachable"}
+    assert relay_db.commits == 1
+
+
+@pytest.mark.asyncio
+async def test_idle_relay_releases_its_transaction(monkeypatch):
+    db = FakeSession(rows=[])
+    monkeypatch.setattr(outbox_relay, "_open_session", lambda: ("gen", db))
+    monkeypatch.setattr(outbox_relay, "_close_session", lambda gen: None)
+
+    assert await OutboxRelay(bus=FakeBus()).relay_once() == 0
+    assert db.rollbacks == 1
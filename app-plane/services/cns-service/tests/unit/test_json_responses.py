@@ -0,0 +1,154 @@
+"""
+Tests for the orjson-backed default response class and streamed JSON responses
+"""
+
+import asyncio
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import UUID
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from app.cache.redis_cache import DecimalEncoder
+from app.core import responses
+from app.core.responses import FastJSONResponse, NDJSONResponse, StreamingJSONResponse, wants_ndjson
+
+ROW = {
+    "id": UUID("3f2b8c1e-0000-4000-8000-00000000abcd"),
+    "unit_price": Decimal("0.0125"),
+    "enriched_at": datetime(2025, 11, 25, 8, 30, 15, 120000, tzinfo=timezone.utc),
+    "description": "Résistance 10kΩ",
+    "quantity": 4,
+}
+
+
+class Item(BaseModel):
+    line_number: int
+    mpn: str
+
+
+def test_fast_json_matches_decimal_encoder():
+    body = FastJSONResponse(ROW).body
+
+    assert json.loads(body) == json.loads(json.dumps(ROW, cls=DecimalEncoder))
+    assert "Résistance 10kΩ".encode() in body
+    assert b'"quantity":4' in body
+
+
+def test_stdlib_fallback_without_orjson(monkeypatch):
+    monkeypatch.setattr(responses, "orjson", None)
+
+    assert json.loads(responses.dumps({**ROW, "item": Item(line_number=1, mpn="LM358N")})) == {
+        **json.loads(json.dumps(ROW, cls=DecimalEncoder)),
+        "item": {"line_number": 1, "mpn": "LM358N"},
+    }
+
+
+def test_default_response_class_for_endpoints():
+    app = FastAPI(default_response_class=FastJSONResponse)
+
+    @app.get("/row")
+    def row():
+        return {"price": Decimal("1.50"), "items": [Item(line_number=1, mpn="LM358N")]}
+
+    response = TestClient(app).get("/row")
+
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == {"price": 1.5, "items": [{"line_number": 1, "mpn": "LM358N"}]}
+
+
+def test_streamed_array_and_ndjson():
+    app = FastAPI()
+
+    @app.get("/items")
+    def items(request: Request):
+        rows = (Item(line_number=i, mpn=f"MPN-{i}") for i in range(3))
+        if wants_ndjson(request):
+            return NDJSONResponse(rows)
+        return StreamingJSONResponse(rows)
+
+    client = TestClient(app)
+
+    array = client.get("/items")
+    assert array.headers["content-type"] == "application/json"
+    assert [item["mpn"] for item in array.json()] == ["MPN-0", "MPN-1", "MPN-2"]
+
+    ndjson = client.get("/items", headers={"Accept": "application/x-ndjson"})
+    assert ndjson.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line)["line_number"] for line in ndjson.text.splitlines()] == [0, 1, 2]
+
+    empty = StreamingJSONResponse(iter(()))
+    assert _drain(empty) == [b"[]"]
+
+
+def test_first_chunk_sent_before_last_row_is_produced(monkeypatch):
+    monkeypatch.setattr(responses, "STREAM_CHUNK_BYTES", 64)
+    produced = []
+
+    async def rows():
+        for i in range(20):
+            produced.append(i)
+            yield {"line_number": i, "mpn": f"MPN-{i:04d}"}
+
+    chunks, produced_at_first_chunk = [], []
+
+    async def send(message):
+        if message.get("body"):
+            if not chunks:
+                produced_at_first_chunk.append(len(produced))
+            chunks.append(message["body"])
+
+    async def receive():
+        await asyncio.sleep(1)
+        return {"type": "http.disconnect"}
+
+    asyncio.run(NDJSONResponse(rows())({"type": "http"}, receive, send))
+
+    assert produced_at_first_chunk[0] < 20
+    assert len(chunks) > 1
+    assert [json.loads(line)["line_number"] for line in b"".join(chunks).splitlines()] == list(range(20))
+
+
+def _drain(response):
+    chunks = []
+
+    async def send(message):
+        if message.get("body"):
+            chunks.append(message["body"])
+
+    async def receive():
+        await asyncio.sleep(1)
+        return {"type": "http.disconnect"}
+
+    asyncio.run(response({"type": "http"}, receive, send))
+    return chunks
+
+
+def test_line_items_streamed_in_batches_from_real_session(monkeypatch):
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.orm import Session
+
+    from app.api import bom_line_items
+
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE bom_line_items (line_number INTEGER)"))
+        conn.execute(text("INSERT INTO bom_line_items VALUES (:n)"), [{"n": n} for n in range(10)])
+
+    batches = []
+
+    def build(rows):
+        batches.append(len(rows))
+        return [row.line_number for row in rows]
+
+    monkeypatch.setattr(bom_line_items, "_build_line_item_responses", build)
+
+    with Session(engine) as db:
+        query = text("SELECT line_number FROM bom_line_items ORDER BY line_number")
+        items = list(bom_line_items._iter_line_items(db, query, {}, batch_size=4))
+
+    assert items == list(range(10))
+    assert batches == [4, 4, 2]
@@ -0,0 +1,86 @@
+"""
+Tests for the shared stream message dedup store
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.cache.message_dedup import MessageDedupStore
+from tests.unit.test_stream_consumer_dispatch import RecordingConsumer, _message
+from tests.utils.fake_redis import FakeAsyncRedis
+
+
+def _store(redis, **kwargs):
+    async def client():
+        return redis
+    return MessageDedupStore("unified-bom-consumer", client_factory=client, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_claim_complete_and_release():
+    redis = FakeAsyncRedis()
+    store = _store(redis, ttl_seconds=86400, claim_ttl_seconds=600)
+    key = "stream_dedup:unified-bom-consumer:evt-1"
+
+    assert await store.claim("evt-1") is True
+    assert await store.claim("evt-1") is False  # in progress elsewhere
+    assert redis.ttls[key] == 600
+
+    await store.complete("evt-1")
+    assert redis.data[key] == "done"
+    assert redis.ttls[key] == 86400
+    assert await store.claim("evt-1") is False
+
+    await store.release("evt-1")
+    assert await store.claim("evt-1") is True
+
+
+@pytest.mark.asyncio
+async def test_replayed_offsets_do_not_start_work_twice():
+    redis = FakeAsyncRedis()
+    event = {"event_id": "evt-1", "bom_id": "bom-1", "n": 0}
+
+    # First deployment handles the message...
+    first = RecordingConsumer(redis=redis)
+    await first.on_message(_message(event), SimpleNamespace(offset=0))
+    await first.dispatcher.drain()
+
+    # ...the redeployed consumer (new process, empty memory) replays it
+    second = RecordingConsumer(redis=redis)
+    await second.on_message(_message(event), SimpleNamespace(offset=0))
+    await second.dispatcher.drain()
+
+    assert first.messages_succeeded == 1
+    assert second.events == []
+    assert second.committed == [0]
+
+
+@pytest.mark.asyncio
+async def test_transient_failure_releases_claim_for_replay():
+    redis = FakeAsyncRedis()
+    consumer = RecordingConsumer(redis=redis)
+    consumer.transient_retries = 0
+    consumer.failures[0] = 1
+
+    await consumer.on_message(_message({"event_id": "evt-1", "n": 0}), SimpleNamespace(offset=0))
+    await consumer.dispatcher.drain()
+
+    assert consumer.messages_failed == 1
+    assert "stream_dedup:test-consumer:evt-1" not in redis.data
+
+
+@pytest.mark.asyncio
+async def test_local_fallback_evicts_oldest_when_redis_is_down():
+    async def unavailable():
+        raise RedisConnectionError("connection refused")
+
+    store = MessageDedupStore("unified-bom-consumer", client_factory=unavailable, local_size=2)
+
+    for message_id in ("evt-1", "evt-2", "evt-3"):
+        assert await store.claim(message_id) is True
+
+    assert await store.claim("evt-3") is False
+    assert await store.claim("evt-2") is False
+    assert await store.claim("evt-1") is True  # oldest was evicted
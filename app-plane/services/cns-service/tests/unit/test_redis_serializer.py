@@ -0,0 +1,75 @@
+"""
+Tests for the Redis payload serializer (codec header byte + optional zstd)
+"""
+
+import json
+from datetime import datetime
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+
+from app.cache.redis_cache import (
+    CODEC_JSON,
+    CODEC_MSGPACK,
+    FLAG_ZSTD,
+    DecimalEncoder,
+    RedisSerializer,
+)
+
+
+def _record():
+    return {
+        "mpn": "STM32F407VGT6",
+        "unit_price": Decimal("12.34"),
+        "component_id": UUID("12345678-1234-5678-1234-567812345678"),
+        "enriched_at": datetime(2024, 1, 2, 3, 4, 5),
+        "price_breaks": [{"quantity": q, "price": 1.0 / q} for q in (1, 10, 100)],
+    }
+
+
+@pytest.mark.parametrize("codec", ["json", "msgpack"])
+class TestRoundTrip:
+
+    def test_matches_decimal_encoder_output(self, codec):
+        serializer = RedisSerializer(codec=codec, compression_threshold=0)
+        expected = json.loads(json.dumps(_record(), cls=DecimalEncoder))
+
+        assert serializer.loads(serializer.dumps(_record())) == expected
+
+    def test_large_payloads_are_compressed(self, codec):
+        serializer = RedisSerializer(codec=codec, compression_threshold=256)
+        value = {"parameters": [{"name": "Capacitance", "value": "100nF"}] * 200}
+
+        raw = serializer.dumps(value)
+
+        assert raw[0] & FLAG_ZSTD
+        assert len(raw) < len(json.dumps(value))
+        assert serializer.loads(raw) == value
+
+    def test_small_payloads_are_not_compressed(self, codec):
+        serializer = RedisSerializer(codec=codec, compression_threshold=256)
+
+        raw = serializer.dumps({"status": "ok"})
+
+        assert raw[0] == (CODEC_MSGPACK if codec == "msgpack" else CODEC_JSON)
+
+
+class TestCompatibility:
+
+    def test_legacy_json_values_are_readable(self):
+        serializer = RedisSerializer()
+        legacy = json.dumps({"quality_score": 72.5})
+
+        assert serializer.loads(legacy) == {"quality_score": 72.5}
+        assert serializer.loads(legacy.encode()) == {"quality_score": 72.5}
+        assert serializer.loads(b"5") == 5
+
+    def test_reader_decodes_other_codec(self):
+        raw = RedisSerializer(codec="msgpack", compression_threshold=16).dumps({"mpn": "LM358N" * 10})
+
+        assert RedisSerializer(codec="json").loads(raw) == {"mpn": "LM358N" * 10}
+
+    def test_unknown_codec_is_rejected(self):
+        with pytest.raises(ValueError):
+            RedisSerializer(codec="pickle")
@@ -0,0 +1,176 @@
+"""
+Tests for the pure-ASGI middleware pipeline and shared RequestContext.
+"""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.middleware import CorrelationIDMiddleware
+from app.core.request_context import ASGIMiddleware, get_request_context
+
+
+class TenantMiddleware(ASGIMiddleware):
+    async def handle(self, scope, receive, send, ctx):
+        ctx.set_state("tenant", ctx.headers.get("x-tenant-id"))
+        ctx.response_headers["X-Tenant"] = ctx.headers.get("x-tenant-id", "")
+        ctx.response_headers["X-Elapsed"] = lambda: "computed"
+        await self.app(scope, receive, send)
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/echo")
+    async def echo(request: Request):
+        ctx = get_request_context(request.scope)
+        return {
+            "correlation_id": request.state.correlation_id,
+            "tenant": request.state.tenant,
+            "same_context": ctx.correlation_id == request.state.correlation_id,
+        }
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"data: {i}\n\n"
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    app.add_middleware(TenantMiddleware)
+    app.add_middleware(CorrelationIDMiddleware)
+    return app
+
+
+def test_state_and_headers_shared_across_middlewares():
+    client = TestClient(_app())
+
+    response = client.get("/echo", headers={"X-Correlation-ID": "corr-1", "X-Tenant-Id": "t-1"})
+
+    assert response.status_code == 200
+    assert response.json() == {"correlation_id": "corr-1", "tenant": "t-1", "same_context": True}
+    assert response.headers["X-Correlation-ID"] == "corr-1"
+    assert response.headers["X-Tenant"] == "t-1"
+    assert response.headers["X-Elapsed"] == "computed"
+
+
+def test_streaming_response_passes_through_unbuffered():
+    app = _app()
+    messages = []
+
+    async def run():
+        scope = {
+            "type": "http", "method": "GET", "path": "/stream", "raw_path": b"/stream",
+            "root_path": "", "scheme": "http", "query_string": b"", "headers": [],
+            "client": ("127.0.0.1", 1234), "server": ("test", 80), "http_version": "1.1",
+        }
+
+        async def receive():
+            await asyncio.sleep(0)
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            messages.append(message)
+
+        await app(scope, receive, send)
+
+    asyncio.run(run())
+
+    start = messages[0]
+    assert start["type"] == "http.response.start"
+    assert (b"x-correlation-id" in dict(start["headers"]))
+    bodies = [m["body"] for m in messages[1:] if m.get("body")]
+    # Each chunk reaches the server as its own message
+    assert bodies == [b"data: 0\n\n", b"data: 1\n\n", b"data: 2\n\n"]
+
+
+def test_short_circuit_response_gets_context_headers():
+    from app.middleware.rate_limit import AUTHENTICATED_RATE_LIMIT, RateLimitDecision, RateLimitMiddleware
+
+    app = FastAPI()
+
+    @app.get("/api/data")
+    async def data():
+        return {"ok": True}
+
+    app.add_middleware(RateLimitMiddleware)
+    app.add_middleware(CorrelationIDMiddleware)
+
+    from unittest.mock import AsyncMock, patch
+
+    with patch("app.middleware.rate_limit._rate_limit_store") as store:
+        store.hit = AsyncMock(return_value=RateLimitDecision(False, AUTHENTICATED_RATE_LIMIT, 0, 1.0, 60.0))
+        response = TestClient(app).get("/api/data", headers={"Authorization": "Bearer x"})
+
+        assert response.status_code == 429
+        assert "X-Correlation-ID" in response.headers
+
+        # Allowed requests carry the quota from the same check
+        store.hit.return_value = RateLimitDecision(True, AUTHENTICATED_RATE_LIMIT, 1999, 0.0, 0.03)
+        response = TestClient(app).get("/api/data", headers={"Authorization": "Bearer x"})
+
+    assert response.status_code == 200
+    assert response.headers["X-RateLimit-Remaining"] == "1999"
+    assert response.headers["X-RateLimit-Reset"] == "1"
+
+
+@pytest.mark.parametrize("scope_type", ["websocket", "lifespan"])
+def test_non_http_scopes_pass_through(scope_type):
+    seen = []
+
+    async def inner(scope, receive, send):
+        seen.append(scope)
+
+    asyncio.run(CorrelationIDMiddleware(inner)({"type": scope_type}, None, None))
+
+    assert seen == [{"type": scope_type}]
+
+
+def test_request_id_assigned_once_per_request():
+    from app.logging_config import RequestLoggingMiddleware
+
+    app = FastAPI()
+
+    @app.get("/id")
+    async def request_id(request: Request):
+        return {"request_id": request.state.request_id}
+
+    app.add_middleware(TenantMiddleware)
+    app.add_middleware(RequestLoggingMiddleware)
+    app.add_middleware(CorrelationIDMiddleware)
+
+    response = TestClient(app).get("/id")
+
+    assert [name for name in response.headers if name.lower() == "x-request-id"] == ["x-request-id"]
+    assert response.headers["X-Request-ID"] == response.json()["request_id"]
+
+
+def test_error_handling_middleware_returns_standard_error():
+    from app.core.error_handling import ErrorHandlingMiddleware
+
+    app = FastAPI()
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    app.add_middleware(ErrorHandlingMiddleware)
+    app.add_middleware(CorrelationIDMiddleware)
+
+    response = TestClient(app, raise_server_exceptions=False).get("/boom")
+
+    assert response.status_code == 500
+    assert response.json()["request_id"] == response.headers["X-Request-ID"]
+    assert "X-Correlation-ID" in response.headers
+    assert "X-Response-Time-Ms" in response.headers
+
+
+def test_middleware_must_implement_handle():
+    class Incomplete(ASGIMiddleware):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete(None)
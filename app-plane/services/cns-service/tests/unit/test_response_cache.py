@@ -0,0 +1,240 @@
+"""
+Tests for the versioned HTTP response cache and conditional GETs
+"""
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.api import catalog
+from app.cache import response_cache as rc
+from tests.utils.fake_redis import FakeRedis
+
+COMPONENT_ID = "3f2b8c1e-0000-4000-8000-00000000abcd"
+
+
+def _component(description="10k resistor"):
+    return catalog.CatalogComponent(
+        id=COMPONENT_ID, mpn="RC0603FR-0710KL", manufacturer="Yageo", category="Resistors",
+        description=description, datasheet_url=None, image_url=None, lifecycle="Active",
+        rohs="Compliant", reach=None, specifications={}, pricing=[], quality_score=95.0,
+        enrichment_source="digikey", last_enriched_at=None, created_at=None, updated_at=None,
+    )
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    redis = FakeRedis()
+    cache = rc.ResponseCache(client_factory=lambda: redis, ttl_seconds=300)
+    cache.enabled = True
+    monkeypatch.setattr(rc, "_response_cache", cache)
+    return redis
+
+
+@pytest.fixture
+def fetches(monkeypatch):
+    fetches = []
+
+    def fetch(where_clause, params, identifier):
+        fetches.append(identifier)
+        return _component(description=f"fetch {len(fetches)}")
+
+    monkeypatch.setattr(catalog, "_fetch_component", fetch)
+    return fetches
+
+
+def _client():
+    app = FastAPI()
+    app.include_router(catalog.router, prefix="/catalog")
+    return TestClient(app)
+
+
+def test_catalog_component_served_from_cache_with_etag(redis, fetches):
+    client = _client()
+
+    first = client.get("/catalog/component/RC0603FR-0710KL")
+    second = client.get("/catalog/component/rc0603fr-0710kl")
+
+    assert first.status_code == second.status_code == 200
+    assert first.json()["description"] == "fetch 1"
+    assert second.content == first.content
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "private, no-cache"
+    assert fetches == ["RC0603FR-0710KL"]
+
+    revalidated = client.get("/catalog/component/RC0603FR-0710KL", headers={"If-None-Match": first.headers["ETag"]})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["ETag"] == first.headers["ETag"]
+
+
+def test_catalog_write_bumps_version_and_changes_etag(redis, fetches):
+    client = _client()
+    etag = client.get(f"/catalog/component/id/{COMPONENT_ID.upper()}").headers["ETag"]
+
+    rc.invalidate_catalog_component(COMPONENT_ID, "RC0603FR-0710KL")
+
+    response = client.get(f"/catalog/component/id/{COMPONENT_ID}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["description"] == "fetch 2"
+    assert response.headers["ETag"] != etag
+    assert len(fetches) == 2
+
+
+def test_unchanged_payload_keeps_etag_across_bumps(redis):
+    app = FastAPI()
+    builds = []
+
+    @app.get("/portfolio")
+    def portfolio(request: Request):
+        slot = rc.get_response_cache().slot("risk:portfolio:org-1", rc.portfolio_risk_namespaces("org-1"))
+        cached = slot.get()
+        if cached:
+            return rc.conditional_response(request, cached)
+        builds.append(1)
+        return rc.conditional_response(request, slot.put({"total_components": 3}))
+
+    client = TestClient(app)
+    etag = client.get("/portfolio").headers["ETag"]
+
+    # A write to another org leaves this org's entry alone
+    rc.invalidate_risk("org-2", ["bom-9"])
+    assert client.get("/portfolio", headers={"If-None-Match": etag}).status_code == 304
+    assert len(builds) == 1
+
+    rc.invalidate_risk("org-1")
+    assert client.get("/portfolio", headers={"If-None-Match": etag}).status_code == 304
+    assert len(builds) == 2
+
+
+@pytest.mark.parametrize("header,expected", [
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"xyz", "abc"', True),
+    ("*", True),
+    ('"xyz"', False),
+    (None, False),
+])
+def test_if_none_match_parsing(header, expected):
+    assert rc.etag_matches(header, '"abc"') is expected
+
+
+def test_uncached_when_redis_unavailable(fetches, monkeypatch):
+    def unavailable():
+        raise OSError("connection refused")
+
+    cache = rc.ResponseCache(client_factory=unavailable, ttl_seconds=300)
+    cache.enabled = True
+    monkeypatch.setattr(rc, "_response_cache", cache)
+    client = _client()
+
+    first = client.get("/catalog/component/RC0603FR-0710KL")
+    rc.invalidate_catalog_component(mpn="RC0603FR-0710KL")
+    second = client.get("/catalog/component/RC0603FR-0710KL", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert first.status_code == 200 and second.status_code == 200
+    assert len(fetches) == 2
+
+
+class _Row:
+    def __init__(self, **mapping):
+        self._mapping = mapping
+
+
+class _PortfolioDB:
+    """Org-filtered queries see no rows; the unfiltered (super admin) query sees one."""
+
+    def __init__(self):
+        self.queries = []
+
+    def execute(self, statement, params):
+        self.queries.append(params)
+        rows = [] if "auth_org_id" in params else [_Row(
+            component_id="li-1", risk_level="high", total_risk_score=80,
+            manufacturer_part_number="LM358N", manufacturer="TI",
+        )]
+        return type("Result", (), {"fetchall": lambda self: rows, "fetchone": lambda self: None})()
+
+    def close(self):
+        pass
+
+
+def test_portfolio_not_shared_with_org_less_caller(redis, monkeypatch):
+    from app.api import risk
+    from app.core.authorization import get_auth_context
+    from shared.auth_billing import AuthContext
+
+    db = _PortfolioDB()
+
+    class _DualDB:
+        def get_session(self, name):
+            yield db
+
+    monkeypatch.setattr(risk, "get_dual_database", lambda: _DualDB())
+    app = FastAPI()
+    app.include_router(risk.router)
+    client = TestClient(app)
+
+    caller = {}
+    app.dependency_overrides[get_auth_context] = lambda: caller["auth"]
+
+    caller["auth"] = AuthContext(user_id="admin", organization_id="", role="super_admin")
+    admin = client.get("/risk/portfolio")
+    assert admin.json()["total_components"] == 1
+
+    # Same empty org id, but not a super admin: filtered query, never the all-org entry
+    caller["auth"] = AuthContext(user_id="user", organization_id="", role="analyst")
+    for _ in range(2):
+        assert client.get("/risk/portfolio").json()["total_components"] == 0
+    assert [q.get("auth_org_id") for q in db.queries[-2:]] == ["", ""]
+
+    caller["auth"] = AuthContext(user_id="admin", organization_id="", role="super_admin")
+    assert client.get("/risk/portfolio").content == admin.content
+
+
+class _BomDetailDB:
+    """One BOM row (None once deleted) and one risk summary row; counts risk summary reads."""
+
+    def __init__(self):
+        self.bom = {"id": "bom-1", "name": "Board A", "project_id": None, "component_count": 3, "project_name": None}
+        self.summary_reads = 0
+
+    def execute(self, statement, params):
+        if "bom_risk_summaries" in str(statement):
+            self.summary_reads += 1
+            row = _Row(
+                total_line_items=3, low_risk_count=3, medium_risk_count=0, high_risk_count=0,
+                critical_risk_count=0, average_risk_score=12.5, weighted_risk_score=12.5,
+                health_grade="A", score_trend="stable", top_risk_components=[],
+            )
+        else:
+            row = _Row(**self.bom) if self.bom else None
+        return type("Result", (), {"fetchone": lambda self: row})()
+
+
+def test_bom_risk_detail_reads_bom_row_on_every_request(redis, monkeypatch):
+    from app.api import risk
+    from app.core.authorization import get_auth_context
+    from shared.auth_billing import AuthContext
+
+    db = _BomDetailDB()
+
+    class _DualDB:
+        def get_session(self, name):
+            yield db
+
+    monkeypatch.setattr(risk, "get_dual_database", lambda: _DualDB())
+    app = FastAPI()
+    app.include_router(risk.router)
+    app.dependency_overrides[get_auth_context] = lambda: AuthContext(user_id="u", organization_id="org-1", role="analyst")
+    client = TestClient(app)
+
+    assert client.get("/risk/boms/bom-1").json()["bom_name"] == "Board A"
+
+    db.bom["name"] = "Board B"  # Renamed: no risk write, so risk:bom is not bumped
+    renamed = client.get("/risk/boms/bom-1").json()
+    assert (renamed["bom_name"], renamed["health_grade"]) == ("Board B", "A")
+    assert db.summary_reads == 1
+
+    db.bom = None  # Deleted
+    assert client.get("/risk/boms/bom-1").status_code == 404
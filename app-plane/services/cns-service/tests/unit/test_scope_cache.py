@@ -0,0 +1,161 @@
+"""
+Tests for the two-level scope hierarchy cache and batch chain validation
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.cache import scope_cache as sc
+from app.core import scope_validators as sv
+from tests.utils.fake_redis import FakeRedis
+
+TENANT = "00000000-0000-0000-0000-00000000000a"
+ORG = "00000000-0000-0000-0000-00000000000b"
+WS = "00000000-0000-0000-0000-00000000000c"
+PROJECT = "00000000-0000-0000-0000-00000000000d"
+BOM_1 = "00000000-0000-0000-0000-000000000001"
+BOM_2 = "00000000-0000-0000-0000-000000000002"
+
+ROWS = {
+    "bom": [
+        {"bom_id": BOM_1, "project_id": PROJECT, "workspace_id": WS, "organization_id": ORG, "tenant_id": TENANT},
+        {"bom_id": BOM_2, "project_id": PROJECT, "workspace_id": WS, "organization_id": ORG, "tenant_id": TENANT},
+    ],
+    "project": [{"project_id": PROJECT, "workspace_id": WS, "organization_id": ORG, "tenant_id": TENANT}],
+    "workspace": [{"workspace_id": WS, "organization_id": ORG, "tenant_id": TENANT}],
+}
+
+
+class FakeDB:
+    """Answers the hierarchy queries from ROWS and records them."""
+
+    def __init__(self):
+        self.queries = []
+
+    def execute(self, query, params):
+        kind = next(k for k in ("bom", "project", "workspace") if f"{k}_id" in str(query).split(",")[0])
+        self.queries.append((kind, params["ids"]))
+        rows = [SimpleNamespace(_mapping=row) for row in ROWS[kind] if row[f"{kind}_id"] in params["ids"]]
+        return SimpleNamespace(fetchall=lambda: rows)
+
+
+def _cache(redis):
+    cache = sc.ScopeHierarchyCache(client_factory=lambda: redis, ttl_seconds=300, local_ttl_seconds=5)
+    cache.enabled = True
+    return cache
+
+
+@pytest.fixture(autouse=True)
+def redis_enabled(monkeypatch):
+    monkeypatch.setattr(sc.settings, "redis_enabled", True)
+
+
+def test_entries_shared_through_redis_with_dependents():
+    redis = FakeRedis()
+    pod_a, pod_b = _cache(redis), _cache(redis)
+
+    pod_a.set_many("bom", {BOM_1: ROWS["bom"][0]}, pod_a.generation())
+
+    assert pod_b.get_many("bom", [BOM_1, BOM_2]) == {BOM_1: ROWS["bom"][0]}
+    assert redis.data[f"scope:deps:workspace:{WS}"] == {f"scope:bom:{BOM_1}"}
+    assert redis.data[f"scope:deps:organization:{ORG}"] == {f"scope:bom:{BOM_1}"}
+
+    # Second read comes from the in-process layer
+    redis.data.clear()
+    assert pod_b.get_many("bom", [BOM_1]) == {BOM_1: ROWS["bom"][0]}
+
+
+def test_workspace_invalidation_drops_everything_below_it_on_every_pod():
+    redis = FakeRedis()
+    pod_a, pod_b = _cache(redis), _cache(redis)
+    pod_a.set_many("bom", {BOM_1: ROWS["bom"][0]}, pod_a.generation())
+    pod_a.set_many("project", {PROJECT: ROWS["project"][0]}, pod_a.generation())
+    assert pod_b.get_many("project", [PROJECT])
+
+    pod_a.invalidate(workspace_ids=[WS])
+
+    assert not any(key.startswith(("scope:bom:", "scope:project:")) for key in redis.data)
+    assert f"scope:deps:workspace:{WS}" not in redis.data
+    assert pod_a.get_many("bom", [BOM_1]) == {}
+    channel, message = redis.published[-1]
+    assert channel == sc.INVALIDATION_CHANNEL and json.loads(message) == {"ids": [WS]}
+
+    # pod_b still holds a local copy until the published message arrives
+    assert pod_b.get_many("project", [PROJECT])
+    pod_b.handle_invalidation(message)
+    assert pod_b.get_many("project", [PROJECT]) == {}
+
+
+def test_batch_validation_resolves_each_kind_with_one_query(monkeypatch):
+    monkeypatch.setattr(sv, "get_scope_cache", lambda: cache)
+    cache = _cache(FakeRedis())
+    db = FakeDB()
+    chains = [
+        {"bom_id": BOM_1, "project_id": PROJECT},
+        {"bom_id": BOM_2.upper(), "workspace_id": WS},
+        {"project_id": PROJECT, "workspace_id": BOM_1},
+        {"workspace_id": WS},
+    ]
+
+    results = sv.validate_scope_chains(db, TENANT, chains)
+
+    assert [r["valid"] for r in results] == [True, True, False, True]
+    assert results[0]["hierarchy"]["workspace_id"] == WS
+    assert results[2]["errors"] == [f"Project {PROJECT} belongs to workspace {WS}, not {BOM_1}"]
+    assert sorted(kind for kind, _ in db.queries) == ["bom", "project", "workspace"]
+    assert dict(db.queries)["bom"] == [BOM_1, BOM_2]
+
+    # Warm cache: no queries, and another tenant is still denied
+    db.queries.clear()
+    other = sv.validate_full_scope_chain(db, "00000000-0000-0000-0000-0000000000ff", bom_id=BOM_1)
+    assert not other["valid"] and other["bom_valid"] is False
+    assert sv.validate_bom_in_project(db, BOM_2, PROJECT)
+    assert db.queries == []
+
+
+def test_invalidate_after_commit_waits_for_commit(monkeypatch):
+    redis = FakeRedis()
+    cache = _cache(redis)
+    monkeypatch.setattr(sc, "_scope_cache", cache)
+    cache.set_many("bom", {BOM_1: ROWS["bom"][0]}, cache.generation())
+
+    session = Session()
+    sc.invalidate_after_commit(session, bom_ids=[BOM_1])
+    session.rollback()
+    assert cache.get_many("bom", [BOM_1])
+
+    session.commit()
+    assert cache.get_many("bom", [BOM_1]) == {}
+    assert f"scope:bom:{BOM_1}" not in redis.data
+
+
+def test_lookup_that_raced_an_invalidation_is_not_cached():
+    redis = FakeRedis()
+    pod_a, pod_b = _cache(redis), _cache(redis)
+
+    # pod_a reads the old rows, then pod_b's transaction commits and invalidates
+    generation = pod_a.generation()
+    pod_b.invalidate(workspace_ids=[WS])
+    pod_a.set_many("bom", {BOM_1: ROWS["bom"][0]}, generation)
+
+    assert f"scope:bom:{BOM_1}" not in redis.data
+    assert pod_a.get_many("bom", [BOM_1]) == {}
+
+    # A lookup that starts after the invalidation is cached as usual
+    pod_a.set_many("bom", {BOM_1: ROWS["bom"][0]}, pod_a.generation())
+    assert pod_b.get_many("bom", [BOM_1]) == {BOM_1: ROWS["bom"][0]}
+
+
+def test_local_write_skipped_after_invalidation_message():
+    redis = FakeRedis()
+    cache = _cache(redis)
+
+    generation = cache.generation()
+    cache.handle_invalidation(json.dumps({"ids": [WS]}))
+    redis.data.clear()  # Keep the read on the local layer
+    cache.set_many("bom", {BOM_1: ROWS["bom"][0]}, generation._replace(shared=None))
+
+    assert cache.get_many("bom", [BOM_1]) == {}
@@ -0,0 +1,57 @@
+"""
+Startup import-time budget for the CNS API
+
+Each test imports in a fresh interpreter (python -X importtime), so results
+don't depend on what other tests already imported. Raise the budget on slow
+CI machines with CNS_STARTUP_BUDGET_SECONDS.
+"""
+
+import os
+
+import pytest
+
+from app.core.import_profile import parse_importtime, profile_imports
+
+STARTUP_BUDGET_SECONDS = float(os.getenv("CNS_STARTUP_BUDGET_SECONDS", "15"))
+
+# Only needed by upload parsing, file storage, billing and AI code paths
+LAZY_DEPENDENCIES = ["pandas", "openpyxl", "minio", "stripe", "openai", "anthropic"]
+
+
+@pytest.fixture(scope="module")
+def main_profile():
+    return profile_imports("app.main")
+
+
+def test_parse_importtime():
+    output = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       120 |        120 |     _json",
+        "import time:       300 |        420 |   json",
+        "import time:        80 |        500 | app.config",
+    ])
+
+    records = parse_importtime(output)
+
+    assert [(r.name, r.self_us, r.cumulative_us, r.depth) for r in records] == [
+        ("_json", 120, 120, 2),
+        ("json", 300, 420, 1),
+        ("app.config", 80, 500, 0),
+    ]
+
+
+def test_api_package_does_not_import_routers():
+    profile = profile_imports("app.api")
+
+    assert [m for m in profile.modules if m.startswith("app.api.")] == []
+
+
+def test_heavy_dependencies_not_imported_at_startup(main_profile):
+    assert [name for name in LAZY_DEPENDENCIES if main_profile.imported(name)] == []
+
+
+def test_startup_import_budget(main_profile):
+    assert main_profile.wall_seconds < STARTUP_BUDGET_SECONDS, (
+        f"import app.main took {main_profile.wall_seconds:.1f}s "
+        f"(budget {STARTUP_BUDGET_SECONDS:.0f}s); run python -m app.core.import_profile"
+    )
@@ -0,0 +1,202 @@
+"""
+Tests for concurrent stream message dispatch with per-key ordering and
+offset commits
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.cache.message_dedup import MessageDedupStore
+from app.workers.base_consumer import BaseRStreamConsumer, ConcurrentDispatcher
+from tests.utils.fake_redis import FakeAsyncRedis
+
+
+def _message(event, routing_key="customer.bom.uploaded"):
+    return SimpleNamespace(
+        data=json.dumps(event).encode(),
+        message_annotations={b"x-routing-key": routing_key.encode()},
+        application_properties=None,
+        properties=None,
+    )
+
+
+class RecordingConsumer(BaseRStreamConsumer):
+
+    def __init__(self, concurrency=4, redis=None):
+        super().__init__(
+            stream="stream.platform.bom",
+            consumer_name="test-consumer",
+            routing_keys=["customer.bom.uploaded"],
+            concurrency=concurrency,
+        )
+        self.redis = redis or FakeAsyncRedis()
+        self.dedup = MessageDedupStore("test-consumer", client_factory=self._redis)
+        self.transient_retries = 1
+        self.events = []
+        self.active = 0
+        self.max_active = 0
+        self.committed = []
+        self.failures = {}
+        self.raises = set()
+
+    async def _redis(self):
+        return self.redis
+
+    async def handle_message(self, event_data, routing_key, priority):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        self.events.append(("start", event_data["n"]))
+        await asyncio.sleep(event_data.get("delay", 0.01))
+        self.events.append(("end", event_data["n"]))
+        self.active -= 1
+        if event_data["n"] in self.raises:
+            raise RuntimeError("handler crashed")
+        if self.failures.get(event_data["n"], 0) > 0:
+            self.failures[event_data["n"]] -= 1
+            return False, "transient"
+        return True, ""
+
+    async def store_offset(self, offset):
+        self.committed.append(offset)
+
+
+async def _feed(consumer, events, routing_key="customer.bom.uploaded"):
+    for offset, event in enumerate(events):
+        await consumer.on_message(_message(event, routing_key), SimpleNamespace(offset=offset))
+    await consumer.dispatcher.drain()
+
+
+@pytest.mark.asyncio
+async def test_messages_for_different_boms_run_in_parallel():
+    consumer = RecordingConsumer(concurrency=3)
+    events = [{"event_id": f"e{n}", "bom_id": f"bom-{n}", "n": n, "delay": 0.05} for n in range(6)]
+
+    await _feed(consumer, events)
+
+    assert consumer.max_active == 3
+    assert consumer.messages_succeeded == 6
+    assert consumer.committed[-1] == 5
+
+
+@pytest.mark.asyncio
+async def test_messages_for_one_bom_keep_stream_order():
+    consumer = RecordingConsumer(concurrency=4)
+    events = [
+        {"event_id": "e0", "bom_id": "bom-1", "n": 0, "delay": 0.05},
+        {"event_id": "e1", "bom_id": "bom-2", "n": 1, "delay": 0.01},
+        {"event_id": "e2", "bom_id": "bom-1", "n": 2, "delay": 0.01},
+    ]
+
+    await _feed(consumer, events)
+
+    order = consumer.events
+    assert order.index(("end", 0)) < order.index(("start", 2))
+    assert order.index(("end", 1)) < order.index(("end", 0))  # other BOM didn't wait
+
+
+@pytest.mark.asyncio
+async def test_offset_is_not_committed_past_unfinished_messages():
+    committed = []
+
+    async def commit(offset):
+        committed.append(offset)
+
+    dispatcher = ConcurrentDispatcher(concurrency=4, on_commit=commit)
+    gates = {n: asyncio.Event() for n in range(3)}
+
+    for n in range(3):
+        await dispatcher.submit(n, f"bom-{n}", gates[n].wait)
+    dispatcher.skip(3)  # filtered message behind the in-flight ones
+
+    gates[1].set()
+    gates[2].set()
+    await asyncio.sleep(0.01)
+    assert committed == []
+    assert dispatcher.safe_offset is None
+
+    gates[0].set()
+    await dispatcher.drain()
+    assert committed[-1] == 3
+    assert dispatcher.committed_offset == 3
+
+
+@pytest.mark.asyncio
+async def test_transient_failure_is_retried_and_filtered_messages_advance_offset(monkeypatch):
+    consumer = RecordingConsumer()
+    consumer.failures[0] = 1
+
+    real_sleep = asyncio.sleep
+    monkeypatch.setattr("app.workers.base_consumer.asyncio.sleep", lambda delay: real_sleep(0))
+
+    await consumer.on_message(_message({"event_id": "e0", "bom_id": "bom-1", "n": 0}), SimpleNamespace(offset=0))
+    await consumer.on_message(_message({"event_id": "e1", "n": 1}, "customer.bom.deleted"), SimpleNamespace(offset=1))
+    await consumer.dispatcher.drain()
+
+    assert consumer.events.count(("start", 0)) == 2
+    assert consumer.messages_succeeded == 1
+    assert consumer.committed[-1] == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("failure", ["transient", "raises"])
+async def test_failed_message_is_not_committed_and_is_redelivered(monkeypatch, failure):
+    consumer = RecordingConsumer()
+    consumer.consumer = SimpleNamespace(stop=lambda: consumer.events.append("stop"))
+    if failure == "transient":
+        consumer.failures[0] = 2  # Still failing after the one retry
+    else:
+        consumer.raises.add(0)
+
+    real_sleep = asyncio.sleep
+    monkeypatch.setattr("app.workers.base_consumer.asyncio.sleep", lambda delay: real_sleep(0))
+
+    await _feed(consumer, [
+        {"event_id": "e0", "bom_id": "bom-1", "n": 0},
+        {"event_id": "e1", "bom_id": "bom-2", "n": 1},
+    ])
+
+    assert consumer.committed == []
+    assert consumer.events.count("stop") == 1
+    assert await consumer.dedup.claim("e0")  # Released, so the redelivery is handled
+
+
+class UndecodableMessage:
+    """Message whose body must not be touched."""
+
+    message_annotations = {b"x-routing-key": b"customer.project.created"}
+    application_properties = None
+    properties = None
+
+    @property
+    def data(self):
+        raise AssertionError("body decoded for an irrelevant routing key")
+
+
+@pytest.mark.asyncio
+async def test_other_routing_keys_are_dropped_before_body_decode():
+    consumer = RecordingConsumer()
+
+    await consumer.on_message(UndecodableMessage(), SimpleNamespace(offset=0))
+    await consumer.dispatcher.drain()
+
+    assert consumer.messages_skipped == 1
+    assert consumer.messages_processed == 0
+    assert consumer.committed == [0]
+
+
+def test_subscription_requests_broker_side_filter_values():
+    consumer = RecordingConsumer()
+    consumer.routing_keys = ["customer.bom.uploaded", "customer.bom.*", "cns.bom.bulk_uploaded", "bom.parsed"]
+
+    assert consumer.subscription_properties() == {
+        "filter.0": "bom.parsed",
+        "filter.1": "cns.bom",
+        "filter.2": "customer.bom",
+        "match-unfiltered": "true",
+    }
+
+    consumer.routing_keys = ["customer.*.uploaded"]
+    assert consumer.subscription_properties() is None
@@ -0,0 +1,99 @@
+"""
+Tests for the streaming MinIO upload pipeline (upload teed into the parser)
+"""
+
+import hashlib
+import io
+
+import pytest
+
+from app.utils import streaming_upload
+from app.utils.streaming_upload import stream_upload_to_minio
+
+
+class FakeMinIOClient:
+    """Stores streamed objects in memory, reading them the way MinIO does."""
+
+    def __init__(self, fail: bool = False):
+        self.objects = {}
+        self.fail = fail
+
+    def is_enabled(self):
+        return True
+
+    def upload_stream(self, bucket, object_name, stream, content_type='application/octet-stream', part_size=None):
+        parts = []
+        while True:
+            data = stream.read(5 * 1024 * 1024)
+            if not data:
+                break
+            parts.append(data)
+            if self.fail:
+                return False, "MinIO upload failed: boom"
+        self.objects[(bucket, object_name)] = b"".join(parts)
+        return True, None
+
+    def get_presigned_url(self, bucket, object_name, expires=None):
+        return f"http://minio/{bucket}/{object_name}"
+
+
+@pytest.fixture
+def fake_minio(monkeypatch):
+    client = FakeMinIOClient()
+    monkeypatch.setattr(streaming_upload, "get_minio_client", lambda: client)
+    return client
+
+
+def _csv_bytes(rows: int) -> bytes:
+    lines = ["MPN,Manufacturer,Quantity"]
+    lines += [f"PART-{i},ACME,{i % 7 + 1}" for i in range(rows)]
+    return ("\n".join(lines) + "\n").encode()
+
+
+class TestStreamUploadToMinIO:
+
+    def test_csv_is_stored_and_parsed(self, fake_minio):
+        content = _csv_bytes(20000)  # spans several tee chunks and parse chunks
+
+        result = stream_upload_to_minio(
+            io.BytesIO(content), "org-1", "upload-1", "bom.csv", parse_as="csv"
+        )
+
+        assert result.error is None
+        assert result.parse_error is None
+        assert result.file_size == len(content)
+        assert result.sha256 == hashlib.sha256(content).hexdigest()
+        assert fake_minio.objects[("bulk-uploads", "uploads/org-1/upload-1/bom.csv")] == content
+        assert len(result.dataframe) == 20000
+        assert list(result.dataframe.index[:3]) == [0, 1, 2]
+        assert result.dataframe.iloc[-1]["MPN"] == "PART-19999"
+
+    def test_store_only_does_not_parse(self, fake_minio):
+        content = b"not,a\nreal,bom\n"
+
+        result = stream_upload_to_minio(io.BytesIO(content), "org-1", "upload-2", "bom.csv")
+
+        assert result.error is None
+        assert result.dataframe is None
+        assert result.file_size == len(content)
+
+    def test_parse_error_does_not_block_upload(self, fake_minio):
+        content = b""
+
+        result = stream_upload_to_minio(
+            io.BytesIO(content), "org-1", "upload-3", "empty.csv", parse_as="csv"
+        )
+
+        assert result.error is None
+        assert result.parse_error is not None
+
+    def test_upload_failure_is_reported(self, monkeypatch):
+        client = FakeMinIOClient(fail=True)
+        monkeypatch.setattr(streaming_upload, "get_minio_client", lambda: client)
+
+        result = stream_upload_to_minio(
+            io.BytesIO(_csv_bytes(10)), "org-1", "upload-4", "bom.csv", parse_as="csv"
+        )
+
+        assert result.s3_key is None
+        assert "boom" in result.error
@@ -0,0 +1,109 @@
+"""
+Tests for cross-instance WebSocket broadcast and bounded send queues
+"""
+
+import asyncio
+
+import pytest
+
+from app.api import websocket
+from app.api.websocket import ConnectionManager, JobConnection
+from tests.utils.fake_redis import FakeAsyncRedis
+
+
+class FakeWebSocket:
+
+    def __init__(self, gate=None):
+        self.sent = []
+        self.gate = gate
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, message):
+        if self.gate is not None:
+            await self.gate.wait()
+        self.sent.append(message)
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    client = FakeAsyncRedis()
+
+    async def get_redis_client():
+        return client
+
+    monkeypatch.setattr(websocket, "get_redis_client", get_redis_client)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_broadcast_reaches_clients_on_other_instances(redis):
+    pod_a, pod_b = ConnectionManager(), ConnectionManager()
+    ws_a, ws_b = FakeWebSocket(), FakeWebSocket()
+    await pod_a.connect(ws_a, "job-1")
+    await pod_b.connect(ws_b, "job-1")
+    await _settle()
+
+    await pod_a.broadcast_to_job("job-1", {"event": "completed", "job_id": "job-1"})
+    await asyncio.sleep(0.05)
+
+    assert ws_a.sent == ws_b.sent == [{"event": "completed", "job_id": "job-1"}]
+
+    await pod_a.disconnect(ws_a, "job-1")
+    await pod_b.disconnect(ws_b, "job-1")
+    assert redis.pubsubs == []
+
+
+@pytest.mark.asyncio
+async def test_slow_client_does_not_block_others(redis):
+    manager = ConnectionManager()
+    gate = asyncio.Event()
+    slow, fast = FakeWebSocket(gate), FakeWebSocket()
+    await manager.connect(slow, "job-1")
+    await manager.connect(fast, "job-1")
+
+    for n in range(10):
+        manager.deliver_local("job-1", {"event": "progress", "data": {"progress": n}})
+        await _settle()
+
+    assert len(fast.sent) == 10
+    assert manager.get_stats()["job-1"]["queue_depth"] <= 1
+
+    gate.set()
+    await _settle()
+    assert slow.sent[-1]["data"]["progress"] == 9
+
+    await manager.disconnect(slow, "job-1")
+    await manager.disconnect(fast, "job-1")
+
+
+@pytest.mark.asyncio
+async def test_progress_frames_are_merged():
+    connection = JobConnection(FakeWebSocket(), "job-1", max_queue=8)
+
+    connection.offer({"event": "progress", "data": {"progress": 10}})
+    connection.offer({"event": "item_completed", "data": {"mpn": "LM358N"}})
+    connection.offer({"event": "progress", "data": {"progress": 20}})
+
+    assert [f["event"] for f in connection.frames] == ["item_completed", "progress"]
+    assert connection.frames[-1]["data"]["progress"] == 20
+    assert connection.merged == 1
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_oldest_non_essential_frame():
+    connection = JobConnection(FakeWebSocket(), "job-1", max_queue=3)
+
+    connection.offer({"event": "status_change", "data": {"status": "processing"}})
+    connection.offer({"event": "item_completed", "data": {"n": 1}})
+    connection.offer({"event": "item_failed", "data": {"n": 2}})
+    connection.offer({"event": "completed", "data": {}})
+
+    assert [f["event"] for f in connection.frames] == ["status_change", "item_failed", "completed"]
+    assert connection.dropped == 1
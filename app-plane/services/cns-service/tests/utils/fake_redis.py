@@ -0,0 +1,557 @@
+"""
+In-memory stand-ins for redis-py and RedisCache used by unit tests.
+
+Implements only the commands the cache modules use, plus the pub/sub,
+stream, string, hash and set subset of redis.asyncio used by the progress
+fan-out, stream dedup and auth context cache code. FakeRedis.publish()
+records messages in .published. Values are stored as
+given (str or bytes); sorted set members and hash fields are normalized
+to str. Pipelines support WATCH/MULTI: execute() raises WatchError when a
+watched key changed after watch(). Lua scripts the service registers run
+as the Python equivalents in LUA_SCRIPTS, atomically like the real ones.
+"""
+
+import asyncio
+import copy
+import fnmatch
+import json
+from typing import Any, Callable, Dict, List, Optional
+
+from redis.exceptions import WatchError
+
+from app.cache.redis_cache import deserialize, serialize
+
+
+def _s(value) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+def _score_bound(value, default: float) -> float:
+    if value in ("-inf", b"-inf"):
+        return float("-inf")
+    if value in ("+inf", "inf", b"+inf"):
+        return float("inf")
+    return float(value) if value is not None else default
+
+
+class FakeRedis:
+    """In-memory subset of redis-py."""
+
+    def __init__(self):
+        self.data: Dict[str, Any] = {}
+        self.ttls: Dict[str, int] = {}
+        self.commands = []
+        self.published = []
+
+    def _log(self, name):
+        self.commands.append(name)
+
+    # -- strings -------------------------------------------------------------
+
+    def get(self, key):
+        self._log("get")
+        return self.data.get(_s(key))
+
+    def mget(self, keys):
+        self._log("mget")
+        return [self.data.get(_s(key)) for key in keys]
+
+    def set(self, key, value, nx=False, ex=None):
+        self._log("set")
+        key = _s(key)
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        if ex:
+            self.ttls[key] = ex
+        return True
+
+    def setex(self, key, seconds, value):
+        self._log("setex")
+        self.data[_s(key)] = value
+        self.ttls[_s(key)] = seconds
+        return True
+
+    def incrby(self, key, amount=1):
+        key = _s(key)
+        self.data[key] = int(self.data.get(key, 0)) + amount
+        return self.data[key]
+
+    def incr(self, key, amount=1):
+        return self.incrby(key, amount)
+
+    # -- keys ----------------------------------------------------------------
+
+    def exists(self, *keys):
+        return sum(1 for key in keys if _s(key) in self.data)
+
+    def delete(self, *keys):
+        removed = 0
+        for key in keys:
+            key = _s(key)
+            if self.data.pop(key, None) is not None:
+                removed += 1
+            self.ttls.pop(key, None)
+        return removed
+
+    def expire(self, key, seconds):
+        if _s(key) in self.data:
+            self.ttls[_s(key)] = seconds
+            return True
+        return False
+
+    def ttl(self, key):
+        key = _s(key)
+        if key not in self.data:
+            return -2
+        return self.ttls.get(key, -1)
+
+    def scan_iter(self, match="*", count=None):
+        self._log("scan_iter")
+        return [key for key in list(self.data) if fnmatch.fnmatchcase(key, match)]
+
+    # -- hashes --------------------------------------------------------------
+
+    def hset(self, key, field=None, value=None, mapping=None):
+        self._log("hset")
+        stored = self.data.setdefault(_s(key), {})
+        if field is not None:
+            stored[_s(field)] = value
+        for k, v in (mapping or {}).items():
+            stored[_s(k)] = v
+
+    def hget(self, key, field):
+        return self.data.get(_s(key), {}).get(_s(field))
+
+    def hmget(self, key, fields):
+        self._log("hmget")
+        stored = self.data.get(_s(key), {})
+        return [stored.get(_s(field)) for field in fields]
+
+    def hgetall(self, key):
+        return dict(self.data.get(_s(key), {}))
+
+    def hkeys(self, key):
+        return list(self.data.get(_s(key), {}))
+
+    def hincrby(self, key, field, amount=1):
+        stored = self.data.setdefault(_s(key), {})
+        stored[_s(field)] = int(stored.get(_s(field), 0)) + amount
+        return stored[_s(field)]
+
+    def hincrbyfloat(self, key, field, amount=1.0):
+        stored = self.data.setdefault(_s(key), {})
+        stored[_s(field)] = float(stored.get(_s(field), 0)) + amount
+        return stored[_s(field)]
+
+    def hdel(self, key, *fields):
+        stored = self.data.get(_s(key), {})
+        return sum(1 for field in fields if stored.pop(_s(field), None) is not None)
+
+    # -- lists ---------------------------------------------------------------
+
+    def rpush(self, key, *values):
+        self._log("rpush")
+        self.data.setdefault(_s(key), []).extend(
+            v.encode() if isinstance(v, str) else v for v in values
+        )
+
+    def lrange(self, key, start, end):
+        self._log("lrange")
+        items = self.data.get(_s(key), [])
+        return items[start:] if end == -1 else items[start:end + 1]
+
+    def llen(self, key):
+        return len(self.data.get(_s(key), []))
+
+    # -- sets ----------------------------------------------------------------
+
+    def sadd(self, key, *members):
+        stored = self.data.setdefault(_s(key), set())
+        before = len(stored)
+        stored.update(_s(member) for member in members)
+        return len(stored) - before
+
+    def srem(self, key, *members):
+        stored = self.data.get(_s(key), set())
+        removed = 0
+        for member in map(_s, members):
+            if member in stored:
+                stored.discard(member)
+                removed += 1
+        return removed
+
+    def smembers(self, key):
+        return set(self.data.get(_s(key), set()))
+
+    # -- sorted sets ---------------------------------------------------------
+
+    def zadd(self, key, mapping, nx=False, xx=False):
+        self._log("zadd")
+        zset = self.data.setdefault(_s(key), {})
+        added = 0
+        for member, score in mapping.items():
+            member = _s(member)
+            if nx and member in zset:
+                continue
+            if xx and member not in zset:
+                continue
+            added += member not in zset
+            zset[member] = float(score)
+        if not zset:
+            self.data.pop(_s(key))
+        return added
+
+    def zrem(self, key, *members):
+        zset = self.data.get(_s(key), {})
+        return sum(1 for member in members if zset.pop(_s(member), None) is not None)
+
+    def zscore(self, key, member):
+        return self.data.get(_s(key), {}).get(_s(member))
+
+    def zcard(self, key):
+        return len(self.data.get(_s(key), {}))
+
+    def _zsorted(self, key, reverse=False):
+        return sorted(self.data.get(_s(key), {}).items(), key=lambda kv: (kv[1], kv[0]), reverse=reverse)
+
+    def zcount(self, key, min, max):
+        lo, hi = _score_bound(min, float("-inf")), _score_bound(max, float("inf"))
+        return sum(1 for _, score in self._zsorted(key) if lo <= score <= hi)
+
+    def zrangebyscore(self, key, min, max, start=None, num=None, withscores=False):
+        self._log("zrangebyscore")
+        lo, hi = _score_bound(min, float("-inf")), _score_bound(max, float("inf"))
+        items = [(m, s) for m, s in self._zsorted(key) if lo <= s <= hi]
+        if start is not None:
+            items = items[start:start + num]
+        return items if withscores else [m for m, _ in items]
+
+    def zrevrangebyscore(self, key, max, min, start=None, num=None, withscores=False):
+        self._log("zrevrangebyscore")
+        lo, hi = _score_bound(min, float("-inf")), _score_bound(max, float("inf"))
+        items = [(m, s) for m, s in self._zsorted(key, reverse=True) if lo <= s <= hi]
+        if start is not None:
+            items = items[start:start + num]
+        return items if withscores else [m for m, _ in items]
+
+    def zrevrange(self, key, start, end, withscores=False):
+        items = self._zsorted(key, reverse=True)
+        items = items[start:] if end == -1 else items[start:end + 1]
+        return items if withscores else [m for m, _ in items]
+
+    # -- pub/sub -------------------------------------------------------------
+
+    def publish(self, channel, message):
+        self.published.append((channel, message))
+        return 0
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    # -- scripting -----------------------------------------------------------
+
+    def register_script(self, script):
+        run = LUA_SCRIPTS[script]
+
+        def call(keys=(), args=(), client=None):
+            logged = len(self.commands)
+            result = run(self, list(keys), list(args))
+            del self.commands[logged:]  # The script's own commands aren't round trips
+            self._log("evalsha")
+            return result
+        return call
+
+
+class FakePipeline:
+    """Queues commands and runs them on execute(); commands run immediately between watch() and multi()."""
+
+    def __init__(self, redis: FakeRedis):
+        self.redis = redis
+        self.queued = []
+        self.watched: Dict[str, Any] = {}
+        self.immediate = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.reset()
+
+    def watch(self, *keys):
+        self.watched = {_s(key): copy.deepcopy(self.redis.data.get(_s(key))) for key in keys}
+        self.immediate = True
+
+    def unwatch(self):
+        self.watched = {}
+        self.immediate = False
+
+    def multi(self):
+        self.immediate = False
+
+    def reset(self):
+        self.queued = []
+        self.watched = {}
+        self.immediate = False
+
+    def __getattr__(self, name):
+        if self.immediate:
+            return getattr(self.redis, name)
+
+        def queue(*args, **kwargs):
+            self.queued.append((name, args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        changed = any(self.redis.data.get(key) != value for key, value in self.watched.items())
+        if changed:
+            self.reset()
+            raise WatchError("Watched variable changed.")
+        results = [getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.queued]
+        self.reset()
+        return results
+
+
+class FakeCache:
+    """RedisCache stand-in backed by one FakeRedis for both clients."""
+
+    is_connected = True
+
+    def __init__(self, client: Optional[FakeRedis] = None):
+        self.client = client or FakeRedis()
+
+    def get_client(self):
+        return self.client
+
+    def get_binary_client(self):
+        return self.client
+
+    def get(self, key):
+        raw = self.client.get(key)
+        return deserialize(raw) if raw is not None else None
+
+    def set(self, key, value, ttl=None):
+        self.client.setex(key, ttl or 3600, serialize(value))
+        return True
+
+    def delete(self, key):
+        self.client.delete(key)
+        return True
+
+
+class FakePubSub:
+    """Pattern subscription fed by FakeAsyncRedis.publish()."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.messages = asyncio.Queue()
+        self.pattern = None
+
+    async def psubscribe(self, pattern):
+        self.pattern = pattern
+        self.redis.pattern_subscriptions += 1
+        self.redis.pubsubs.append(self)
+
+    async def punsubscribe(self):
+        self.redis.pubsubs.remove(self)
+
+    async def subscribe(self, channel):
+        await self.psubscribe(channel)
+
+    async def unsubscribe(self):
+        await self.punsubscribe()
+
+    async def close(self):
+        pass
+
+    async def get_message(self, ignore_subscribe_messages=True, timeout=1.0):
+        try:
+            return await asyncio.wait_for(self.messages.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class FakeAsyncRedis:
+    """Pub/sub, stream, string, counter, hash and set subset of redis.asyncio."""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+        self.streams = {}
+        self.pubsubs = []
+        self.pattern_subscriptions = 0
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        if ex:
+            self.ttls[key] = ex
+        return True
+
+    async def incr(self, key, amount=1):
+        self.data[key] = int(self.data.get(key, 0)) + amount
+        return self.data[key]
+
+    async def delete(self, *keys):
+        removed = 0
+        for key in keys:
+            removed += self.data.pop(key, None) is not None
+            self.ttls.pop(key, None)
+        return removed
+
+    def pubsub(self):
+        return FakePubSub(self)
+
+    async def publish(self, channel, message):
+        for pubsub in self.pubsubs:
+            if fnmatch.fnmatchcase(channel, pubsub.pattern):
+                pubsub.messages.put_nowait({"type": "pmessage", "channel": channel, "data": message})
+
+    async def xadd(self, key, fields, maxlen=None, approximate=True):
+        entries = self.streams.setdefault(key, [])
+        entry_id = f"1700000000000-{len(entries)}"
+        entries.append((entry_id, dict(fields)))
+        return entry_id
+
+    async def xrange(self, key, min="-", max="+", count=None):
+        lo = tuple(map(int, min.split("-")))
+        return [(i, f) for i, f in self.streams.get(key, []) if tuple(map(int, i.split("-"))) >= lo][:count]
+
+    async def expire(self, key, seconds):
+        return True
+
+    async def hset(self, key, field, value):
+        self.data.setdefault(key, {})[field] = value
+
+    async def hget(self, key, field):
+        return self.data.get(key, {}).get(field)
+
+    async def sadd(self, key, *members):
+        self.data.setdefault(key, set()).update(members)
+
+    async def smembers(self, key):
+        return set(self.data.get(key, set()))
+
+    def pipeline(self, transaction=True):
+        return FakeAsyncPipeline(self)
+
+
+class FakeAsyncPipeline:
+    """Queues commands and runs them on await execute(); commands run immediately between watch() and multi()."""
+
+    def __init__(self, redis: FakeAsyncRedis):
+        self.redis = redis
+        self.queued = []
+        self.watched: Dict[str, Any] = {}
+        self.immediate = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.reset()
+
+    async def watch(self, *keys):
+        self.watched = {key: copy.deepcopy(self.redis.data.get(key)) for key in keys}
+        self.immediate = True
+
+    def multi(self):
+        self.immediate = False
+
+    def reset(self):
+        self.queued = []
+        self.watched = {}
+        self.immediate = False
+
+    def __getattr__(self, name):
+        if self.immediate:
+            return getattr(self.redis, name)
+
+        def queue(*args, **kwargs):
+            self.queued.append((name, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self):
+        if any(self.redis.data.get(key) != value for key, value in self.watched.items()):
+            self.reset()
+            raise WatchError("Watched variable changed.")
+        results = [await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.queued]
+        self.reset()
+        return results
+
+
+# -- Lua scripts -------------------------------------------------------------
+
+def _undo_component_index(redis: FakeRedis, keys: List[str], args: List[Any], member: str) -> None:
+    old = redis.hget(keys[0], member)
+    if old is None:
+        return
+    quality, source, job_id = json.loads(old)
+    redis.zrem(args[0] + source, member)
+    if job_id:
+        redis.zrem(args[1] + job_id, member)
+    redis.hincrbyfloat(keys[1], "quality_sum", -quality)
+
+
+def _index_component(redis: FakeRedis, keys: List[str], args: List[Any]) -> None:
+    member, quality, source, job_id, stored_at, expires_at, meta = args[2:9]
+    _undo_component_index(redis, keys, args, member)
+    redis.zadd(keys[2], {member: float(stored_at)}, nx=True)
+    redis.zadd(keys[3], {member: float(quality)})
+    redis.zadd(args[0] + source, {member: float(quality)})
+    redis.sadd(keys[5], source)
+    if job_id:
+        redis.zadd(args[1] + job_id, {member: float(quality)})
+    if expires_at != "":
+        redis.zadd(keys[4], {member: float(expires_at)})
+    else:
+        redis.zrem(keys[4], member)
+    redis.hset(keys[0], member, meta)
+    redis.hincrbyfloat(keys[1], "quality_sum", float(quality))
+
+
+def _unindex_components(redis: FakeRedis, keys: List[str], args: List[Any]) -> int:
+    removed = 0
+    for member in keys[6:]:
+        if not redis.exists(member):
+            _undo_component_index(redis, keys, args, member)
+            redis.hdel(keys[0], member)
+            for index_key in keys[2:5]:
+                redis.zrem(index_key, member)
+            removed += 1
+    return removed
+
+
+def _update_line_items(redis: FakeRedis, keys: List[str], args: List[Any]) -> List[str]:
+    changed = []
+    for line_item_id, read, merged in zip(args[1::3], args[2::3], args[3::3]):
+        if redis.hget(keys[0], line_item_id) == read:
+            redis.hset(keys[0], line_item_id, merged)
+        else:
+            changed.append(line_item_id)
+    redis.expire(keys[0], args[0])
+    redis.expire(keys[1], args[0])
+    return changed
+
+
+def _lua_scripts() -> Dict[str, Callable]:
+    from app.cache import component_redis_storage
+    from app.utils import bulk_upload_redis
+
+    return {
+        component_redis_storage.INDEX_SCRIPT: _index_component,
+        component_redis_storage.UNINDEX_SCRIPT: _unindex_components,
+        bulk_upload_redis.UPDATE_ITEMS_SCRIPT: _update_line_items,
+    }
+
+
+LUA_SCRIPTS = _lua_scripts()
@@ -3,17 +3,32 @@ Novu Consumer Service
 
 RabbitMQ consumer that listens for notification events
 and triggers Novu workflows for async/non-critical alerts.
+
+Messages are handled concurrently, each routing-key family (notification,
+auth, customer) on its own bounded worker pool, so a stalled Novu backs up
+notification workers without taking the threads that sync subscribers or
+cancel subscriptions. Each family may also hold only its share of the
+prefetch window; past that its deliveries are requeued at once instead of
+filling the window for everyone. Workers share one pooled HTTP session and
+one Supabase connection pool. Acks/nacks are handed back to the connection
+thread, since pika channels are not thread-safe.
 """
 
+import functools
 import json
 import logging
 import os
 import sys
+import threading
 import time
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional
 
 import pika
+import requests
 from pika.exceptions import AMQPConnectionError
+from requests.adapters import HTTPAdapter
 
 # Configure logging
 logging.basicConfig(
@@ -52,6 +67,28 @@ ROUTING_KEY_CUSTOMER = "customer.#"  # Customer events (org delete, billing)
 MAX_RETRIES = 5
 RETRY_DELAY = 5  # seconds
 
+# Concurrent dispatch (false = handle messages inline on the consumer thread)
+CONCURRENT_DISPATCH = os.getenv("NOVU_CONSUMER_CONCURRENT", "true").lower() == "true"
+
+# Worker threads per lane; a lane is the routing-key family of a message
+LANE_WORKERS = {
+    "notification": int(os.getenv("NOVU_CONSUMER_NOTIFICATION_WORKERS", "8")),
+    "auth": int(os.getenv("NOVU_CONSUMER_AUTH_WORKERS", "4")),
+    "customer": int(os.getenv("NOVU_CONSUMER_CUSTOMER_WORKERS", "4")),
+}
+# Unsettled deliveries one lane may hold (running plus queued for a worker)
+LANE_BACKLOG = {name: workers * 2 for name, workers in LANE_WORKERS.items()}
+PREFETCH_COUNT = sum(LANE_BACKLOG.values())
+
+SUPABASE_MAX_CONNECTIONS = int(os.getenv("SUPABASE_MAX_CONCURRENCY", "4"))
+HTTP_TIMEOUT = 30  # seconds
+NOVU_BULK_MAX_EVENTS = 100  # Novu limit per /v1/events/trigger/bulk request
+
+# Delivery outcomes
+ACK = "ack"
+REQUEUE = "requeue"  # nack and requeue for retry
+REJECT = "reject"  # nack without requeue (dead-lettered)
+
 
 class NovuConsumer:
     """
@@ -65,8 +102,69 @@ class NovuConsumer:
         self.connection = None
         self.channel = None
         self.novu_client = None
+        self.http = self._init_http()
+        self.lanes = {
+            name: ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"novu-{name}")
+            for name, workers in LANE_WORKERS.items()
+        } if CONCURRENT_DISPATCH else {}
+        # Unsettled deliveries per lane; only touched on the connection thread
+        self.in_flight = {name: 0 for name in LANE_WORKERS}
+        self.db_slots = threading.BoundedSemaphore(SUPABASE_MAX_CONNECTIONS)
+        self.db_pool = None
+        self._db_pool_lock = threading.Lock()
         self._init_novu()
 
+    @staticmethod
+    def _init_http() -> requests.Session:
+        """Shared HTTP session; keeps connections to Novu and Stripe alive between messages."""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=sum(LANE_WORKERS.values()))
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    @staticmethod
+    def _novu_headers() -> Dict[str, str]:
+        return {
+            "Authorization": f"ApiKey {NOVU_API_KEY}",
+            "Content-Type": "application/json",
+        }
+
+    @contextmanager
+    def _supabase_connection(self):
+        """
+        Borrow a connection from the shared Supabase pool.
+
+        Commits on success. On error the connection is discarded rather than
+        returned, since it may be broken or mid-transaction.
+        """
+        with self.db_slots:
+            if self.db_pool is None:
+                with self._db_pool_lock:
+                    if self.db_pool is None:
+                        from psycopg2.pool import ThreadedConnectionPool
+
+                        self.db_pool = ThreadedConnectionPool(
+                            minconn=1,
+                            maxconn=SUPABASE_MAX_CONNECTIONS,
+                            host=SUPABASE_DB_HOST,
+                            port=SUPABASE_DB_PORT,
+                            dbname=SUPABASE_DB_NAME,
+                            user=SUPABASE_DB_USER,
+                            password=SUPABASE_DB_PASSWORD,
+                        )
+            pool = self.db_pool
+            conn = pool.getconn()
+            discard = False
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                discard = True
+                raise
+            finally:
+                pool.putconn(conn, close=discard or bool(conn.closed))
+
     def _init_novu(self):
         """Initialize Novu client using direct HTTP calls for reliability."""
         if not NOVU_API_KEY:
@@ -176,14 +274,9 @@ class NovuConsumer:
             return True
 
         try:
-            import requests
-
             # Novu API v1 subscribers endpoint
             url = f"{NOVU_API_URL}/v1/subscribers"
-            headers = {
-                "Authorization": f"ApiKey {NOVU_API_KEY}",
-                "Content-Type": "application/json",
-            }
+            headers = self._novu_headers()
             subscriber_data = {
                 "subscriberId": subscriber_id,
                 "email": email,
@@ -196,7 +289,7 @@ class NovuConsumer:
                 subscriber_data["data"] = data
 
             # POST to create (will update if exists due to Novu's behavior)
-            response = requests.post(url, json=subscriber_data, headers=headers, timeout=30)
+            response = self.http.post(url, json=subscriber_data, headers=headers, timeout=HTTP_TIMEOUT)
 
             if response.status_code in (200, 201):
                 logger.info(f"Created/updated Novu subscriber: {subscriber_id} ({email})")
@@ -204,7 +297,7 @@ class NovuConsumer:
             elif response.status_code == 409:
                 # Subscriber exists, try to update
                 update_url = f"{NOVU_API_URL}/v1/subscribers/{subscriber_id}"
-                response = requests.put(update_url, json=subscriber_data, headers=headers, timeout=30)
+                response = self.http.put(update_url, json=subscriber_data, headers=headers, timeout=HTTP_TIMEOUT)
                 if response.status_code in (200, 201):
                     logger.info(f"Updated existing Novu subscriber: {subscriber_id}")
                     return True
@@ -243,14 +336,8 @@ class NovuConsumer:
             return True
 
         try:
-            import requests
-
             # Novu API v1 trigger endpoint
             url = f"{NOVU_API_URL}/v1/events/trigger"
-            headers = {
-                "Authorization": f"ApiKey {NOVU_API_KEY}",
-                "Content-Type": "application/json",
-            }
             data = {
                 "name": workflow_id,
                 "to": {"subscriberId": subscriber_id},
@@ -259,7 +346,7 @@ class NovuConsumer:
             if overrides:
                 data["overrides"] = overrides
 
-            response = requests.post(url, json=data, headers=headers, timeout=30)
+            response = self.http.post(url, json=data, headers=self._novu_headers(), timeout=HTTP_TIMEOUT)
 
             if response.status_code in (200, 201):
                 result = response.json()
@@ -274,6 +361,67 @@ class NovuConsumer:
             logger.error(f"Failed to trigger {workflow_id}: {e}")
             return False
 
+    def _trigger_novu_bulk(
+        self,
+        workflow_id: str,
+        subscriber_ids: List[str],
+        payload: Dict[str, Any],
+        overrides: Optional[Dict] = None,
+        event_id: Optional[str] = None,
+    ) -> bool:
+        """
+        Trigger a Novu workflow for many subscribers via the bulk trigger API.
+
+        Sends NOVU_BULK_MAX_EVENTS triggers per request. When the source event
+        has an event_id, each trigger gets a transactionId derived from it so
+        a redelivered message does not notify the same subscriber twice.
+
+        Args:
+            workflow_id: Novu workflow identifier
+            subscriber_ids: Target subscriber IDs
+            payload: Notification data (same for every subscriber)
+            overrides: Optional channel overrides
+            event_id: Source event ID (used for transaction IDs)
+
+        Returns:
+            True if every request was accepted
+        """
+        if not self.novu_client:
+            logger.info(f"[STUB] Would bulk trigger {workflow_id} for {len(subscriber_ids)} subscribers")
+            return True
+
+        events = []
+        for subscriber_id in subscriber_ids:
+            data = {
+                "name": workflow_id,
+                "to": {"subscriberId": subscriber_id},
+                "payload": payload,
+            }
+            if overrides:
+                data["overrides"] = overrides
+            if event_id:
+                data["transactionId"] = f"{event_id}:{subscriber_id}"
+            events.append(data)
+
+        url = f"{NOVU_API_URL}/v1/events/trigger/bulk"
+        success = True
+        for start in range(0, len(events), NOVU_BULK_MAX_EVENTS):
+            chunk = events[start:start + NOVU_BULK_MAX_EVENTS]
+            try:
+                response = self.http.post(
+                    url, json={"events": chunk}, headers=self._novu_headers(), timeout=HTTP_TIMEOUT
+                )
+                if response.status_code in (200, 201):
+                    logger.info(f"Bulk triggered {workflow_id} for {len(chunk)} subscribers")
+                else:
+                    logger.error(f"Novu bulk API error {response.status_code}: {response.text}")
+                    success = False
+            except Exception as e:
+                logger.error(f"Failed to bulk trigger {workflow_id}: {e}")
+                success = False
+
+        return success
+
     def _handle_auth_event(self, message: Dict[str, Any], event_type: str) -> bool:
         """
         Handle auth events for Novu subscriber management.
@@ -379,8 +527,6 @@ class NovuConsumer:
             return True
 
         try:
-            import requests
-
             url = f"https://api.stripe.com/v1/subscriptions/{stripe_subscription_id}"
             headers = {
                 "Authorization": f"Bearer {STRIPE_API_KEY}",
@@ -388,7 +534,7 @@ class NovuConsumer:
             }
 
             # Cancel immediately (not at period end) since org is being deleted
-            response = requests.delete(url, headers=headers, timeout=30)
+            response = self.http.delete(url, headers=headers, timeout=HTTP_TIMEOUT)
 
             if response.status_code == 200:
                 result = response.json()
@@ -421,32 +567,18 @@ class NovuConsumer:
             True if updated successfully
         """
         try:
-            import psycopg2
-
-            conn = psycopg2.connect(
-                host=SUPABASE_DB_HOST,
-                port=SUPABASE_DB_PORT,
-                dbname=SUPABASE_DB_NAME,
-                user=SUPABASE_DB_USER,
-                password=SUPABASE_DB_PASSWORD,
-            )
-            cursor = conn.cursor()
-
-            # Update subscription status
-            cursor.execute(
-                """
-                UPDATE subscriptions
-                SET status = %s::subscription_status, updated_at = NOW(), canceled_at = NOW()
-                WHERE organization_id = %s::uuid
-                RETURNING id, provider_subscription_id
-                """,
-                (new_status, organization_id),
-            )
-
-            result = cursor.fetchone()
-            conn.commit()
-            cursor.close()
-            conn.close()
+            with self._supabase_connection() as conn, conn.cursor() as cursor:
+                # Update subscription status
+                cursor.execute(
+                    """
+                    UPDATE subscriptions
+                    SET status = %s::subscription_status, updated_at = NOW(), canceled_at = NOW()
+                    WHERE organization_id = %s::uuid
+                    RETURNING id, provider_subscription_id
+                    """,
+                    (new_status, organization_id),
+                )
+                result = cursor.fetchone()
 
             if result:
                 logger.info(f"[SUPABASE] Updated subscription {result[0]} to status={new_status}")
@@ -470,32 +602,19 @@ class NovuConsumer:
             Stripe subscription ID or None
         """
         try:
-            import psycopg2
-
-            conn = psycopg2.connect(
-                host=SUPABASE_DB_HOST,
-                port=SUPABASE_DB_PORT,
-                dbname=SUPABASE_DB_NAME,
-                user=SUPABASE_DB_USER,
-                password=SUPABASE_DB_PASSWORD,
-            )
-            cursor = conn.cursor()
-
-            cursor.execute(
-                """
-                SELECT provider_subscription_id FROM subscriptions
-                WHERE organization_id = %s::uuid
-                AND provider_subscription_id IS NOT NULL
-                AND status NOT IN ('canceled'::subscription_status, 'expired'::subscription_status)
-                ORDER BY created_at DESC
-                LIMIT 1
-                """,
-                (organization_id,),
-            )
-
-            result = cursor.fetchone()
-            cursor.close()
-            conn.close()
+            with self._supabase_connection() as conn, conn.cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT provider_subscription_id FROM subscriptions
+                    WHERE organization_id = %s::uuid
+                    AND provider_subscription_id IS NOT NULL
+                    AND status NOT IN ('canceled'::subscription_status, 'expired'::subscription_status)
+                    ORDER BY created_at DESC
+                    LIMIT 1
+                    """,
+                    (organization_id,),
+                )
+                result = cursor.fetchone()
 
             if result:
                 return result[0]
@@ -732,9 +851,56 @@ class NovuConsumer:
             logger.warning(f"[CUSTOMER] Unhandled customer event type: {event_type}")
             return True  # ACK unknown events to avoid requeue
 
+    @staticmethod
+    def _lane_for(routing_key: str) -> str:
+        """Worker pool a message runs on, by routing-key family."""
+        if routing_key.startswith("auth."):
+            return "auth"
+        if routing_key.startswith("customer."):
+            return "customer"
+        return "notification"
+
     def _process_message(self, ch, method, properties, body):
+        """Consumer callback: hand the message to its lane's worker pool, or handle it inline."""
+        lane = self._lane_for(method.routing_key)
+        executor = self.lanes.get(lane)
+        if executor is None:
+            self._settle(ch, method.delivery_tag, self._handle_message(method.routing_key, body))
+            return
+        if self.in_flight[lane] >= LANE_BACKLOG[lane]:
+            # Lane is backed up (e.g. Novu stalled): give the prefetch slot back
+            # so other lanes keep receiving; the broker redelivers this later
+            logger.warning(f"[{lane.upper()}] Lane backlog full, requeueing delivery {method.delivery_tag}")
+            self._settle(ch, method.delivery_tag, REQUEUE)
+            return
+        self.in_flight[lane] += 1
+        executor.submit(self._dispatch, ch, lane, method.delivery_tag, method.routing_key, body)
+
+    def _dispatch(self, ch, lane: str, delivery_tag: int, routing_key: str, body: bytes):
+        """Worker thread: handle the message, then settle it on the connection thread."""
+        outcome = self._handle_message(routing_key, body)
+        try:
+            self.connection.add_callback_threadsafe(
+                functools.partial(self._settle, ch, delivery_tag, outcome, lane)
+            )
+        except Exception as e:
+            # Connection is gone; the broker redelivers unacked messages
+            logger.warning(f"Could not settle delivery {delivery_tag}: {e}")
+
+    def _settle(self, ch, delivery_tag: int, outcome: str, lane: Optional[str] = None):
+        """Ack or nack one delivery (each tag individually, since workers finish out of order)."""
+        if lane is not None:
+            self.in_flight[lane] -= 1
+        if not ch.is_open:
+            return
+        if outcome == ACK:
+            ch.basic_ack(delivery_tag=delivery_tag)
+        else:
+            ch.basic_nack(delivery_tag=delivery_tag, requeue=outcome == REQUEUE)
+
+    def _handle_message(self, routing_key: str, body: bytes) -> str:
         """
-        Process incoming events from RabbitMQ.
+        Process an incoming event from RabbitMQ.
 
         Handles three types of events:
         1. Notification events (notification.#):
@@ -745,6 +911,8 @@ class NovuConsumer:
                "payload": { ... },
                "overrides": { ... }  # optional
            }
+           Fan-out notifications carry "subscriber_ids": [...] instead of
+           "subscriber_id" and go through Novu's bulk trigger API.
 
         2. Auth events (auth.#) - for subscriber sync:
            {
@@ -765,8 +933,10 @@ class NovuConsumer:
                "user_id": "admin-uuid",
                "organization_name": "Acme Corp"
            }
+
+        Returns:
+            ACK, REQUEUE or REJECT
         """
-        routing_key = method.routing_key
         try:
             message = json.loads(body)
             # Use event_type from message body, or derive from routing_key if not present
@@ -777,31 +947,33 @@ class NovuConsumer:
             # Handle auth events (subscriber sync)
             if routing_key.startswith("auth."):
                 success = self._handle_auth_event(message, event_type)
-                if success:
-                    ch.basic_ack(delivery_tag=method.delivery_tag)
-                else:
-                    ch.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
-                return
+                return ACK if success else REQUEUE
 
             # Handle customer events (billing cleanup)
             if routing_key.startswith("customer."):
                 success = self._handle_customer_event(message, event_type)
-                if success:
-                    ch.basic_ack(delivery_tag=method.delivery_tag)
-                else:
-                    ch.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
-                return
+                return ACK if success else REQUEUE
 
             # Handle notification events (workflow triggers)
             workflow_id = message.get("workflow_id")
             subscriber_id = message.get("subscriber_id")
             payload = message.get("payload", {})
             overrides = message.get("overrides")
+            subscriber_ids = message.get("subscriber_ids")
+
+            if workflow_id and subscriber_ids:
+                success = self._trigger_novu_bulk(
+                    workflow_id=workflow_id,
+                    subscriber_ids=subscriber_ids,
+                    payload=payload,
+                    overrides=overrides,
+                    event_id=message.get("event_id"),
+                )
+                return ACK if success else REQUEUE
 
             if not workflow_id or not subscriber_id:
                 logger.error("Missing workflow_id or subscriber_id in notification message")
-                ch.basic_ack(delivery_tag=method.delivery_tag)
-                return
+                return ACK
 
             # Trigger Novu workflow
             success = self._trigger_novu(
@@ -811,18 +983,15 @@ class NovuConsumer:
                 overrides=overrides,
             )
 
-            if success:
-                ch.basic_ack(delivery_tag=method.delivery_tag)
-            else:
-                # Requeue for retry (will go to DLX after TTL)
-                ch.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
+            # Requeue for retry on failure (will go to DLX after TTL)
+            return ACK if success else REQUEUE
 
         except json.JSONDecodeError as e:
             logger.error(f"Invalid JSON in message: {e}")
-            ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+            return REJECT
         except Exception as e:
             logger.error(f"Error processing message: {e}")
-            ch.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
+            return REQUEUE
 
     def start(self):
         """Start consuming messages from RabbitMQ."""
@@ -830,8 +999,8 @@ class NovuConsumer:
             logger.error("Cannot start consumer - RabbitMQ connection failed")
             sys.exit(1)
 
-        # Set QoS
-        self.channel.basic_qos(prefetch_count=10)
+        # Set QoS (bounds the messages in flight across all lanes)
+        self.channel.basic_qos(prefetch_count=PREFETCH_COUNT)
 
         # Start consuming
         self.channel.basic_consume(
@@ -843,6 +1012,7 @@ class NovuConsumer:
         logger.info("Novu consumer started, waiting for messages...")
         logger.info(f"Novu API: {NOVU_API_URL}")
         logger.info(f"Novu configured: {self.novu_client is not None}")
+        logger.info(f"Lane workers: {LANE_WORKERS}, prefetch: {PREFETCH_COUNT}")
 
         try:
             self.channel.start_consuming()
@@ -850,15 +1020,26 @@ class NovuConsumer:
             logger.info("Shutting down consumer...")
             self.channel.stop_consuming()
         finally:
-            if self.connection:
-                self.connection.close()
+            self._shutdown()
 
     def stop(self):
         """Stop the consumer gracefully."""
         if self.channel:
             self.channel.stop_consuming()
-        if self.connection:
+        self._shutdown()
+
+    def _shutdown(self):
+        """Let in-flight handlers finish and settle their deliveries, then close."""
+        for executor in self.lanes.values():
+            executor.shutdown(wait=True)
+        if self.connection and self.connection.is_open:
+            # Run the acks/nacks the workers queued with add_callback_threadsafe
+            self.connection.process_data_events(time_limit=0)
             self.connection.close()
+        self.http.close()
+        if self.db_pool is not None:
+            self.db_pool.closeall()
+            self.db_pool = None
 
 
 if __name__ == "__main__":